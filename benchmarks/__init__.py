@@ -0,0 +1 @@
+"""Benchmark scripts for measuring the task store at scale."""
@@ -0,0 +1,44 @@
+"""
+Compares saving a few edits as an autosave delta with rewriting the whole
+snapshot, by latency and bytes written.
+
+Run with: uv run python -m benchmarks.bench_autosave [task_count] [edits]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.services.task_service import TaskService
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    edits = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    service = TaskService()
+    service.add_tasks((f"Task {i}", f"Description {i}") for i in range(count))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "tasks.snap"
+        service.save_changes(path)
+
+        start = time.perf_counter()
+        size = service.save_snapshot(Path(directory) / "full.snap")
+        full_seconds = time.perf_counter() - start
+        print(f"{'full snapshot':<28} {full_seconds * 1000:10.3f} ms {size:>12} B")
+
+        best = float("inf")
+        written = 0
+        for round_ in range(5):
+            for task_id in range(1 + round_ * edits, 1 + (round_ + 1) * edits):
+                service.update_task(task_id, title=f"Edited {task_id}")
+            report = service.save_changes(path)
+            best = min(best, report.seconds)
+            written = report.bytes_written
+        label = f"delta, {edits} edits"
+        print(f"{label:<28} {best * 1000:10.3f} ms {written:>12} B")
+
+
+if __name__ == "__main__":
+    main()
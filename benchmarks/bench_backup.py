@@ -0,0 +1,60 @@
+"""
+Compares incremental backups, which find changed tasks in the revision log,
+with full backups and with scanning every task for a newer revision, at
+hundreds of thousands of tasks and a few changes between backups.
+
+Run with: uv run python -m benchmarks.bench_backup [task_count] [changes]
+"""
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import measure
+from src.services.task_service import TaskService
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rng = random.Random(11)
+    service = TaskService()
+    service.add_tasks((f"Task {i}", f"Notes for task {i}") for i in range(count))
+
+    with tempfile.TemporaryDirectory() as directory:
+        folder = Path(directory)
+        full = service.backup(folder / "full")
+        print(f"full backup of {count} tasks: {full.bytes_written} bytes")
+        measure(f"full backup, {count} tasks", lambda: service.backup(folder / "f"), 3)
+
+        since = full.revision
+        for task_id in rng.sample(range(1, count + 1), changes):
+            service.update_task(task_id, title=f"Edited {task_id}")
+        service.delete_tasks(rng.sample(range(1, count + 1), changes // 10))
+        incremental = service.backup(folder / "inc", since)
+        print(
+            f"incremental backup: {incremental.tasks} tasks, "
+            f"{incremental.deleted} deletions, {incremental.bytes_written} bytes"
+        )
+        measure(
+            f"incremental backup, {changes} changes",
+            lambda: service.backup(folder / "i", since),
+        )
+
+        def scan() -> list[int]:
+            return [t.id for t in service._tasks.values() if t.revision > since]
+
+        measure("revision log lookup", lambda: service._revisions.changed_since(since))
+        measure("scan for changed tasks", scan)
+
+        restored = TaskService()
+        chain = [folder / "full", folder / "inc"]
+        measure(
+            "restore full + incremental", lambda: restored.restore_backups(chain), 1
+        )
+        assert len(restored.get_all_tasks()) == len(service.get_all_tasks())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Churns a store through millions of tasks, then measures bulk deletes and the
+memory compaction gives back.
+
+Run with: uv run python -m benchmarks.bench_churn [churned_tasks] [live_tasks]
+"""
+
+import sys
+import time
+
+from benchmarks.common import measure
+from src.services.memory import format_bytes
+from src.services.task_service import TaskService
+
+_BATCH = 50_000
+
+
+def main() -> None:
+    churned = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    live = int(sys.argv[2]) if len(sys.argv) > 2 else 50_000
+    service = TaskService()
+
+    start = time.perf_counter()
+    for offset in range(0, churned, _BATCH):
+        tasks = service.add_tasks((f"Churn {i}", "") for i in range(_BATCH))
+        service.toggle_tasks(task.id for task in tasks)
+        service.purge_completed()
+        service.compact()
+    label = f"churn {churned} tasks"
+    print(f"{label:<40} {time.perf_counter() - start:10.3f} s")
+
+    tasks = service.add_tasks((f"Live {i}", "") for i in range(live))
+    service.toggle_tasks(task.id for task in tasks[::2])
+    before = service.memory_report().structures["task dict"]
+    measure("purge_completed", service.purge_completed, repeat=1)
+    ids = [task.id for task in tasks[1::2]]
+    measure(
+        "delete_task, one at a time", lambda: [service.delete_task(i) for i in ids], 1
+    )
+    measure("compact", service.compact, repeat=1)
+    after = service.memory_report().structures["task dict"]
+    print(f"{'task dict before compaction':<40} {format_bytes(before):>12}")
+    print(f"{'task dict after compaction':<40} {format_bytes(after):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Compares reading archived tasks straight from the cold store with reading
+them through the LRU cache, under a skewed access pattern where a few tasks
+are read far more often than the rest.
+
+Run with: uv run python -m benchmarks.bench_cold_cache [task_count] [reads]
+"""
+
+import random
+import sys
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from benchmarks.common import measure
+from src.services.task_service import TaskService
+from src.storage.cached_store import CachedStore, TaskBackend
+from src.storage.cold_store import ColdStore
+
+
+def archived_service(cold_store: TaskBackend, count: int) -> TaskService:
+    """Builds a service whose tasks are all in the cold tier."""
+    service = TaskService(cold_store=cold_store, archive_after=timedelta(0))
+    service.add_tasks((f"Task {i}", f"Description {i}") for i in range(count))
+    service.toggle_tasks(range(1, count + 1))
+    service.archive_completed()
+    return service
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    reads = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    rng = random.Random(7)
+    ids = [min(count, int(rng.paretovariate(1.2))) for _ in range(reads)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label, cache_size in (("uncached", 0), ("LRU of 1024", 1024)):
+            cold: TaskBackend = ColdStore(Path(directory) / f"{cache_size}.jsonl")
+            if cache_size:
+                cold = CachedStore(cold, cache_size)
+            service = archived_service(cold, count)
+
+            def read_all(service: TaskService = service) -> None:
+                for task_id in ids:
+                    service.get_task(task_id)
+
+            measure(f"{reads} reads, {label}", read_all, repeat=3)
+            stats = service.cold_cache_stats()
+            if stats is not None:
+                print(f"  hit rate {stats.hit_rate:.1%}")
+            service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Compares the dependency index, which keeps a topological order and the ready
+set current as edges and tasks change, with searching and sorting the whole
+graph, at hundreds of thousands of edges.
+
+Edges are drawn between random tasks, oriented by a hidden random ranking
+so the graph stays acyclic while most edges disagree with the ID order. The
+index is driven directly; through `TaskService` every change also updates
+the sorted views, which dominate at this size.
+
+Run with: uv run python -m benchmarks.bench_dependencies [task_count ...]
+"""
+
+import random
+import sys
+from collections import deque
+from itertools import islice
+
+from benchmarks.common import measure
+from src.models.task import Task
+from src.services.dependencies import DependencyIndex
+
+
+def reaches(dependents: dict[int, set[int]], start: int, goal: int) -> bool:
+    """Checks for a path by searching the whole graph, without an order."""
+    seen, stack = {start}, [start]
+    while stack:
+        node = stack.pop()
+        if node == goal:
+            return True
+        for nxt in dependents.get(node, ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return False
+
+
+def kahn_order(dependents: dict[int, set[int]]) -> list[int]:
+    """Sorts the whole graph topologically from scratch."""
+    indegree: dict[int, int] = dict.fromkeys(dependents, 0)
+    for targets in dependents.values():
+        for node in targets:
+            indegree[node] = indegree.get(node, 0) + 1
+    queue = deque(node for node, degree in indegree.items() if not degree)
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for nxt in dependents.get(node, ()):
+            indegree[nxt] -= 1
+            if not indegree[nxt]:
+                queue.append(nxt)
+    return order
+
+
+def scan_ready(tasks: dict[int, Task]) -> list[int]:
+    """Finds ready tasks by checking the blockers of every task."""
+    return [
+        task.id
+        for task in tasks.values()
+        if not task.completed
+        and not any(not tasks[b].completed for b in task.blocked_by)
+    ]
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [200_000]
+    rng = random.Random(5)
+    for count in sizes:
+        tasks = {i: Task(i, f"Task {i}") for i in range(1, count + 1)}
+        index = DependencyIndex()
+        index.add_many(list(tasks.values()))
+        rank = list(range(count + 1))
+        rng.shuffle(rank)
+        pairs = []
+        for _ in range(count * 3 // 2):
+            a, b = rng.sample(range(1, count + 1), 2)
+            pairs.append((a, b) if rank[a] < rank[b] else (b, a))
+        dependents: dict[int, set[int]] = {}
+
+        def link(edges: list[tuple[int, int]]) -> None:
+            for blocker, task_id in edges:
+                task = tasks[task_id]
+                index.make_room(blocker, task_id)
+                index.discard(task)
+                task.blocked_by = tuple(sorted({*task.blocked_by, blocker}))
+                index.add(task)
+                dependents.setdefault(blocker, set()).add(task_id)
+
+        def search(edges: list[tuple[int, int]]) -> None:
+            for blocker, task_id in edges:
+                reaches(dependents, task_id, blocker)
+
+        pairs, extra = pairs[:-1000], pairs[-1000:]
+        measure(f"add {len(pairs)} edges, {count} tasks", lambda: link(pairs), 1)
+        measure("1000 full cycle searches", lambda: search(extra), 1)
+        measure("add 1000 more edges", lambda: link(extra), 1)
+        print(f"  {len(index)} edges, {len(index.ready)} tasks ready")
+
+        measure("listing the maintained order", lambda: list(index.order()))
+        measure("full topological sort", lambda: kahn_order(dependents), 3)
+        assert index.ready.to_list() == scan_ready(tasks)
+        measure("ready set, first 50", lambda: list(islice(index.ready, 50)))
+        measure("ready set, all", index.ready.to_list)
+        measure("scan for ready tasks", lambda: scan_ready(tasks), 3)
+
+        def complete() -> None:
+            for task_id in rng.sample(range(1, count + 1), 1000):
+                task = tasks[task_id]
+                index.discard(task)
+                task.completed = not task.completed
+                index.add(task)
+
+        measure("toggle 1000 tasks", complete, 3)
+
+
+if __name__ == "__main__":
+    main()
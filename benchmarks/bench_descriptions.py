@@ -0,0 +1,72 @@
+"""
+Compares memory and read latency of plain and compressed description storage.
+
+Run with: uv run python -m benchmarks.bench_descriptions [task_count]
+"""
+
+import random
+import sys
+
+from benchmarks.common import measure
+from src.services.compression import train_dictionary
+from src.services.memory import format_bytes
+from src.services.task_service import TaskService
+
+TOPICS = ["billing", "onboarding", "search", "payments", "reporting", "mobile"]
+TEAMS = ["platform", "growth", "support", "data", "security"]
+
+
+def make_description(rng: random.Random) -> str:
+    """Generates a description resembling the ones in our stores."""
+    sentences = [
+        f"Follow up with the {rng.choice(TEAMS)} team about {rng.choice(TOPICS)}.",
+        f"Ticket {rng.randint(1000, 99999)} is blocked on {rng.choice(TOPICS)} work.",
+        "Update the checklist, attach the latest metrics and notify stakeholders.",
+        f"Deadline moved to week {rng.randint(1, 52)}; confirm with the owner.",
+    ]
+    return " ".join(rng.choice(sentences) for _ in range(rng.randint(4, 10)))
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(42)
+    descriptions = [make_description(rng)[:1000] for _ in range(count)]
+    dictionary = train_dictionary(descriptions[:500])
+
+    configurations = {
+        "plain": TaskService(),
+        "compressed": TaskService(compress_descriptions=True),
+        "compressed + dictionary": TaskService(
+            compress_descriptions=True, description_dictionary=dictionary
+        ),
+    }
+    hot_ids = [rng.randint(1, 100) for _ in range(1000)]
+    cold_ids = [rng.randint(1, count) for _ in range(1000)]
+
+    for label, service in configurations.items():
+        print(f"\n== {label} ==")
+        for i, description in enumerate(descriptions):
+            service.add_task(f"Task {i}", description)
+        report = service.memory_report()
+        description_bytes = report.fields["description"] + report.structures.get(
+            "compressed descriptions", 0
+        )
+        print(f"{'description bytes':<40} {format_bytes(description_bytes):>12}")
+        print(f"{'whole store':<40} {format_bytes(report.total):>12}")
+
+        def read(ids: list[int], service: TaskService = service) -> None:
+            for task_id in ids:
+                service.get_task(task_id)
+
+        measure("1000 hot reads", lambda: read(hot_ids))
+        measure("1000 random reads", lambda: read(cold_ids))
+        stats = service.compression_stats()
+        if stats is not None:
+            print(
+                f"{'stored / raw':<40} {stats.ratio:>11.0%}\n"
+                f"{'cache hit rate':<40} {stats.cache.hit_rate:>11.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Compares answering "what is due next" from the due-date heap with sorting
+every task, and measures keeping the heap current while tasks change.
+
+Run with: uv run python -m benchmarks.bench_due [task_count ...]
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+
+from benchmarks.common import measure
+from src.models.task import Task
+from src.services.task_service import TaskService
+
+
+def sort_all(service: TaskService, k: int) -> list[Task]:
+    """Finds the next due tasks by sorting the whole store."""
+    due = [t for t in service.get_all_tasks() if t.due_ns and not t.completed]
+    return sorted(due, key=lambda t: (t.due_ns, -t.priority, t.id))[:k]
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    rng = random.Random(11)
+    start = datetime.now()
+    for count in sizes:
+        service = TaskService()
+        service.add_tasks((f"Task {i}", "") for i in range(count))
+        for task_id in range(1, count + 1):
+            due = start + timedelta(minutes=rng.randrange(-10_000, 100_000))
+            service.update_task(task_id, due_at=due, priority=rng.randrange(4))
+
+        measure(f"next_due(10), {count} tasks", lambda: service.next_due(10))
+        measure(f"overdue(100), {count} tasks", lambda: service.overdue(100))
+        measure(f"full sort, {count} tasks", lambda: sort_all(service, 10), 1)
+
+        def reschedule() -> None:
+            for _ in range(1000):
+                task_id = rng.randrange(1, count + 1)
+                due = start + timedelta(minutes=rng.randrange(100_000))
+                service.update_task(task_id, due_at=due)
+
+        measure(f"1000 reschedules, {count} tasks", reschedule, 3)
+
+
+if __name__ == "__main__":
+    main()
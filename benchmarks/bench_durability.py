@@ -0,0 +1,81 @@
+"""
+Compares mutation throughput and data-loss exposure of the log durability modes.
+
+Run with: uv run python -m benchmarks.bench_durability [ops_per_thread] [threads]
+"""
+
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.services.task_service import TaskService
+from src.storage.mutation_log import DURABILITY_MODES, MutationLog
+
+
+def os_writeback_seconds() -> float | None:
+    """Returns how long Linux may keep dirty pages before writing them back."""
+    try:
+        centiseconds = Path("/proc/sys/vm/dirty_expire_centisecs").read_text()
+    except OSError:
+        return None
+    return int(centiseconds) / 100
+
+
+def loss_window(log: MutationLog) -> str:
+    """Describes what a power failure could lose once writes were acknowledged."""
+    if log.durability == "always":
+        return "none (fsync before ack)"
+    if log.durability == "group":
+        return f"none (ack after group fsync, every >= {log.group_commit_ms:g} ms)"
+    writeback = os_writeback_seconds()
+    bound = f"~{writeback:g} s of" if writeback is not None else "unbounded"
+    return f"{bound} acked writes ({log.stats().max_unsynced} unsynced at peak)"
+
+
+def run(mode: str, directory: Path, ops: int, threads: int) -> None:
+    log = MutationLog(directory / f"{mode}.log", durability=mode)
+    service = TaskService(log=log)
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def worker(worker_id: int) -> None:
+        local: list[float] = []
+        for n in range(ops):
+            start = time.perf_counter()
+            service.add_task(f"Task {worker_id}-{n}")
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    service.close()
+
+    stats = log.stats()
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"\n== {mode} ==")
+    print(f"{'throughput':<24} {len(latencies) / elapsed:12.0f} ops/s")
+    print(f"{'latency p50 / p99':<24} {quantiles[49] * 1000:8.3f} / ", end="")
+    print(f"{quantiles[98] * 1000:.3f} ms")
+    print(f"{'fsyncs':<24} {stats.syncs:12d} ({stats.records_per_sync:.1f} ops each)")
+    print(f"{'loss window':<24} {loss_window(log)}")
+
+
+def main() -> None:
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in DURABILITY_MODES:
+            run(mode, Path(directory), ops, threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compares exporting a store with and without the per-task encoding cache.
+
+Run with: uv run python -m benchmarks.bench_export [task_count]
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import measure, populate
+from src.services.task_service import TaskService
+from src.utils.export import export_tasks
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    service = TaskService()
+    populate(service, count)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for suffix in (".json", ".csv"):
+            path = Path(directory) / f"tasks{suffix}"
+            measure(
+                f"{suffix} export, uncached",
+                lambda: export_tasks(service.get_all_tasks(), path),
+                repeat=3,
+            )
+            measure(
+                f"{suffix} export, first (fills cache)",
+                lambda: service.export_tasks(path),
+                1,
+            )
+            measure(
+                f"{suffix} export, unchanged store",
+                lambda: service.export_tasks(path),
+                3,
+            )
+            service.toggle_tasks(range(1, count + 1, 100))
+            measure(
+                f"{suffix} export, 1% changed", lambda: service.export_tasks(path), 1
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Compares inserting tasks one at a time with batched inserts sharing one clock
+reading, and reports what timestamps cost per task in memory.
+
+Run with: uv run python -m benchmarks.bench_inserts [task_count]
+"""
+
+import sys
+
+from benchmarks.common import measure
+from src.services.task_service import TaskService
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    entries = [(f"Generated task {i}", f"Description {i}") for i in range(count)]
+
+    def one_by_one() -> None:
+        service = TaskService()
+        for title, description in entries:
+            service.add_task(title, description)
+
+    measure(f"add_task x {count}", one_by_one, repeat=3)
+    measure(
+        f"add_tasks ({count} in one batch)", lambda: TaskService().add_tasks(entries), 3
+    )
+
+    batched = TaskService()
+    batched.add_tasks(entries)
+    tasks = batched.get_all_tasks()
+    measure("created_label, first access", lambda: [t.created_label for t in tasks], 1)
+    measure("created_label, cached", lambda: [t.created_label for t in tasks], 3)
+
+    single = TaskService()
+    for title, description in entries:
+        single.add_task(title, description)
+    for label, service in (("add_task", single), ("add_tasks", batched)):
+        report = service.memory_report()
+        print(
+            f"{'timestamps per task, ' + label:<40} "
+            f"{report.fields['created_ns'] / count:10.1f} B"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Opens many named lists under a residency cap and reports the cost of a
+cold open (loaded from disk), a warm open (already resident) and the memory
+held by the resident lists.
+
+Run with: uv run python -m benchmarks.bench_lists [list_count] [max_open]
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.services.task_lists import TaskLists
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    max_open = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    with tempfile.TemporaryDirectory() as directory:
+        lists = TaskLists(directory, max_open=max_open)
+        start = time.perf_counter()
+        for i in range(count):
+            lists.open(f"list-{i}").add_tasks(
+                (f"Task {j} of list {i}", "") for j in range(20)
+            )
+        lists.close_all()
+        print(f"created {count} lists in {time.perf_counter() - start:.2f} s")
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        for i in range(count):
+            lists.open(f"list-{i}")
+        cold = (time.perf_counter() - start) / count
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for i in range(count - max_open, count):
+            lists.open(f"list-{i}")
+        warm = (time.perf_counter() - start) / max_open
+        stats = lists.stats()
+        print(f"{'cold open':<28} {cold * 1e6:10.1f} us")
+        print(f"{'warm open':<28} {warm * 1e6:10.1f} us")
+        print(f"resident: {stats.resident}/{count}, {current / 1e6:.1f} MB traced")
+        lists.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Measures calls per second through the Unix socket server: one round trip
+per call, calls batched into one frame, and frames pipelined before reading
+the replies.
+
+Run with: uv run python -m benchmarks.bench_remote [calls] [depth]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.remote.client import Call, RemoteTaskService
+from src.remote.server import TaskServer
+from src.services.task_service import TaskService
+
+
+def report(label: str, calls: int, seconds: float) -> None:
+    print(f"{label:<28} {calls / seconds:12,.0f} calls/s")
+
+
+def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    service = TaskService()
+    service.add_tasks((f"Task {i}", "") for i in range(1000))
+    with tempfile.TemporaryDirectory() as directory:
+        server = TaskServer(service, Path(directory) / "todo.sock")
+        server.start()
+        remote = RemoteTaskService(server.path)
+        get: list[Call] = [("get_task", (i % 1000 + 1,), {}) for i in range(depth)]
+        try:
+            start = time.perf_counter()
+            for i in range(calls):
+                remote.get_task(i % 1000 + 1)
+            report("round trip per call", calls, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for _ in range(calls // depth):
+                remote.batch(get)
+            report(f"batches of {depth}", calls, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for _ in range(calls // depth):
+                remote.pipeline([call] for call in get)
+            report(f"pipeline depth {depth}", calls, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for i in range(calls):
+                service.get_task(i % 1000 + 1)
+            report("in process", calls, time.perf_counter() - start)
+        finally:
+            remote.close()
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
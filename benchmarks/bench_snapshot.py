@@ -0,0 +1,58 @@
+"""
+Measures saving and loading a whole store through a binary snapshot.
+
+The store carries tags, due dates and dependencies as well, so loading it
+builds every index: sorted views, status, activity, due dates, tags and
+the dependency graph with its ready set.
+
+Run with: uv run python -m benchmarks.bench_snapshot [task_count]
+"""
+
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from benchmarks.common import measure, populate
+from src.services.memory import format_bytes
+from src.services.task_service import TaskService
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    service = TaskService()
+    populate(service, count)
+    service.toggle_tasks(range(1, count + 1, 3))
+    service.tag_tasks(range(1, count + 1, 4), add=["backend"])
+    service.tag_tasks(range(1, count + 1, 10), add=["urgent"])
+    due = datetime.now() + timedelta(days=7)
+    for task_id in range(2, count + 1, 50):
+        service.update_task(task_id, due_at=due, priority=2)
+    for task_id in range(101, count + 1, 100):
+        service.add_dependency(task_id, task_id - 1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "tasks.snap"
+        measure("save_snapshot", lambda: service.save_snapshot(path), repeat=3)
+        print(f"{'snapshot size':<40} {format_bytes(path.stat().st_size):>12}")
+
+        best = measure(
+            "load_snapshot (trusted)", lambda: TaskService().load_snapshot(path), 3
+        )
+        print(f"{'  per task':<40} {best / count * 1e6:10.3f} us")
+        restored = TaskService()
+        restored.load_snapshot(path)
+        assert restored.tag_counts() == service.tag_counts()
+        assert len(restored.ready_tasks(count)) == len(service.ready_tasks(count))
+        assert restored.next_due(5) == service.next_due(5)
+        measure("reload over a loaded store", lambda: restored.load_snapshot(path), 3)
+        measure(
+            "load_snapshot (validated)",
+            lambda: TaskService().load_snapshot(path, validate=True),
+            repeat=1,
+        )
+        measure("first text search after load", lambda: restored.find_ids("7"), 1)
+
+
+if __name__ == "__main__":
+    main()
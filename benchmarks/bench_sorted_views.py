@@ -0,0 +1,45 @@
+"""
+Compares top-k queries on maintained sorted views against full sorts, and
+times single edits, which shift one block of the views whose key changed.
+
+Run with: uv run python -m benchmarks.bench_sorted_views [task_count]
+"""
+
+import sys
+
+from benchmarks.common import measure, populate
+from src.services.task_service import TaskService
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    service = TaskService()
+    measure(f"populate {count} tasks", lambda: populate(service, count), repeat=1)
+
+    tasks = service._tasks
+    measure(
+        "full sort, newest 20",
+        lambda: sorted(tasks.values(), key=lambda t: t.created_at, reverse=True)[:20],
+    )
+    measure("top_k newest 20", lambda: service.top_k("created_at", 20, reverse=True))
+    measure("top_k by title 20", lambda: service.top_k("title", 20))
+    measure(
+        "title prefix lookup",
+        lambda: service.find_by_title_prefix("generated task 4242", limit=10),
+    )
+
+    # Toggling leaves the title and created_at keys alone, so only the
+    # completed view moves; retitling moves the title view only.
+    sample = range(1, count + 1, max(1, count // 1000))
+    measure(
+        f"toggle {len(sample)} tasks one by one",
+        lambda: [service.toggle_status(task_id) for task_id in sample],
+    )
+    measure(
+        f"retitle {len(sample)} tasks one by one",
+        lambda: [service.update_task(i, title=f"Renamed {i}") for i in sample],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Shows that rendering statistics costs the same on any store size, compared
+with recounting every task.
+
+Run with: uv run python -m benchmarks.bench_stats [task_count ...]
+"""
+
+import sys
+from collections import Counter
+
+from benchmarks.common import measure
+from src.services.task_service import TaskService
+
+
+def recount(service: TaskService) -> Counter[object]:
+    """Builds the creation histogram by scanning every task."""
+    return Counter(task.created_at.date() for task in service.get_all_tasks())
+
+
+def main() -> None:
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    for count in sizes:
+        service = TaskService()
+        service.add_tasks((f"Task {i}", "") for i in range(count))
+        service.toggle_tasks(range(1, count + 1, 3))
+        measure(f"stats(), {count} tasks", service.stats, repeat=5)
+        measure(f"full scan, {count} tasks", lambda: recount(service), repeat=1)
+
+
+if __name__ == "__main__":
+    main()
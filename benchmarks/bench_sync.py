@@ -0,0 +1,86 @@
+"""
+Compares syncing two mostly identical stores through range hashes with
+exchanging every record, at hundreds of thousands of tasks and a handful of
+changes on each side.
+
+The stores are first made identical with a full sync, then each edits a
+few random tasks. Both ways are timed on copies of that starting point, so
+every round moves the same records.
+
+Run with: uv run python -m benchmarks.bench_sync [task_count] [changes]
+"""
+
+import marshal
+import random
+import sys
+import time
+
+from benchmarks.common import measure
+from src.services.sync import RECORD_LEVEL, TOP_LEVEL
+from src.services.task_service import TaskService
+
+
+def edit(service: TaskService, rng: random.Random, count: int, changes: int) -> None:
+    """Edits random tasks of a store."""
+    for task_id in rng.sample(range(1, count + 1), changes):
+        service.update_task(task_id, title=f"Edited {rng.random()}")
+
+
+def full_exchange(local: TaskService, peer: TaskService, count: int) -> None:
+    """Syncs by sending every record both ways, without hashes."""
+    task_ids = list(range(1, count + 1))
+    outgoing = local.sync_records(task_ids)
+    local.sync_merge(peer.sync_records(task_ids))
+    peer.sync_merge(outgoing)
+
+
+def exchanged_bytes(local: TaskService, peer: TaskService) -> int:
+    """Sizes the hashes and records one sync reads from the peer."""
+    size, parents = 0, None
+    for level in range(TOP_LEVEL, RECORD_LEVEL - 1, -1):
+        mine = local.sync_hashes(level, parents)
+        theirs = peer.sync_hashes(level, parents)
+        size += len(marshal.dumps(theirs))
+        parents = sorted(
+            k for k in mine.keys() | theirs.keys() if mine.get(k) != theirs.get(k)
+        )
+    return size + len(marshal.dumps(peer.sync_records(parents or [])))
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rng = random.Random(3)
+    left = TaskService()
+    left.add_tasks((f"Task {i}", f"Notes for task {i}") for i in range(count))
+
+    def fresh_pair() -> tuple[TaskService, TaskService]:
+        local, peer = TaskService(), TaskService()
+        local.sync_with(left)
+        peer.sync_with(left)
+        edit(local, random.Random(1), count, changes)
+        edit(peer, random.Random(2), count, changes)
+        return local, peer
+
+    start = time.perf_counter()
+    pairs = [fresh_pair() for _ in range(3)]
+    print(f"prepared 3 pairs of {count} tasks in {time.perf_counter() - start:.1f} s")
+
+    local, peer = pairs.pop()
+    every = peer.sync_records(list(range(1, count + 1)))
+    print(f"  range sync reads {exchanged_bytes(local, peer)} bytes")
+    print(f"  full exchange reads {len(marshal.dumps(every))} bytes")
+
+    local, peer = pairs.pop()
+    measure(f"range sync, {changes} changes a side", lambda: local.sync_with(peer), 1)
+    report = peer.sync_with(local)
+    print(f"  then {report.hashes_received} hashes, {report.differing} differing")
+    local, peer = pairs.pop()
+    measure("full exchange", lambda: full_exchange(local, peer, count), 1)
+    edit(local, rng, count, changes)
+    measure("sync after more edits", lambda: local.sync_with(peer), 1)
+    measure("sync of identical stores", lambda: local.sync_with(peer))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compares multi-tag boolean filters answered from the tag bitmaps with a scan
+over every task, and reports the memory the bitmaps take per tag.
+
+Run with: uv run python -m benchmarks.bench_tags [task_count]
+"""
+
+import random
+import sys
+
+from benchmarks.common import measure
+from src.services.memory import deep_sizeof, format_bytes
+from src.services.task_service import TaskService
+
+# Tag names with the share of tasks carrying them.
+TAG_SHARES = {
+    "backend": 0.4,
+    "frontend": 0.3,
+    "urgent": 0.1,
+    "blocked": 0.05,
+    "docs": 0.02,
+    "security": 0.001,
+}
+QUERY = "tag:backend tag:urgent -tag:blocked"
+
+
+def scan(service: TaskService) -> list[int]:
+    """Evaluates QUERY by checking every stored task's tags."""
+    return [
+        task.id
+        for task in service._tasks.values()
+        if "backend" in task.tags
+        and "urgent" in task.tags
+        and "blocked" not in task.tags
+    ]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(5)
+    service = TaskService()
+    service.add_tasks((f"Task {i}", "") for i in range(count))
+    for tag, share in TAG_SHARES.items():
+        ids = [i for i in range(1, count + 1) if rng.random() < share]
+        service.tag_tasks(ids, add=[tag])
+
+    matches = service.find_ids(QUERY)
+    assert matches == scan(service)
+    print(f"{len(matches)} of {count} tasks match {QUERY!r}")
+    measure("bitmap query, ids", lambda: service.find_ids(QUERY))
+    measure("bitmap query, limit 50", lambda: service.find_ids(QUERY + " limit:50"))
+    measure("bitmap query, tasks", lambda: service.search(QUERY))
+    measure("scan of every task", lambda: scan(service), 1)
+    measure("tag 1000 tasks", lambda: service.tag_tasks(range(1, 1001), ["docs"]))
+
+    tags = service._tags
+    for tag, tasks in service.tag_counts().items():
+        size = deep_sizeof(tags.bitmap(tag), set())
+        print(f"  #{tag:<10} {tasks:>8} tasks {format_bytes(size):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import time
+from collections.abc import Callable
+
+from src.services.task_service import TaskService
+
+
+def populate(service: TaskService, count: int) -> None:
+    """Fills a service with generated tasks."""
+    for i in range(count):
+        service.add_task(f"Generated task {i}", f"Description for task {i}")
+
+
+def measure(label: str, func: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Runs a callable several times and prints its best wall-clock time.
+
+    Returns:
+        The best observed time in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<40} {best * 1000:10.3f} ms")
+    return best
@@ -0,0 +1,57 @@
+"""
+Replays a trace recorded with `--record-trace` against a fresh service.
+
+Run with:
+    uv run python -m benchmarks.replay_trace trace.jsonl [--speed 10] [--scale 4]
+
+`--speed 0` replays as fast as possible; `--scale N` interleaves N copies of
+the workload, each working on its own tasks. Traces that select tasks by query
+or age, such as bulk deletes by query, can only be replayed at scale 1.
+"""
+
+import argparse
+
+from src.services.recorder import read_trace, replay_trace
+from src.services.task_service import TaskService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("trace", help="trace file to replay")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="multiple of the recorded pace; 0 for as fast as possible",
+    )
+    parser.add_argument("--scale", type=int, default=1, help="workload copies")
+    args = parser.parse_args()
+
+    events = read_trace(args.trace)
+    report = replay_trace(
+        events, TaskService(), speed=args.speed or None, scale=args.scale
+    )
+
+    print(f"{'operations':<24} {report.operations:>10}")
+    print(f"{'errors':<24} {report.errors:>10}")
+    print(f"{'elapsed':<24} {report.elapsed:>10.3f} s")
+    print(f"{'throughput':<24} {report.throughput:>10.0f} ops/s")
+    print(
+        f"\n{'operation':<24} {'calls':>8} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}"
+    )
+    for op in sorted(report.latencies):
+        p50, p95, p99 = report.percentiles(op)
+        calls = len(report.latencies[op])
+        print(
+            f"{op:<24} {calls:>8} {p50 * 1000:>10.3f} "
+            f"{p95 * 1000:>10.3f} {p99 * 1000:>10.3f}"
+        )
+    p50, p95, p99 = report.percentiles()
+    print(
+        f"{'all':<24} {report.operations:>8} {p50 * 1000:>10.3f} "
+        f"{p95 * 1000:>10.3f} {p99 * 1000:>10.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
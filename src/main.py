@@ -1,25 +1,288 @@
+import argparse
+import asyncio
 import sys
+from datetime import timedelta
+from pathlib import Path
 
+from src.remote.client import RemoteTaskService
+from src.remote.server import TaskServer
+from src.services.autosave import Autosaver
+from src.services.follower import LogFollower
+from src.services.periodic import PeriodicWorker
+from src.services.recorder import TraceRecorder
+from src.services.task_lists import TaskLists
 from src.services.task_service import TaskService
+from src.storage.cached_store import CachedStore, TaskBackend
+from src.storage.cold_store import ColdStore
+from src.storage.mutation_log import DURABILITY_MODES, MutationLog
 from src.ui.cli import TodoCLI
 
 
-def main() -> None:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parses the command-line options of the application."""
+    parser = argparse.ArgumentParser(description="Todo console application.")
+    parser.add_argument(
+        "--dedupe-strings",
+        action="store_true",
+        help="share one copy of repeated titles and descriptions in memory",
+    )
+    parser.add_argument(
+        "--compress-descriptions",
+        action="store_true",
+        help="keep descriptions compressed in memory, decompressing on access",
+    )
+    parser.add_argument(
+        "--description-cache-size",
+        type=int,
+        default=1024,
+        help="decompressed descriptions kept in the LRU cache (default: 1024)",
+    )
+    parser.add_argument(
+        "--cold-store",
+        metavar="PATH",
+        help="file holding archived completed tasks (enables the archive command)",
+    )
+    parser.add_argument(
+        "--cold-cache-size",
+        type=int,
+        default=1024,
+        metavar="N",
+        help="archived tasks kept in an LRU cache in front of the cold store; "
+        "0 disables the cache (default: 1024)",
+    )
+    parser.add_argument(
+        "--cold-cache-bytes",
+        type=int,
+        metavar="BYTES",
+        help="also bound the archived-task cache by its estimated size",
+    )
+    parser.add_argument(
+        "--replica",
+        type=int,
+        default=0,
+        metavar="N",
+        help="number of this store among stores that sync; each hands out "
+        "task IDs from its own range (default: 0)",
+    )
+    parser.add_argument(
+        "--archive-after-days",
+        type=float,
+        default=30.0,
+        help="default age of completion before tasks are archived (default: 30)",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--log",
+        metavar="PATH",
+        help="mutation log that changes are persisted to and replayed from",
+    )
+    source.add_argument(
+        "--autosave",
+        metavar="PATH",
+        help="snapshot file that changes are saved to in the background and "
+        "restored from on startup",
+    )
+    source.add_argument(
+        "--lists",
+        metavar="DIR",
+        help="keep named task lists in this directory, switched with `use`; "
+        "each list is autosaved and loaded on first use",
+    )
+    source.add_argument(
+        "--connect",
+        metavar="SOCKET",
+        help="run the console against a store served with --serve",
+    )
+    source.add_argument(
+        "--follow",
+        metavar="PATH",
+        help="run a read-only follower that tails a primary's mutation log",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="SOCKET",
+        help="serve the store over a Unix domain socket instead of the console",
+    )
+    parser.add_argument(
+        "--durability",
+        choices=DURABILITY_MODES,
+        default="group",
+        help="when logged changes are fsynced: every write, in groups, or "
+        "left to the OS (default: group)",
+    )
+    parser.add_argument(
+        "--group-commit-ms",
+        type=float,
+        default=1.0,
+        help="minimum time between group-mode fsyncs (default: 1)",
+    )
+    parser.add_argument(
+        "--autosave-debounce",
+        type=float,
+        default=2.0,
+        metavar="SECONDS",
+        help="quiet time after the last change before autosaving (default: 2)",
+    )
+    parser.add_argument(
+        "--max-open-lists",
+        type=int,
+        default=64,
+        metavar="N",
+        help="named lists kept in memory before the least recently used one "
+        "is saved and dropped (default: 64)",
+    )
+    parser.add_argument(
+        "--list-idle-seconds",
+        type=float,
+        default=300.0,
+        metavar="SECONDS",
+        help="drop a named list from memory after this long unused (default: 300)",
+    )
+    parser.add_argument(
+        "--compact-every",
+        type=float,
+        default=60.0,
+        metavar="SECONDS",
+        help="reclaim deleted tasks older than this in the background; "
+        "0 disables compaction (default: 60)",
+    )
+    parser.add_argument(
+        "--record-trace",
+        metavar="PATH",
+        help="record every task service call to a trace file for replaying",
+    )
+    args = parser.parse_args(argv)
+    if args.lists and (args.cold_store or args.record_trace):
+        parser.error("--lists cannot be combined with --cold-store or --record-trace")
+    if not 0 <= args.replica < 1 << 16:
+        parser.error("--replica must be between 0 and 65535")
+    if args.serve and (args.lists or args.follow or args.connect):
+        parser.error("--serve cannot be combined with --lists, --follow or --connect")
+    return args
+
+
+def run_client(path: str) -> None:
+    """Runs the console against a store served by another process."""
+    try:
+        remote = RemoteTaskService(path)
+    except OSError as e:
+        print(f"Could not connect to {path}: {e}")
+        sys.exit(1)
+    try:
+        asyncio.run(TodoCLI(remote).run_async())
+    except KeyboardInterrupt:
+        print("\n\nGoodbye!")
+        sys.exit(0)
+    except Exception as e:
+        print(f"\nA fatal error occurred: {e}")
+        sys.exit(1)
+    finally:
+        remote.close()
+
+
+def main(argv: list[str] | None = None) -> None:
     """
     Principal entry point of the application.
     Initializes components and starts the user interface loop.
     """
-    service = TaskService()
-    cli = TodoCLI(service)
+    args = parse_args(argv)
+    if args.connect:
+        run_client(args.connect)
+        return
+    replay = bool(args.log) and Path(args.log).exists()
+    log = None
+    if args.log:
+        log = MutationLog(args.log, args.durability, args.group_commit_ms)
+
+    cold_store: TaskBackend | None = None
+    if args.cold_store:
+        cold_store = ColdStore(args.cold_store)
+        if args.cold_cache_size > 0:
+            cold_store = CachedStore(
+                cold_store, args.cold_cache_size, args.cold_cache_bytes
+            )
+
+    def build_service(_list_name: str = "") -> TaskService:
+        return TaskService(
+            dedupe_strings=args.dedupe_strings,
+            compress_descriptions=args.compress_descriptions,
+            description_cache_size=args.description_cache_size,
+            cold_store=cold_store,
+            archive_after=timedelta(days=args.archive_after_days),
+            log=log,
+            replica=args.replica,
+        )
+
+    lists = None
+    if args.lists:
+        lists = TaskLists(
+            args.lists,
+            max_open=args.max_open_lists,
+            factory=build_service,
+            debounce=args.autosave_debounce,
+            max_delay=max(30.0, args.autosave_debounce),
+        )
+        service = lists.open("default")
+    else:
+        service = build_service()
+    if replay:
+        service.replay_log(args.log)
+    follower = None
+    if args.follow:
+        follower = LogFollower(service, args.follow)
+        follower.start()
+    jobs = []
+    if args.compact_every > 0:
+        grace = timedelta(seconds=args.compact_every)
+        # With named lists, every resident list is compacted.
+        target: TaskLists | TaskService = lists if lists is not None else service
+        compactor = PeriodicWorker(
+            lambda: target.compact(grace), args.compact_every, "compaction"
+        )
+        jobs.append(compactor.run_async())
+    autosaver = None
+    if args.autosave:
+        if Path(args.autosave).exists():
+            service.load_autosave(args.autosave)
+        autosaver = Autosaver(
+            service,
+            args.autosave,
+            debounce=args.autosave_debounce,
+            max_delay=max(30.0, args.autosave_debounce),
+        )
+        jobs.append(autosaver.worker().run_async())
+    if lists is not None:
+        jobs.append(lists.worker(args.list_idle_seconds).run_async())
+    recorder = None
+    if args.record_trace:
+        recorder = TraceRecorder(args.record_trace)
+        recorder.attach(service)
+    if args.serve:
+        server = TaskServer(service, args.serve)
+        print(f"Serving the task store on {args.serve} (Ctrl-C stops).")
+        main_loop = server.run(jobs)
+    else:
+        main_loop = TodoCLI(service, follower, lists).run_async(jobs)
 
     try:
-        cli.run()
+        asyncio.run(main_loop)
     except KeyboardInterrupt:
         print("\n\nGoodbye!")
         sys.exit(0)
     except Exception as e:
         print(f"\nA fatal error occurred: {e}")
         sys.exit(1)
+    finally:
+        if follower is not None:
+            follower.stop()
+        if recorder is not None:
+            recorder.close()
+        if autosaver is not None:
+            autosaver.flush()
+        if lists is not None:
+            lists.close_all()
+        else:
+            service.close()
 
 
 if __name__ == "__main__":
@@ -1,28 +1,148 @@
+import re
+import sys
+import time
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+_NS_PER_SECOND = 1_000_000_000
+# Priority levels, indexed by the value stored on a task.
+PRIORITIES = ("none", "low", "medium", "high")
+# Tags are short lowercase words; a task carries a few of them at most.
+TAG_PATTERN = re.compile(r"[a-z0-9][a-z0-9_-]{0,31}")
+MAX_TAGS = 16
+# Cached conversions of one timestamp: (ns, datetime, ISO text if formatted).
+type _Stamp = tuple[int, datetime, str | None]
 
-@dataclass
+
+def now_ns() -> int:
+    """
+    Returns the current time in nanoseconds since the Unix epoch.
+
+    The reading is truncated to whole microseconds, the resolution of
+    datetimes and ISO text, so timestamps survive `to_dict`/`from_dict`.
+    """
+    return time.time_ns() // 1000 * 1000
+
+
+def to_ns(moment: datetime) -> int:
+    """
+    Converts a datetime to integer nanoseconds since the Unix epoch.
+
+    Naive datetimes are taken as local time, like `datetime.now()` returns.
+    """
+    whole_seconds = int(moment.replace(microsecond=0).timestamp())
+    return whole_seconds * _NS_PER_SECOND + moment.microsecond * 1000
+
+
+def from_ns(ns: int) -> datetime:
+    """Converts nanoseconds since the Unix epoch to a naive local datetime."""
+    seconds, remainder = divmod(ns, _NS_PER_SECOND)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1000)
+
+
+@dataclass(slots=True, init=False)
 class Task:
     """
     Represents a single task in the todo application.
 
+    Timestamps are stored as integer nanoseconds since the epoch, which are
+    cheap to create and compare. `created_at` and `completed_at` build the
+    matching datetimes on first access and cache them, along with the ISO
+    text used by `to_dict`.
+
     Attributes:
         id: Unique identifier for the task.
         title: Short summary of the task.
         description: Detailed information about the task.
         completed: Status indicating if the task is finished.
-        created_at: Timestamp when the task was created.
+        created_ns: When the task was created, in nanoseconds since the epoch.
+        completed_ns: When the task was last completed, if it is.
+        due_ns: When the task is due, in nanoseconds since the epoch, if set.
+        priority: Index into `PRIORITIES`, 0 for none.
+        tags: Distinct tag names in sorted order.
+        blocked_by: IDs of the tasks this one waits on, distinct and sorted.
+        version: Number of changes made to the task, used to merge copies.
+        revision: The store's revision counter when the task last changed
+            there; unlike `version`, it only grows within one store.
     """
 
     id: int
     title: str
-    description: str = ""
-    completed: bool = False
-    created_at: datetime = field(default_factory=datetime.now)
+    description: str
+    completed: bool
+    created_ns: int
+    completed_ns: int | None
+    due_ns: int | None
+    priority: int
+    tags: tuple[str, ...]
+    blocked_by: tuple[int, ...]
+    version: int
+    revision: int
+    # Conversion caches, rebuilt whenever the matching ns value changes.
+    _created: _Stamp | None = field(repr=False, compare=False)
+    _completed: _Stamp | None = field(repr=False, compare=False)
+    # Encoded export rows by format; None while the task is dirty.
+    _encoded: dict[str, str] | None = field(repr=False, compare=False)
 
-    def __post_init__(self) -> None:
+    def __init__(
+        self,
+        id: int,
+        title: str,
+        description: str = "",
+        completed: bool = False,
+        created_at: datetime | None = None,
+        completed_at: datetime | None = None,
+        *,
+        created_ns: int | None = None,
+        completed_ns: int | None = None,
+        due_at: datetime | None = None,
+        due_ns: int | None = None,
+        priority: int = 0,
+        tags: Iterable[str] = (),
+        blocked_by: Iterable[int] = (),
+        version: int = 0,
+        revision: int = 0,
+    ) -> None:
+        """
+        Initializes and validates a task.
+
+        Timestamps may be given either as datetimes or as nanoseconds; the
+        creation time defaults to the current time.
+
+        Raises:
+            ValueError: If the title, description, priority, tags, blockers,
+                version or revision are invalid.
+        """
+        self.id = id
+        self.title = title
+        self.description = description
+        self.completed = completed
+        self._created = None
+        self._completed = None
+        self._encoded = None
+        if created_ns is not None:
+            self.created_ns = created_ns
+        elif created_at is not None:
+            self.created_at = created_at
+        else:
+            self.created_ns = now_ns()
+        self.completed_ns = completed_ns
+        if completed_ns is None and completed_at is not None:
+            self.completed_at = completed_at
+        if due_ns is None and due_at is not None:
+            due_ns = to_ns(due_at)
+        self.due_ns = due_ns
+        self.priority = priority
+        # Interned, so tasks sharing a tag share one string.
+        self.tags = tuple(map(sys.intern, tags))
+        self.blocked_by = tuple(blocked_by)
+        self.version = version
+        self.revision = revision
+        self._validate()
+
+    def _validate(self) -> None:
         """Validates the task data after initialization."""
         if not self.title or not self.title.strip():
             raise ValueError("Title cannot be empty.")
@@ -30,6 +150,149 @@ class Task:
             raise ValueError("Title must be 200 characters or less.")
         if len(self.description) > 1000:
             raise ValueError("Description must be 1000 characters or less.")
+        if not 0 <= self.priority < len(PRIORITIES):
+            raise ValueError(f"Priority must be between 0 and {len(PRIORITIES) - 1}.")
+        if len(self.tags) > MAX_TAGS:
+            raise ValueError(f"A task can have at most {MAX_TAGS} tags.")
+        for tag in self.tags:
+            if not isinstance(tag, str) or not TAG_PATTERN.fullmatch(tag):
+                raise ValueError(f"Invalid tag: {tag}.")
+        if list(self.tags) != sorted(set(self.tags)):
+            raise ValueError("Tags must be distinct and sorted.")
+        for blocker in self.blocked_by:
+            if not isinstance(blocker, int) or blocker < 1:
+                raise ValueError(f"Invalid blocking task ID: {blocker}.")
+        if self.id in self.blocked_by:
+            raise ValueError("A task cannot block itself.")
+        if list(self.blocked_by) != sorted(set(self.blocked_by)):
+            raise ValueError("Blocking task IDs must be distinct and sorted.")
+        if not isinstance(self.version, int) or self.version < 0:
+            raise ValueError(f"Invalid version: {self.version}.")
+        if not isinstance(self.revision, int) or self.revision < 0:
+            raise ValueError(f"Invalid revision: {self.revision}.")
+
+    @staticmethod
+    def _stamp(ns: int, cache: _Stamp | None) -> _Stamp:
+        """Returns the cache for a timestamp, rebuilt if it belongs to another."""
+        if cache is None or cache[0] != ns:
+            return (ns, from_ns(ns), None)
+        return cache
+
+    @staticmethod
+    def _iso(cache: _Stamp) -> tuple[_Stamp, str]:
+        """Returns the cache with its ISO text filled in, and that text."""
+        ns, moment, iso = cache
+        if iso is None:
+            iso = moment.isoformat()
+            cache = (ns, moment, iso)
+        return cache, iso
+
+    @property
+    def created_at(self) -> datetime:
+        """Creation time as a naive local datetime."""
+        self._created = cache = self._stamp(self.created_ns, self._created)
+        return cache[1]
+
+    @created_at.setter
+    def created_at(self, moment: datetime) -> None:
+        self.created_ns = to_ns(moment)
+        self._created = (self.created_ns, moment, None)
+
+    @property
+    def completed_at(self) -> datetime | None:
+        """Completion time as a naive local datetime, or None."""
+        if self.completed_ns is None:
+            return None
+        self._completed = cache = self._stamp(self.completed_ns, self._completed)
+        return cache[1]
+
+    @completed_at.setter
+    def completed_at(self, moment: datetime | None) -> None:
+        if moment is None:
+            self.completed_ns = None
+            return
+        self.completed_ns = to_ns(moment)
+        self._completed = (self.completed_ns, moment, None)
+
+    @property
+    def due_at(self) -> datetime | None:
+        """Due time as a naive local datetime, or None."""
+        return from_ns(self.due_ns) if self.due_ns is not None else None
+
+    @property
+    def due_iso(self) -> str | None:
+        """Due time in ISO 8601 format, or None."""
+        due_at = self.due_at
+        return due_at.isoformat() if due_at is not None else None
+
+    @property
+    def created_iso(self) -> str:
+        """Creation time in ISO 8601 format, formatted once and cached."""
+        self._created, iso = self._iso(self._stamp(self.created_ns, self._created))
+        return iso
+
+    @property
+    def completed_iso(self) -> str | None:
+        """Completion time in ISO 8601 format, or None, cached like created_iso."""
+        if self.completed_ns is None:
+            return None
+        cache = self._stamp(self.completed_ns, self._completed)
+        self._completed, iso = self._iso(cache)
+        return iso
+
+    @property
+    def created_label(self) -> str:
+        """Creation time as `YYYY-MM-DD HH:MM:SS`, cut from the cached ISO text."""
+        return self.created_iso[:19].replace("T", " ")
+
+    @property
+    def due_label(self) -> str | None:
+        """Due time as `YYYY-MM-DD HH:MM`, or None."""
+        due_at = self.due_at
+        return due_at.strftime("%Y-%m-%d %H:%M") if due_at is not None else None
+
+    def encoded(self, key: str, encode: Callable[["Task"], str]) -> str:
+        """
+        Returns the task encoded in some format, reusing the cached text.
+
+        Args:
+            key: Names the format, e.g. an export file extension.
+            encode: Builds the text when it is not cached; it receives this task.
+        """
+        if self._encoded is None:
+            self._encoded = {}
+        text = self._encoded.get(key)
+        if text is None:
+            text = self._encoded[key] = encode(self)
+        return text
+
+    def __copy__(self) -> "Task":
+        """
+        Returns a shallow copy, assigning the slots directly instead of going
+        through the generic reduce protocol of `copy.copy`, which costs
+        several times more and is paid on every task handed to a caller.
+        """
+        clone = Task.__new__(Task)
+        clone.id = self.id
+        clone.title = self.title
+        clone.description = self.description
+        clone.completed = self.completed
+        clone.created_ns = self.created_ns
+        clone.completed_ns = self.completed_ns
+        clone.due_ns = self.due_ns
+        clone.priority = self.priority
+        clone.tags = self.tags
+        clone.blocked_by = self.blocked_by
+        clone.version = self.version
+        clone.revision = self.revision
+        clone._created = self._created
+        clone._completed = self._completed
+        clone._encoded = self._encoded
+        return clone
+
+    def mark_dirty(self) -> None:
+        """Drops cached encodings; call this before changing the task."""
+        self._encoded = None
 
     def to_dict(self) -> dict[str, Any]:
         """Converts the task object to a dictionary."""
@@ -38,10 +301,56 @@ class Task:
             "title": self.title,
             "description": self.description,
             "completed": self.completed,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self.created_iso,
+            "completed_at": self.completed_iso,
+            "due_at": self.due_iso,
+            "priority": self.priority,
+            "tags": list(self.tags),
+            "blocked_by": list(self.blocked_by),
+            "version": self.version,
+            "revision": self.revision,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Task":
+        """
+        Creates a task from a dictionary produced by `to_dict`.
+
+        Raises:
+            ValueError: If the data is invalid.
+        """
+        try:
+            completed_at = data.get("completed_at")
+            due_at = data.get("due_at")
+            return cls(
+                id=int(data["id"]),
+                title=data["title"],
+                description=data.get("description", ""),
+                completed=bool(data.get("completed", False)),
+                created_at=datetime.fromisoformat(data["created_at"]),
+                completed_at=(
+                    datetime.fromisoformat(completed_at) if completed_at else None
+                ),
+                due_at=datetime.fromisoformat(due_at) if due_at else None,
+                priority=int(data.get("priority", 0)),
+                tags=data.get("tags", ()),
+                blocked_by=data.get("blocked_by", ()),
+                version=int(data.get("version", 0)),
+                revision=int(data.get("revision", 0)),
+            )
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid task data: {e}") from None
+
     def __str__(self) -> str:
         """Returns a string representation of the task."""
         status = "✓" if self.completed else "✗"
-        return f"[{status}] ID: {self.id} | {self.title}"
+        text = f"[{status}] ID: {self.id} | {self.title}"
+        if self.due_ns is not None:
+            text += f" | due {self.due_label}"
+        if self.priority:
+            text += f" | {PRIORITIES[self.priority]}"
+        if self.tags:
+            text += " | " + " ".join(f"#{tag}" for tag in self.tags)
+        if self.blocked_by:
+            text += " | after " + ", ".join(map(str, self.blocked_by))
+        return text
@@ -0,0 +1 @@
+"""Remote package for serving the task store over local sockets."""
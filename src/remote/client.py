@@ -0,0 +1,296 @@
+import socket
+import threading
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, cast
+
+from src.models.task import Task
+from src.remote.protocol import (
+    HEADER,
+    INVALID,
+    OK,
+    RemotePlan,
+    decode_header,
+    decode_payload,
+    decode_value,
+    encode_frame,
+    encode_value,
+)
+from src.services.cache import CacheStats
+from src.services.compression import CompressionStats
+from src.services.memory import MemoryReport
+from src.services.stats import TaskStats
+from src.utils.export import EXPORT_FORMATS, export_format, write_export
+
+# A service call: method name, positional arguments, keyword arguments.
+Call = tuple[str, tuple[Any, ...], dict[str, Any]]
+
+
+class RemoteTaskService:
+    """
+    Client for a `TaskServer`, offering the `TaskService` methods the CLI uses.
+
+    Besides one round trip per call, calls can be batched into one frame
+    (`batch`) or several frames can be sent before reading the replies
+    (`pipeline`). Methods are safe to call from several threads.
+    """
+
+    def __init__(self, path: str | Path, timeout: float | None = 30.0) -> None:
+        """
+        Connects to a server.
+
+        Args:
+            path: The server's socket file.
+            timeout: Seconds to wait for a reply before failing.
+
+        Raises:
+            OSError: If the server cannot be reached.
+        """
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        try:
+            self._socket.connect(str(path))
+        except OSError:
+            self._socket.close()
+            raise
+        self._reader = self._socket.makefile("rb")
+        self._lock = threading.Lock()
+        self._next_id = 0
+        # Replies read while waiting for another request ID.
+        self._replies: dict[int, list[Any]] = {}
+
+    def submit(self, calls: Iterable[Call]) -> int:
+        """
+        Sends a batch of calls as one frame without waiting for the reply.
+
+        Returns:
+            The request ID to pass to `result`.
+        """
+        payload = [
+            (name, encode_value(args), encode_value(kwargs))
+            for name, args, kwargs in calls
+        ]
+        with self._lock:
+            self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+            request_id = self._next_id
+            self._socket.sendall(encode_frame(request_id, payload))
+        return request_id
+
+    def result(self, request_id: int) -> list[Any]:
+        """
+        Waits for the reply to a submitted batch.
+
+        Returns:
+            The result of each call, in order.
+
+        Raises:
+            ValueError: If a call was rejected; later results are dropped.
+            OSError: If the connection failed or a call failed on the server.
+        """
+        with self._lock:
+            while request_id not in self._replies:
+                header = self._reader.read(HEADER.size)
+                if len(header) < HEADER.size:
+                    raise ConnectionError("The server closed the connection.")
+                length, reply_id = decode_header(header)
+                self._replies[reply_id] = decode_payload(self._reader.read(length))
+            replies = self._replies.pop(request_id)
+        results = []
+        for status, value in replies:
+            if status == INVALID:
+                raise ValueError(value)
+            if status != OK:
+                raise OSError(f"Server error: {value}")
+            results.append(decode_value(value))
+        return results
+
+    def batch(self, calls: Iterable[Call]) -> list[Any]:
+        """Runs several calls in one round trip and returns their results."""
+        return self.result(self.submit(calls))
+
+    def pipeline(self, batches: Iterable[Iterable[Call]]) -> list[list[Any]]:
+        """
+        Sends every batch before reading any reply, then collects the results.
+
+        The replies wait in the socket buffers meanwhile, so keep the number
+        of batches modest when their results are large.
+
+        Returns:
+            The results of each batch, in order.
+        """
+        request_ids = [self.submit(calls) for calls in batches]
+        return [self.result(request_id) for request_id in request_ids]
+
+    def call(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        """Runs one call in its own round trip and returns its result."""
+        return self.batch([(name, args, kwargs)])[0]
+
+    def close(self) -> None:
+        """Closes the connection."""
+        self._reader.close()
+        self._socket.close()
+
+    def add_task(
+        self,
+        title: str,
+        description: str = "",
+        due_at: datetime | None = None,
+        priority: int = 0,
+        tags: Iterable[str] = (),
+    ) -> Task:
+        return cast(
+            Task,
+            self.call("add_task", title, description, due_at, priority, list(tags)),
+        )
+
+    def add_tasks(self, entries: Iterable[tuple[str, str]]) -> list[Task]:
+        return cast(list[Task], self.call("add_tasks", list(entries)))
+
+    def get_task(self, task_id: int) -> Task | None:
+        return cast(Task | None, self.call("get_task", task_id))
+
+    def get_all_tasks(self, sort_key: str = "id", reverse: bool = False) -> list[Task]:
+        return cast(list[Task], self.call("get_all_tasks", sort_key, reverse))
+
+    def top_k(self, sort_key: str, k: int, reverse: bool = False) -> list[Task]:
+        return cast(list[Task], self.call("top_k", sort_key, k, reverse))
+
+    def next_due(self, k: int = 10) -> list[Task]:
+        return cast(list[Task], self.call("next_due", k))
+
+    def overdue(self, limit: int | None = None) -> list[Task]:
+        return cast(list[Task], self.call("overdue", limit))
+
+    def find_by_title_prefix(self, prefix: str, limit: int = 10) -> list[Task]:
+        return cast(list[Task], self.call("find_by_title_prefix", prefix, limit))
+
+    def search(self, query: str) -> list[Task]:
+        return cast(list[Task], self.call("search", query))
+
+    def find_ids(self, query: str) -> list[int]:
+        return cast(list[int], self.call("find_ids", query))
+
+    def ids_in_ranges(self, ranges: Iterable[tuple[int, int]]) -> list[int]:
+        return cast(list[int], self.call("ids_in_ranges", list(ranges)))
+
+    def explain(self, query: str) -> RemotePlan:
+        return cast(RemotePlan, self.call("explain", query))
+
+    def export_tasks(self, path: str | Path, query: str | None = None) -> int:
+        """
+        Writes the server's tasks, or those matching a query, to a local file.
+
+        The server writes no files for clients, so the tasks are fetched and
+        encoded here.
+        """
+        encode, _ = EXPORT_FORMATS[export_format(path)]
+        tasks = self.search(query) if query else self.get_all_tasks()
+        return write_export(map(encode, tasks), path)
+
+    def update_task(
+        self,
+        task_id: int,
+        title: str | None = None,
+        description: str | None = None,
+        due_at: datetime | None = None,
+        priority: int | None = None,
+        clear_due: bool = False,
+        tags: Iterable[str] | None = None,
+    ) -> Task:
+        return cast(
+            Task,
+            self.call(
+                "update_task",
+                task_id,
+                title,
+                description,
+                due_at,
+                priority,
+                clear_due,
+                None if tags is None else list(tags),
+            ),
+        )
+
+    def delete_task(self, task_id: int) -> bool:
+        return cast(bool, self.call("delete_task", task_id))
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> list[int]:
+        return cast(list[int], self.call("delete_tasks", list(task_ids)))
+
+    def delete_where(self, query: str) -> list[int]:
+        return cast(list[int], self.call("delete_where", query))
+
+    def purge_completed(self) -> list[int]:
+        return cast(list[int], self.call("purge_completed"))
+
+    def undelete_task(self, task_id: int) -> Task:
+        return cast(Task, self.call("undelete_task", task_id))
+
+    def deleted_count(self) -> int:
+        return cast(int, self.call("deleted_count"))
+
+    def toggle_tasks(self, task_ids: Iterable[int]) -> list[int]:
+        return cast(list[int], self.call("toggle_tasks", list(task_ids)))
+
+    def toggle_status(self, task_id: int) -> Task:
+        return cast(Task, self.call("toggle_status", task_id))
+
+    def tag_tasks(
+        self,
+        task_ids: Iterable[int],
+        add: Iterable[str] = (),
+        remove: Iterable[str] = (),
+    ) -> list[int]:
+        return cast(
+            list[int],
+            self.call("tag_tasks", list(task_ids), list(add), list(remove)),
+        )
+
+    def tag_counts(self) -> dict[str, int]:
+        return cast(dict[str, int], self.call("tag_counts"))
+
+    def add_dependency(self, task_id: int, blocker_id: int) -> Task:
+        return cast(Task, self.call("add_dependency", task_id, blocker_id))
+
+    def remove_dependency(self, task_id: int, blocker_id: int) -> Task:
+        return cast(Task, self.call("remove_dependency", task_id, blocker_id))
+
+    def ready_tasks(self, limit: int | None = None) -> list[Task]:
+        return cast(list[Task], self.call("ready_tasks", limit))
+
+    def dependency_order(self) -> list[Task]:
+        return cast(list[Task], self.call("dependency_order"))
+
+    def sync_hashes(
+        self, level: int, parents: list[int] | None = None
+    ) -> dict[int, int]:
+        return cast(dict[int, int], self.call("sync_hashes", level, parents))
+
+    def sync_records(self, task_ids: list[int]) -> list[dict[str, Any]]:
+        return cast(list[dict[str, Any]], self.call("sync_records", task_ids))
+
+    def sync_merge(self, rows: list[dict[str, Any]]) -> list[int]:
+        return cast(list[int], self.call("sync_merge", rows))
+
+    def archive_completed(self, older_than: timedelta | None = None) -> int:
+        return cast(int, self.call("archive_completed", older_than))
+
+    def get_archived_tasks(self) -> list[Task]:
+        return cast(list[Task], self.call("get_archived_tasks"))
+
+    def archived_count(self) -> int:
+        return cast(int, self.call("archived_count"))
+
+    def stats(self, days: int = 14) -> TaskStats:
+        return cast(TaskStats, self.call("stats", days))
+
+    def memory_report(self) -> MemoryReport:
+        """Reports the server's memory, as measured there."""
+        return cast(MemoryReport, self.call("memory_report"))
+
+    def compression_stats(self) -> CompressionStats | None:
+        return cast(CompressionStats | None, self.call("compression_stats"))
+
+    def cold_cache_stats(self) -> CacheStats | None:
+        return cast(CacheStats | None, self.call("cold_cache_stats"))
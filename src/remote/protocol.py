@@ -0,0 +1,269 @@
+import marshal
+import struct
+from collections.abc import Iterable
+from dataclasses import dataclass, fields, is_dataclass
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from src.models.task import Task, from_ns, to_ns
+from src.services.cache import CacheStats
+from src.services.changes import AutosaveStats
+from src.services.compression import CompressionStats
+from src.services.memory import MemoryReport
+from src.services.query import QueryPlan
+from src.services.stats import TaskStats
+from src.services.sync import SyncReport
+
+# payload length, request ID
+HEADER = struct.Struct("<II")
+MAX_FRAME = 64 * 1024 * 1024
+
+# TaskService methods a client may call. Persistence and lifecycle methods are
+# left out, and so is exporting: the server owns its files and never writes
+# to a path a client names.
+REMOTE_METHODS = frozenset(
+    {
+        "add_task",
+        "add_tasks",
+        "get_task",
+        "get_all_tasks",
+        "top_k",
+        "next_due",
+        "overdue",
+        "find_by_title_prefix",
+        "search",
+        "find_ids",
+        "ids_in_ranges",
+        "explain",
+        "update_task",
+        "delete_task",
+        "delete_tasks",
+        "delete_where",
+        "purge_completed",
+        "undelete_task",
+        "deleted_count",
+        "toggle_tasks",
+        "toggle_status",
+        "tag_tasks",
+        "tag_counts",
+        "add_dependency",
+        "remove_dependency",
+        "ready_tasks",
+        "dependency_order",
+        "sync_hashes",
+        "sync_records",
+        "sync_merge",
+        "archive_completed",
+        "get_archived_tasks",
+        "archived_count",
+        "stats",
+        "memory_report",
+        "compression_stats",
+        "cold_cache_stats",
+    }
+)
+
+# Remote methods that change the store, and may wait for the log to be durable.
+MUTATING_METHODS = frozenset(
+    {
+        "add_task",
+        "add_tasks",
+        "update_task",
+        "delete_task",
+        "delete_tasks",
+        "delete_where",
+        "purge_completed",
+        "undelete_task",
+        "toggle_tasks",
+        "toggle_status",
+        "tag_tasks",
+        "add_dependency",
+        "remove_dependency",
+        "sync_merge",
+        "archive_completed",
+    }
+)
+
+# Result statuses: the call returned, raised ValueError, or failed otherwise.
+OK, INVALID, FAILED = 0, 1, 2
+
+_RECORDS: dict[str, type[Any]] = {
+    cls.__name__: cls
+    for cls in (
+        TaskStats,
+        AutosaveStats,
+        MemoryReport,
+        CompressionStats,
+        CacheStats,
+        SyncReport,
+    )
+}
+
+
+@dataclass(frozen=True)
+class RemotePlan:
+    """
+    A query plan as described by the server, which keeps the plan itself.
+
+    Attributes:
+        text: The output of `QueryPlan.describe` on the server.
+    """
+
+    text: str
+
+    def describe(self) -> str:
+        """Returns the server's explanation of the plan."""
+        return self.text
+
+
+def encode_value(value: Any) -> Any:
+    """
+    Converts a call argument or result to plain values marshal can write.
+
+    Tuples on the wire are always tagged, so values such as tasks and dates
+    are told apart from plain sequences, which travel as lists.
+
+    Raises:
+        TypeError: If the value has no wire form.
+    """
+    if value is None or isinstance(value, bool | int | float | str | bytes):
+        return value
+    if isinstance(value, Task):
+        return (
+            "task",
+            value.id,
+            value.title,
+            value.description,
+            value.completed,
+            value.created_ns,
+            value.completed_ns,
+            value.due_ns,
+            value.priority,
+            list(value.tags),
+            list(value.blocked_by),
+            value.version,
+            value.revision,
+        )
+    if isinstance(value, list):
+        return [encode_value(item) for item in value]
+    if isinstance(value, tuple):
+        return ("tuple", [encode_value(item) for item in value])
+    if isinstance(value, dict):
+        return {encode_value(key): encode_value(item) for key, item in value.items()}
+    if isinstance(value, datetime):
+        return ("datetime", to_ns(value))
+    if isinstance(value, date):
+        return ("date", value.toordinal())
+    if isinstance(value, timedelta):
+        return ("timedelta", value.total_seconds())
+    if isinstance(value, QueryPlan):
+        return ("plan", value.describe())
+    if is_dataclass(value) and type(value).__name__ in _RECORDS:
+        return (
+            "record",
+            type(value).__name__,
+            {f.name: encode_value(getattr(value, f.name)) for f in fields(value)},
+        )
+    if isinstance(value, Iterable):
+        return [encode_value(item) for item in value]
+    raise TypeError(f"Cannot send a value of type {type(value).__name__}.")
+
+
+def decode_value(value: Any) -> Any:
+    """
+    Rebuilds a value written by `encode_value`.
+
+    Raises:
+        ValueError: If the value is malformed.
+    """
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    if isinstance(value, dict):
+        return {decode_value(key): decode_value(item) for key, item in value.items()}
+    if not isinstance(value, tuple):
+        return value
+    tag = value[0] if value else None
+    if tag == "task":
+        (
+            _,
+            task_id,
+            title,
+            description,
+            completed,
+            created,
+            completed_ns,
+            due,
+            priority,
+            tags,
+            blocked_by,
+            version,
+            revision,
+        ) = value
+        return Task(
+            task_id,
+            title,
+            description,
+            completed,
+            created_ns=created,
+            completed_ns=completed_ns,
+            due_ns=due,
+            priority=priority,
+            tags=tags,
+            blocked_by=blocked_by,
+            version=version,
+            revision=revision,
+        )
+    if tag == "tuple":
+        return tuple(decode_value(item) for item in value[1])
+    if tag == "datetime":
+        return from_ns(value[1])
+    if tag == "date":
+        return date.fromordinal(value[1])
+    if tag == "timedelta":
+        return timedelta(seconds=value[1])
+    if tag == "plan":
+        return RemotePlan(value[1])
+    if tag == "record" and value[1] in _RECORDS:
+        values = {name: decode_value(item) for name, item in value[2].items()}
+        return _RECORDS[value[1]](**values)
+    raise ValueError(f"Malformed value on the wire: {tag!r}.")
+
+
+def encode_frame(request_id: int, payload: Any) -> bytes:
+    """
+    Frames a request or response: a length and request ID header, then the
+    marshalled payload.
+
+    Raises:
+        ValueError: If the payload is larger than `MAX_FRAME`.
+    """
+    body = marshal.dumps(payload)
+    if len(body) > MAX_FRAME:
+        raise ValueError(f"Frame of {len(body)} bytes exceeds the limit.")
+    return HEADER.pack(len(body), request_id) + body
+
+
+def decode_header(header: bytes) -> tuple[int, int]:
+    """
+    Returns the payload length and request ID of a frame header.
+
+    Raises:
+        ValueError: If the announced payload is larger than `MAX_FRAME`.
+    """
+    length, request_id = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ValueError(f"Frame of {length} bytes exceeds the limit.")
+    return length, request_id
+
+
+def decode_payload(body: bytes) -> Any:
+    """
+    Unmarshals a frame payload.
+
+    Raises:
+        ValueError: If the payload is not valid marshal data.
+    """
+    try:
+        return marshal.loads(body)
+    except (EOFError, TypeError, ValueError) as e:
+        raise ValueError("Malformed frame payload.") from e
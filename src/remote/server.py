@@ -0,0 +1,196 @@
+import asyncio
+import os
+import threading
+from collections.abc import Coroutine, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.remote.protocol import (
+    FAILED,
+    HEADER,
+    INVALID,
+    MUTATING_METHODS,
+    OK,
+    REMOTE_METHODS,
+    decode_header,
+    decode_payload,
+    decode_value,
+    encode_frame,
+    encode_value,
+)
+from src.services.task_service import TaskService
+
+
+@dataclass(frozen=True)
+class ServerStats:
+    """
+    Counters describing the traffic a server has handled.
+
+    Attributes:
+        connections: Clients connected so far.
+        frames: Request frames answered.
+        calls: Service calls made, counting each call of a batch.
+    """
+
+    connections: int
+    frames: int
+    calls: int
+
+
+class TaskServer:
+    """
+    Serves a task store over a Unix domain socket.
+
+    Each request frame carries a batch of calls, answered by one response
+    frame with the same request ID. Frames of a connection are answered in
+    order, so a client may pipeline many requests before reading replies.
+
+    Batches that change the store run on a worker thread, so the loop keeps
+    serving other connections while a change waits for the log to reach
+    the disk, and concurrent writers share group-commit fsyncs. Read-only
+    batches run on the event loop, skipping the thread hop.
+    """
+
+    def __init__(self, service: TaskService, path: str | Path) -> None:
+        """
+        Args:
+            service: The store to serve.
+            path: Socket file to listen on; a stale one is replaced.
+        """
+        self.service = service
+        self.path = Path(path)
+        self.connections = 0
+        self.frames = 0
+        self.calls = 0
+        self.error: str | None = None
+        self._listening = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._task: asyncio.Task[Any] | None = None
+        self._thread: threading.Thread | None = None
+
+    def _call(self, call: Any) -> tuple[int, Any]:
+        """Runs one call of a batch and returns its status and result."""
+        try:
+            name, args, kwargs = call
+            if name not in REMOTE_METHODS:
+                raise ValueError(f"Unknown remote method: {name}.")
+            result = getattr(self.service, name)(
+                *decode_value(args), **decode_value(kwargs)
+            )
+            return OK, encode_value(result)
+        except ValueError as e:
+            return INVALID, str(e)
+        except (TypeError, OSError) as e:
+            return FAILED, str(e)
+
+    def _call_batch(self, calls: list[Any]) -> list[tuple[int, Any]]:
+        """Runs the calls of a batch in order."""
+        return [self._call(call) for call in calls]
+
+    @staticmethod
+    def _mutates(calls: list[Any]) -> bool:
+        """Returns whether a batch holds a call that changes the store."""
+        return any(
+            isinstance(call, (list, tuple)) and call and call[0] in MUTATING_METHODS
+            for call in calls
+        )
+
+    async def _serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answers a connection's frames until it closes or sends garbage."""
+        self.connections += 1
+        try:
+            while True:
+                header = await reader.readexactly(HEADER.size)
+                length, request_id = decode_header(header)
+                calls = decode_payload(await reader.readexactly(length))
+                if not isinstance(calls, list):
+                    raise ValueError("A request must hold a list of calls.")
+                if self._mutates(calls):
+                    replies = await asyncio.to_thread(self._call_batch, calls)
+                else:
+                    replies = self._call_batch(calls)
+                self.frames += 1
+                self.calls += len(calls)
+                try:
+                    frame = encode_frame(request_id, replies)
+                except ValueError as e:
+                    frame = encode_frame(request_id, [(FAILED, str(e))])
+                writer.write(frame)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def run(
+        self, background: Iterable[Coroutine[object, object, object]] = ()
+    ) -> None:
+        """
+        Serves clients until the asyncio task is cancelled.
+
+        Args:
+            background: Jobs to run on the event loop while serving.
+        """
+        self.path.unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(self._serve_client, self.path)
+        jobs = [asyncio.create_task(job) for job in background]
+        self._listening.set()
+        try:
+            await server.serve_forever()
+        finally:
+            server.close()
+            server.close_clients()
+            await server.wait_closed()
+            for job in jobs:
+                job.cancel()
+            await asyncio.gather(*jobs, return_exceptions=True)
+            self._listening.clear()
+            if self.path.exists():
+                os.unlink(self.path)
+
+    def start(self) -> None:
+        """
+        Serves in a background thread, returning once the socket listens.
+
+        Raises:
+            OSError: If the socket could not be opened.
+        """
+        self.error = None
+        self._listening.clear()
+        self._thread = threading.Thread(
+            target=asyncio.run, args=(self._run_in_thread(),), daemon=True
+        )
+        self._thread.start()
+        self._listening.wait()
+        if self.error is not None:
+            self.stop()
+            raise OSError(self.error)
+
+    async def _run_in_thread(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        try:
+            await self.run()
+        except asyncio.CancelledError:
+            pass
+        except OSError as e:
+            self.error = str(e)
+            self._listening.set()
+
+    def stop(self) -> None:
+        """Stops a server started with `start`, closing its connections."""
+        if self._loop is not None and self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._loop = self._task = None
+
+    def stats(self) -> ServerStats:
+        """Returns a snapshot of the traffic counters."""
+        return ServerStats(
+            connections=self.connections, frames=self.frames, calls=self.calls
+        )
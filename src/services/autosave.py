@@ -0,0 +1,69 @@
+import time
+from pathlib import Path
+
+from src.services.changes import SaveReport
+from src.services.periodic import PeriodicWorker
+from src.services.task_service import TaskService
+
+
+class Autosaver:
+    """
+    Saves a store's changes in the background once edits pause.
+
+    Bursts of edits are coalesced: a save happens `debounce` seconds after
+    the latest change, or `max_delay` seconds after the first unsaved one
+    at the latest, so a steady stream of edits is still saved regularly.
+    """
+
+    def __init__(
+        self,
+        service: TaskService,
+        path: str | Path,
+        debounce: float = 2.0,
+        max_delay: float = 30.0,
+        full_ratio: float = 0.5,
+    ) -> None:
+        """
+        Args:
+            service: The store to save.
+            path: Snapshot file; the delta is kept next to it.
+            debounce: Seconds without changes before saving.
+            max_delay: Most seconds a change waits to be saved.
+            full_ratio: Share of changed tasks above which a full snapshot is
+                written instead of a delta.
+
+        Raises:
+            ValueError: If the delays are not positive.
+        """
+        if debounce <= 0 or max_delay < debounce:
+            raise ValueError(
+                "The debounce must be positive and no longer than the maximum delay."
+            )
+        self.service = service
+        self.path = Path(path)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.full_ratio = full_ratio
+
+    def due(self) -> bool:
+        """Whether unsaved changes have waited long enough to be saved."""
+        window = self.service.unsaved_changes()
+        if window is None:
+            return False
+        first, last = window
+        now = time.monotonic()
+        return now - last >= self.debounce or now - first >= self.max_delay
+
+    def save_if_due(self) -> SaveReport | None:
+        """Saves the changes if they are due, returning what was written."""
+        if not self.due():
+            return None
+        return self.flush()
+
+    def flush(self) -> SaveReport:
+        """Saves any unsaved changes now, e.g. before exiting."""
+        return self.service.save_changes(self.path, self.full_ratio)
+
+    def worker(self) -> PeriodicWorker:
+        """Returns a worker checking for due changes four times per debounce."""
+        return PeriodicWorker(self.save_if_due, self.debounce / 4, "autosave")
@@ -0,0 +1,222 @@
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.models.task import Task
+from src.storage.mutation_log import read_log, write_records
+
+
+@dataclass(frozen=True)
+class BackupReport:
+    """
+    Outcome of one `TaskService.backup` call.
+
+    Attributes:
+        since: Revision the backup starts after, 0 for a full backup.
+        revision: Revision the backup is complete up to; pass it as `since`
+            to the next incremental backup.
+        tasks: Tasks written.
+        deleted: Deletions written.
+        bytes_written: Size of the backup file.
+    """
+
+    since: int
+    revision: int
+    tasks: int
+    deleted: int
+    bytes_written: int
+
+
+class RevisionLog:
+    """
+    Task IDs in the order they last changed, with the revision of the change.
+
+    Revisions only grow, so the IDs changed after a revision are found by
+    walking back from the newest change, at a cost that depends on the
+    number of changes rather than the size of the store. IDs of tasks that
+    left the store stay listed, so backups can record their deletion, until
+    `prune` drops them once a full backup no longer needs them.
+
+    After `invalidate` it is rebuilt from `source` on the next lookup, like
+    the text indexes.
+    """
+
+    def __init__(self, source: Callable[[], Iterable[Task]]) -> None:
+        """
+        Initializes an empty log.
+
+        Args:
+            source: Returns every task the store holds, for rebuilding.
+        """
+        self._source = source
+        self._latest: dict[int, int] = {}
+        self._top = 0
+        self._sorted = True
+        self._stale = False
+        # IDs whose tasks were reclaimed, kept until a full backup covers them.
+        self._gone: set[int] = set()
+        # Revisions up to this one may hide deletions the log no longer has.
+        self.floor = 0
+
+    def __len__(self) -> int:
+        self._rebuild()
+        return len(self._latest)
+
+    def invalidate(self, floor: int) -> None:
+        """
+        Drops the log so it is rebuilt lazily from the source.
+
+        Args:
+            floor: Revision up to which deletions are no longer known.
+        """
+        self._latest = {}
+        self._gone.clear()
+        self._top = 0
+        self._sorted = True
+        self._stale = True
+        self.floor = floor
+
+    def _rebuild(self) -> None:
+        if self._stale:
+            self._stale = False
+            for task in self._source():
+                self.add(task)
+        if not self._sorted:
+            self._latest = dict(sorted(self._latest.items(), key=lambda e: e[1]))
+            self._sorted = True
+
+    def add(self, task: Task) -> None:
+        """Records the revision a task carries, moving it to its place."""
+        if self._stale:
+            return
+        self._gone.discard(task.id)
+        if self._latest.get(task.id) == task.revision:
+            return
+        self._latest.pop(task.id, None)
+        self._latest[task.id] = task.revision
+        if task.revision < self._top:
+            # Replayed records may arrive out of order; sort on next lookup.
+            self._sorted = False
+        self._top = max(self._top, task.revision)
+
+    def discard(self, task: Task) -> None:
+        pass
+
+    def add_many(self, tasks: list[Task]) -> None:
+        if not self._stale:
+            for task in tasks:
+                self.add(task)
+
+    def discard_many(self, tasks: list[Task]) -> None:
+        pass
+
+    def forget(self, task_id: int) -> None:
+        """Marks a task as gone from the store, so `prune` may drop it."""
+        if not self._stale and task_id in self._latest:
+            self._gone.add(task_id)
+
+    def prune(self, revision: int) -> int:
+        """
+        Drops the gone tasks last changed at or before a revision.
+
+        Called after a full backup up to the revision, which no longer holds
+        those tasks. `floor` is raised past the dropped deletions, so only
+        incremental backups that chain from a later revision remain possible.
+
+        Args:
+            revision: Revision the full backup is complete up to.
+
+        Returns:
+            The number of IDs dropped.
+        """
+        dropped = [
+            task_id for task_id in self._gone if self._latest[task_id] <= revision
+        ]
+        for task_id in dropped:
+            self._gone.discard(task_id)
+            self.floor = max(self.floor, self._latest.pop(task_id))
+        return len(dropped)
+
+    def changed_since(self, revision: int) -> list[int]:
+        """
+        Returns the IDs changed after a revision, oldest change first.
+
+        Raises:
+            ValueError: If deletions after the revision may be missing.
+        """
+        if 0 < revision < self.floor:
+            raise ValueError(
+                f"Changes since revision {revision} are no longer known; "
+                f"make a full backup."
+            )
+        self._rebuild()
+        changed = []
+        for task_id, task_revision in reversed(self._latest.items()):
+            if task_revision <= revision:
+                break
+            changed.append(task_id)
+        changed.reverse()
+        return changed
+
+
+def write_backup(
+    path: str | Path,
+    header: dict[str, Any],
+    rows: list[dict[str, Any]],
+    deleted: list[int],
+) -> int:
+    """
+    Writes a backup atomically, as mutation log records between a header
+    and an end marker.
+
+    Returns:
+        The number of bytes written.
+    """
+    records: list[dict[str, Any]] = [{"op": "backup", **header}]
+    if rows:
+        records.append({"op": "put", "tasks": rows})
+    if deleted:
+        records.append({"op": "delete", "ids": deleted})
+    records.append({"op": "end", "tasks": len(rows), "deleted": len(deleted)})
+    return write_records(path, records, replace=True)
+
+
+def read_backup(path: str | Path) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """
+    Reads a backup written by `write_backup`.
+
+    Returns:
+        The header and the records to apply.
+
+    Raises:
+        ValueError: If the file is not a complete backup.
+    """
+    records = list(read_log(path))
+    if (
+        len(records) < 2
+        or records[0].get("op") != "backup"
+        or records[-1].get("op") != "end"
+    ):
+        raise ValueError(f"{path} is not a complete backup.")
+    return records[0], records[1:-1]
+
+
+def check_chain(headers: list[dict[str, Any]]) -> None:
+    """
+    Checks that backups restore in order: a full one, then incrementals each
+    starting at or before the revision the previous one ends at.
+
+    Raises:
+        ValueError: If the first backup is not full or the chain has a gap.
+    """
+    if not headers:
+        raise ValueError("No backups to restore.")
+    if headers[0]["since"] != 0:
+        raise ValueError("The first backup to restore must be a full backup.")
+    for previous, header in zip(headers, headers[1:]):
+        if not header["since"] <= previous["revision"] <= header["revision"]:
+            raise ValueError(
+                f"Backup of revisions {header['since']}-{header['revision']} "
+                f"does not follow one ending at revision {previous['revision']}."
+            )
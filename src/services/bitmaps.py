@@ -0,0 +1,263 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+
+# Values per chunk. Only chunks holding at least one value are stored, and
+# changing a value only rewrites its own chunk.
+CHUNK_BITS = 1 << 12
+_CHUNK_SHIFT = CHUNK_BITS.bit_length() - 1
+_CHUNK_MASK = CHUNK_BITS - 1
+_ZEROS = b"0" * CHUNK_BITS
+_ONE = ord("1")
+# Chunks with at most this many values are kept as packed 16-bit offsets,
+# taking at most half the room of the chunk's bitset. Combining such an
+# array with a bitset steps through the offsets, so the bound also keeps
+# mixed operations short.
+ARRAY_MAX = CHUNK_BITS // 32
+
+# A chunk is either packed sorted offsets (bytes) or a bitset (int).
+type _Chunk = bytes | int
+
+
+def _offsets(chunk: _Chunk) -> list[int]:
+    """Returns the offsets held by a chunk, in ascending order."""
+    if isinstance(chunk, bytes):
+        return array("H", chunk).tolist()
+    offsets = []
+    # Lowest bit first; str.find skips runs of zeros in C.
+    bits = bin(chunk)[:1:-1]
+    position = bits.find("1")
+    while position >= 0:
+        offsets.append(position)
+        position = bits.find("1", position + 1)
+    return offsets
+
+
+def _bitset(offsets: Iterable[int]) -> int:
+    """Builds the bitset holding some offsets."""
+    # One ASCII digit per offset, read in base 2 with the lowest bit last;
+    # storing a byte is cheaper than shifting and ORing one.
+    digits = bytearray(_ZEROS)
+    for offset in offsets:
+        digits[offset] = _ONE
+    digits.reverse()
+    return int(digits, 2)
+
+
+def _bits(chunk: _Chunk) -> int:
+    """Returns a chunk as a bitset."""
+    if isinstance(chunk, int):
+        return chunk
+    return _bitset(array("H", chunk))
+
+
+def _pack_offsets(offsets: list[int]) -> _Chunk | None:
+    """Builds the chunk holding sorted, distinct offsets, or None if empty."""
+    if not offsets:
+        return None
+    if len(offsets) <= ARRAY_MAX:
+        return array("H", offsets).tobytes()
+    return _bitset(offsets)
+
+
+def _compact(chunk: _Chunk) -> _Chunk:
+    """Returns a chunk in its smaller form."""
+    if isinstance(chunk, int) and chunk.bit_count() <= ARRAY_MAX:
+        return array("H", _offsets(chunk)).tobytes()
+    return chunk
+
+
+# Set operations on chunks return None for an empty result. Bitsets are left
+# as bitsets even when few values remain; `_compact` converts them.
+
+
+def _and(left: _Chunk, right: _Chunk) -> _Chunk | None:
+    if isinstance(left, int) and isinstance(right, int):
+        return left & right or None
+    if isinstance(right, bytes):
+        left, right = right, left
+    if isinstance(right, bytes):
+        kept = sorted(set(_offsets(left)).intersection(_offsets(right)))
+    else:
+        kept = [offset for offset in _offsets(left) if right >> offset & 1]
+    return _pack_offsets(kept)
+
+
+def _or(left: _Chunk, right: _Chunk) -> _Chunk:
+    if isinstance(left, bytes) and isinstance(right, bytes):
+        merged = sorted(set(_offsets(left)).union(_offsets(right)))
+        chunk = _pack_offsets(merged)
+        assert chunk is not None
+        return chunk
+    return _bits(left) | _bits(right)
+
+
+def _sub(left: _Chunk, right: _Chunk) -> _Chunk | None:
+    if isinstance(left, int):
+        return left & ~_bits(right) or None
+    if isinstance(right, bytes):
+        removed = set(_offsets(right))
+        return _pack_offsets([o for o in _offsets(left) if o not in removed])
+    return _pack_offsets([o for o in _offsets(left) if not right >> o & 1])
+
+
+class Bitmap:
+    """
+    Set of non-negative integers stored as a compressed, chunked bitset.
+
+    Values are split into fixed-size chunks and chunks without values are
+    not stored. Like Roaring bitmaps, a sparse chunk is kept as a packed
+    array of 16-bit offsets and a dense one as a bitset in a Python integer,
+    so a chunk costs two bytes per value while sparse and one bit per ID it
+    covers once dense. Set operations combine matching chunks; dense chunks
+    meet with integer AND/OR/AND-NOT, which run in C over whole words.
+
+    Bitmaps changed in place keep every chunk in its smaller form. Results
+    of `&`, `|` and `-` skip that step, as they are usually short-lived.
+    """
+
+    __slots__ = ("_chunks",)
+
+    def __init__(self, values: Iterable[int] = ()) -> None:
+        self._chunks: dict[int, _Chunk] = {}
+        self.update(values)
+
+    @classmethod
+    def _from_chunks(cls, chunks: dict[int, _Chunk]) -> "Bitmap":
+        bitmap = cls()
+        bitmap._chunks = chunks
+        return bitmap
+
+    def __len__(self) -> int:
+        return sum(
+            len(chunk) // 2 if isinstance(chunk, bytes) else chunk.bit_count()
+            for chunk in self._chunks.values()
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self._chunks)
+
+    def __contains__(self, value: int) -> bool:
+        chunk = self._chunks.get(value >> _CHUNK_SHIFT)
+        if chunk is None:
+            return False
+        offset = value & _CHUNK_MASK
+        if isinstance(chunk, int):
+            return bool(chunk >> offset & 1)
+        offsets = memoryview(chunk).cast("H")
+        position = bisect_left(offsets, offset)
+        return position < len(offsets) and offsets[position] == offset
+
+    def __iter__(self) -> Iterator[int]:
+        return self.values()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Bitmap):
+            return NotImplemented
+        if self._chunks.keys() != other._chunks.keys():
+            return False
+        return all(
+            _bits(chunk) == _bits(other._chunks[key])
+            for key, chunk in self._chunks.items()
+        )
+
+    def __repr__(self) -> str:
+        return f"Bitmap({len(self)} values in {len(self._chunks)} chunks)"
+
+    def add(self, value: int) -> None:
+        """Adds a value."""
+        self._merge(value >> _CHUNK_SHIFT, array("H", [value & _CHUNK_MASK]).tobytes())
+
+    def discard(self, value: int) -> None:
+        """Removes a value if present."""
+        key = value >> _CHUNK_SHIFT
+        chunk = self._chunks.get(key)
+        if chunk is None:
+            return
+        left = _sub(chunk, array("H", [value & _CHUNK_MASK]).tobytes())
+        if left is None:
+            del self._chunks[key]
+        else:
+            self._chunks[key] = _compact(left)
+
+    def _merge(self, key: int, chunk: _Chunk) -> None:
+        current = self._chunks.get(key)
+        self._chunks[key] = chunk if current is None else _or(current, chunk)
+
+    def update(self, values: Iterable[int]) -> None:
+        """
+        Adds many values, rewriting each touched chunk once.
+
+        The values are sorted once and cut into runs sharing a chunk, so
+        a batch of IDs in ascending order costs little more than a copy.
+        """
+        ordered = sorted(set(values))
+        start = 0
+        while start < len(ordered):
+            key = ordered[start] >> _CHUNK_SHIFT
+            end = bisect_left(ordered, (key + 1) << _CHUNK_SHIFT, start)
+            chunk = _pack_offsets([v & _CHUNK_MASK for v in ordered[start:end]])
+            assert chunk is not None
+            self._merge(key, chunk)
+            start = end
+
+    def difference_update(self, values: Iterable[int]) -> None:
+        """Removes many values, skipping those not present."""
+        removed = Bitmap(values)
+        self -= removed
+        for key in removed._chunks.keys() & self._chunks.keys():
+            self._chunks[key] = _compact(self._chunks[key])
+
+    def __and__(self, other: "Bitmap") -> "Bitmap":
+        small, large = sorted((self._chunks, other._chunks), key=len)
+        chunks = {}
+        for key, chunk in small.items():
+            match = large.get(key)
+            if match is not None and (both := _and(chunk, match)) is not None:
+                chunks[key] = both
+        return Bitmap._from_chunks(chunks)
+
+    def __or__(self, other: "Bitmap") -> "Bitmap":
+        chunks = dict(self._chunks)
+        for key, chunk in other._chunks.items():
+            current = chunks.get(key)
+            chunks[key] = chunk if current is None else _or(current, chunk)
+        return Bitmap._from_chunks(chunks)
+
+    def __sub__(self, other: "Bitmap") -> "Bitmap":
+        return self.copy().__isub__(other)
+
+    def __isub__(self, other: "Bitmap") -> "Bitmap":
+        chunks = self._chunks
+        for key, chunk in other._chunks.items():
+            current = chunks.get(key)
+            if current is None:
+                continue
+            left = _sub(current, chunk)
+            if left is None:
+                del chunks[key]
+            else:
+                chunks[key] = left
+        return self
+
+    def copy(self) -> "Bitmap":
+        """Returns an independent copy."""
+        return Bitmap._from_chunks(dict(self._chunks))
+
+    def values(self, reverse: bool = False) -> Iterator[int]:
+        """Yields the values in order, decoding one chunk at a time."""
+        for key in sorted(self._chunks, reverse=reverse):
+            base = key << _CHUNK_SHIFT
+            offsets = _offsets(self._chunks[key])
+            if reverse:
+                offsets.reverse()
+            yield from [base + offset for offset in offsets]
+
+    def to_list(self) -> list[int]:
+        """Returns the values in ascending order."""
+        return list(self.values())
+
+    @property
+    def chunk_count(self) -> int:
+        """Number of stored chunks."""
+        return len(self._chunks)
@@ -0,0 +1,128 @@
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    Counters describing how well a cache is serving reads.
+
+    Attributes:
+        hits: Lookups answered from the cache.
+        misses: Lookups that had to go to the backing data.
+        evictions: Entries dropped to stay within capacity.
+        size: Entries currently cached.
+        capacity: Maximum number of entries.
+        bytes: Estimated bytes held by the entries, if sized by bytes.
+        max_bytes: Byte budget of the entries, if any.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    capacity: int
+    bytes: int = 0
+    max_bytes: int | None = None
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache, 0.0 before any lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache[K, V]:
+    """
+    Bounded mapping that evicts the least recently used entry when full.
+
+    The bound is a number of entries and, optionally, a byte budget measured
+    by a sizing function when each entry is added.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        max_bytes: int | None = None,
+        size_of: Callable[[V], int] | None = None,
+    ) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            capacity: Maximum number of entries.
+            max_bytes: Maximum estimated bytes of the entries, or None.
+            size_of: Estimates an entry's bytes; required with `max_bytes`.
+
+        Raises:
+            ValueError: If a bound is negative or `max_bytes` lacks `size_of`.
+        """
+        if capacity < 0:
+            raise ValueError("Cache capacity cannot be negative.")
+        if max_bytes is not None and (max_bytes < 0 or size_of is None):
+            raise ValueError("A byte budget must be non-negative and have a sizer.")
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self._size_of = size_of
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._sizes: dict[K, int] = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """Returns a cached value and marks it recently used, or None."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        """Caches a value, evicting the least recently used entry if full."""
+        if self.capacity == 0:
+            return
+        self.discard(key)
+        self._entries[key] = value
+        if self._size_of is not None:
+            size = self._sizes[key] = self._size_of(value)
+            self.bytes += size
+        while len(self._entries) > self.capacity or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        ):
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _drop(self, key: K) -> None:
+        del self._entries[key]
+        self.bytes -= self._sizes.pop(key, 0)
+
+    def discard(self, key: K) -> None:
+        """Drops a key from the cache if present."""
+        if key in self._entries:
+            self._drop(key)
+
+    def clear(self) -> None:
+        """Drops every cached entry, keeping the counters."""
+        self._entries.clear()
+        self._sizes.clear()
+        self.bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Returns a snapshot of the cache counters."""
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self._entries),
+            capacity=self.capacity,
+            bytes=self.bytes,
+            max_bytes=self.max_bytes,
+        )
@@ -0,0 +1,114 @@
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.models.task import Task
+
+
+def autosave_delta_path(path: Path) -> Path:
+    """Returns the delta file kept next to an autosave snapshot."""
+    return path.with_name(path.name + ".delta")
+
+
+@dataclass(frozen=True)
+class SaveReport:
+    """
+    Outcome of one `TaskService.save_changes` call.
+
+    Attributes:
+        full: Whether a full snapshot was written instead of a delta.
+        tasks: Changed task IDs covered by the save.
+        bytes_written: Bytes written to disk.
+        seconds: Wall-clock time the save took.
+    """
+
+    full: bool
+    tasks: int
+    bytes_written: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class AutosaveStats:
+    """
+    Totals over every save of a store.
+
+    Attributes:
+        saves: Saves that wrote something.
+        full_saves: Saves that wrote a full snapshot.
+        bytes_written: Bytes written by all saves.
+        last_seconds: Duration of the latest save.
+        max_seconds: Duration of the slowest save.
+        pending: Task IDs changed since the latest save.
+    """
+
+    saves: int = 0
+    full_saves: int = 0
+    bytes_written: int = 0
+    last_seconds: float = 0.0
+    max_seconds: float = 0.0
+    pending: int = 0
+
+
+class ChangeTracker:
+    """
+    IDs of the tasks changed since the store was last saved.
+
+    Kept in sync like an index, so every mutation is seen without the
+    mutating methods knowing about saving.
+    """
+
+    def __init__(self) -> None:
+        self.changed: set[int] = set()
+        # Set when the saved state cannot be patched with a delta, e.g. after
+        # a snapshot load replaced the whole store.
+        self.full = False
+        self.first_change = 0.0
+        self.last_change = 0.0
+
+    def __len__(self) -> int:
+        return len(self.changed)
+
+    @property
+    def pending(self) -> bool:
+        """Whether anything changed since the last save."""
+        return bool(self.changed) or self.full
+
+    def _touch(self) -> None:
+        now = time.monotonic()
+        if not self.pending:
+            self.first_change = now
+        self.last_change = now
+
+    def add(self, task: Task) -> None:
+        self._touch()
+        self.changed.add(task.id)
+
+    def discard(self, task: Task) -> None:
+        self._touch()
+        self.changed.add(task.id)
+
+    def add_many(self, tasks: list[Task]) -> None:
+        if tasks:
+            self._touch()
+            self.changed.update(task.id for task in tasks)
+
+    def discard_many(self, tasks: list[Task]) -> None:
+        self.add_many(tasks)
+
+    def require_full(self) -> None:
+        """Makes the next save write a full snapshot."""
+        self._touch()
+        self.full = True
+
+    def take(self) -> tuple[set[int], bool]:
+        """Returns the changed IDs and the full-save flag, then resets both."""
+        changed, full = self.changed, self.full
+        self.changed, self.full = set(), False
+        return changed, full
+
+    def restore(self, changed: set[int], full: bool) -> None:
+        """Puts back changes taken by a save that failed."""
+        self._touch()
+        self.changed |= changed
+        self.full = self.full or full
@@ -0,0 +1,173 @@
+import re
+import zlib
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from src.services.cache import CacheStats, LRUCache
+
+_WORD_RE = re.compile(r"\S+\s*")
+# Raw deflate streams skip the zlib header and checksum, saving 6 bytes each.
+_WBITS = -15
+
+
+def train_dictionary(samples: Iterable[str], size: int = 8192) -> bytes:
+    """
+    Builds a preset deflate dictionary from sample descriptions.
+
+    Frequent words are packed into the dictionary, most valuable last, because
+    deflate encodes matches near the end of the dictionary most cheaply.
+
+    Args:
+        samples: Representative descriptions.
+        size: Maximum dictionary size in bytes (deflate uses at most 32 KiB).
+
+    Returns:
+        The dictionary bytes, empty if the samples contain no text.
+    """
+    counts = Counter(
+        word for sample in samples for word in _WORD_RE.findall(sample) if len(word) > 2
+    )
+    ranked = sorted(counts.items(), key=lambda item: item[1] * len(item[0]))
+
+    chosen: list[bytes] = []
+    total = 0
+    for word, count in reversed(ranked):
+        if count < 2:
+            break
+        encoded = word.encode()
+        if total + len(encoded) > size:
+            continue
+        chosen.append(encoded)
+        total += len(encoded)
+    return b"".join(reversed(chosen))
+
+
+class DescriptionCodec:
+    """
+    Compresses text with raw deflate, optionally using a preset dictionary.
+    """
+
+    def __init__(self, dictionary: bytes | None = None, level: int = 6) -> None:
+        self.dictionary = dictionary or None
+        self.level = level
+
+    def compress(self, text: str) -> bytes:
+        """Compresses text to a raw deflate stream."""
+        if self.dictionary:
+            compressor = zlib.compressobj(
+                self.level, wbits=_WBITS, zdict=self.dictionary
+            )
+        else:
+            compressor = zlib.compressobj(self.level, wbits=_WBITS)
+        return compressor.compress(text.encode()) + compressor.flush()
+
+    def decompress(self, blob: bytes) -> str:
+        """Restores text compressed by `compress`."""
+        if self.dictionary:
+            decompressor = zlib.decompressobj(wbits=_WBITS, zdict=self.dictionary)
+        else:
+            decompressor = zlib.decompressobj(wbits=_WBITS)
+        return (decompressor.decompress(blob) + decompressor.flush()).decode()
+
+
+@dataclass(frozen=True)
+class CompressionStats:
+    """
+    Space and cache figures for compressed description storage.
+
+    Attributes:
+        raw_bytes: UTF-8 size of all stored descriptions.
+        stored_bytes: Size actually kept, compressed or raw.
+        compressed_count: Descriptions kept compressed.
+        cache: Counters of the decompressed-text cache.
+    """
+
+    raw_bytes: int
+    stored_bytes: int
+    compressed_count: int
+    cache: CacheStats
+
+    @property
+    def ratio(self) -> float:
+        """Stored size as a fraction of the raw size, 1.0 when empty."""
+        return self.stored_bytes / self.raw_bytes if self.raw_bytes else 1.0
+
+
+class CompressedTextStore:
+    """
+    Keeps texts by task ID in compressed form, decompressing through an LRU cache.
+
+    Texts shorter than `min_size`, or that would not shrink, are kept as-is.
+    """
+
+    def __init__(
+        self,
+        codec: DescriptionCodec | None = None,
+        cache_size: int = 1024,
+        min_size: int = 64,
+    ) -> None:
+        self.codec = codec or DescriptionCodec()
+        self.min_size = min_size
+        self._texts: dict[int, bytes | str] = {}
+        # Raw sizes of the compressed texts, so dropping one needs no inflate.
+        self._raw_sizes: dict[int, int] = {}
+        self._cache: LRUCache[int, str] = LRUCache(cache_size)
+        self._raw_bytes = 0
+        self._stored_bytes = 0
+        self._compressed_count = 0
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def put(self, key: int, text: str) -> None:
+        """Stores the text for a key, replacing any previous one."""
+        self.discard(key)
+        if not text:
+            return
+        raw_size = len(text.encode())
+        stored: bytes | str = text
+        if len(text) >= self.min_size:
+            blob = self.codec.compress(text)
+            if len(blob) < raw_size:
+                stored = blob
+                self._raw_sizes[key] = raw_size
+                self._compressed_count += 1
+        self._texts[key] = stored
+        self._raw_bytes += raw_size
+        self._stored_bytes += len(stored) if isinstance(stored, bytes) else raw_size
+
+    def get(self, key: int) -> str:
+        """Returns the text for a key, or an empty string if none is stored."""
+        stored = self._texts.get(key, "")
+        if isinstance(stored, str):
+            return stored
+        text = self._cache.get(key)
+        if text is None:
+            text = self.codec.decompress(stored)
+            self._cache.put(key, text)
+        return text
+
+    def discard(self, key: int) -> None:
+        """Removes the text for a key if present."""
+        stored = self._texts.pop(key, None)
+        if stored is None:
+            return
+        self._cache.discard(key)
+        if isinstance(stored, bytes):
+            self._compressed_count -= 1
+            self._raw_bytes -= self._raw_sizes.pop(key)
+            self._stored_bytes -= len(stored)
+        else:
+            size = len(stored.encode())
+            self._raw_bytes -= size
+            self._stored_bytes -= size
+
+    def stats(self) -> CompressionStats:
+        """Returns the space and cache figures of the store."""
+        return CompressionStats(
+            raw_bytes=self._raw_bytes,
+            stored_bytes=self._stored_bytes,
+            compressed_count=self._compressed_count,
+            cache=self._cache.stats(),
+        )
@@ -0,0 +1,322 @@
+from collections.abc import Callable, Iterable, Iterator
+
+from src.models.task import Task
+from src.services.bitmaps import Bitmap
+
+# Order slots left empty by removed nodes before the order is compacted.
+_COMPACT_MIN = 1024
+
+
+class DependencyIndex:
+    """
+    Graph of which tasks block which, in a maintained topological order,
+    with the set of tasks ready to work on.
+
+    Edges come from each task's `blocked_by` field and are kept in sync like
+    any other index. A task's edges stay while it is deleted, so undeleting
+    it cannot close a cycle; `forget` drops them once the task is gone.
+
+    The order is kept with the Pearce-Kelly algorithm: an edge that already
+    agrees with the order costs O(1), and one that does not only reorders
+    the tasks between its two ends that are reachable from either of them,
+    which also reveals whether the edge would close a cycle.
+
+    A task is ready while it is open and none of its blockers is an open
+    task in the store. Open tasks with open blockers are counted instead,
+    so completing a blocker updates only its own dependents.
+    """
+
+    def __init__(self) -> None:
+        self._blockers: dict[int, set[int]] = {}
+        self._dependents: dict[int, set[int]] = {}
+        # Topological order: slot per position, None where a node was removed.
+        self._slots: list[int | None] = []
+        self._position: dict[int, int] = {}
+        # Open tasks in the store: ready, or waiting on this many open blockers.
+        self.ready = Bitmap()
+        self._waiting: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        """Number of edges."""
+        return sum(map(len, self._blockers.values()))
+
+    def is_open(self, task_id: int) -> bool:
+        """Returns whether a task is open and in the store."""
+        return task_id in self._waiting or task_id in self.ready
+
+    def blockers(self, task_id: int) -> set[int]:
+        """Returns the IDs a task waits on. Do not modify the result."""
+        return self._blockers.get(task_id, set())
+
+    def dependents(self, task_id: int) -> set[int]:
+        """Returns the IDs waiting on a task. Do not modify the result."""
+        return self._dependents.get(task_id, set())
+
+    def waiting_on(self, task_id: int) -> int:
+        """Returns the number of open blockers of an open task."""
+        return self._waiting.get(task_id, 0)
+
+    def order(self) -> Iterator[int]:
+        """Yields every task with dependencies, blockers before dependents."""
+        return (node for node in self._slots if node is not None)
+
+    def _place(self, node: int) -> int:
+        position = self._position.get(node)
+        if position is None:
+            position = self._position[node] = len(self._slots)
+            self._slots.append(node)
+        return position
+
+    def _unplace(self, node: int) -> None:
+        if node in self._blockers or node in self._dependents:
+            return
+        position = self._position.pop(node, None)
+        if position is None:
+            return
+        self._slots[position] = None
+        holes = len(self._slots) - len(self._position)
+        if holes > _COMPACT_MIN and holes > len(self._position):
+            nodes = [n for n in self._slots if n is not None]
+            self._slots = list(nodes)
+            self._position = {n: i for i, n in enumerate(nodes)}
+
+    def _search(
+        self, start: int, edges: dict[int, set[int]], inside: range
+    ) -> list[int]:
+        """Returns the nodes reachable from start within a band of positions."""
+        position = self._position
+        seen = {start}
+        stack = [start]
+        while stack:
+            for nxt in edges.get(stack.pop(), ()):
+                if nxt not in seen and position[nxt] in inside:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return list(seen)
+
+    def make_room(self, blocker: int, task_id: int) -> None:
+        """
+        Reorders the graph so an edge from blocker to task fits the order.
+
+        The edge itself is added when the task is indexed with it.
+
+        Raises:
+            ValueError: If the edge would close a cycle.
+        """
+        if blocker == task_id:
+            raise ValueError("A task cannot block itself.")
+        lower, upper = self._place(task_id), self._place(blocker)
+        if lower < upper:
+            self._reorder(blocker, task_id, lower, upper)
+
+    def _reorder(self, blocker: int, task_id: int, lower: int, upper: int) -> None:
+        """Moves the nodes between task and blocker so blocker comes first."""
+        forward = self._search(task_id, self._dependents, range(lower, upper + 1))
+        if blocker in forward:
+            raise ValueError(
+                f"Task {blocker} already waits on task {task_id}; "
+                "the dependency would form a cycle."
+            )
+        backward = self._search(blocker, self._blockers, range(lower, upper + 1))
+        position = self._position
+        backward.sort(key=position.__getitem__)
+        forward.sort(key=position.__getitem__)
+        moved = backward + forward
+        for slot, node in zip(sorted(position[n] for n in moved), moved, strict=True):
+            position[node] = slot
+            self._slots[slot] = node
+
+    def _link(self, blocker: int, task_id: int) -> bool:
+        """Adds an edge, reordering if needed; False if it would form a cycle."""
+        try:
+            self.make_room(blocker, task_id)
+        except ValueError:
+            self._unplace(task_id)
+            self._unplace(blocker)
+            return False
+        self._blockers.setdefault(task_id, set()).add(blocker)
+        self._dependents.setdefault(blocker, set()).add(task_id)
+        return True
+
+    def _unlink(self, blocker: int, task_id: int) -> None:
+        for edges, node, other in (
+            (self._blockers, task_id, blocker),
+            (self._dependents, blocker, task_id),
+        ):
+            linked = edges[node]
+            linked.discard(other)
+            if not linked:
+                del edges[node]
+        self._unplace(task_id)
+        self._unplace(blocker)
+
+    def _relink(self, task: Task) -> None:
+        """Brings a task's edges in line with its `blocked_by` field."""
+        current = self._blockers.get(task.id, set())
+        wanted = set(task.blocked_by)
+        for blocker in current - wanted:
+            self._unlink(blocker, task.id)
+        for blocker in sorted(wanted - current):
+            self._link(blocker, task.id)
+
+    def add(self, task: Task) -> None:
+        """
+        Brings a task's edges in line with its `blocked_by` field and, if it
+        is open, counts it as ready or waiting.
+
+        Edges that would close a cycle, which only hand-edited data can hold,
+        are left out of the graph.
+        """
+        self._relink(task)
+        if task.completed:
+            return
+        waiting = sum(map(self.is_open, self.blockers(task.id)))
+        if waiting:
+            self._waiting[task.id] = waiting
+        else:
+            self.ready.add(task.id)
+        for dependent in self.dependents(task.id):
+            if dependent in self._waiting:
+                self._waiting[dependent] += 1
+            elif dependent in self.ready:
+                self.ready.discard(dependent)
+                self._waiting[dependent] = 1
+
+    def discard(self, task: Task) -> None:
+        """Stops counting a task as open; its edges stay until `add` or `forget`."""
+        if task.completed:
+            return
+        if self._waiting.pop(task.id, None) is None:
+            self.ready.discard(task.id)
+        for dependent in self.dependents(task.id):
+            waiting = self._waiting.get(dependent)
+            if waiting is None:
+                continue
+            if waiting > 1:
+                self._waiting[dependent] = waiting - 1
+            else:
+                del self._waiting[dependent]
+                self.ready.add(dependent)
+
+    def add_many(self, tasks: list[Task]) -> None:
+        """
+        Adds a batch of tasks like `add`, counting them in one pass and
+        updating the ready set once, as a bitmap rewrites a chunk per change.
+        """
+        for task in tasks:
+            if task.blocked_by or task.id in self._blockers:
+                self._relink(task)
+        opened = {task.id for task in tasks if not task.completed}
+        # Open tasks outside the graph wait on nothing and block nothing.
+        position = self._position
+        ready = [task_id for task_id in opened if task_id not in position]
+        blocked: list[int] = []
+        for task_id in opened.intersection(position):
+            blockers = self._blockers.get(task_id, ())
+            waiting = sum(b in opened or self.is_open(b) for b in blockers)
+            if waiting:
+                self._waiting[task_id] = waiting
+            else:
+                ready.append(task_id)
+            # Dependents in the batch counted this task among their blockers.
+            for dependent in self._dependents.get(task_id, ()):
+                if dependent in opened:
+                    continue
+                if dependent in self._waiting:
+                    self._waiting[dependent] += 1
+                elif dependent in self.ready:
+                    blocked.append(dependent)
+                    self._waiting[dependent] = 1
+        self.ready.update(ready)
+        if blocked:
+            self.ready.difference_update(blocked)
+
+    def discard_many(self, tasks: list[Task]) -> None:
+        """Removes a batch of tasks like `discard`, updating the ready set once."""
+        closed = [task.id for task in tasks if not task.completed]
+        unready = [i for i in closed if self._waiting.pop(i, None) is None]
+        freed: list[int] = []
+        for task_id in closed:
+            for dependent in self._dependents.get(task_id, ()):
+                waiting = self._waiting.get(dependent)
+                if waiting is None:
+                    continue
+                if waiting > 1:
+                    self._waiting[dependent] = waiting - 1
+                else:
+                    del self._waiting[dependent]
+                    freed.append(dependent)
+        if unready:
+            self.ready.difference_update(unready)
+        self.ready.update(freed)
+
+    def forget(self, task_id: int) -> None:
+        """Drops the edges of a task that has left the store for good."""
+        for blocker in list(self.blockers(task_id)):
+            self._unlink(blocker, task_id)
+
+    def clear(self) -> None:
+        """Drops every edge and count."""
+        self._blockers.clear()
+        self._dependents.clear()
+        self._slots.clear()
+        self._position.clear()
+        self.ready = Bitmap()
+        self._waiting.clear()
+
+
+def cycles(
+    starts: Iterable[int], blockers: Callable[[int], Iterable[int]]
+) -> list[list[int]]:
+    """
+    Finds the groups of tasks that wait on each other in a cycle.
+
+    Tarjan's algorithm, run without recursion over the tasks reachable from
+    the starts, so the result only depends on the edges.
+
+    Args:
+        starts: Tasks to search from.
+        blockers: Returns the IDs a task waits on.
+
+    Returns:
+        The strongly connected components that hold a cycle, each sorted.
+    """
+    index: dict[int, int] = {}
+    low: dict[int, int] = {}
+    stack: list[int] = []
+    on_stack: set[int] = set()
+    found: list[list[int]] = []
+    for start in starts:
+        if start in index:
+            continue
+        index[start] = low[start] = len(index)
+        stack.append(start)
+        on_stack.add(start)
+        path = [(start, iter(sorted(blockers(start))))]
+        while path:
+            node, edges = path[-1]
+            for nxt in edges:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = len(index)
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    path.append((nxt, iter(sorted(blockers(nxt)))))
+                    break
+                if nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+            else:
+                path.pop()
+                if path:
+                    parent = path[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in blockers(node):
+                        found.append(sorted(component))
+    return found
@@ -0,0 +1,145 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.services.task_service import TaskService
+from src.storage.mutation_log import decode_record
+
+_CHUNK_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class ReplicationStatus:
+    """
+    How far a follower is behind its primary.
+
+    Attributes:
+        records_applied: Log records applied since the follower started.
+        behind_bytes: Log bytes written by the primary but not yet applied.
+        last_record_at: Primary timestamp of the last applied record, if any.
+        lag_seconds: Age of the last applied record while more are pending,
+            0.0 once the follower has caught up.
+        error: Why tailing stopped, if it did.
+    """
+
+    records_applied: int
+    behind_bytes: int
+    last_record_at: float | None
+    lag_seconds: float
+    error: str | None = None
+
+
+class LogFollower:
+    """
+    Keeps a read-only TaskService in sync by tailing a primary's mutation log.
+
+    The follower runs in its own process, so heavy reads there never contend
+    with the primary's writer. Only complete lines are applied; a record the
+    primary is still writing is picked up by the next poll. Tasks the primary
+    archives go to the service's own cold tier, or stay in memory if it has
+    none.
+    """
+
+    def __init__(
+        self, service: TaskService, path: str | Path, poll_interval: float = 0.2
+    ) -> None:
+        """
+        Args:
+            service: The store the log is applied to.
+            path: The primary's mutation log file; it may not exist yet.
+            poll_interval: Seconds between polls of the background thread.
+        """
+        self.service = service
+        self.path = Path(path)
+        self.poll_interval = poll_interval
+        self._offset = 0
+        self._applied = 0
+        self._last_record_at: float | None = None
+        self._error: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def poll(self) -> int:
+        """
+        Applies every complete record appended since the last poll.
+
+        Returns:
+            The number of records applied.
+
+        Raises:
+            ValueError: If the log shrank or contains a malformed record.
+            OSError: If the log could not be read.
+        """
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            return 0
+        applied = 0
+        with file:
+            if os.fstat(file.fileno()).st_size < self._offset:
+                raise ValueError(
+                    f"{self.path} shrank below the applied position; "
+                    "restart the follower."
+                )
+            file.seek(self._offset)
+            while chunk := file.read(_CHUNK_SIZE):
+                end = chunk.rfind(b"\n") + 1
+                if not end:
+                    if len(chunk) == _CHUNK_SIZE:
+                        raise ValueError(
+                            f"Oversized mutation log record in {self.path}."
+                        )
+                    break
+                for line in chunk[:end].splitlines():
+                    record = decode_record(line, self.path)
+                    self.service.apply_record(record)
+                    self._last_record_at = record.get("ts", self._last_record_at)
+                    applied += 1
+                self._offset += end
+                file.seek(self._offset)
+        self._applied += applied
+        return applied
+
+    def status(self) -> ReplicationStatus:
+        """Reports how far the follower is behind the primary's log."""
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        behind = max(0, size - self._offset)
+        lag = 0.0
+        if behind and self._last_record_at is not None:
+            lag = max(0.0, time.time() - self._last_record_at)
+        return ReplicationStatus(
+            records_applied=self._applied,
+            behind_bytes=behind,
+            last_record_at=self._last_record_at,
+            lag_seconds=lag,
+            error=self._error,
+        )
+
+    def start(self) -> None:
+        """Catches up, then keeps polling the log in a background thread."""
+        self.poll()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="log-follower", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.poll()
+            except (OSError, ValueError) as e:
+                self._error = str(e)
+                return
+
+    def stop(self) -> None:
+        """Stops the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,604 @@
+import heapq
+import re
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from itertools import chain, islice
+from typing import Any, Protocol
+
+from src.models.task import Task
+from src.services.bitmaps import Bitmap
+
+_WORD_RE = re.compile(r"\w+")
+_EMPTY: frozenset[int] = frozenset()
+_EMPTY_BITMAP = Bitmap()
+# Batches at least this large, and at least 1/_REBUILD_SHARE of a view, are
+# applied by rebuilding the view in one pass instead of task by task.
+_BATCH_REBUILD = 64
+_REBUILD_SHARE = 8
+# Entries per block of a sorted view; a block is split at twice this size.
+_BLOCK = 512
+
+SORT_KEYS: dict[str, Callable[[Task], Any] | None] = {
+    "id": None,
+    "title": lambda task: task.title.casefold(),
+    "created_at": lambda task: task.created_ns,
+    "completed": lambda task: task.completed,
+}
+
+
+class TaskIndex(Protocol):
+    """
+    Structure kept in sync with the task storage by TaskService.
+
+    `discard` is always called while the task still holds the values it was
+    indexed with, so indexes can recompute their keys instead of storing them.
+    """
+
+    def add(self, task: Task) -> None: ...
+
+    def discard(self, task: Task) -> None: ...
+
+    def add_many(self, tasks: list[Task]) -> None: ...
+
+    def discard_many(self, tasks: list[Task]) -> None: ...
+
+
+class SortedView:
+    """
+    Task IDs ordered by a sort key, maintained incrementally on every change.
+
+    Keys and IDs are held in parallel lists split into blocks of about
+    `_BLOCK` entries, with the last entry of each block kept aside for a
+    binary search, so a change shifts one block instead of the whole view.
+    Ties on the key are ordered by ID, so a task's position can always be
+    found by binary search.
+
+    A discarded task is only marked for removal until the next change or
+    read: if it is added back with the same key, as when an edit leaves
+    this view's key alone, the view is left untouched.
+    """
+
+    def __init__(self, key: Callable[[Task], Any] | None = None) -> None:
+        """
+        Initializes an empty view.
+
+        Args:
+            key: Extracts the sort key from a task. None orders by ID alone.
+        """
+        self._key = key
+        self._keys: list[list[Any]] = []
+        self._ids: list[list[int]] = []
+        # Last entry of every block: an ID, or a (key, ID) pair.
+        self._maxes: list[Any] = []
+        self._len = 0
+        # Entries of discarded tasks, removed on the next change or read.
+        self._pending: dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        self._flush()
+        return self._len
+
+    def _entry(self, task: Task) -> Any:
+        """Returns what orders a task in the view: its ID, or (key, ID)."""
+        return task.id if self._key is None else (self._key(task), task.id)
+
+    def _find(self, entry: Any) -> tuple[int, int]:
+        """Returns the block and offset an entry is at, or belongs at."""
+        block = bisect_left(self._maxes, entry)
+        if block == len(self._maxes):
+            return block, 0
+        if self._key is None:
+            return block, bisect_left(self._ids[block], entry)
+        key, task_id = entry
+        keys = self._keys[block]
+        lo = bisect_left(keys, key)
+        hi = bisect_right(keys, key, lo)
+        return block, bisect_left(self._ids[block], task_id, lo, hi)
+
+    def _last(self, block: int) -> Any:
+        """Returns the last entry of a block."""
+        if self._key is None:
+            return self._ids[block][-1]
+        return self._keys[block][-1], self._ids[block][-1]
+
+    def _insert(self, entry: Any) -> None:
+        """Inserts an entry, splitting its block once it grows too large."""
+        if not self._maxes:
+            self._ids.append([])
+            self._keys.append([])
+            self._maxes.append(entry)
+        block, offset = self._find(entry)
+        if block == len(self._maxes):
+            block = len(self._maxes) - 1
+            offset = len(self._ids[block])
+            self._maxes[block] = entry
+        ids = self._ids[block]
+        if self._key is None:
+            ids.insert(offset, entry)
+        else:
+            ids.insert(offset, entry[1])
+            self._keys[block].insert(offset, entry[0])
+        self._len += 1
+        if len(ids) > 2 * _BLOCK:
+            self._ids[block : block + 1] = [ids[:_BLOCK], ids[_BLOCK:]]
+            keys = self._keys[block]
+            self._keys[block : block + 1] = [keys[:_BLOCK], keys[_BLOCK:]]
+            self._maxes.insert(block, self._last(block))
+
+    def _remove(self, entry: Any) -> None:
+        """Removes an entry if present, dropping its block once empty."""
+        block, offset = self._find(entry)
+        task_id = entry if self._key is None else entry[1]
+        if block == len(self._maxes) or self._ids[block][offset] != task_id:
+            return
+        ids = self._ids[block]
+        del ids[offset]
+        if self._key is not None:
+            del self._keys[block][offset]
+        self._len -= 1
+        if not ids:
+            del self._ids[block], self._keys[block], self._maxes[block]
+        elif offset == len(ids):
+            self._maxes[block] = self._last(block)
+
+    def _bulk(self, count: int) -> bool:
+        """Returns whether a batch is cheaper applied by rebuilding the view."""
+        return count >= _BATCH_REBUILD and count * _REBUILD_SHARE >= self._len
+
+    def _flush(self) -> None:
+        """Removes the entries of tasks discarded and not added back."""
+        if self._bulk(len(self._pending)):
+            self._rebuild([])
+        else:
+            for entry in self._pending.values():
+                self._remove(entry)
+            self._pending.clear()
+
+    def _entries(self) -> Iterator[Any]:
+        """Iterates over every entry in view order."""
+        ids = chain.from_iterable(self._ids)
+        if self._key is None:
+            return ids
+        return zip(chain.from_iterable(self._keys), ids)
+
+    def _rebuild(self, entries: list[Any]) -> None:
+        """Merges entries in while dropping pending removals, in one pass."""
+        gone = self._pending
+        kept = (
+            e for e in self._entries() if (e if self._key is None else e[1]) not in gone
+        )
+        merged = sorted(chain(kept, entries)) if entries else list(kept)
+        if self._key is None:
+            self._fill(merged, [])
+        else:
+            self._fill([entry[1] for entry in merged], [entry[0] for entry in merged])
+        self._pending = {}
+
+    def _fill(self, ids: list[int], keys: list[Any]) -> None:
+        """Replaces the contents with IDs and their keys, in view order."""
+        self._ids = [ids[i : i + _BLOCK] for i in range(0, len(ids), _BLOCK)]
+        if self._key is None:
+            self._keys = [[] for _ in self._ids]
+        else:
+            self._keys = [keys[i : i + _BLOCK] for i in range(0, len(keys), _BLOCK)]
+        self._maxes = [self._last(block) for block in range(len(self._ids))]
+        self._len = len(ids)
+
+    def add(self, task: Task) -> None:
+        """Inserts a task at its sorted position."""
+        entry = self._entry(task)
+        previous = self._pending.pop(task.id, None)
+        if previous == entry:
+            return
+        if previous is not None:
+            self._remove(previous)
+        self._insert(entry)
+
+    def discard(self, task: Task) -> None:
+        """Removes a task from the view if present."""
+        entry = self._entry(task)
+        block, offset = self._find(entry)
+        if block < len(self._maxes) and self._ids[block][offset] == task.id:
+            self._pending.setdefault(task.id, entry)
+
+    def add_many(self, tasks: list[Task]) -> None:
+        """Inserts a batch of tasks, merging large batches in a single sort."""
+        entries = []
+        for task in tasks:
+            entry = self._entry(task)
+            if self._pending.get(task.id) == entry:
+                del self._pending[task.id]
+            else:
+                entries.append(entry)
+        if self._bulk(len(entries)):
+            self._rebuild(entries)
+        else:
+            self._flush()
+            for entry in entries:
+                self._insert(entry)
+
+    def discard_many(self, tasks: list[Task]) -> None:
+        """
+        Removes a batch of tasks, filtering large batches in a single pass
+        and marking smaller ones for removal like `discard`.
+        """
+        if not self._bulk(len(tasks)):
+            for task in tasks:
+                self.discard(task)
+            return
+        self._pending.update(dict.fromkeys(task.id for task in tasks))
+        self._rebuild([])
+
+    def restore(self, ids: list[int], tasks: Mapping[int, Task]) -> None:
+        """
+        Replaces the contents with IDs already in view order, skipping the sort.
+
+        Args:
+            ids: Task IDs ordered by this view's key, e.g. read from a snapshot.
+            tasks: The stored tasks by ID, used to recompute the keys.
+        """
+        self._pending = {}
+        keys = []
+        if self._key is not None:
+            keys = list(map(self._key, map(tasks.__getitem__, ids)))
+        self._fill(ids, keys)
+
+    def ids(self, reverse: bool = False) -> Iterator[int]:
+        """Iterates over task IDs in view order."""
+        self._flush()
+        if reverse:
+            return chain.from_iterable(map(reversed, reversed(self._ids)))
+        return chain.from_iterable(self._ids)
+
+    def _seek(self, start: Any) -> tuple[int, int]:
+        """Returns the block and offset of the first key not below `start`."""
+        if self._key is None:
+            return self._find(start)
+        block = bisect_left(self._maxes, (start,))
+        if block == len(self._maxes):
+            return block, 0
+        return block, bisect_left(self._keys[block], start)
+
+    def _bounds(self, start: Any, end: Any) -> tuple[int, int, int, int]:
+        """Returns the blocks and offsets bounding keys in [start, end)."""
+        self._flush()
+        first, lo = (0, 0) if start is None else self._seek(start)
+        last, hi = (len(self._ids), 0) if end is None else self._seek(end)
+        return (first, lo, last, hi) if (first, lo) <= (last, hi) else (0, 0, 0, 0)
+
+    def count_range(self, start: Any = None, end: Any = None) -> int:
+        """Counts tasks whose key lies in [start, end); None leaves a side open."""
+        first, lo, last, hi = self._bounds(start, end)
+        return sum(map(len, self._ids[first:last])) - lo + hi
+
+    def range_ids(self, start: Any = None, end: Any = None) -> list[int]:
+        """Returns the IDs of tasks whose key lies in [start, end), in order."""
+        first, lo, last, hi = self._bounds(start, end)
+        if first == last:
+            return self._ids[first][lo:hi] if first < len(self._ids) else []
+        result = self._ids[first][lo:]
+        for block in self._ids[first + 1 : last]:
+            result.extend(block)
+        if last < len(self._ids):
+            result.extend(self._ids[last][:hi])
+        return result
+
+    def prefix_ids(self, prefix: str, limit: int) -> list[int]:
+        """
+        Returns up to `limit` IDs whose string key starts with a prefix.
+
+        Keys sharing a prefix are contiguous in sorted order, so the lookup is
+        a binary search followed by a short forward scan.
+        """
+        self._flush()
+        block, offset = self._seek(prefix)
+        result: list[int] = []
+        while block < len(self._ids) and len(result) < limit:
+            keys = self._keys[block]
+            if offset == len(keys):
+                block, offset = block + 1, 0
+                continue
+            if not keys[offset].startswith(prefix):
+                break
+            result.append(self._ids[block][offset])
+            offset += 1
+        return result
+
+    def top_k(self, k: int, reverse: bool = False) -> list[int]:
+        """Returns the first k task IDs in view order, in O(k)."""
+        if k <= 0:
+            return []
+        return list(islice(self.ids(reverse), k))
+
+
+def tokenize(text: str) -> set[str]:
+    """Splits text into the set of case-folded words used by text indexes."""
+    return set(_WORD_RE.findall(text.casefold()))
+
+
+class StatusIndex:
+    """
+    Sets of open and completed task IDs.
+    """
+
+    def __init__(self) -> None:
+        self.open_ids: set[int] = set()
+        self.completed_ids: set[int] = set()
+
+    def ids(self, completed: bool) -> set[int]:
+        """Returns the IDs of tasks with the given completion status."""
+        return self.completed_ids if completed else self.open_ids
+
+    def add(self, task: Task) -> None:
+        self.ids(task.completed).add(task.id)
+
+    def discard(self, task: Task) -> None:
+        self.ids(task.completed).discard(task.id)
+
+    def add_many(self, tasks: list[Task]) -> None:
+        self.completed_ids.update(task.id for task in tasks if task.completed)
+        self.open_ids.update(task.id for task in tasks if not task.completed)
+
+    def discard_many(self, tasks: list[Task]) -> None:
+        self.completed_ids.difference_update(t.id for t in tasks if t.completed)
+        self.open_ids.difference_update(t.id for t in tasks if not t.completed)
+
+
+# (due time in ns, negated priority, task ID): earliest due first, then the
+# highest priority, then the lowest ID.
+type _DueKey = tuple[int, int, int]
+
+
+class DueIndex:
+    """
+    Open tasks with a due date, in a binary heap ordered by due time.
+
+    Removals are lazy: a task's heap entry stays behind and is skipped when
+    it no longer matches the task's live key. The heap is rebuilt from the
+    live keys once stale entries outnumber them, so they never cost more
+    than a constant factor. Reading the first k entries walks the heap
+    best-first without popping, in O(k log k) plus the stale entries met.
+    """
+
+    def __init__(self, rebuild_min: int = 64) -> None:
+        """
+        Args:
+            rebuild_min: Stale entries tolerated before a rebuild is considered.
+        """
+        self.rebuild_min = rebuild_min
+        self._heap: list[_DueKey] = []
+        self._live: dict[int, _DueKey] = {}
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    @staticmethod
+    def _key(task: Task) -> _DueKey | None:
+        if task.completed or task.due_ns is None:
+            return None
+        return (task.due_ns, -task.priority, task.id)
+
+    def add(self, task: Task) -> None:
+        key = self._key(task)
+        if key is not None:
+            self._live[task.id] = key
+            heapq.heappush(self._heap, key)
+
+    def discard(self, task: Task) -> None:
+        if self._live.pop(task.id, None) is not None:
+            self._maybe_rebuild()
+
+    def add_many(self, tasks: list[Task]) -> None:
+        keys = [key for task in tasks if (key := self._key(task)) is not None]
+        self._live.update((key[2], key) for key in keys)
+        if len(keys) > len(self._heap):
+            # Re-heapifying is linear, cheaper than pushing a large batch.
+            self._heap.extend(keys)
+            heapq.heapify(self._heap)
+        else:
+            for key in keys:
+                heapq.heappush(self._heap, key)
+
+    def discard_many(self, tasks: list[Task]) -> None:
+        for task in tasks:
+            self._live.pop(task.id, None)
+        self._maybe_rebuild()
+
+    def _maybe_rebuild(self) -> None:
+        """Drops stale entries once they outnumber the live ones."""
+        stale = len(self._heap) - len(self._live)
+        if stale > self.rebuild_min and stale > len(self._live):
+            self._heap = list(self._live.values())
+            heapq.heapify(self._heap)
+
+    def first(self, k: int, before: int | None = None) -> list[int]:
+        """
+        Returns the IDs of the first k tasks in due order.
+
+        Args:
+            k: Most IDs to return.
+            before: Only tasks due strictly before this time, in ns.
+        """
+        heap, live = self._heap, self._live
+        result: list[int] = []
+        # Frontier of heap positions, ordered by their entries.
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and len(result) < k:
+            key, position = heapq.heappop(frontier)
+            if before is not None and key[0] >= before:
+                break
+            # A task re-added with an unchanged key has several entries; they
+            # come out next to each other.
+            if live.get(key[2]) == key and (not result or result[-1] != key[2]):
+                result.append(key[2])
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return result
+
+
+class TagIndex:
+    """
+    One compressed bitmap of task IDs per tag, plus one of every indexed task.
+
+    Tag filters are answered by combining bitmaps, so "backend AND urgent
+    AND NOT blocked" costs a few integer operations per chunk of IDs rather
+    than a pass over the tasks.
+    """
+
+    def __init__(self) -> None:
+        self._bitmaps: dict[str, Bitmap] = {}
+        self.all_ids = Bitmap()
+
+    def __len__(self) -> int:
+        return len(self._bitmaps)
+
+    def bitmap(self, tag: str) -> Bitmap:
+        """Returns the IDs of tasks with a tag. Do not modify the result."""
+        return self._bitmaps.get(tag, _EMPTY_BITMAP)
+
+    def counts(self) -> dict[str, int]:
+        """Returns the number of tasks carrying each tag, by tag name."""
+        return {tag: len(self._bitmaps[tag]) for tag in sorted(self._bitmaps)}
+
+    def select(
+        self, required: Iterable[Iterable[str]], excluded: Iterable[str] = ()
+    ) -> Bitmap:
+        """
+        Combines tag bitmaps into the IDs of the matching tasks.
+
+        Args:
+            required: Groups of tags; a task must carry at least one tag of
+                every group. With no groups, every indexed task qualifies.
+            excluded: Tags a task must not carry.
+        """
+        result: Bitmap | None = None
+        for group in required:
+            either = Bitmap()
+            for tag in group:
+                either = either | self.bitmap(tag)
+            result = either if result is None else result & either
+            if not result:
+                return result
+        result = self.all_ids.copy() if result is None else result
+        for tag in excluded:
+            result -= self.bitmap(tag)
+        return result
+
+    def add(self, task: Task) -> None:
+        self.all_ids.add(task.id)
+        for tag in task.tags:
+            bitmap = self._bitmaps.get(tag)
+            if bitmap is None:
+                bitmap = self._bitmaps[tag] = Bitmap()
+            bitmap.add(task.id)
+
+    def discard(self, task: Task) -> None:
+        self.all_ids.discard(task.id)
+        for tag in task.tags:
+            bitmap = self._bitmaps.get(tag)
+            if bitmap is None:
+                continue
+            bitmap.discard(task.id)
+            if not bitmap:
+                del self._bitmaps[tag]
+
+    def add_many(self, tasks: list[Task]) -> None:
+        self.all_ids.update(task.id for task in tasks)
+        by_tag: dict[str, list[int]] = {}
+        for task in tasks:
+            for tag in task.tags:
+                by_tag.setdefault(tag, []).append(task.id)
+        for tag, ids in by_tag.items():
+            self._bitmaps.setdefault(tag, Bitmap()).update(ids)
+
+    def discard_many(self, tasks: list[Task]) -> None:
+        self.all_ids.difference_update(task.id for task in tasks)
+        by_tag: dict[str, list[int]] = {}
+        for task in tasks:
+            for tag in task.tags:
+                by_tag.setdefault(tag, []).append(task.id)
+        for tag, ids in by_tag.items():
+            bitmap = self._bitmaps.get(tag)
+            if bitmap is None:
+                continue
+            bitmap.difference_update(ids)
+            if not bitmap:
+                del self._bitmaps[tag]
+
+
+class TextIndex:
+    """
+    Inverted index from words to the IDs of tasks containing them in a field.
+
+    After `invalidate`, the postings are rebuilt from `source` on the next
+    lookup, so bulk loads do not pay for tokenizing text nobody searches.
+    """
+
+    def __init__(
+        self,
+        text: Callable[[Task], str],
+        source: Callable[[], Iterable[Task]] | None = None,
+    ) -> None:
+        """
+        Initializes an empty index.
+
+        Args:
+            text: Extracts the indexed text from a task.
+            source: Returns every stored task; required to use `invalidate`.
+        """
+        self._text = text
+        self._source = source
+        self._stale = False
+        self._postings: dict[str, set[int]] = {}
+
+    def invalidate(self) -> None:
+        """
+        Drops the postings so they are rebuilt lazily from the source.
+
+        Raises:
+            ValueError: If the index has no source to rebuild from.
+        """
+        if self._source is None:
+            raise ValueError("A text index needs a source to be rebuilt lazily.")
+        self._postings = {}
+        self._stale = True
+
+    def _rebuild(self) -> None:
+        """Indexes every task of the source if the postings are stale."""
+        if self._stale and self._source is not None:
+            self._stale = False
+            for task in self._source():
+                self.add(task)
+
+    def add(self, task: Task) -> None:
+        if self._stale:
+            return
+        for word in tokenize(self._text(task)):
+            self._postings.setdefault(word, set()).add(task.id)
+
+    def discard(self, task: Task) -> None:
+        if self._stale:
+            return
+        for word in tokenize(self._text(task)):
+            posting = self._postings.get(word)
+            if posting is None:
+                continue
+            posting.discard(task.id)
+            if not posting:
+                del self._postings[word]
+
+    def add_many(self, tasks: list[Task]) -> None:
+        if not self._stale:
+            for task in tasks:
+                self.add(task)
+
+    def discard_many(self, tasks: list[Task]) -> None:
+        if not self._stale:
+            for task in tasks:
+                self.discard(task)
+
+    def lookup(self, word: str) -> set[int] | frozenset[int]:
+        """Returns the IDs of tasks containing a word. Do not modify the result."""
+        self._rebuild()
+        return self._postings.get(word, _EMPTY)
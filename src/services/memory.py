@@ -0,0 +1,157 @@
+import sys
+import tracemalloc
+from collections.abc import Iterable
+from dataclasses import dataclass, field, fields
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+
+from src.models.task import Task
+
+_SKIPPED_TYPES = (type, ModuleType, FunctionType, MethodType, BuiltinFunctionType)
+
+
+class StringPool:
+    """
+    Reference-counted pool that makes equal strings share one object.
+
+    Generated stores repeat the same titles and descriptions many times; routing
+    them through the pool keeps a single copy of each distinct value resident.
+    """
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+        self._counts: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    @property
+    def references(self) -> int:
+        """Total number of live references handed out by the pool."""
+        return sum(self._counts.values())
+
+    def intern(self, value: str) -> str:
+        """Returns the pooled copy of a string, adding it if new."""
+        pooled = self._strings.setdefault(value, value)
+        self._counts[pooled] = self._counts.get(pooled, 0) + 1
+        return pooled
+
+    def release(self, value: str) -> None:
+        """Drops one reference to a string, forgetting it when none remain."""
+        count = self._counts.get(value)
+        if count is None:
+            return
+        if count > 1:
+            self._counts[value] = count - 1
+        else:
+            del self._counts[value]
+            del self._strings[value]
+
+
+def deep_sizeof(obj: object, seen: set[int]) -> int:
+    """
+    Estimates the bytes held by an object graph using `sys.getsizeof`.
+
+    Objects already in `seen` are not counted again, so shared objects such as
+    pooled strings are charged to whichever structure is measured first.
+    """
+    if id(obj) in seen or isinstance(obj, _SKIPPED_TYPES):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(value, seen)
+    elif isinstance(obj, list | tuple | set | frozenset):
+        for item in obj:
+            size += deep_sizeof(item, seen)
+    elif hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    else:
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(obj, name):
+                    size += deep_sizeof(getattr(obj, name), seen)
+    return size
+
+
+def format_bytes(size: int) -> str:
+    """Formats a byte count with a binary unit, e.g. `12.5 KiB`."""
+    value = float(size)
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+@dataclass
+class MemoryReport:
+    """
+    Estimated resident bytes of a task store, broken down by field and structure.
+
+    Attributes:
+        task_count: Number of tasks measured.
+        fields: Bytes held by each Task field's values.
+        structures: Bytes held by task objects, storage and indexes.
+        traced_current: Bytes allocated according to tracemalloc, if tracing.
+        traced_peak: Peak bytes according to tracemalloc, if tracing.
+        pooled_strings: Distinct strings in the dedup pool, if enabled.
+        pooled_references: References handed out by the dedup pool, if enabled.
+    """
+
+    task_count: int
+    fields: dict[str, int] = field(default_factory=dict)
+    structures: dict[str, int] = field(default_factory=dict)
+    traced_current: int | None = None
+    traced_peak: int | None = None
+    pooled_strings: int | None = None
+    pooled_references: int | None = None
+
+    @property
+    def total(self) -> int:
+        """Sum of all field and structure bytes."""
+        return sum(self.fields.values()) + sum(self.structures.values())
+
+
+def build_memory_report(
+    tasks: Iterable[Task],
+    structures: dict[str, object],
+    pool: StringPool | None = None,
+) -> MemoryReport:
+    """
+    Measures tasks field by field, then the structures that hold them.
+
+    Field values are measured before structures so shared objects are charged
+    to the task data rather than to the indexes referencing them. Private
+    fields, such as cached timestamp conversions and export rows, are charged
+    together as a structure.
+    """
+    seen: set[int] = set()
+    names = [f.name for f in fields(Task) if not f.name.startswith("_")]
+    caches = [f.name for f in fields(Task) if f.name.startswith("_")]
+    report = MemoryReport(task_count=0, fields=dict.fromkeys(names, 0))
+
+    shells = cached = 0
+    for task in tasks:
+        report.task_count += 1
+        seen.add(id(task))
+        shells += sys.getsizeof(task)
+        for name in names:
+            report.fields[name] += deep_sizeof(getattr(task, name), seen)
+        for name in caches:
+            cached += deep_sizeof(getattr(task, name), seen)
+    report.structures["task objects"] = shells
+    report.structures["task caches"] = cached
+
+    for label, structure in structures.items():
+        report.structures[label] = deep_sizeof(structure, seen)
+
+    if pool is not None:
+        report.structures["string pool"] = deep_sizeof(pool, seen)
+        report.pooled_strings = len(pool)
+        report.pooled_references = pool.references
+
+    if tracemalloc.is_tracing():
+        report.traced_current, report.traced_peak = tracemalloc.get_traced_memory()
+    return report
@@ -0,0 +1,72 @@
+import asyncio
+import threading
+from collections.abc import Callable
+
+
+class PeriodicWorker:
+    """
+    Runs a maintenance action at a fixed interval, either in a background
+    thread (`start`/`stop`) or as an asyncio job (`run_async`).
+
+    A failing action stops the worker; the error is kept for reporting.
+    """
+
+    def __init__(
+        self, action: Callable[[], object], interval: float, name: str
+    ) -> None:
+        """
+        Args:
+            action: Called once per interval.
+            interval: Seconds between calls.
+            name: Name of the background thread.
+
+        Raises:
+            ValueError: If the interval is not positive.
+        """
+        if interval <= 0:
+            raise ValueError("The worker interval must be positive.")
+        self.action = action
+        self.interval = interval
+        self.name = name
+        self.runs = 0
+        self.error: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Starts calling the action in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.action()
+            except (ValueError, OSError) as e:
+                self.error = str(e)
+                return
+            self.runs += 1
+
+    async def run_async(self) -> None:
+        """
+        Calls the action at the interval until the asyncio task is cancelled.
+
+        Each call runs in a worker thread, so a slow action never stalls the
+        event loop.
+        """
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.action)
+            except (ValueError, OSError) as e:
+                self.error = str(e)
+                return
+            self.runs += 1
+
+    def stop(self) -> None:
+        """Stops the background thread, waiting for a running action."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,517 @@
+import heapq
+import re
+import shlex
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from itertools import islice
+from typing import Protocol
+
+from src.models.task import TAG_PATTERN, Task, to_ns
+from src.services.bitmaps import Bitmap
+from src.services.indexes import (
+    SORT_KEYS,
+    SortedView,
+    StatusIndex,
+    TagIndex,
+    TextIndex,
+    tokenize,
+)
+
+STATUS_VALUES: dict[str, bool] = {
+    "open": False,
+    "incomplete": False,
+    "pending": False,
+    "done": True,
+    "complete": True,
+    "completed": True,
+}
+TEXT_FIELDS: dict[str, str] = {
+    "title": "title",
+    "desc": "description",
+    "description": "description",
+}
+SORT_ALIASES: dict[str, str] = {
+    "id": "id",
+    "title": "title",
+    "created": "created_at",
+    "created_at": "created_at",
+    "status": "completed",
+    "completed": "completed",
+}
+
+_CREATED_RE = re.compile(r"^created(>=|<=|>|<|=|:)(.*)$", re.IGNORECASE)
+
+
+class Filter(Protocol):
+    """A single query condition."""
+
+    @property
+    def fields(self) -> tuple[str, ...]: ...
+
+    def matches(self, task: Task) -> bool: ...
+
+    def describe(self) -> str: ...
+
+
+@dataclass(frozen=True)
+class StatusFilter:
+    """Matches tasks by completion status."""
+
+    completed: bool
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return ("completed",)
+
+    def matches(self, task: Task) -> bool:
+        return task.completed == self.completed
+
+    def describe(self) -> str:
+        return f"status = {'done' if self.completed else 'open'}"
+
+
+@dataclass(frozen=True)
+class CreatedFilter:
+    """Matches tasks created in the half-open interval [start, end)."""
+
+    start: datetime | None = None
+    end: datetime | None = None
+    # The bounds as nanoseconds, compared against Task.created_ns.
+    start_ns: int | None = field(init=False, repr=False, compare=False)
+    end_ns: int | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        start_ns = to_ns(self.start) if self.start is not None else None
+        end_ns = to_ns(self.end) if self.end is not None else None
+        object.__setattr__(self, "start_ns", start_ns)
+        object.__setattr__(self, "end_ns", end_ns)
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return ("created_at",)
+
+    def matches(self, task: Task) -> bool:
+        created = task.created_ns
+        if self.start_ns is not None and created < self.start_ns:
+            return False
+        return self.end_ns is None or created < self.end_ns
+
+    def describe(self) -> str:
+        parts = []
+        if self.start is not None:
+            parts.append(f"created >= {self.start.isoformat(sep=' ')}")
+        if self.end is not None:
+            parts.append(f"created < {self.end.isoformat(sep=' ')}")
+        return " AND ".join(parts)
+
+
+@dataclass(frozen=True)
+class WordsFilter:
+    """Matches tasks containing every word in at least one of the fields."""
+
+    fields: tuple[str, ...]
+    words: tuple[str, ...]
+
+    def matches(self, task: Task) -> bool:
+        tokens: set[str] = set()
+        for name in self.fields:
+            tokens |= tokenize(getattr(task, name))
+        return all(word in tokens for word in self.words)
+
+    def describe(self) -> str:
+        return f"{' or '.join(self.fields)} ~ {' '.join(self.words)}"
+
+
+@dataclass(frozen=True)
+class SubstringFilter:
+    """Matches tasks whose field contains the text, ignoring case."""
+
+    field: str
+    text: str
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return (self.field,)
+
+    def matches(self, task: Task) -> bool:
+        value: str = getattr(task, self.field)
+        return self.text in value.casefold()
+
+    def describe(self) -> str:
+        return f"{self.field} contains '{self.text}'"
+
+
+@dataclass(frozen=True)
+class TagFilter:
+    """Matches tasks carrying any of the tags, or none of them if negated."""
+
+    tags: tuple[str, ...]
+    negated: bool = False
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return ("tags",)
+
+    def matches(self, task: Task) -> bool:
+        return any(tag in task.tags for tag in self.tags) != self.negated
+
+    def describe(self) -> str:
+        condition = f"tag = {' or '.join(self.tags)}"
+        return f"NOT {condition}" if self.negated else condition
+
+
+@dataclass
+class Query:
+    """A parsed query: conditions combined with AND, plus ordering."""
+
+    filters: list[Filter] = field(default_factory=list)
+    sort_key: str = "id"
+    reverse: bool = False
+    limit: int | None = None
+
+
+def _parse_date(value: str, op: str) -> CreatedFilter:
+    """Converts a date comparison into a created-at interval."""
+    try:
+        moment = datetime.combine(date.fromisoformat(value), time())
+        step = timedelta(days=1)
+    except ValueError:
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"Invalid date: {value}. Use YYYY-MM-DD.") from None
+        step = timedelta.resolution
+    if moment.tzinfo is not None:
+        raise ValueError("Dates must not include a timezone.")
+
+    if op == ">=":
+        return CreatedFilter(start=moment)
+    if op == ">":
+        return CreatedFilter(start=moment + step)
+    if op == "<":
+        return CreatedFilter(end=moment)
+    if op == "<=":
+        return CreatedFilter(end=moment + step)
+    return CreatedFilter(start=moment, end=moment + step)
+
+
+def _parse_tags(value: str, negated: bool) -> TagFilter:
+    """Converts `a|b` from a tag term into a filter."""
+    tags = tuple(dict.fromkeys(t.removeprefix("#").lower() for t in value.split("|")))
+    for tag in tags:
+        if not TAG_PATTERN.fullmatch(tag):
+            raise ValueError(f"Invalid tag: {tag}.")
+    return TagFilter(tags, negated)
+
+
+def _parse_term(term: str, query: Query) -> None:
+    """Parses a single whitespace-separated term into the query."""
+    if term[:5].casefold() == "-tag:":
+        if not term[5:]:
+            raise ValueError("Missing value for tag.")
+        query.filters.append(_parse_tags(term[5:], negated=True))
+        return
+
+    created = _CREATED_RE.match(term)
+    if created:
+        op, value = created.groups()
+        if not value:
+            raise ValueError("Missing value for created.")
+        query.filters.append(_parse_date(value, op))
+        return
+
+    if ":" not in term:
+        words = tuple(sorted(tokenize(term)))
+        if not words:
+            raise ValueError(f"Invalid search term: {term}.")
+        query.filters.append(WordsFilter(("title", "description"), words))
+        return
+
+    name, value = term.split(":", 1)
+    name = name.casefold()
+    if not value:
+        raise ValueError(f"Missing value for {name}.")
+
+    if name == "status":
+        if value.casefold() not in STATUS_VALUES:
+            raise ValueError(f"Invalid status: {value}. Use open or done.")
+        query.filters.append(StatusFilter(STATUS_VALUES[value.casefold()]))
+    elif name in TEXT_FIELDS:
+        if value.startswith("~"):
+            words = tuple(sorted(tokenize(value[1:])))
+            if not words:
+                raise ValueError(f"Missing words for {name}.")
+            query.filters.append(WordsFilter((TEXT_FIELDS[name],), words))
+        else:
+            query.filters.append(SubstringFilter(TEXT_FIELDS[name], value.casefold()))
+    elif name == "tag":
+        query.filters.append(_parse_tags(value, negated=False))
+    elif name == "sort":
+        key = value.removeprefix("-").casefold()
+        if key not in SORT_ALIASES:
+            raise ValueError(f"Invalid sort key: {key}.")
+        query.sort_key = SORT_ALIASES[key]
+        query.reverse = value.startswith("-")
+    elif name == "limit":
+        if not value.isdigit() or int(value) <= 0:
+            raise ValueError("Limit must be a positive number.")
+        query.limit = int(value)
+    else:
+        raise ValueError(f"Unknown query field: {name}.")
+
+
+def parse_query(text: str) -> Query:
+    """
+    Parses a filter query such as `status:open created>=2026-10-01 title:~report`.
+
+    Supported terms:
+        status:open|done          Completion status.
+        created>=DATE (>, <, <=)  Creation time; `created:DATE` matches a day.
+        title:~words, desc:~words Whole-word match using the text index.
+        title:text, desc:text     Case-insensitive substring match.
+        tag:name, tag:a|b         Tasks tagged name, or tagged a or b.
+        -tag:name                 Tasks not tagged name.
+        word                      Whole-word match in title or description.
+        sort:key, sort:-key       Ordering by id, title, created or status.
+        limit:N                   Maximum number of results.
+
+    Raises:
+        ValueError: If the query is malformed.
+    """
+    try:
+        terms = shlex.split(text)
+    except ValueError as e:
+        raise ValueError(f"Invalid query: {e}.") from None
+
+    query = Query()
+    for term in terms:
+        _parse_term(term, query)
+    return query
+
+
+@dataclass
+class QueryPlan:
+    """
+    The access path chosen for a query and its estimated cost.
+    """
+
+    query: Query
+    access: str
+    estimated_rows: int
+    total_rows: int
+    residual: list[Filter]
+    candidates: Callable[[], Iterable[int]] = field(repr=False)
+    ordered: bool = False
+
+    def describe(self) -> str:
+        """Returns a human-readable explanation of the plan."""
+        lines = [
+            f"Access: {self.access}",
+            f"Estimated rows: {self.estimated_rows} of {self.total_rows}",
+        ]
+        if self.residual:
+            conditions = " AND ".join(f.describe() for f in self.residual)
+            lines.append(f"Filter: {conditions}")
+        direction = "descending" if self.query.reverse else "ascending"
+        order = f"Order: {self.query.sort_key} {direction}"
+        if self.query.limit is not None:
+            order += f", limit {self.query.limit}"
+        lines.append(order)
+        return "\n".join(lines)
+
+
+_IndexOption = tuple[int, str, Callable[[], Iterable[int]], bool]
+
+
+class _Materialized(Mapping[int, Task]):
+    """Read-only view of the task storage that materializes tasks on access."""
+
+    def __init__(
+        self, tasks: dict[int, Task], materialize: Callable[[Task], Task]
+    ) -> None:
+        self._tasks = tasks
+        self._materialize = materialize
+
+    def __getitem__(self, task_id: int) -> Task:
+        return self._materialize(self._tasks[task_id])
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._tasks)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+
+class QueryPlanner:
+    """
+    Picks the most selective index for a query and executes the plan.
+
+    Each indexable condition reports an estimated row count; the smallest wins.
+    When no index narrows the search to at most half of the store, the planner
+    scans the view for the requested ordering instead, stopping at the limit.
+    """
+
+    def __init__(
+        self,
+        tasks: dict[int, Task],
+        views: dict[str, SortedView],
+        status: StatusIndex,
+        text: dict[str, TextIndex],
+        tags: TagIndex,
+        materialize: Callable[[Task], Task] | None = None,
+    ) -> None:
+        """
+        Initializes a planner over the service's storage and indexes.
+
+        Args:
+            tags: Tag bitmaps; every tag condition of a query is answered by
+                combining them into one candidate set.
+            materialize: Returns a task with every field readable, for stores
+                that keep descriptions outside the Task objects. Only used when
+                a residual filter reads the description.
+        """
+        self._tasks = tasks
+        self._views = views
+        self._status = status
+        self._text = text
+        self._tags = tags
+        self._materialize = materialize
+
+    def _words_ids(self, condition: WordsFilter) -> set[int]:
+        """Intersects the postings of every word across the filter's fields."""
+        result: set[int] | None = None
+        for word in condition.words:
+            ids: set[int] = set()
+            for name in condition.fields:
+                ids |= self._text[name].lookup(word)
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result or set()
+
+    def _index_option(self, condition: Filter, query: Query) -> _IndexOption | None:
+        """Returns (estimate, access, candidates, ordered) for an indexable filter."""
+        if isinstance(condition, StatusFilter):
+            ids = self._status.ids(condition.completed)
+            return (
+                len(ids),
+                f"status index ({condition.describe()})",
+                lambda: ids,
+                False,
+            )
+
+        if isinstance(condition, CreatedFilter):
+            view = self._views["created_at"]
+            start, end = condition.start_ns, condition.end_ns
+            ordered = query.sort_key == "created_at"
+
+            def created_ids() -> Iterable[int]:
+                ids = view.range_ids(start, end)
+                return reversed(ids) if query.reverse else ids
+
+            estimate = view.count_range(start, end)
+            access = f"created_at index range ({condition.describe()})"
+            return estimate, access, created_ids, ordered
+
+        if isinstance(condition, WordsFilter):
+            estimate = min(
+                sum(len(self._text[name].lookup(word)) for name in condition.fields)
+                for word in condition.words
+            )
+            access = f"text index ({condition.describe()})"
+            return estimate, access, lambda: self._words_ids(condition), False
+
+        return None
+
+    def _tag_option(self, conditions: list[TagFilter], query: Query) -> _IndexOption:
+        """Combines the tag bitmaps of every tag filter into one option."""
+        ids: Bitmap = self._tags.select(
+            (c.tags for c in conditions if not c.negated),
+            (tag for c in conditions if c.negated for tag in c.tags),
+        )
+
+        def tagged_ids() -> Iterable[int]:
+            return ids.values(query.reverse)
+
+        conditions_text = " AND ".join(c.describe() for c in conditions)
+        access = f"tag bitmap index ({conditions_text})"
+        return len(ids), access, tagged_ids, query.sort_key == "id"
+
+    def plan(self, query: Query) -> QueryPlan:
+        """Chooses the access path for a parsed query."""
+        total = len(self._tasks)
+        best: _IndexOption | None = None
+        driving: list[Filter] = []
+        for condition in query.filters:
+            option = self._index_option(condition, query)
+            if option is not None and (best is None or option[0] < best[0]):
+                best, driving = option, [condition]
+        tag_filters = [f for f in query.filters if isinstance(f, TagFilter)]
+        if tag_filters:
+            option = self._tag_option(tag_filters, query)
+            if best is None or option[0] < best[0]:
+                best, driving = option, list(tag_filters)
+
+        if best is None or best[0] > total // 2:
+            view = self._views[query.sort_key]
+            kind = "full scan" if query.filters else "ordered scan"
+            return QueryPlan(
+                query=query,
+                access=f"{kind} of {query.sort_key} view",
+                estimated_rows=total,
+                total_rows=total,
+                residual=list(query.filters),
+                candidates=lambda: view.ids(query.reverse),
+                ordered=True,
+            )
+
+        estimate, access, candidates, ordered = best
+        return QueryPlan(
+            query=query,
+            access=access,
+            estimated_rows=estimate,
+            total_rows=total,
+            residual=[f for f in query.filters if f not in driving],
+            candidates=candidates,
+            ordered=ordered,
+        )
+
+    def execute(self, plan: QueryPlan) -> list[int]:
+        """Runs a plan and returns the matching task IDs in result order."""
+        tasks: Mapping[int, Task] = self._tasks
+        residual = plan.residual
+        limit = plan.query.limit
+        if self._materialize is not None and any(
+            "description" in f.fields for f in residual
+        ):
+            tasks = _Materialized(self._tasks, self._materialize)
+
+        if not residual:
+            # The access path matches exactly; only ordering is left.
+            if plan.ordered:
+                return list(islice(plan.candidates(), limit))
+            matches = list(plan.candidates())
+        elif plan.ordered:
+            result: list[int] = []
+            for task_id in plan.candidates():
+                if all(f.matches(tasks[task_id]) for f in residual):
+                    result.append(task_id)
+                    if limit is not None and len(result) >= limit:
+                        break
+            return result
+        else:
+            matches = [
+                task_id
+                for task_id in plan.candidates()
+                if all(f.matches(tasks[task_id]) for f in residual)
+            ]
+        key = SORT_KEYS[plan.query.sort_key]
+
+        def order(task_id: int) -> tuple[object, int]:
+            return (key(tasks[task_id]) if key else None, task_id)
+
+        if limit is None:
+            return sorted(matches, key=order, reverse=plan.query.reverse)
+        pick = heapq.nlargest if plan.query.reverse else heapq.nsmallest
+        return pick(limit, matches, key=order)
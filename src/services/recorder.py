@@ -0,0 +1,368 @@
+import functools
+import json
+import statistics
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from src.services.task_service import TaskService
+
+# Public TaskService calls captured in traces. Diagnostics and persistence
+# calls are left out because they depend on the recording machine.
+TRACED_OPERATIONS = (
+    "add_task",
+    "add_tasks",
+    "get_task",
+    "get_all_tasks",
+    "top_k",
+    "next_due",
+    "overdue",
+    "find_by_title_prefix",
+    "search",
+    "find_ids",
+    "ids_in_ranges",
+    "explain",
+    "update_task",
+    "delete_task",
+    "delete_tasks",
+    "delete_where",
+    "purge_completed",
+    "undelete_task",
+    "toggle_tasks",
+    "toggle_status",
+    "tag_tasks",
+    "tag_counts",
+    "add_dependency",
+    "remove_dependency",
+    "ready_tasks",
+    "dependency_order",
+    "archive_completed",
+    "get_archived_tasks",
+    "archived_count",
+)
+# Arguments holding one task ID, those holding two and those holding a list
+# of task IDs, which are remapped when a trace is replayed several times side
+# by side.
+_ID_ARGUMENTS = {
+    "get_task",
+    "update_task",
+    "delete_task",
+    "undelete_task",
+    "toggle_status",
+}
+_ID_PAIR_ARGUMENTS = {"add_dependency", "remove_dependency"}
+_ID_LIST_ARGUMENTS = {"delete_tasks", "toggle_tasks", "tag_tasks"}
+# Calls that pick tasks by query or age across the whole store. Copies of a
+# workload share the store, so these would act on every copy's tasks at once.
+_STORE_WIDE_OPERATIONS = {
+    "find_ids",
+    "delete_where",
+    "purge_completed",
+    "archive_completed",
+}
+
+
+def _encode(value: Any) -> Any:
+    """Converts a call argument to a JSON-compatible value."""
+    if value is None or isinstance(value, bool | int | float | str):
+        return value
+    if isinstance(value, timedelta):
+        return {"timedelta": value.total_seconds()}
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, Iterable):
+        return [_encode(item) for item in value]
+    raise TypeError(f"Cannot record argument of type {type(value).__name__}.")
+
+
+def _decode(value: Any) -> Any:
+    """Restores a call argument encoded by `_encode`."""
+    if isinstance(value, dict) and "timedelta" in value:
+        return timedelta(seconds=value["timedelta"])
+    if isinstance(value, dict) and "datetime" in value:
+        return datetime.fromisoformat(value["datetime"])
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class TraceEvent:
+    """
+    One recorded TaskService call.
+
+    Attributes:
+        at: Seconds since recording started when the call began.
+        op: Name of the TaskService method.
+        args: Positional arguments, JSON-encoded.
+        kwargs: Keyword arguments, JSON-encoded.
+        duration: Seconds the call took when recorded.
+        result_id: ID of the created task, for `add_task`.
+        result_ids: IDs of the created tasks, for `add_tasks`.
+        error: Message of the ValueError raised, if any.
+    """
+
+    at: float
+    op: str
+    args: list[Any] = field(default_factory=list)
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    duration: float = 0.0
+    result_id: int | None = None
+    result_ids: list[int] | None = None
+    error: str | None = None
+
+
+def read_trace(path: str | Path) -> list[TraceEvent]:
+    """
+    Loads the events of a trace file.
+
+    Raises:
+        ValueError: If a line is not a valid trace event.
+    """
+    events: list[TraceEvent] = []
+    with open(path, encoding="utf-8") as file:
+        for number, line in enumerate(file, start=1):
+            try:
+                events.append(TraceEvent(**json.loads(line)))
+            except (ValueError, TypeError):
+                raise ValueError(
+                    f"Invalid trace event on line {number} of {path}."
+                ) from None
+    return events
+
+
+class TraceRecorder:
+    """
+    Writes every traced TaskService call, with its timing, to a JSON-lines file.
+
+    Calls made by the service to itself, such as `search` calling `find_ids`,
+    are not recorded separately.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started = time.perf_counter()
+        self.events = 0
+
+    def attach(self, service: TaskService) -> TaskService:
+        """
+        Instruments a service in place so its traced calls are recorded.
+
+        Returns:
+            The same service, for chaining.
+        """
+        for op in TRACED_OPERATIONS:
+            setattr(service, op, self._wrap(op, getattr(service, op)))
+        return service
+
+    def _wrap(self, op: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(method)
+        def traced(*args: Any, **kwargs: Any) -> Any:
+            if getattr(self._local, "active", False):
+                return method(*args, **kwargs)
+            # Materialize one-shot iterables so they can be both used and logged.
+            args = tuple(list(a) if isinstance(a, Iterator) else a for a in args)
+            event: dict[str, Any] = {
+                "at": time.perf_counter() - self._started,
+                "op": op,
+                "args": _encode(args),
+                "kwargs": {key: _encode(value) for key, value in kwargs.items()},
+            }
+            self._local.active = True
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except ValueError as e:
+                event["error"] = str(e)
+                raise
+            else:
+                if op == "add_task":
+                    event["result_id"] = result.id
+                elif op == "add_tasks":
+                    event["result_ids"] = [task.id for task in result]
+                return result
+            finally:
+                event["duration"] = time.perf_counter() - start
+                self._local.active = False
+                self._write(event)
+
+        return traced
+
+    def _write(self, event: dict[str, Any]) -> None:
+        line = json.dumps(event, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self.events += 1
+
+    def close(self) -> None:
+        """Flushes and closes the trace file."""
+        with self._lock:
+            self._file.close()
+
+
+@dataclass
+class ReplayReport:
+    """
+    Throughput and latency figures of a replayed trace.
+
+    Attributes:
+        elapsed: Wall-clock seconds the replay took.
+        latencies: Seconds taken by each replayed call, by operation.
+        errors: Calls that raised ValueError.
+    """
+
+    elapsed: float
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: int = 0
+
+    @property
+    def operations(self) -> int:
+        """Number of calls replayed."""
+        return sum(len(values) for values in self.latencies.values())
+
+    @property
+    def throughput(self) -> float:
+        """Calls per second over the whole replay."""
+        return self.operations / self.elapsed if self.elapsed else 0.0
+
+    def percentiles(self, op: str | None = None) -> tuple[float, float, float]:
+        """Returns the p50, p95 and p99 latency in seconds, for one op or all."""
+        if op is None:
+            values = [value for group in self.latencies.values() for value in group]
+        else:
+            values = self.latencies.get(op, [])
+        if len(values) < 2:
+            single = values[0] if values else 0.0
+            return single, single, single
+        cuts = statistics.quantiles(values, n=100, method="inclusive")
+        return cuts[49], cuts[94], cuts[98]
+
+
+def _remap(event: TraceEvent, ids: dict[int, int]) -> tuple[list[Any], dict[str, Any]]:
+    """Returns the decoded arguments of an event with task IDs remapped."""
+    args = _decode(event.args)
+    kwargs = {key: _decode(value) for key, value in event.kwargs.items()}
+    if event.op in _ID_ARGUMENTS or event.op in _ID_PAIR_ARGUMENTS:
+        names = ["task_id"]
+        if event.op in _ID_PAIR_ARGUMENTS:
+            names.append("blocker_id")
+        for position, name in enumerate(names):
+            if position < len(args):
+                args[position] = ids.get(args[position], args[position])
+            elif name in kwargs:
+                kwargs[name] = ids.get(kwargs[name], kwargs[name])
+    elif event.op in _ID_LIST_ARGUMENTS:
+        if args:
+            args[0] = [ids.get(task_id, task_id) for task_id in args[0]]
+        elif "task_ids" in kwargs:
+            kwargs["task_ids"] = [ids.get(i, i) for i in kwargs["task_ids"]]
+    elif event.op == "ids_in_ranges":
+        if args:
+            args[0] = _remap_ranges(args[0], ids)
+        elif "ranges" in kwargs:
+            kwargs["ranges"] = _remap_ranges(kwargs["ranges"], ids)
+    return args, kwargs
+
+
+def _remap_ranges(
+    ranges: list[list[int]], ids: dict[int, int]
+) -> list[tuple[int, int]]:
+    """
+    Maps recorded ID ranges to ranges over the replayed IDs of one copy.
+
+    Only IDs the trace created are kept, since other IDs in a range may
+    belong to another copy; consecutive replayed IDs are merged again.
+    """
+    mapped = sorted(
+        new for old, new in ids.items() if any(lo <= old <= hi for lo, hi in ranges)
+    )
+    merged: list[tuple[int, int]] = []
+    for task_id in mapped:
+        if merged and merged[-1][1] + 1 == task_id:
+            merged[-1] = (merged[-1][0], task_id)
+        else:
+            merged.append((task_id, task_id))
+    return merged
+
+
+def _record_ids(event: TraceEvent, result: Any, ids: dict[int, int]) -> None:
+    """Maps the IDs of tasks created when recording to those of the replay."""
+    if event.result_id is not None:
+        ids[event.result_id] = result.id
+    elif event.result_ids is not None:
+        for recorded, task in zip(event.result_ids, result, strict=False):
+            ids[recorded] = task.id
+
+
+def replay_trace(
+    events: list[TraceEvent],
+    service: TaskService,
+    speed: float | None = 1.0,
+    scale: int = 1,
+) -> ReplayReport:
+    """
+    Re-executes recorded calls against a service.
+
+    Args:
+        events: The recorded calls, in order.
+        service: Usually a fresh service.
+        speed: Multiplier of the recorded pace, e.g. 10 for ten times faster;
+            None replays as fast as possible.
+        scale: Copies of the workload to interleave. Each copy creates its own
+            tasks and refers to them through its own ID mapping, ranges of
+            IDs included. Traces that pick tasks by query or age, with
+            `find_ids`, `delete_where`, `purge_completed` or
+            `archive_completed`, can only be replayed once.
+
+    Returns:
+        The measured throughput and latencies.
+
+    Raises:
+        ValueError: If speed is not positive, scale is below 1, or scale is
+            above 1 for a trace with store-wide calls.
+    """
+    if speed is not None and speed <= 0:
+        raise ValueError("Replay speed must be positive.")
+    if scale < 1:
+        raise ValueError("Replay scale must be at least 1.")
+    if scale > 1:
+        store_wide = sorted({e.op for e in events} & _STORE_WIDE_OPERATIONS)
+        if store_wide:
+            raise ValueError(
+                f"Cannot replay {', '.join(store_wide)} at a scale above 1; "
+                "copies would act on each other's tasks."
+            )
+
+    id_maps: list[dict[int, int]] = [{} for _ in range(scale)]
+    report = ReplayReport(elapsed=0.0)
+    start = time.perf_counter()
+    for event in events:
+        if speed is not None:
+            delay = event.at / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        method = getattr(service, event.op)
+        for ids in id_maps:
+            args, kwargs = _remap(event, ids)
+            began = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except ValueError:
+                report.errors += 1
+                result = None
+            report.latencies.setdefault(event.op, []).append(
+                time.perf_counter() - began
+            )
+            if result is not None:
+                _record_ids(event, result, ids)
+    report.elapsed = time.perf_counter() - start
+    return report
@@ -0,0 +1,144 @@
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+
+from src.models.task import Task, from_ns, to_ns
+from src.services.changes import AutosaveStats
+
+
+@dataclass(frozen=True)
+class TaskStats:
+    """
+    Counts describing the store, read from incrementally maintained indexes.
+
+    Attributes:
+        total: Tasks in the hot tier.
+        open: Hot tasks not completed yet.
+        completed: Hot tasks completed.
+        archived: Tasks in the cold tier.
+        deleted: Deleted tasks that can still be undeleted.
+        created_per_day: Hot tasks created on each day, oldest day first.
+        completed_per_day: Hot tasks completed on each day, oldest day first.
+        autosave: Save counts, bytes written and latencies.
+    """
+
+    total: int
+    open: int
+    completed: int
+    archived: int = 0
+    deleted: int = 0
+    created_per_day: dict[date, int] = field(default_factory=dict)
+    completed_per_day: dict[date, int] = field(default_factory=dict)
+    autosave: AutosaveStats = field(default_factory=AutosaveStats)
+
+    @property
+    def completion_ratio(self) -> float:
+        """Share of hot tasks that are completed, 0.0 for an empty store."""
+        return self.completed / self.total if self.total else 0.0
+
+
+class _DayOf:
+    """
+    Maps nanosecond timestamps to local calendar days.
+
+    The bounds of the last day seen are remembered, so timestamps from the
+    same day, such as a batch sharing one clock reading, skip the conversion.
+    """
+
+    def __init__(self) -> None:
+        self._start = self._end = 0
+        self._day = date.min
+
+    def __call__(self, ns: int) -> date:
+        if not self._start <= ns < self._end:
+            self._day = from_ns(ns).date()
+            self._start = to_ns(datetime.combine(self._day, time.min))
+            next_day = self._day + timedelta(days=1)
+            self._end = to_ns(datetime.combine(next_day, time.min))
+        return self._day
+
+    def count(self, values: Iterable[int]) -> Counter[date]:
+        """Counts timestamps per day, converting only where the day changes."""
+        counts: Counter[date] = Counter()
+        start, end, day, run = self._start, self._end, self._day, 0
+        for ns in values:
+            if start <= ns < end:
+                run += 1
+                continue
+            if run:
+                counts[day] += run
+            day, run = self(ns), 1
+            start, end = self._start, self._end
+        if run:
+            counts[day] += run
+        return counts
+
+
+class ActivityIndex:
+    """
+    Numbers of tasks created and completed per local day.
+
+    Kept in sync like any other index, so histograms never scan the store.
+    """
+
+    def __init__(self) -> None:
+        self.created: Counter[date] = Counter()
+        self.completed: Counter[date] = Counter()
+        self._day_of = _DayOf()
+
+    @staticmethod
+    def _decrement(counter: Counter[date], day: date) -> None:
+        if counter[day] > 1:
+            counter[day] -= 1
+        else:
+            del counter[day]
+
+    def add(self, task: Task) -> None:
+        self.created[self._day_of(task.created_ns)] += 1
+        if task.completed and task.completed_ns is not None:
+            self.completed[self._day_of(task.completed_ns)] += 1
+
+    def discard(self, task: Task) -> None:
+        self._decrement(self.created, self._day_of(task.created_ns))
+        if task.completed and task.completed_ns is not None:
+            self._decrement(self.completed, self._day_of(task.completed_ns))
+
+    def _days(self, tasks: list[Task]) -> tuple[Counter[date], Counter[date]]:
+        """Counts the tasks of a batch by creation day and by completion day."""
+        created = self._day_of.count(task.created_ns for task in tasks)
+        completed = self._day_of.count(
+            task.completed_ns
+            for task in tasks
+            if task.completed and task.completed_ns is not None
+        )
+        return created, completed
+
+    def add_many(self, tasks: list[Task]) -> None:
+        created, completed = self._days(tasks)
+        self.created.update(created)
+        self.completed.update(completed)
+
+    def discard_many(self, tasks: list[Task]) -> None:
+        created, completed = self._days(tasks)
+        for counter, days in ((self.created, created), (self.completed, completed)):
+            counter.subtract(days)
+            for day in days:
+                if counter[day] <= 0:
+                    del counter[day]
+
+    def histograms(
+        self, last: date, days: int
+    ) -> tuple[dict[date, int], dict[date, int]]:
+        """
+        Returns the created and completed counts of a run of days.
+
+        Args:
+            last: The final day of the run.
+            days: Number of days, ending with `last`.
+        """
+        run = [last - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+        return (
+            {day: self.created.get(day, 0) for day in run},
+            {day: self.completed.get(day, 0) for day in run},
+        )
@@ -0,0 +1,272 @@
+import hashlib
+import marshal
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+from src.models.task import Task
+
+# A leaf range holds 1 << LEAF_BITS IDs and every level above groups
+# 1 << FANOUT_BITS ranges of the level below, up to TOP_LEVEL.
+LEAF_BITS = 6
+FANOUT_BITS = 4
+TOP_LEVEL = 6
+# Level whose hashes are those of single records, keyed by task ID.
+RECORD_LEVEL = -1
+# Task IDs above these bits hold the replica that created the task, so
+# stores that sync never hand out the same ID.
+REPLICA_BITS = 32
+
+_FILE_MAGIC = "TODOSYNC"
+_FILE_VERSION = 1
+
+# A record to hash: the task, its description and whether it is deleted.
+type SyncRecord = tuple[Task, str, bool]
+
+
+def record_digest(task: Task, description: str, deleted: bool) -> int:
+    """
+    Returns the 128-bit digest of a task record as exchanged by sync.
+
+    The digest covers every synced field, including the version, so it
+    also breaks ties between different records of the same version.
+    """
+    fields = (
+        task.id,
+        task.version,
+        deleted,
+        task.title,
+        description,
+        task.completed,
+        task.created_ns,
+        task.completed_ns,
+        task.due_ns,
+        task.priority,
+        task.tags,
+        task.blocked_by,
+    )
+    digest = hashlib.blake2b(repr(fields).encode(), digest_size=16).digest()
+    return int.from_bytes(digest, "big")
+
+
+def parse_sync_rows(rows: Iterable[dict[str, Any]]) -> list[tuple[Task, bool]]:
+    """
+    Rebuilds the tasks of rows from `TaskService.sync_records`.
+
+    Returns:
+        Each task with whether it is deleted.
+
+    Raises:
+        ValueError: If a row is not a valid task.
+    """
+    return [(Task.from_dict(row), bool(row.get("deleted"))) for row in rows]
+
+
+def leaf_range(key: int) -> range:
+    """Returns the task IDs covered by a leaf range."""
+    return range(key << LEAF_BITS, (key + 1) << LEAF_BITS)
+
+
+@dataclass(frozen=True)
+class SyncReport:
+    """
+    Outcome of synchronizing two stores.
+
+    Attributes:
+        hashes_received: Range and record hashes read from the other store.
+        differing: Task IDs whose records differed, or leaf ranges when
+            syncing by file.
+        pulled: Records taken from the other store.
+        pushed: Records sent to the other store; over a connection, only
+            those it took.
+    """
+
+    hashes_received: int = 0
+    differing: int = 0
+    pulled: int = 0
+    pushed: int = 0
+
+
+class SyncPeer(Protocol):
+    """The calls sync makes on the other store, local or remote."""
+
+    def sync_hashes(
+        self, level: int, parents: list[int] | None = None
+    ) -> dict[int, int]: ...
+
+    def sync_records(self, task_ids: list[int]) -> list[dict[str, Any]]: ...
+
+    def sync_merge(self, rows: list[dict[str, Any]]) -> list[int]: ...
+
+
+class RangeHashTree:
+    """
+    Merkle-style tree of hashes over task ID ranges.
+
+    A range's hash is the XOR of the digests of the records it holds, so a
+    change patches one hash per level instead of rehashing sibling ranges,
+    and two stores holding the same records in a range have the same hash.
+    Stores compare hashes from the top down and descend only into ranges
+    that differ.
+
+    Besides the stored tasks it is kept in sync with, the tree covers
+    deleted and archived tasks added with `add_record`. After `invalidate`
+    it is rebuilt from `source` on the next lookup, so bulk loads do not
+    pay for hashing stores that are never synced.
+    """
+
+    def __init__(
+        self,
+        description: Callable[[Task], str],
+        source: Callable[[], Iterable[SyncRecord]],
+    ) -> None:
+        """
+        Initializes an empty tree.
+
+        Args:
+            description: Reads a stored task's description.
+            source: Returns every record the tree covers, for rebuilding.
+        """
+        self._description = description
+        self._source = source
+        self._stale = False
+        self._levels: list[dict[int, int]] = [{} for _ in range(TOP_LEVEL + 1)]
+
+    def invalidate(self) -> None:
+        """Drops the hashes so they are rebuilt lazily from the source."""
+        self._levels = [{} for _ in range(TOP_LEVEL + 1)]
+        self._stale = True
+
+    def _rebuild(self) -> None:
+        if self._stale:
+            self._stale = False
+            for task, description, deleted in self._source():
+                self.add_record(task, description, deleted)
+
+    def _toggle(self, task_id: int, digest: int) -> None:
+        """XORs a digest into the ranges holding a task ID."""
+        key = task_id >> LEAF_BITS
+        for level in self._levels:
+            value = level.get(key, 0) ^ digest
+            if value:
+                level[key] = value
+            else:
+                del level[key]
+            key >>= FANOUT_BITS
+
+    def add_record(self, task: Task, description: str, deleted: bool) -> None:
+        """Adds a record, such as a deleted or archived task."""
+        if not self._stale:
+            self._toggle(task.id, record_digest(task, description, deleted))
+
+    def discard_record(self, task: Task, description: str, deleted: bool) -> None:
+        """Removes a record added with `add_record`."""
+        # XOR is its own inverse.
+        self.add_record(task, description, deleted)
+
+    def add(self, task: Task) -> None:
+        self.add_record(task, self._description(task), False)
+
+    def discard(self, task: Task) -> None:
+        self.add_record(task, self._description(task), False)
+
+    def add_many(self, tasks: list[Task]) -> None:
+        if not self._stale:
+            for task in tasks:
+                self.add(task)
+
+    def discard_many(self, tasks: list[Task]) -> None:
+        if not self._stale:
+            for task in tasks:
+                self.discard(task)
+
+    def hashes(self, level: int, parents: list[int] | None = None) -> dict[int, int]:
+        """
+        Returns the non-empty range hashes of a level.
+
+        Args:
+            level: From 0 for leaf ranges up to TOP_LEVEL.
+            parents: Only return ranges within these ranges of the level
+                above; None returns the whole level.
+
+        Raises:
+            ValueError: If the level does not exist.
+        """
+        if not 0 <= level <= TOP_LEVEL:
+            raise ValueError(f"Hash levels range from 0 to {TOP_LEVEL}.")
+        self._rebuild()
+        hashes = self._levels[level]
+        if parents is None:
+            return dict(hashes)
+        found = {}
+        for parent in parents:
+            first = parent << FANOUT_BITS
+            for key in range(first, first + (1 << FANOUT_BITS)):
+                value = hashes.get(key)
+                if value is not None:
+                    found[key] = value
+        return found
+
+
+def sync_stores(local: SyncPeer, peer: SyncPeer) -> SyncReport:
+    """
+    Brings two stores to the same records, moving only differing ones.
+
+    Range hashes are compared level by level from the top, fetching the
+    children of differing ranges only, down to the digests of single
+    records. Each store then takes the records of the other that win
+    under `TaskService.sync_merge`, so both end up identical.
+    """
+    received = 0
+    parents: list[int] | None = None
+    differing: list[int] = []
+    for level in range(TOP_LEVEL, RECORD_LEVEL - 1, -1):
+        mine = local.sync_hashes(level, parents)
+        theirs = peer.sync_hashes(level, parents)
+        received += len(theirs)
+        differing = sorted(
+            key
+            for key in mine.keys() | theirs.keys()
+            if mine.get(key) != theirs.get(key)
+        )
+        if not differing:
+            return SyncReport(hashes_received=received)
+        parents = differing
+    outgoing = local.sync_records(differing)
+    pulled = local.sync_merge(peer.sync_records(differing))
+    pushed = peer.sync_merge(outgoing)
+    return SyncReport(received, len(differing), len(pulled), len(pushed))
+
+
+def write_sync_file(path: str | Path, kind: str, payload: dict[str, Any]) -> int:
+    """
+    Writes one step of a sync exchanged through files.
+
+    Returns:
+        The number of bytes written.
+    """
+    data = marshal.dumps((_FILE_MAGIC, _FILE_VERSION, kind, payload))
+    Path(path).write_bytes(data)
+    return len(data)
+
+
+def read_sync_file(path: str | Path) -> tuple[str, dict[str, Any]]:
+    """
+    Reads a file written by `write_sync_file`.
+
+    Returns:
+        The kind of step and its payload.
+
+    Raises:
+        ValueError: If the file is not a sync file.
+    """
+    try:
+        magic, version, kind, payload = marshal.loads(Path(path).read_bytes())
+    except (EOFError, ValueError, TypeError):
+        raise ValueError(f"{path} is not a sync file.") from None
+    if magic != _FILE_MAGIC:
+        raise ValueError(f"{path} is not a sync file.")
+    if version != _FILE_VERSION:
+        raise ValueError(f"Unsupported sync file version: {version}.")
+    return kind, payload
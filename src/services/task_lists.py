@@ -0,0 +1,269 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+
+from src.services.autosave import Autosaver
+from src.services.periodic import PeriodicWorker
+from src.services.task_service import TaskService
+from src.utils.validators import validate_list_name
+
+_SUFFIX = ".snap"
+
+
+@dataclass(frozen=True)
+class ListStats:
+    """
+    Counters describing which named lists are resident in memory.
+
+    Attributes:
+        resident: Lists currently open.
+        capacity: Most lists kept open at once.
+        loads: Lists opened, whether read from disk or created empty.
+        evictions: Lists saved and dropped from memory.
+    """
+
+    resident: int
+    capacity: int
+    loads: int
+    evictions: int
+
+
+@dataclass
+class _Resident:
+    """An open list, with its saver, when it was last used and its pins."""
+
+    autosaver: Autosaver
+    last_used: float
+    pins: int = 0
+
+
+class TaskLists:
+    """
+    Named task lists, each stored on disk as its own autosave snapshot.
+
+    A list is loaded on first access and stays resident while it is used.
+    When more than `max_open` lists are open, the least recently used one is
+    saved and dropped, so a process can serve many lists with only the
+    active ones in memory. Services returned by `open` should not be kept
+    across calls, since an evicted list is reloaded as a new service; a
+    client that keeps one, such as the console, holds it with `pin`.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        max_open: int = 64,
+        factory: Callable[[str], TaskService] | None = None,
+        debounce: float = 2.0,
+        max_delay: float = 30.0,
+    ) -> None:
+        """
+        Args:
+            root: Directory holding one snapshot and delta per list.
+            max_open: Most lists kept in memory at once.
+            factory: Builds the empty service a list is loaded into, given
+                the list name; defaults to a plain `TaskService`.
+            debounce: Seconds without changes before a list is saved.
+            max_delay: Most seconds a change waits to be saved.
+
+        Raises:
+            ValueError: If `max_open` is not positive or the delays are invalid.
+        """
+        if max_open < 1:
+            raise ValueError("At least one list must be allowed to stay open.")
+        if debounce <= 0 or max_delay < debounce:
+            raise ValueError(
+                "The debounce must be positive and no longer than the maximum delay."
+            )
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_open = max_open
+        self._factory = factory or (lambda _name: TaskService())
+        self._debounce = debounce
+        self._max_delay = max_delay
+        self._open: OrderedDict[str, _Resident] = OrderedDict()
+        self._lock = threading.RLock()
+        self.loads = 0
+        self.evictions = 0
+
+    def path(self, name: str) -> Path:
+        """Returns the snapshot file of a list."""
+        return self.root / (name + _SUFFIX)
+
+    def names(self, prefix: str = "") -> list[str]:
+        """Returns the names of the saved and open lists, sorted."""
+        with self._lock:
+            names = {name for name in self._open if name.startswith(prefix)}
+        names.update(
+            path.name.removesuffix(_SUFFIX)
+            for path in self.root.glob(f"{prefix}*{_SUFFIX}")
+        )
+        return sorted(names)
+
+    def is_open(self, name: str) -> bool:
+        """Whether a list is resident in memory."""
+        with self._lock:
+            return name in self._open
+
+    def open(self, name: str) -> TaskService:
+        """
+        Returns a list's store, loading it from disk or creating it if needed.
+
+        Opening a list beyond `max_open` first saves and drops the least
+        recently used one.
+
+        Raises:
+            ValueError: If the name is invalid or the list's files are corrupt.
+            OSError: If the evicted list could not be saved; it stays open.
+        """
+        is_valid, err = validate_list_name(name)
+        if not is_valid:
+            raise ValueError(err)
+        with self._lock:
+            resident = self._open.get(name)
+            if resident is not None:
+                self._open.move_to_end(name)
+                resident.last_used = time.monotonic()
+                return resident.autosaver.service
+            while len(self._open) >= self.max_open:
+                unpinned = (n for n, r in self._open.items() if not r.pins)
+                victim = next(unpinned, None)
+                if victim is None:
+                    # Every open list is held; go over the limit rather than
+                    # drop a service a client still writes to.
+                    break
+                self._evict(victim)
+            service = self._factory(name)
+            path = self.path(name)
+            if path.exists():
+                service.load_autosave(path)
+            autosaver = Autosaver(service, path, self._debounce, self._max_delay)
+            self._open[name] = _Resident(autosaver, time.monotonic())
+            self.loads += 1
+            return service
+
+    def pin(self, name: str) -> TaskService:
+        """
+        Opens a list and keeps it resident until as many `unpin` calls.
+
+        Pinned lists are never evicted, whether idle or over `max_open`, so
+        the returned service can be kept and written to.
+
+        Raises:
+            ValueError: If the name is invalid or the list's files are corrupt.
+            OSError: If an evicted list could not be saved.
+        """
+        with self._lock:
+            service = self.open(name)
+            self._open[name].pins += 1
+            return service
+
+    def unpin(self, name: str) -> None:
+        """Releases a list held with `pin`, counting as a use of it."""
+        with self._lock:
+            resident = self._open.get(name)
+            if resident is not None and resident.pins:
+                resident.pins -= 1
+                resident.last_used = time.monotonic()
+
+    def _evict(self, name: str) -> None:
+        """Saves a list's pending changes, then drops it from memory."""
+        resident = self._open[name]
+        resident.autosaver.flush()
+        del self._open[name]
+        resident.autosaver.service.close()
+        self.evictions += 1
+
+    def close(self, name: str) -> bool:
+        """
+        Saves and drops a list from memory.
+
+        Returns:
+            False if the list was not open or is pinned.
+        """
+        with self._lock:
+            resident = self._open.get(name)
+            if resident is None or resident.pins:
+                return False
+            self._evict(name)
+            return True
+
+    def close_idle(self, idle_for: float) -> int:
+        """
+        Saves and drops the unpinned lists not used for `idle_for` seconds.
+
+        Returns:
+            The number of lists dropped.
+        """
+        with self._lock:
+            cutoff = time.monotonic() - idle_for
+            # Lists are in use order, so the idle ones come first.
+            idle = []
+            for name, resident in self._open.items():
+                if resident.last_used > cutoff:
+                    break
+                if not resident.pins:
+                    idle.append(name)
+            for name in idle:
+                self._evict(name)
+            return len(idle)
+
+    def save_due(self) -> int:
+        """
+        Saves the open lists whose changes have waited long enough.
+
+        Returns:
+            The number of lists saved.
+        """
+        with self._lock:
+            residents = list(self._open.values())
+        return sum(
+            resident.autosaver.save_if_due() is not None for resident in residents
+        )
+
+    def compact(self, older_than: timedelta | None = None) -> int:
+        """
+        Reclaims deleted tasks in every open list.
+
+        Returns:
+            The number of tasks reclaimed.
+        """
+        with self._lock:
+            residents = list(self._open.values())
+        return sum(
+            resident.autosaver.service.compact(older_than) for resident in residents
+        )
+
+    def worker(self, idle_for: float) -> PeriodicWorker:
+        """
+        Returns a worker that saves due changes and drops idle lists.
+
+        Args:
+            idle_for: Seconds after its last use when a list is dropped.
+        """
+
+        def maintain() -> None:
+            self.save_due()
+            self.close_idle(idle_for)
+
+        return PeriodicWorker(maintain, self._debounce / 4, "task-lists")
+
+    def close_all(self) -> None:
+        """Saves and drops every open list, e.g. before exiting."""
+        with self._lock:
+            for name in list(self._open):
+                self._evict(name)
+
+    def stats(self) -> ListStats:
+        """Returns a snapshot of the residency counters."""
+        with self._lock:
+            return ListStats(
+                resident=len(self._open),
+                capacity=self.max_open,
+                loads=self.loads,
+                evictions=self.evictions,
+            )
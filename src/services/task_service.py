@@ -1,32 +1,416 @@
-from copy import deepcopy
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from copy import copy
+from dataclasses import replace
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any
 
-from src.models.task import Task
-from src.utils.validators import validate_description, validate_title
+from src.models.task import Task, from_ns, now_ns, to_ns
+from src.services.backup import (
+    BackupReport,
+    RevisionLog,
+    check_chain,
+    read_backup,
+    write_backup,
+)
+from src.services.cache import CacheStats
+from src.services.changes import (
+    AutosaveStats,
+    ChangeTracker,
+    SaveReport,
+    autosave_delta_path,
+)
+from src.services.compression import (
+    CompressedTextStore,
+    CompressionStats,
+    DescriptionCodec,
+)
+from src.services.dependencies import DependencyIndex, cycles
+from src.services.indexes import (
+    SORT_KEYS,
+    DueIndex,
+    SortedView,
+    StatusIndex,
+    TagIndex,
+    TaskIndex,
+    TextIndex,
+)
+from src.services.memory import MemoryReport, StringPool, build_memory_report
+from src.services.query import QueryPlan, QueryPlanner, parse_query
+from src.services.stats import ActivityIndex, TaskStats
+from src.services.sync import (
+    RECORD_LEVEL,
+    REPLICA_BITS,
+    RangeHashTree,
+    SyncPeer,
+    SyncRecord,
+    SyncReport,
+    leaf_range,
+    parse_sync_rows,
+    read_sync_file,
+    record_digest,
+    sync_stores,
+    write_sync_file,
+)
+from src.storage.cached_store import CachedStore, TaskBackend
+from src.storage.cold_store import MemoryStore
+from src.storage.mutation_log import MutationLog, read_log, write_records
+from src.storage.snapshot import (
+    Snapshot,
+    read_snapshot,
+    snapshot_digest,
+    write_snapshot,
+)
+from src.utils.export import EXPORT_FORMATS, export_format, write_export
+from src.utils.validators import (
+    validate_description,
+    validate_priority,
+    validate_tags,
+    validate_title,
+)
 
 
 class TaskService:
     """
     Manages the business logic and in-memory storage for tasks.
+
+    Reads and writes are serialized by a reentrant lock, so another thread,
+    such as a log follower, can apply changes while the store is being read.
     """
 
-    def __init__(self) -> None:
-        """Initializes an empty task storage."""
+    def __init__(
+        self,
+        dedupe_strings: bool = False,
+        compress_descriptions: bool = False,
+        description_cache_size: int = 1024,
+        description_dictionary: bytes | None = None,
+        cold_store: TaskBackend | None = None,
+        archive_after: timedelta | None = None,
+        log: MutationLog | None = None,
+        clock: Callable[[], int] = now_ns,
+        replica: int = 0,
+    ) -> None:
+        """
+        Initializes an empty task storage.
+
+        Args:
+            dedupe_strings: Share one copy of repeated titles and descriptions.
+            compress_descriptions: Keep descriptions zlib-compressed, decompressing
+                on access through a bounded LRU cache.
+            description_cache_size: Decompressed descriptions kept in the cache.
+            description_dictionary: Optional preset dictionary for compression,
+                see `train_dictionary`.
+            cold_store: On-disk tier that completed tasks can be archived to,
+                such as a `ColdStore`, optionally behind a `CachedStore`.
+            archive_after: Default age of completion after which
+                `archive_completed` moves a task to the cold tier.
+            log: Mutation log that every change is recorded to, with the
+                durability policy the log was opened with.
+            clock: Returns the current time in nanoseconds since the epoch,
+                read once per operation; batch operations share one reading.
+            replica: Number of this store among the stores it syncs with.
+                Each replica hands out IDs from its own range, so tasks added
+                on two stores between syncs never share an ID; give every
+                store that syncs a different number.
+
+        Raises:
+            ValueError: If the replica number is out of range.
+        """
+        if not 0 <= replica < 1 << 16:
+            raise ValueError("Replica numbers range from 0 to 65535.")
         self._tasks: dict[int, Task] = {}
-        self._next_id: int = 1
+        # Soft-deleted tasks by ID, with their deletion time, until compacted.
+        self._tombstones: dict[int, tuple[int, Task]] = {}
+        # Hot-tier removals since the task dict was last rebuilt.
+        self._removed = 0
+        # IDs this replica hands out lie above _id_base, up to _id_limit.
+        self._id_base = replica << REPLICA_BITS
+        self._id_limit = (replica + 1) << REPLICA_BITS
+        self._next_id: int = self._id_base + 1
+        # Grows with every change; each changed task carries the new value.
+        self._revision = 0
+        self._pool: StringPool | None = StringPool() if dedupe_strings else None
+        self._cold = cold_store
+        self._archive_after = archive_after
+        self._log = log
+        self._clock = clock
+        self._lock = threading.RLock()
+        if cold_store is not None:
+            self._advance_next_id(cold_store.max_id(self._id_limit) + 1)
+        self._descriptions: CompressedTextStore | None = None
+        if compress_descriptions:
+            self._descriptions = CompressedTextStore(
+                DescriptionCodec(description_dictionary), description_cache_size
+            )
+        self._views: dict[str, SortedView] = {
+            name: SortedView(key) for name, key in SORT_KEYS.items()
+        }
+        self._status = StatusIndex()
+        self._activity = ActivityIndex()
+        self._due = DueIndex()
+        self._tags = TagIndex()
+        self._dependencies = DependencyIndex()
+        self._changes = ChangeTracker()
+        self._save_stats = AutosaveStats()
+        self._save_lock = threading.Lock()
+        self._text: dict[str, TextIndex] = {
+            "title": TextIndex(lambda task: task.title, self._tasks.values),
+            "description": TextIndex(self._description, self._tasks.values),
+        }
+        # Covers archived tasks too, so it starts stale and is built on use.
+        self._sync = RangeHashTree(self._description, self._sync_source)
+        self._sync.invalidate()
+        self._revisions = RevisionLog(self._revision_source)
+        self._indexes: list[TaskIndex] = [
+            *self._views.values(),
+            self._status,
+            self._activity,
+            self._due,
+            self._tags,
+            self._dependencies,
+            self._sync,
+            self._revisions,
+            self._changes,
+            *self._text.values(),
+        ]
+        self._planner = QueryPlanner(
+            self._tasks,
+            self._views,
+            self._status,
+            self._text,
+            self._tags,
+            self._export,
+        )
+
+    def _advance_next_id(self, next_id: int) -> None:
+        """
+        Moves the next ID up to `next_id` if it lies in this replica's range.
+
+        IDs of tasks created by other replicas are theirs to hand out.
+        """
+        if self._id_base < next_id <= self._id_limit:
+            self._next_id = max(self._next_id, next_id)
+
+    def _store_text(self, value: str) -> str:
+        """Returns the string to keep in storage, pooled if dedup is enabled."""
+        return self._pool.intern(value) if self._pool is not None else value
+
+    def _release_text(self, value: str) -> None:
+        """Releases a stored string from the dedup pool, if enabled."""
+        if self._pool is not None:
+            self._pool.release(value)
+
+    def _description(self, task: Task) -> str:
+        """Returns a stored task's description, decompressing if needed."""
+        if self._descriptions is not None:
+            return self._descriptions.get(task.id)
+        return task.description
+
+    def _set_description(self, task: Task, description: str) -> None:
+        """Replaces a stored task's description in the configured representation."""
+        if self._descriptions is not None:
+            self._descriptions.put(task.id, description)
+        else:
+            self._release_text(task.description)
+            task.description = self._store_text(description)
+
+    def _forget(self, task: Task) -> None:
+        """Releases the text held for a task that left the store."""
+        self._release_text(task.title)
+        if self._descriptions is not None:
+            self._descriptions.discard(task.id)
+        else:
+            self._release_text(task.description)
+
+    def _adopt(self, task: Task) -> None:
+        """Converts a new task's text to the configured storage representation."""
+        task.title = self._store_text(task.title)
+        if self._descriptions is not None:
+            self._descriptions.put(task.id, task.description)
+            task.description = ""
+        else:
+            task.description = self._store_text(task.description)
+
+    def _stamp(self, task: Task) -> None:
+        """Gives a changed task the store's next revision."""
+        self._revision += 1
+        task.revision = self._revision
+
+    def _touch(self, task: Task) -> None:
+        """Counts an edit of a task, in its version and its revision."""
+        task.version += 1
+        self._stamp(task)
+
+    def _insert(self, task: Task) -> None:
+        """Stores a validated task in the hot tier and indexes it."""
+        self._adopt(task)
+        self._tasks[task.id] = task
+        self._index(task)
+
+    def _remove(self, task_id: int) -> Task:
+        """Removes a task from the hot tier and returns a detached copy of it."""
+        task = self._tasks.pop(task_id)
+        self._removed += 1
+        self._unindex(task)
+        exported = self._export(task)
+        self._forget(task)
+        return exported
+
+    def _archive(self, task_id: int) -> Task:
+        """Removes a task from the hot tier to archive it, returning a copy."""
+        archived = self._remove(task_id)
+        self._sync.add_record(archived, archived.description, False)
+        return archived
+
+    def _stored_task(self, task_id: int) -> Task | None:
+        """
+        Returns a stored task from either tier without promoting it, so
+        changes can be checked before anything moves.
+        """
+        task = self._tasks.get(task_id)
+        if task is None and self._cold is not None:
+            return self._cold.get(task_id)
+        return task
+
+    def _hot_task(self, task_id: int) -> Task:
+        """
+        Returns a stored task, bringing it back from the cold tier if archived.
+
+        The promotion is only logged with the change that follows, so call
+        this once the change cannot fail.
+
+        Raises:
+            ValueError: If the task is not found in either tier.
+        """
+        task = self._tasks.get(task_id)
+        if task is not None:
+            return task
+        if self._cold is not None:
+            archived = self._cold.get(task_id)
+            if archived is not None:
+                self._cold.delete(task_id)
+                self._sync.discard_record(archived, archived.description, False)
+                self._insert(archived)
+                return self._tasks[task_id]
+        raise ValueError(f"Task with ID {task_id} not found.")
+
+    def _export(self, task: Task) -> Task:
+        """
+        Returns a detached copy of a stored task for callers.
+
+        Every field holds an immutable value, so a shallow copy is enough;
+        the copy starts without the stored task's cached encodings.
+        """
+        exported = copy(task)
+        exported.mark_dirty()
+        if self._descriptions is not None:
+            exported.description = self._descriptions.get(task.id)
+        return exported
+
+    def _index(self, task: Task) -> None:
+        """Adds a task to every maintained index."""
+        for index in self._indexes:
+            index.add(task)
+
+    def _unindex(self, task: Task) -> None:
+        """
+        Removes a task from every maintained index, before it changes.
 
-    def add_task(self, title: str, description: str = "") -> Task:
+        The task's cached encodings are dropped too, as it is about to change.
+        """
+        task.mark_dirty()
+        for index in self._indexes:
+            index.discard(task)
+
+    def _index_many(self, tasks: list[Task]) -> None:
+        """Adds a batch of tasks to every maintained index."""
+        for index in self._indexes:
+            index.add_many(tasks)
+
+    def _unindex_many(self, tasks: list[Task]) -> None:
+        """Removes a batch of tasks from every maintained index, like `_unindex`."""
+        for task in tasks:
+            task.mark_dirty()
+        for index in self._indexes:
+            index.discard_many(tasks)
+
+    @contextmanager
+    def _write(self) -> Iterator[list[dict[str, Any]]]:
+        """
+        Serializes a mutation and logs the records it collects.
+
+        Records are appended while the lock is held, so the log order matches
+        the order changes were applied in; waiting for durability happens
+        after the lock is released, letting concurrent writers share an fsync.
+        """
+        records: list[dict[str, Any]] = []
+        sequence = 0
+        with self._lock:
+            yield records
+            if self._log is not None:
+                now = time.time()
+                for record in records:
+                    record["next_id"] = self._next_id
+                    record["revision"] = self._revision
+                    record["ts"] = now
+                    sequence = self._log.append(record)
+        if sequence and self._log is not None:
+            self._log.wait(sequence)
+
+    def _put_record(self, tasks: Iterable[Task]) -> dict[str, Any]:
+        """Builds a log record holding the full state of stored tasks."""
+        if self._log is None:
+            # Records are only kept by the log, so skip serializing the tasks.
+            return {"op": "put", "tasks": []}
+        return {"op": "put", "tasks": self._task_rows(tasks)}
+
+    def _task_rows(self, tasks: Iterable[Task]) -> list[dict[str, Any]]:
+        """Serializes stored tasks with `Task.to_dict`."""
+        rows = []
+        for task in tasks:
+            row = task.to_dict()
+            if self._descriptions is not None:
+                row["description"] = self._description(task)
+            rows.append(row)
+        return rows
+
+    def _view(self, sort_key: str) -> SortedView:
+        """Returns the sorted view for a sort key."""
+        if sort_key not in self._views:
+            raise ValueError(
+                f"Unknown sort key: {sort_key}. "
+                f"Choose from: {', '.join(self._views)}."
+            )
+        return self._views[sort_key]
+
+    def add_task(
+        self,
+        title: str,
+        description: str = "",
+        due_at: datetime | None = None,
+        priority: int = 0,
+        tags: Iterable[str] = (),
+    ) -> Task:
         """
         Creates and stores a new task.
 
         Args:
             title: The title of the task.
             description: Optional description of the task.
+            due_at: Optional time the task is due.
+            priority: Index into `PRIORITIES`, 0 for none.
+            tags: Tag names; they are lowercased and deduplicated.
 
         Returns:
             The newly created Task object.
 
         Raises:
-            ValueError: If the title or description is invalid.
+            ValueError: If the title, description, priority or tags are invalid.
         """
         is_valid_title, title_err = validate_title(title)
         if not is_valid_title:
@@ -36,39 +420,271 @@ class TaskService:
         if not is_valid_desc:
             raise ValueError(desc_err)
 
-        task = Task(
-            id=self._next_id, title=title.strip(), description=description.strip()
-        )
-        self._tasks[task.id] = task
-        self._next_id += 1
-        return deepcopy(task)
+        is_valid_priority, _, priority_err = validate_priority(priority)
+        if not is_valid_priority:
+            raise ValueError(priority_err)
+
+        is_valid_tags, normalized_tags, tags_err = validate_tags(tags)
+        if not is_valid_tags or normalized_tags is None:
+            raise ValueError(tags_err)
+
+        with self._write() as records:
+            task = Task(
+                id=self._next_id,
+                title=title.strip(),
+                description=description.strip(),
+                created_ns=self._clock(),
+                due_at=due_at,
+                priority=priority,
+                tags=normalized_tags,
+            )
+            self._stamp(task)
+            self._insert(task)
+            self._next_id += 1
+            records.append(self._put_record([task]))
+        return self._export(task)
+
+    def add_tasks(self, entries: Iterable[tuple[str, str]]) -> list[Task]:
+        """
+        Creates and stores several tasks in one batch.
+
+        Every entry is validated before any task is stored, the tasks share a
+        single clock reading, and indexes are updated once for the batch.
+
+        Args:
+            entries: (title, description) pairs.
+
+        Returns:
+            The newly created Task objects, in order.
+
+        Raises:
+            ValueError: If any title or description is invalid.
+        """
+        pairs = [(title, description) for title, description in entries]
+        for title, description in pairs:
+            is_valid_title, title_err = validate_title(title)
+            if not is_valid_title:
+                raise ValueError(title_err)
+            is_valid_desc, desc_err = validate_description(description)
+            if not is_valid_desc:
+                raise ValueError(desc_err)
+
+        with self._write() as records:
+            now = self._clock()
+            tasks = [
+                Task(
+                    id=self._next_id + offset,
+                    title=title.strip(),
+                    description=description.strip(),
+                    created_ns=now,
+                )
+                for offset, (title, description) in enumerate(pairs)
+            ]
+            for task in tasks:
+                self._stamp(task)
+                self._adopt(task)
+                self._tasks[task.id] = task
+            self._index_many(tasks)
+            self._next_id += len(tasks)
+            if tasks:
+                records.append(self._put_record(tasks))
+        return [self._export(task) for task in tasks]
 
     def get_task(self, task_id: int) -> Task | None:
         """
         Retrieves a task by its ID.
 
+        Archived tasks are read from the cold tier without being promoted.
         Returns a copy to prevent external modification of internal storage.
         """
-        task = self._tasks.get(task_id)
-        return deepcopy(task) if task else None
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is not None:
+                return self._export(task)
+            return self._cold.get(task_id) if self._cold is not None else None
 
-    def get_all_tasks(self) -> list[Task]:
+    def get_all_tasks(self, sort_key: str = "id", reverse: bool = False) -> list[Task]:
         """
-        Retrieves all stored tasks, sorted by their ID.
+        Retrieves all stored tasks from a maintained sorted view.
+
+        Args:
+            sort_key: One of "id", "title", "created_at" or "completed".
+            reverse: Whether to return the tasks in descending order.
 
         Returns a list of task copies.
+
+        Raises:
+            ValueError: If the sort key is unknown.
+        """
+        with self._lock:
+            view = self._view(sort_key)
+            return [self._export(self._tasks[task_id]) for task_id in view.ids(reverse)]
+
+    def top_k(self, sort_key: str, k: int, reverse: bool = False) -> list[Task]:
+        """
+        Retrieves the first k tasks of a sorted view without sorting the store.
+
+        For example, the 20 newest tasks are `top_k("created_at", 20, True)`.
+
+        Returns:
+            A list of at most k task copies.
+
+        Raises:
+            ValueError: If the sort key is unknown.
+        """
+        with self._lock:
+            view = self._view(sort_key)
+            return [
+                self._export(self._tasks[task_id]) for task_id in view.top_k(k, reverse)
+            ]
+
+    def next_due(self, k: int = 10) -> list[Task]:
+        """
+        Retrieves the open tasks due soonest, without sorting the store.
+
+        Tasks due at the same time come highest priority first. Completed
+        tasks and tasks without a due date are left out.
+
+        Args:
+            k: Maximum number of tasks to return.
+        """
+        with self._lock:
+            return [self._export(self._tasks[i]) for i in self._due.first(k)]
+
+    def overdue(self, limit: int | None = None) -> list[Task]:
+        """
+        Retrieves the open tasks whose due time has passed, oldest first.
+
+        Args:
+            limit: Maximum number of tasks to return, or None for all.
+        """
+        with self._lock:
+            k = len(self._due) if limit is None else limit
+            task_ids = self._due.first(k, before=self._clock())
+            return [self._export(self._tasks[task_id]) for task_id in task_ids]
+
+    def find_by_title_prefix(self, prefix: str, limit: int = 10) -> list[Task]:
         """
-        tasks = sorted(self._tasks.values(), key=lambda t: t.id)
-        return [deepcopy(task) for task in tasks]
+        Retrieves tasks whose title starts with a prefix, ignoring case.
+
+        Uses the maintained title view, so the cost is a binary search plus
+        the number of returned tasks, regardless of store size.
+
+        Returns:
+            Up to `limit` task copies ordered by title.
+        """
+        prefix = prefix.strip().casefold()
+        if not prefix:
+            return []
+        with self._lock:
+            ids = self._views["title"].prefix_ids(prefix, limit)
+            return [self._export(self._tasks[task_id]) for task_id in ids]
+
+    def search(self, query: str) -> list[Task]:
+        """
+        Retrieves the tasks matching a filter query.
+
+        Example: `status:open created>=2026-10-01 title:~report sort:-created`.
+
+        Returns:
+            A list of task copies in the order requested by the query.
+
+        Raises:
+            ValueError: If the query is malformed.
+        """
+        with self._lock:
+            return [
+                self._export(self._tasks[task_id]) for task_id in self.find_ids(query)
+            ]
+
+    def find_ids(self, query: str) -> list[int]:
+        """
+        Retrieves the IDs of the tasks matching a filter query, without copies.
+
+        Raises:
+            ValueError: If the query is malformed.
+        """
+        with self._lock:
+            return self._planner.execute(self.explain(query))
+
+    def export_tasks(self, path: str | Path, query: str | None = None) -> int:
+        """
+        Writes all tasks, or those matching a query, to a .json or .csv file.
+
+        Each stored task keeps its encoded row until it next changes, so
+        exporting an unchanged store again only joins cached text.
+
+        Returns:
+            The number of tasks written.
+
+        Raises:
+            ValueError: If the format is unknown or the query is malformed.
+            OSError: If the file cannot be written.
+        """
+        key = export_format(path)
+        encode, _ = EXPORT_FORMATS[key]
+
+        def encode_stored(task: Task) -> str:
+            return encode(self._export(task))
+
+        with self._lock:
+            ids = self.find_ids(query) if query else self._views["id"].ids()
+            rows = [self._tasks[task_id].encoded(key, encode_stored) for task_id in ids]
+        return write_export(rows, path)
+
+    def ids_in_ranges(self, ranges: Iterable[tuple[int, int]]) -> list[int]:
+        """
+        Retrieves the IDs of existing tasks within inclusive ID ranges.
+
+        Only stored IDs are visited, so a wide range over a sparse store is cheap.
+
+        Returns:
+            The matching IDs in ascending order, without duplicates.
+        """
+        view = self._views["id"]
+        found: set[int] = set()
+        with self._lock:
+            for start, end in ranges:
+                found.update(view.range_ids(start, end + 1))
+        return sorted(found)
+
+    def explain(self, query: str) -> QueryPlan:
+        """
+        Plans a filter query without running it.
+
+        Returns:
+            The chosen plan, including the index used and the estimated rows.
+
+        Raises:
+            ValueError: If the query is malformed.
+        """
+        parsed = parse_query(query)
+        with self._lock:
+            return self._planner.plan(parsed)
 
     def update_task(
         self,
         task_id: int,
         title: str | None = None,
         description: str | None = None,
+        due_at: datetime | None = None,
+        priority: int | None = None,
+        clear_due: bool = False,
+        tags: Iterable[str] | None = None,
     ) -> Task:
         """
-        Updates an existing task's title and/or description.
+        Updates an existing task's fields; those left as None are kept.
+
+        Archived tasks are brought back to the hot tier.
+
+        Args:
+            task_id: The task to update.
+            title: New title.
+            description: New description.
+            due_at: New due time.
+            priority: New priority, an index into `PRIORITIES`.
+            clear_due: Remove the due time instead.
+            tags: Tags replacing the current ones; empty removes them all.
 
         Returns:
             The updated Task object.
@@ -76,24 +692,48 @@ class TaskService:
         Raises:
             ValueError: If the task is not found or new data is invalid.
         """
-        if task_id not in self._tasks:
-            raise ValueError(f"Task with ID {task_id} not found.")
-
-        task = self._tasks[task_id]
-
         if title is not None:
             is_valid_title, title_err = validate_title(title)
             if not is_valid_title:
                 raise ValueError(title_err)
-            task.title = title.strip()
 
         if description is not None:
             is_valid_desc, desc_err = validate_description(description)
             if not is_valid_desc:
                 raise ValueError(desc_err)
-            task.description = description.strip()
 
-        return deepcopy(task)
+        if priority is not None:
+            is_valid_priority, _, priority_err = validate_priority(priority)
+            if not is_valid_priority:
+                raise ValueError(priority_err)
+
+        normalized_tags = None
+        if tags is not None:
+            is_valid_tags, normalized_tags, tags_err = validate_tags(tags)
+            if not is_valid_tags:
+                raise ValueError(tags_err)
+
+        with self._write() as records:
+            task = self._hot_task(task_id)
+            self._unindex(task)
+            if title is not None:
+                self._release_text(task.title)
+                task.title = self._store_text(title.strip())
+            if description is not None:
+                self._set_description(task, description.strip())
+            if clear_due:
+                task.due_ns = None
+            elif due_at is not None:
+                task.due_ns = to_ns(due_at)
+            if priority is not None:
+                task.priority = priority
+            if normalized_tags is not None:
+                task.tags = tuple(map(sys.intern, normalized_tags))
+            self._touch(task)
+            self._index(task)
+            records.append(self._put_record([task]))
+
+        return self._export(task)
 
     def delete_task(self, task_id: int) -> bool:
         """
@@ -102,24 +742,1198 @@ class TaskService:
         Returns:
             True if the task was deleted, False if it was not found.
         """
-        if task_id in self._tasks:
-            del self._tasks[task_id]
-            return True
-        return False
+        return bool(self.delete_tasks([task_id]))
+
+    def delete_tasks(self, task_ids: Iterable[int]) -> list[int]:
+        """
+        Deletes several tasks in one batch.
+
+        Returns:
+            The IDs that were deleted; unknown IDs are skipped.
+        """
+        with self._write() as records:
+            deleted, archived = self._delete(task_ids)
+            if deleted:
+                records.append(self._delete_record(deleted, archived))
+        return deleted
+
+    def delete_where(self, query: str) -> list[int]:
+        """
+        Deletes every task matching a filter query in one batch.
+
+        Returns:
+            The IDs that were deleted.
+
+        Raises:
+            ValueError: If the query is malformed.
+        """
+        with self._write() as records:
+            deleted, archived = self._delete(self.find_ids(query))
+            if deleted:
+                records.append(self._delete_record(deleted, archived))
+        return deleted
+
+    def purge_completed(self) -> list[int]:
+        """
+        Deletes every completed task in the hot tier in one batch.
+
+        Archived tasks are left in the cold tier.
+
+        Returns:
+            The IDs that were deleted.
+        """
+        return self.delete_where("status:done")
+
+    def _delete_record(
+        self, deleted: list[int], archived: list[dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Builds a log record for a deletion, with the archived tasks' rows."""
+        record: dict[str, Any] = {"op": "delete", "ids": deleted}
+        if archived and self._log is not None:
+            record["archived"] = archived
+        return record
+
+    def _delete(
+        self, task_ids: Iterable[int], logged: Iterable[dict[str, Any]] = ()
+    ) -> tuple[list[int], list[dict[str, Any]]]:
+        """
+        Deletes tasks from both tiers.
+
+        Hot tasks are soft-deleted: they leave the indexes at once but are kept
+        as tombstones, which can be undeleted until `compact` reclaims them.
+        Archived tasks are deleted from the cold tier and kept as tombstones
+        too. The cold file is already without them when the log is replayed,
+        so their rows are logged with the deletion and passed back as
+        `logged`.
+
+        Returns:
+            The IDs that existed, and the rows of the archived tasks among them.
+        """
+        unique_ids = list(dict.fromkeys(task_ids))
+        tasks = [
+            self._tasks.pop(task_id) for task_id in unique_ids if task_id in self._tasks
+        ]
+        self._unindex_many(tasks)
+        self._removed += len(tasks)
+        hot = {task.id for task in tasks}
+        rows = {row["id"]: row for row in logged}
+        archived_rows = []
+        for task_id in unique_ids:
+            if task_id in hot or task_id in self._tombstones:
+                continue
+            archived = self._cold.get(task_id) if self._cold is not None else None
+            if archived is not None and self._cold is not None:
+                self._cold.delete(task_id)
+                self._sync.discard_record(archived, archived.description, False)
+            elif task_id in rows:
+                archived = Task.from_dict(rows[task_id])
+            else:
+                continue
+            archived_rows.append(archived.to_dict())
+            self._adopt(archived)
+            tasks.append(archived)
+        now = self._clock()
+        for task in tasks:
+            self._touch(task)
+            self._tombstones[task.id] = (now, task)
+            self._sync.add_record(task, self._description(task), True)
+            self._revisions.add(task)
+        return [task.id for task in tasks], archived_rows
+
+    def undelete_task(self, task_id: int) -> Task:
+        """
+        Restores a deleted task that has not been compacted away yet.
+
+        Returns:
+            The restored Task object.
+
+        Raises:
+            ValueError: If there is no tombstone for the ID.
+        """
+        with self._write() as records:
+            task = self._undelete(task_id)
+            if task is None:
+                raise ValueError(f"No deleted task with ID {task_id} to restore.")
+            records.append({"op": "undelete", "ids": [task_id]})
+        return self._export(task)
+
+    def _undelete(self, task_id: int) -> Task | None:
+        """Moves a tombstone back into the hot tier, returning its task."""
+        entry = self._tombstones.pop(task_id, None)
+        if entry is None:
+            return None
+        _, task = entry
+        self._sync.discard_record(task, self._description(task), True)
+        self._touch(task)
+        self._tasks[task_id] = task
+        self._index(task)
+        return task
+
+    def _reclaim(self, task_id: int) -> None:
+        """Drops a tombstone for good."""
+        _, task = self._tombstones.pop(task_id)
+        self._sync.discard_record(task, self._description(task), True)
+        self._forget(task)
+        self._dependencies.forget(task_id)
+        self._revisions.forget(task_id)
+
+    def deleted_count(self) -> int:
+        """Returns the number of deleted tasks that can still be undeleted."""
+        return len(self._tombstones)
+
+    def compact(self, older_than: timedelta | None = None) -> int:
+        """
+        Reclaims tombstones and shrinks the task dict after heavy churn.
+
+        Python dicts keep their table size as entries are removed, so once a
+        quarter of the hot tier has been removed since the last rebuild, the
+        task dict is rebuilt at its current size. The reclaimed IDs are
+        logged, so replays and followers drop the same tombstones.
+
+        Args:
+            older_than: Only reclaim tasks deleted at least this long ago, so
+                recent deletes can still be undone; None reclaims them all.
+
+        Returns:
+            The number of tombstones reclaimed.
+        """
+        with self._write() as records:
+            cutoff = None
+            if older_than is not None:
+                cutoff = self._clock() - older_than // timedelta(microseconds=1) * 1000
+            expired = [
+                task_id
+                for task_id, (deleted_ns, _) in self._tombstones.items()
+                if cutoff is None or deleted_ns <= cutoff
+            ]
+            for task_id in expired:
+                self._reclaim(task_id)
+            if expired:
+                self._tombstones = dict(self._tombstones.items())
+                records.append({"op": "compact", "ids": expired})
+            if self._removed and self._removed * 4 >= len(self._tasks):
+                # Insert one by one into a fresh dict so it is sized for the
+                # live entries, then refill in place: indexes hold a reference.
+                live = dict(self._tasks.items())
+                self._tasks.clear()
+                self._tasks.update(live)
+                self._removed = 0
+        return len(expired)
+
+    def toggle_tasks(self, task_ids: Iterable[int]) -> list[int]:
+        """
+        Toggles the completion status of several tasks in one batch.
+
+        Returns:
+            The IDs that were toggled; unknown IDs are skipped.
+        """
+        with self._write() as records:
+            tasks: list[Task] = []
+            for task_id in dict.fromkeys(task_ids):
+                try:
+                    tasks.append(self._hot_task(task_id))
+                except ValueError:
+                    continue
+            self._unindex_many(tasks)
+            now = self._clock()
+            for task in tasks:
+                task.completed = not task.completed
+                task.completed_ns = now if task.completed else None
+                self._touch(task)
+            self._index_many(tasks)
+            if tasks:
+                records.append(self._put_record(tasks))
+        return [task.id for task in tasks]
 
     def toggle_status(self, task_id: int) -> Task:
         """
         Toggles the completion status of a task.
 
+        Archived tasks are brought back to the hot tier.
+
         Returns:
             The updated Task object.
 
         Raises:
             ValueError: If the task is not found.
         """
-        if task_id not in self._tasks:
-            raise ValueError(f"Task with ID {task_id} not found.")
+        with self._write() as records:
+            task = self._hot_task(task_id)
+            self._unindex(task)
+            task.completed = not task.completed
+            task.completed_ns = self._clock() if task.completed else None
+            self._touch(task)
+            self._index(task)
+            records.append(self._put_record([task]))
+        return self._export(task)
+
+    def tag_tasks(
+        self,
+        task_ids: Iterable[int],
+        add: Iterable[str] = (),
+        remove: Iterable[str] = (),
+    ) -> list[int]:
+        """
+        Adds and removes tags on several tasks in one batch.
+
+        Archived tasks are brought back to the hot tier.
+
+        Args:
+            task_ids: The tasks to change.
+            add: Tags to add to each task.
+            remove: Tags to remove from each task.
+
+        Returns:
+            The IDs whose tags changed; unknown IDs are skipped.
+
+        Raises:
+            ValueError: If a tag is invalid or a task would exceed the limit.
+        """
+        is_valid_add, added, add_err = validate_tags(add)
+        if not is_valid_add or added is None:
+            raise ValueError(add_err)
+        is_valid_remove, removed, remove_err = validate_tags(remove)
+        if not is_valid_remove or removed is None:
+            raise ValueError(remove_err)
+
+        with self._write() as records:
+            planned: list[tuple[int, tuple[str, ...]]] = []
+            for task_id in dict.fromkeys(task_ids):
+                stored = self._stored_task(task_id)
+                if stored is None:
+                    continue
+                tags = set(stored.tags).union(added).difference(removed)
+                new_tags = tuple(sorted(tags))
+                if new_tags != stored.tags:
+                    # Checked for every task before any archived one is
+                    # promoted, so a failure changes nothing.
+                    is_valid, _, err = validate_tags(new_tags)
+                    if not is_valid:
+                        raise ValueError(err)
+                    planned.append((task_id, new_tags))
+            changes = [(self._hot_task(i), new_tags) for i, new_tags in planned]
+            tasks = [task for task, _ in changes]
+            self._unindex_many(tasks)
+            for task, new_tags in changes:
+                task.tags = tuple(map(sys.intern, new_tags))
+                self._touch(task)
+            self._index_many(tasks)
+            if tasks:
+                records.append(self._put_record(tasks))
+        return [task.id for task in tasks]
+
+    def tag_counts(self) -> dict[str, int]:
+        """Returns the number of tasks in the hot tier carrying each tag."""
+        with self._lock:
+            return self._tags.counts()
+
+    def add_dependency(self, task_id: int, blocker_id: int) -> Task:
+        """
+        Makes a task wait on another until that one is completed.
+
+        Archived tasks are brought back to the hot tier. The check for a
+        cycle only searches the tasks the new dependency reorders.
+
+        Returns:
+            The updated Task object.
+
+        Raises:
+            ValueError: If either task is not found, or the dependency would
+                form a cycle.
+        """
+        with self._write() as records:
+            if self._stored_task(blocker_id) is None:
+                raise ValueError(f"Task with ID {blocker_id} not found.")
+            task = self._stored_task(task_id)
+            if task is None:
+                raise ValueError(f"Task with ID {task_id} not found.")
+            if blocker_id not in task.blocked_by:
+                # Checked before an archived task is promoted, which is only
+                # logged with the change.
+                self._dependencies.make_room(blocker_id, task_id)
+                task = self._hot_task(task_id)
+                self._unindex(task)
+                task.blocked_by = tuple(sorted((*task.blocked_by, blocker_id)))
+                self._touch(task)
+                self._index(task)
+                records.append(self._put_record([task]))
+        return self._export(task)
+
+    def remove_dependency(self, task_id: int, blocker_id: int) -> Task:
+        """
+        Stops a task waiting on another.
+
+        Returns:
+            The updated Task object.
+
+        Raises:
+            ValueError: If the task is not found or does not wait on the other.
+        """
+        with self._write() as records:
+            stored = self._stored_task(task_id)
+            if stored is None:
+                raise ValueError(f"Task with ID {task_id} not found.")
+            if blocker_id not in stored.blocked_by:
+                raise ValueError(f"Task {task_id} does not wait on task {blocker_id}.")
+            task = self._hot_task(task_id)
+            self._unindex(task)
+            task.blocked_by = tuple(b for b in task.blocked_by if b != blocker_id)
+            self._touch(task)
+            self._index(task)
+            records.append(self._put_record([task]))
+        return self._export(task)
+
+    def ready_tasks(self, limit: int | None = None) -> list[Task]:
+        """
+        Retrieves the open tasks that wait on no open task, by ID.
+
+        The set is kept up to date as tasks change, so the cost depends on
+        the number of tasks returned.
+
+        Args:
+            limit: Maximum number of tasks to return; None returns them all.
+        """
+        with self._lock:
+            task_ids = islice(self._dependencies.ready.values(), limit)
+            return [self._export(self._tasks[task_id]) for task_id in task_ids]
+
+    def dependency_order(self) -> list[Task]:
+        """
+        Retrieves the open tasks that wait on or block others, each after
+        the tasks it waits on.
+
+        The order is maintained as dependencies are added, so listing it
+        does not sort the graph again.
+        """
+        with self._lock:
+            graph = self._dependencies
+            return [
+                self._export(self._tasks[task_id])
+                for task_id in graph.order()
+                if graph.is_open(task_id)
+            ]
+
+    def stats(self, days: int = 14) -> TaskStats:
+        """
+        Summarizes the store from counts maintained on every change.
+
+        The cost depends on the number of days requested, not on the number
+        of tasks stored.
+
+        Args:
+            days: Length of the per-day histograms, ending today.
+
+        Raises:
+            ValueError: If days is below 1.
+        """
+        if days < 1:
+            raise ValueError("The histogram must cover at least one day.")
+        with self._lock:
+            today = from_ns(self._clock()).date()
+            created, completed = self._activity.histograms(today, days)
+            open_count = len(self._status.open_ids)
+            completed_count = len(self._status.completed_ids)
+            return TaskStats(
+                total=open_count + completed_count,
+                open=open_count,
+                completed=completed_count,
+                archived=self.archived_count(),
+                deleted=len(self._tombstones),
+                created_per_day=created,
+                completed_per_day=completed,
+                autosave=replace(self._save_stats, pending=len(self._changes)),
+            )
+
+    def memory_report(self) -> MemoryReport:
+        """
+        Estimates the memory held by the store, by task field and by structure.
+
+        Sizes come from `sys.getsizeof`, counting each shared object once. When
+        tracemalloc is tracing, its current and peak totals are included too.
+        """
+        structures: dict[str, object] = {
+            "task dict": self._tasks,
+            "tombstones": self._tombstones,
+            "sorted views": self._views,
+            "status index": self._status,
+            "activity index": self._activity,
+            "tag index": self._tags,
+            "dependency index": self._dependencies,
+            "revision log": self._revisions,
+            "text index": self._text,
+        }
+        if self._descriptions is not None:
+            structures["compressed descriptions"] = self._descriptions
+        if self._cold is not None:
+            structures["cold tier index"] = self._cold
+        with self._lock:
+            return build_memory_report(self._tasks.values(), structures, self._pool)
+
+    def compression_stats(self) -> CompressionStats | None:
+        """
+        Reports description compression and cache hit rates.
+
+        Returns:
+            The statistics, or None if descriptions are not compressed.
+        """
+        return self._descriptions.stats() if self._descriptions is not None else None
+
+    def cold_cache_stats(self) -> CacheStats | None:
+        """
+        Reports how well the cache in front of the cold tier serves reads.
+
+        Returns:
+            The statistics, or None if the cold tier is not cached.
+        """
+        if not isinstance(self._cold, CachedStore):
+            return None
+        with self._lock:
+            return self._cold.stats()
+
+    def save_snapshot(self, path: str | Path) -> int:
+        """
+        Writes the hot tier to a checksummed binary snapshot.
+
+        The sorted view orders are stored alongside the tasks so that loading
+        does not have to sort again. Archived tasks stay in the cold tier.
+
+        Returns:
+            The size of the snapshot in bytes.
+        """
+        with self._lock:
+            snapshot = self._snapshot()
+        return write_snapshot(path, snapshot)
+
+    def _snapshot(self) -> Snapshot:
+        """Captures the hot tier and the sorted view orders."""
+        tasks = [self._tasks[task_id] for task_id in self._views["id"].ids()]
+        orders = {
+            name: list(view.ids())
+            for name, view in self._views.items()
+            if SORT_KEYS[name] is not None
+        }
+        return Snapshot.from_tasks(
+            tasks, self._next_id, self._description, orders, self._revision
+        )
+
+    def save_changes(self, path: str | Path, full_ratio: float = 0.5) -> SaveReport:
+        """
+        Saves what changed since the last save, as a snapshot plus a delta.
+
+        Changed tasks are appended to `<path>.delta` as mutation log records.
+        A full snapshot is written instead, starting a new delta, on the first
+        save, after a snapshot load, when at least `full_ratio` of the hot
+        tier changed, or once the delta outgrows the snapshot and reloading
+        the snapshot is cheaper than replaying the delta.
+
+        Returns:
+            What was written and how long it took.
+
+        Raises:
+            OSError: If writing fails; the changes stay pending.
+        """
+        path = Path(path)
+        delta_path = autosave_delta_path(path)
+        start = time.perf_counter()
+        with self._save_lock:
+            with self._lock:
+                changed, full = self._changes.take()
+                if not changed and not full:
+                    return SaveReport(full=False, tasks=0, bytes_written=0, seconds=0.0)
+                base = snapshot_digest(path)
+                delta_size = delta_path.stat().st_size if delta_path.exists() else 0
+                full = (
+                    full
+                    or base is None
+                    or len(changed) >= full_ratio * len(self._tasks)
+                    or delta_size > path.stat().st_size
+                )
+                if full:
+                    snapshot = self._snapshot()
+                else:
+                    records = self._change_records(changed)
+            try:
+                if full:
+                    written = write_snapshot(path, snapshot)
+                    base = snapshot_digest(path)
+                    if base is None:
+                        raise OSError(f"{path} could not be read back.")
+                    records = [{"op": "base", "snapshot": base.hex()}]
+                    written += write_records(delta_path, records, replace=True)
+                else:
+                    written = write_records(delta_path, records)
+            except OSError:
+                with self._lock:
+                    self._changes.restore(changed, full)
+                raise
+            report = SaveReport(
+                full=full,
+                tasks=len(changed),
+                bytes_written=written,
+                seconds=time.perf_counter() - start,
+            )
+            previous = self._save_stats
+            self._save_stats = replace(
+                previous,
+                saves=previous.saves + 1,
+                full_saves=previous.full_saves + full,
+                bytes_written=previous.bytes_written + written,
+                last_seconds=report.seconds,
+                max_seconds=max(previous.max_seconds, report.seconds),
+            )
+        return report
+
+    def unsaved_changes(self) -> tuple[float, float] | None:
+        """
+        Returns when the first and latest unsaved changes happened.
+
+        Returns:
+            `time.monotonic()` readings, or None if everything is saved.
+        """
+        with self._lock:
+            if not self._changes.pending:
+                return None
+            return self._changes.first_change, self._changes.last_change
+
+    def _change_records(self, task_ids: set[int]) -> list[dict[str, Any]]:
+        """Builds delta records bringing saved tasks up to date."""
+        ordered = sorted(task_ids)
+        hot = [self._tasks[task_id] for task_id in ordered if task_id in self._tasks]
+        gone = [task_id for task_id in ordered if task_id not in self._tasks]
+        archived = []
+        if self._cold is not None:
+            archived = [task_id for task_id in gone if task_id in self._cold]
+        deleted = sorted(set(gone) - set(archived))
+        records: list[dict[str, Any]] = []
+        if hot:
+            records.append({"op": "put", "tasks": self._task_rows(hot)})
+        if archived:
+            records.append({"op": "archive", "ids": archived})
+        if deleted:
+            records.append({"op": "delete", "ids": deleted})
+        for record in records:
+            record["next_id"] = self._next_id
+            record["revision"] = self._revision
+        return records
+
+    def load_autosave(self, path: str | Path) -> int:
+        """
+        Restores the store saved by `save_changes`: the snapshot, then the delta.
+
+        A delta left over from an older snapshot, e.g. by a crash in the middle
+        of a full save, is ignored. The load is not written to the mutation log.
+
+        Returns:
+            The number of tasks in the hot tier afterwards.
+
+        Raises:
+            ValueError: If the snapshot or the delta is corrupt.
+        """
+        path = Path(path)
+        delta_path = autosave_delta_path(path)
+        with self._lock:
+            self._load_snapshot(path, validate=False)
+            if delta_path.exists():
+                records = read_log(delta_path)
+                base = next(records, None)
+                digest = snapshot_digest(path)
+                if base is not None and digest is not None:
+                    if base.get("snapshot") == digest.hex():
+                        for record in records:
+                            self.apply_record(record)
+            self._changes.take()
+            return len(self._tasks)
+
+    def load_snapshot(self, path: str | Path, validate: bool = False) -> int:
+        """
+        Replaces the hot tier with the tasks of a snapshot.
+
+        Snapshots are verified by checksum, so by default tasks are rebuilt
+        without re-running validation, the sorted views are restored in their
+        saved order, and the text indexes are rebuilt on first search.
+
+        Args:
+            path: Snapshot written by `save_snapshot`.
+            validate: Validate every task and re-sort the views instead of
+                trusting the snapshot contents.
+
+        Returns:
+            The number of tasks loaded.
+
+        Raises:
+            ValueError: If the file is not a valid snapshot.
+        """
+        with self._write() as records:
+            digest = snapshot_digest(path)
+            count = self._load_snapshot(path, validate)
+            records.append(
+                {
+                    "op": "load_snapshot",
+                    "path": str(Path(path).resolve()),
+                    "snapshot": digest.hex() if digest is not None else None,
+                }
+            )
+        return count
+
+    def _load_snapshot(
+        self, path: str | Path, validate: bool, digest: bytes | None = None
+    ) -> int:
+        """
+        Replaces the hot tier with a snapshot, returning the task count.
+
+        Raises:
+            ValueError: If a digest is given and the snapshot does not match it,
+                e.g. because the file was rewritten after the load was logged.
+        """
+        if digest is not None and snapshot_digest(path) != digest:
+            raise ValueError(
+                f"{path} is not the snapshot that was loaded when this was logged."
+            )
+        snapshot = read_snapshot(path)
+        tasks = snapshot.to_tasks(validate)
+
+        # Indexes rebuilt lazily are dropped first, so they skip the removals.
+        self._sync.invalidate()
+        # Deletions before the snapshot was saved are not in it.
+        self._revision = max(self._revision, snapshot.revision)
+        self._revisions.invalidate(self._revision)
+        for index in self._text.values():
+            index.invalidate()
+        current = list(self._tasks.values())
+        self._unindex_many(current)
+        for task in current:
+            self._forget(task)
+        for _, task in self._tombstones.values():
+            self._forget(task)
+        self._tasks.clear()
+        self._tombstones.clear()
+        self._removed = 0
+
+        if self._pool is not None or self._descriptions is not None:
+            for task in tasks:
+                self._adopt(task)
+        self._tasks.update(zip(snapshot.ids, tasks, strict=True))
+        for name, view in self._views.items():
+            order = snapshot.view_orders.get(name, snapshot.ids)
+            if validate or len(order) != len(tasks):
+                view.add_many(tasks)
+            else:
+                view.restore(order, self._tasks)
+        self._status.add_many(tasks)
+        self._activity.add_many(tasks)
+        self._due.add_many(tasks)
+        self._tags.add_many(tasks)
+        self._dependencies.clear()
+        self._dependencies.add_many(tasks)
+        self._changes.require_full()
+
+        self._next_id = self._id_base + 1
+        self._advance_next_id(snapshot.next_id)
+        if self._cold is not None:
+            self._advance_next_id(self._cold.max_id(self._id_limit) + 1)
+        return len(tasks)
+
+    def _revision_source(self) -> Iterator[Task]:
+        """Yields every task the revision log covers: stored, deleted and archived."""
+        yield from self._tasks.values()
+        for _, task in self._tombstones.values():
+            yield task
+        if self._cold is not None:
+            yield from self._cold.tasks()
+
+    def backup(self, path: str | Path, since: int = 0) -> BackupReport:
+        """
+        Writes the tasks changed or deleted after a revision to a backup file.
+
+        A full backup, from revision 0, holds every stored and archived task.
+        An incremental one holds the tasks changed after the revision the
+        previous backup reported, found in the revision log without scanning
+        the store, and the IDs deleted since. A full backup lets the log drop
+        tasks compacted away before it, so later incrementals must chain from
+        it rather than from an older backup.
+
+        Args:
+            path: The backup file, replaced atomically.
+            since: Revision reported by the previous backup; 0 for a full one.
+
+        Returns:
+            What was written, including the revision to pass as `since` next.
+
+        Raises:
+            ValueError: If the revision is ahead of the store, or changes after
+                it are no longer known because a snapshot was loaded or a full
+                backup was made since.
+        """
+        with self._lock:
+            if not 0 <= since <= self._revision:
+                raise ValueError(
+                    f"Revision {since} is outside the store's 0-{self._revision}."
+                )
+            rows: list[dict[str, Any]] = []
+            deleted: list[int] = []
+            if since == 0:
+                rows = self._task_rows(self._tasks.values())
+                if self._cold is not None:
+                    rows.extend(task.to_dict() for task in self._cold.tasks())
+                self._revisions.prune(self._revision)
+            else:
+                for task_id in self._revisions.changed_since(since):
+                    task = self._tasks.get(task_id)
+                    if task is not None:
+                        rows.extend(self._task_rows([task]))
+                    elif self._cold is not None and task_id in self._cold:
+                        archived = self._cold.get(task_id)
+                        if archived is not None:
+                            rows.append(archived.to_dict())
+                    else:
+                        deleted.append(task_id)
+            header = {
+                "since": since,
+                "revision": self._revision,
+                "next_id": self._next_id,
+            }
+        written = write_backup(path, header, rows, deleted)
+        return BackupReport(since, header["revision"], len(rows), len(deleted), written)
+
+    def restore_backups(self, paths: Iterable[str | Path]) -> int:
+        """
+        Restores a full backup followed by the incremental backups after it.
+
+        The whole chain is checked before anything is applied. Archived tasks
+        are restored to the hot tier. The records applied are written to the
+        mutation log.
+
+        Args:
+            paths: Backup files in the order they were made, full one first.
+
+        Returns:
+            The number of tasks in the hot tier afterwards.
+
+        Raises:
+            ValueError: If a file is not a complete backup, the chain has a
+                gap, or the store is not empty.
+        """
+        backups = [read_backup(path) for path in paths]
+        check_chain([header for header, _ in backups])
+        with self._write() as records:
+            if self._tasks or self._tombstones or self.archived_count():
+                raise ValueError("Backups can only be restored into an empty store.")
+            for header, body in backups:
+                try:
+                    # Deletions replayed below are stamped after the backup.
+                    self._revision = max(self._revision, int(header["revision"]))
+                    for record in body:
+                        self._apply(record)
+                        records.append(record)
+                    self._advance_next_id(int(header["next_id"]))
+                except (KeyError, TypeError, AttributeError) as e:
+                    raise ValueError(f"Invalid backup record: {e}") from e
+            return len(self._tasks)
+
+    def archive_completed(self, older_than: timedelta | None = None) -> int:
+        """
+        Moves tasks completed longer ago than a threshold to the cold tier.
+
+        Args:
+            older_than: Minimum time since completion; defaults to the
+                service's `archive_after` setting.
+
+        Returns:
+            The number of tasks archived.
+
+        Raises:
+            ValueError: If no cold tier or threshold is configured.
+        """
+        if self._cold is None:
+            raise ValueError("No cold storage is configured.")
+        threshold = older_than if older_than is not None else self._archive_after
+        if threshold is None:
+            raise ValueError("No archive threshold is configured.")
+
+        cutoff = self._clock() - threshold // timedelta(microseconds=1) * 1000
+        with self._write() as records:
+            task_ids = [
+                task_id
+                for task_id in self._status.ids(completed=True)
+                if (completed_ns := self._tasks[task_id].completed_ns) is None
+                or completed_ns <= cutoff
+            ]
+            task_ids.sort()
+            for task_id in task_ids:
+                self._cold.put(self._archive(task_id))
+            if task_ids:
+                # Archiving only moves tasks, the cold store persists them itself.
+                records.append({"op": "archive", "ids": task_ids})
+        return len(task_ids)
+
+    def get_archived_tasks(self) -> list[Task]:
+        """Retrieves every task in the cold tier, sorted by ID."""
+        if self._cold is None:
+            return []
+        with self._lock:
+            return list(self._cold.tasks())
+
+    def archived_count(self) -> int:
+        """Returns the number of tasks in the cold tier."""
+        return len(self._cold) if self._cold is not None else 0
+
+    def _sync_source(self) -> Iterator[SyncRecord]:
+        """Yields every record sync covers: stored, deleted and archived."""
+        for task in self._tasks.values():
+            yield task, self._description(task), False
+        for _, task in self._tombstones.values():
+            yield task, self._description(task), True
+        if self._cold is not None:
+            for task in self._cold.tasks():
+                yield task, task.description, False
+
+    def _sync_record(self, task_id: int) -> SyncRecord | None:
+        """Returns the record sync holds for a task ID, if any."""
+        task = self._tasks.get(task_id)
+        if task is not None:
+            return task, self._description(task), False
+        entry = self._tombstones.get(task_id)
+        if entry is not None:
+            return entry[1], self._description(entry[1]), True
+        if self._cold is not None and task_id in self._cold:
+            archived = self._cold.get(task_id)
+            if archived is not None:
+                return archived, archived.description, False
+        return None
+
+    def sync_hashes(
+        self, level: int, parents: list[int] | None = None
+    ) -> dict[int, int]:
+        """
+        Returns the hashes of task ID ranges, for comparing with another store.
+
+        Args:
+            level: From `TOP_LEVEL` down to 0 for leaf ranges, or
+                `RECORD_LEVEL` for the digests of single tasks by ID.
+            parents: Only return ranges within these ranges of the level
+                above; None returns the whole level.
+
+        Raises:
+            ValueError: If the level does not exist, or parents are missing
+                for the record level.
+        """
+        with self._lock:
+            if level != RECORD_LEVEL:
+                return self._sync.hashes(level, parents)
+            if parents is None:
+                raise ValueError("Record digests are only returned by leaf range.")
+            digests = {}
+            for key in parents:
+                for task_id in leaf_range(key):
+                    record = self._sync_record(task_id)
+                    if record is not None:
+                        digests[task_id] = record_digest(*record)
+            return digests
+
+    def sync_records(self, task_ids: list[int]) -> list[dict[str, Any]]:
+        """
+        Serializes tasks for another store to merge, deleted ones included.
+
+        Unknown IDs are skipped.
+        """
+        rows = []
+        with self._lock:
+            for task_id in task_ids:
+                record = self._sync_record(task_id)
+                if record is None:
+                    continue
+                task, description, deleted = record
+                row = task.to_dict()
+                # Revisions only mean something within one store.
+                del row["revision"]
+                row["description"] = description
+                row["deleted"] = deleted
+                rows.append(row)
+        return rows
+
+    def sync_merge(self, rows: list[dict[str, Any]]) -> list[int]:
+        """
+        Merges tasks serialized by another store's `sync_records`.
+
+        Of two records with the same ID, the one with the higher version
+        wins; between equal versions, the higher digest wins. Both stores
+        therefore keep the same record whichever side merges first.
+
+        Returns:
+            The IDs whose incoming record was taken.
+
+        Raises:
+            ValueError: If a row is not a valid task.
+        """
+        incoming = parse_sync_rows(rows)
+        with self._write() as records:
+            taken = self._merge(incoming)
+            if taken:
+                chosen = set(taken)
+                kept = [row for row in rows if int(row["id"]) in chosen]
+                records.append({"op": "merge", "tasks": kept})
+        return taken
+
+    def _merge(self, incoming: list[tuple[Task, bool]]) -> list[int]:
+        """Applies the winning records of a merge, returning their IDs."""
+        taken = []
+        for task, deleted in incoming:
+            current = self._sync_record(task.id)
+            if current is not None:
+                current_key = (current[0].version, record_digest(*current))
+                new_key = (task.version, record_digest(task, task.description, deleted))
+                if new_key <= current_key:
+                    continue
+            if task.id in self._tasks:
+                self._remove(task.id)
+            elif task.id in self._tombstones:
+                self._reclaim(task.id)
+            elif current is not None and self._cold is not None:
+                self._cold.delete(task.id)
+                self._sync.discard_record(*current)
+            self._stamp(task)
+            if deleted:
+                self._adopt(task)
+                self._tombstones[task.id] = (self._clock(), task)
+                self._sync.add_record(task, self._description(task), True)
+                self._revisions.add(task)
+            else:
+                self._insert(task)
+            self._advance_next_id(task.id + 1)
+            taken.append(task.id)
+        linked = [i for i in taken if i in self._tasks and self._tasks[i].blocked_by]
+        if linked:
+            self._break_cycles(linked)
+        return taken
+
+    def _break_cycles(self, task_ids: list[int]) -> None:
+        """
+        Drops dependencies until merged tasks no longer wait on each other.
+
+        Each store only adds dependencies that keep its graph acyclic, but
+        two stores can add opposite ones that meet in a merge. In each cycle
+        the record with the lowest version and digest stops waiting on its
+        lowest blocker in the cycle and gets a new version, so every store
+        holding the same records drops the same dependency, and the edited
+        record wins the next sync.
+        """
+
+        def blockers(task_id: int) -> tuple[int, ...]:
+            record = self._sync_record(task_id)
+            return () if record is None or record[2] else record[0].blocked_by
+
+        pending = cycles(task_ids, blockers)
+        while pending:
+            component = pending.pop()
+            members = set(component)
+            records: dict[int, SyncRecord] = {}
+            for task_id in component:
+                record = self._sync_record(task_id)
+                if record is not None:
+                    records[task_id] = record
+            loser = min(
+                records,
+                key=lambda i: (records[i][0].version, record_digest(*records[i])),
+            )
+            task = records[loser][0]
+            self._drop_blocker(loser, min(members.intersection(task.blocked_by)))
+            # Edges the graph left out while the cycle stood go back in.
+            hot = [self._tasks[i] for i in component if i in self._tasks]
+            self._unindex_many(hot)
+            self._index_many(hot)
+            pending.extend(
+                cycles(component, lambda i: members.intersection(blockers(i)))
+            )
+
+    def _drop_blocker(self, task_id: int, blocker_id: int) -> None:
+        """Stops a live task in either tier waiting on another, as an edit."""
+        task = self._tasks.get(task_id)
+        if task is not None:
+            self._unindex(task)
+            task.blocked_by = tuple(b for b in task.blocked_by if b != blocker_id)
+            self._touch(task)
+            self._index(task)
+            return
+        archived = self._cold.get(task_id) if self._cold is not None else None
+        if archived is None or self._cold is None:
+            return
+        self._sync.discard_record(archived, archived.description, False)
+        archived.blocked_by = tuple(b for b in archived.blocked_by if b != blocker_id)
+        self._touch(archived)
+        self._cold.put(archived)
+        self._sync.add_record(archived, archived.description, False)
+        self._revisions.add(archived)
+
+    def sync_with(self, peer: SyncPeer) -> SyncReport:
+        """
+        Synchronizes with another store, local or a `RemoteTaskService`.
+
+        Hashes of ID ranges are compared from the top of each store's tree,
+        descending only into ranges that differ, so two mostly identical
+        stores exchange a few hashes per changed task and the changed
+        records themselves. Deletions travel while their tombstones last;
+        sync before compacting them away. Stores that both add tasks must
+        be created with different `replica` numbers.
+
+        Raises:
+            ValueError: If the other store sends an invalid record.
+        """
+        return sync_stores(self, peer)
+
+    def write_sync_summary(self, path: str | Path) -> int:
+        """
+        Writes the leaf range hashes of the store, starting a sync by file.
+
+        The other store answers with `answer_sync_file`, and so does this
+        one with the answer, writing a reply the other store then merges.
+
+        Returns:
+            The number of bytes written.
+        """
+        with self._lock:
+            hashes = self._sync.hashes(0)
+        return write_sync_file(path, "summary", {"hashes": hashes})
+
+    def answer_sync_file(
+        self, path: str | Path, reply_path: str | Path | None = None
+    ) -> SyncReport:
+        """
+        Handles a file from another store's sync by file.
+
+        A summary is answered with this store's records in the leaf ranges
+        whose hashes differ. Records are merged, and answered with this
+        store's records in the same ranges if the sender asked for them.
+
+        Args:
+            path: The summary or records file received.
+            reply_path: Where to write the answer, if one is due.
+
+        Raises:
+            ValueError: If the file is invalid, or an answer is due but no
+                reply path was given.
+        """
+        kind, payload = read_sync_file(path)
+        if kind not in ("summary", "records"):
+            raise ValueError(f"Unknown sync file kind: {kind}.")
+        received = 0
+        if kind == "summary":
+            theirs: dict[int, int] = payload["hashes"]
+            received = len(theirs)
+            with self._lock:
+                mine = self._sync.hashes(0)
+            ranges = sorted(
+                key
+                for key in mine.keys() | theirs.keys()
+                if mine.get(key) != theirs.get(key)
+            )
+        else:
+            ranges = payload["ranges"]
+        reply = kind == "summary" or bool(payload["reply"])
+        outgoing: list[dict[str, Any]] = []
+        if reply:
+            if reply_path is None:
+                raise ValueError("This sync file needs a reply file.")
+            with self._lock:
+                outgoing = self._range_records(ranges)
+        pulled = self.sync_merge(payload["rows"]) if kind == "records" else []
+        if reply and reply_path is not None:
+            answer = {"ranges": ranges, "rows": outgoing, "reply": kind == "summary"}
+            write_sync_file(reply_path, "records", answer)
+        return SyncReport(received, len(ranges), len(pulled), len(outgoing))
+
+    def _range_records(self, ranges: list[int]) -> list[dict[str, Any]]:
+        """Serializes every record in some leaf ranges with `sync_records`."""
+        return self.sync_records([i for key in ranges for i in leaf_range(key)])
+
+    def apply_record(self, record: dict[str, Any]) -> None:
+        """
+        Applies a mutation log record without logging it again.
+
+        Records hold the resulting state of the tasks they touch, so applying
+        one twice leaves the store unchanged.
+
+        Raises:
+            ValueError: If the record is malformed or its operation is unknown.
+        """
+        with self._lock:
+            try:
+                self._apply(record)
+                self._advance_next_id(int(record.get("next_id", 0)))
+                self._revision = max(self._revision, int(record.get("revision", 0)))
+            except (KeyError, TypeError, AttributeError) as e:
+                raise ValueError(f"Invalid mutation log record: {e}") from e
+
+    def _apply(self, record: dict[str, Any]) -> None:
+        """Dispatches a mutation log record to the matching internal change."""
+        op = record.get("op")
+        if op == "put":
+            tasks = {task.id: task for task in map(Task.from_dict, record["tasks"])}
+            for task_id in tasks:
+                if task_id in self._tasks:
+                    self._remove(task_id)
+                if task_id in self._tombstones:
+                    self._reclaim(task_id)
+                if self._cold is not None and task_id in self._cold:
+                    # Promoted, in a cold tier mirrored by the archive below.
+                    archived = self._cold.get(task_id)
+                    self._cold.delete(task_id)
+                    if archived is not None:
+                        self._sync.discard_record(archived, archived.description, False)
+            # Indexed as one batch, so large records such as backups merge
+            # into the sorted views instead of inserting task by task.
+            batch = list(tasks.values())
+            for task in batch:
+                self._adopt(task)
+                self._tasks[task.id] = task
+            self._index_many(batch)
+        elif op == "delete":
+            self._delete(record["ids"], record.get("archived", ()))
+        elif op == "undelete":
+            for task_id in record["ids"]:
+                self._undelete(task_id)
+        elif op == "compact":
+            for task_id in record["ids"]:
+                if task_id in self._tombstones:
+                    self._reclaim(task_id)
+        elif op == "archive":
+            # The primary's cold store persists archived tasks itself. A
+            # follower mirrors them into its own cold tier, or into memory.
+            if self._cold is None:
+                self._cold = MemoryStore()
+            for task_id in record["ids"]:
+                if task_id in self._tasks:
+                    archived = self._archive(task_id)
+                    if task_id not in self._cold:
+                        self._cold.put(archived)
+        elif op == "merge":
+            self._merge(parse_sync_rows(record["tasks"]))
+        elif op == "load_snapshot":
+            digest = record.get("snapshot")
+            self._load_snapshot(
+                record["path"], False, bytes.fromhex(digest) if digest else None
+            )
+        else:
+            raise ValueError(f"Unknown mutation log operation: {op}.")
+
+    def replay_log(self, path: str | Path) -> int:
+        """
+        Rebuilds the store from a mutation log file, e.g. after a restart.
+
+        Returns:
+            The number of records applied.
+
+        Raises:
+            ValueError: If the log contains a malformed record.
+        """
+        count = 0
+        for record in read_log(path):
+            self.apply_record(record)
+            count += 1
+        return count
 
-        task = self._tasks[task_id]
-        task.completed = not task.completed
-        return deepcopy(task)
+    def close(self) -> None:
+        """Syncs and closes the mutation log and the cold store, if any."""
+        if self._log is not None:
+            self._log.close()
+        if self._cold is not None:
+            self._cold.close()
@@ -0,0 +1 @@
+"""Storage package for persistence backends."""
@@ -0,0 +1,123 @@
+import sys
+from collections.abc import Iterator
+from copy import copy
+from typing import Protocol
+
+from src.models.task import Task
+from src.services.cache import CacheStats, LRUCache
+
+
+class TaskBackend(Protocol):
+    """A persistent store of tasks by ID, such as `ColdStore`."""
+
+    def __len__(self) -> int: ...
+
+    def __contains__(self, task_id: object) -> bool: ...
+
+    def ids(self) -> Iterator[int]: ...
+
+    def max_id(self, below: int | None = None) -> int: ...
+
+    def put(self, task: Task) -> None: ...
+
+    def get(self, task_id: int) -> Task | None: ...
+
+    def tasks(self) -> Iterator[Task]: ...
+
+    def delete(self, task_id: int) -> bool: ...
+
+    def close(self) -> None: ...
+
+
+def task_size(task: Task) -> int:
+    """Estimates the bytes a cached task holds: the object and its text."""
+    return (
+        sys.getsizeof(task)
+        + sys.getsizeof(task.title)
+        + sys.getsizeof(task.description)
+    )
+
+
+class CachedStore:
+    """
+    Read-through, write-through LRU cache in front of a persistent backend.
+
+    Reads of recently used tasks are served from memory; misses load from the
+    backend and are cached. Writes go to the backend first, then the cache,
+    so the backend always holds every task. Callers receive copies, so they
+    may change the tasks they get without corrupting the cache.
+    """
+
+    def __init__(
+        self,
+        backend: TaskBackend,
+        capacity: int = 1024,
+        max_bytes: int | None = None,
+    ) -> None:
+        """
+        Args:
+            backend: The store holding every task.
+            capacity: Most tasks kept in the cache.
+            max_bytes: Most estimated bytes of cached tasks, or None.
+
+        Raises:
+            ValueError: If a bound is negative.
+        """
+        self.backend = backend
+        self._cache: LRUCache[int, Task] = LRUCache(
+            capacity, max_bytes, task_size if max_bytes is not None else None
+        )
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self.backend
+
+    def ids(self) -> Iterator[int]:
+        return self.backend.ids()
+
+    def max_id(self, below: int | None = None) -> int:
+        return self.backend.max_id(below)
+
+    @staticmethod
+    def _detach(task: Task) -> Task:
+        """Returns a copy that shares no mutable state with the given task."""
+        detached = copy(task)
+        detached.mark_dirty()
+        return detached
+
+    def get(self, task_id: int) -> Task | None:
+        """Returns a task from the cache, or loads and caches it."""
+        task = self._cache.get(task_id)
+        if task is None:
+            task = self.backend.get(task_id)
+            if task is None:
+                return None
+            self._cache.put(task_id, task)
+        return self._detach(task)
+
+    def tasks(self) -> Iterator[Task]:
+        """
+        Iterates over every task in ID order without caching them, so a full
+        scan does not evict the hot tasks.
+        """
+        return self.backend.tasks()
+
+    def put(self, task: Task) -> None:
+        """Stores a task in the backend, then caches a copy of it."""
+        self.backend.put(task)
+        self._cache.put(task.id, self._detach(task))
+
+    def delete(self, task_id: int) -> bool:
+        """Removes a task from the backend and the cache."""
+        self._cache.discard(task_id)
+        return self.backend.delete(task_id)
+
+    def close(self) -> None:
+        """Closes the backend."""
+        self.backend.close()
+
+    def stats(self) -> CacheStats:
+        """Returns the cache counters."""
+        return self._cache.stats()
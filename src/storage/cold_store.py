@@ -0,0 +1,217 @@
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from src.models.task import Task
+
+
+class ColdStore:
+    """
+    On-disk tier for tasks that are rarely read, such as old completed ones.
+
+    Tasks are appended to a JSON-lines file; only a map from task ID to the
+    record's offset and length stays in memory. Deletions append a marker, and
+    the file is rewritten once dead records outweigh live ones.
+    """
+
+    def __init__(self, path: str | Path, compact_min_bytes: int = 1 << 20) -> None:
+        """
+        Opens or creates a cold store file and indexes its records.
+
+        Args:
+            path: Location of the data file.
+            compact_min_bytes: Dead bytes required before automatic compaction.
+
+        Raises:
+            ValueError: If the file contains a malformed record.
+        """
+        self.path = Path(path)
+        self.compact_min_bytes = compact_min_bytes
+        self._offsets: dict[int, tuple[int, int]] = {}
+        self._live_bytes = 0
+        self._dead_bytes = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a+b")
+        self._load()
+
+    def _load(self) -> None:
+        """
+        Rebuilds the offset map by scanning the data file.
+
+        A torn last line, left by a crash in the middle of an append, is cut
+        off, as `read_log` does for the mutation log.
+        """
+        self._file.seek(0)
+        offset = 0
+        for line in self._file:
+            if not line.endswith(b"\n"):
+                self._file.truncate(offset)
+                break
+            try:
+                record = json.loads(line)
+                task_id = int(record["id"])
+            except (ValueError, KeyError, TypeError):
+                raise ValueError(
+                    f"Corrupt cold store record at byte {offset} in {self.path}."
+                ) from None
+            previous = self._offsets.pop(task_id, None)
+            if previous is not None:
+                self._live_bytes -= previous[1]
+                self._dead_bytes += previous[1]
+            if record.get("deleted"):
+                self._dead_bytes += len(line)
+            else:
+                self._offsets[task_id] = (offset, len(line))
+                self._live_bytes += len(line)
+            offset += len(line)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._offsets
+
+    def ids(self) -> Iterator[int]:
+        """Iterates over the stored task IDs in ascending order."""
+        return iter(sorted(self._offsets))
+
+    def max_id(self, below: int | None = None) -> int:
+        """
+        Returns the highest stored task ID, or 0 when there is none.
+
+        Args:
+            below: Only consider IDs lower than this one.
+        """
+        if below is None:
+            return max(self._offsets, default=0)
+        return max((i for i in self._offsets if i < below), default=0)
+
+    def _append(self, record: dict[str, object]) -> tuple[int, int]:
+        """Appends a record and returns its offset and length."""
+        line = json.dumps(record, separators=(",", ":")).encode() + b"\n"
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(line)
+        self._file.flush()
+        return offset, len(line)
+
+    def put(self, task: Task) -> None:
+        """Stores a task, replacing any previous version."""
+        previous = self._offsets.get(task.id)
+        location = self._append(task.to_dict())
+        self._offsets[task.id] = location
+        self._live_bytes += location[1]
+        if previous is not None:
+            self._live_bytes -= previous[1]
+            self._dead_bytes += previous[1]
+            self._maybe_compact()
+
+    def get(self, task_id: int) -> Task | None:
+        """Loads a task from disk, or returns None if it is not stored."""
+        location = self._offsets.get(task_id)
+        if location is None:
+            return None
+        offset, length = location
+        self._file.seek(offset)
+        return Task.from_dict(json.loads(self._file.read(length)))
+
+    def tasks(self) -> Iterator[Task]:
+        """Loads every stored task, in ascending ID order."""
+        for task_id in self.ids():
+            task = self.get(task_id)
+            if task is not None:
+                yield task
+
+    def delete(self, task_id: int) -> bool:
+        """
+        Removes a task.
+
+        Returns:
+            True if the task was stored, False otherwise.
+        """
+        location = self._offsets.pop(task_id, None)
+        if location is None:
+            return False
+        _, marker_length = self._append({"id": task_id, "deleted": True})
+        self._live_bytes -= location[1]
+        self._dead_bytes += location[1] + marker_length
+        self._maybe_compact()
+        return True
+
+    def _maybe_compact(self) -> None:
+        """Compacts once dead records are large and outweigh live ones."""
+        dead = self._dead_bytes
+        if dead >= self.compact_min_bytes and dead > self._live_bytes:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrites the data file with only the live records."""
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        offsets: dict[int, tuple[int, int]] = {}
+        with open(temp_path, "wb") as temp:
+            for task_id in sorted(self._offsets):
+                offset, length = self._offsets[task_id]
+                self._file.seek(offset)
+                offsets[task_id] = (temp.tell(), length)
+                temp.write(self._file.read(length))
+            temp.flush()
+            os.fsync(temp.fileno())
+        self._file.close()
+        os.replace(temp_path, self.path)
+        self._file = open(self.path, "a+b")
+        self._offsets = offsets
+        self._dead_bytes = 0
+
+    def close(self) -> None:
+        """Closes the data file."""
+        self._file.close()
+
+
+class MemoryStore:
+    """
+    Cold tier kept in memory, for a store that applies another one's log.
+
+    A follower or a replay without a cold store of its own keeps the tasks
+    the primary archived here, so its reads match the primary's. Tasks are
+    held serialized, so callers get copies as from `ColdStore`.
+    """
+
+    def __init__(self) -> None:
+        self._rows: dict[int, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._rows
+
+    def ids(self) -> Iterator[int]:
+        """Iterates over the stored task IDs in ascending order."""
+        return iter(sorted(self._rows))
+
+    def max_id(self, below: int | None = None) -> int:
+        """Returns the highest stored task ID below a limit, or 0."""
+        return max((i for i in self._rows if below is None or i < below), default=0)
+
+    def put(self, task: Task) -> None:
+        """Stores a task, replacing any previous version."""
+        self._rows[task.id] = task.to_dict()
+
+    def get(self, task_id: int) -> Task | None:
+        """Returns a copy of a task, or None if it is not stored."""
+        row = self._rows.get(task_id)
+        return Task.from_dict(row) if row is not None else None
+
+    def tasks(self) -> Iterator[Task]:
+        """Returns copies of every stored task, in ascending ID order."""
+        for task_id in self.ids():
+            yield Task.from_dict(self._rows[task_id])
+
+    def delete(self, task_id: int) -> bool:
+        """Removes a task, returning whether it was stored."""
+        return self._rows.pop(task_id, None) is not None
+
+    def close(self) -> None:
+        """Does nothing; there is no file to close."""
@@ -0,0 +1,252 @@
+import json
+import os
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+# always: fsync before every write returns.
+# group:  writers wait for a shared fsync, issued at most every `group_commit_ms`
+#         or as soon as `group_commit_ops` writes are pending.
+# os:     hand each write to the OS page cache and let it decide when to flush.
+DURABILITY_MODES = ("always", "group", "os")
+
+
+@dataclass(frozen=True)
+class LogStats:
+    """
+    Counters describing the write traffic of a mutation log.
+
+    Attributes:
+        records: Records appended.
+        syncs: fsync calls issued.
+        max_unsynced: Most records that were ever written but not yet fsynced.
+    """
+
+    records: int
+    syncs: int
+    max_unsynced: int
+
+    @property
+    def records_per_sync(self) -> float:
+        """Average group size, 0.0 before the first fsync."""
+        return self.records / self.syncs if self.syncs else 0.0
+
+
+def read_log(path: str | Path) -> Iterator[dict[str, Any]]:
+    """
+    Iterates over the records of a mutation log file.
+
+    A torn last line, left by a crash in the middle of a write, ends the
+    iteration instead of raising.
+
+    Raises:
+        ValueError: If a record other than the last one is malformed.
+    """
+    with open(path, "rb") as file:
+        for line in file:
+            if not line.endswith(b"\n"):
+                return
+            yield decode_record(line, path)
+
+
+def encode_record(record: dict[str, Any]) -> bytes:
+    """Serializes a record as one compact JSON line."""
+    return json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+
+def write_records(
+    path: str | Path, records: list[dict[str, Any]], replace: bool = False
+) -> int:
+    """
+    Appends records to a log file and fsyncs it, outside any MutationLog.
+
+    Args:
+        path: The log file.
+        records: Records to write.
+        replace: Atomically replace the file with just these records instead.
+
+    Returns:
+        The number of bytes written.
+    """
+    path = Path(path)
+    data = b"".join(map(encode_record, records))
+    target = path.with_suffix(path.suffix + ".tmp") if replace else path
+    with open(target, "wb" if replace else "ab") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    if replace:
+        os.replace(target, path)
+    return len(data)
+
+
+def decode_record(line: bytes, path: str | Path) -> dict[str, Any]:
+    """
+    Parses one log line.
+
+    Raises:
+        ValueError: If the line is not a JSON object.
+    """
+    try:
+        record = json.loads(line)
+    except ValueError:
+        record = None
+    if not isinstance(record, dict):
+        raise ValueError(f"Corrupt mutation log record in {path}.")
+    return record
+
+
+class MutationLog:
+    """
+    Append-only JSON-lines log of store mutations with a configurable fsync policy.
+
+    `append` writes a record and returns its sequence number; `wait` then
+    blocks until that record is as durable as the policy promises. Appends
+    are cheap and serialized by the caller, while waits happen outside the
+    caller's locks, so concurrent writers share one fsync in group mode.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        durability: str = "group",
+        group_commit_ms: float = 1.0,
+        group_commit_ops: int = 64,
+    ) -> None:
+        """
+        Opens or creates a log file for appending.
+
+        Args:
+            path: Location of the log file.
+            durability: One of "always", "group" or "os".
+            group_commit_ms: Minimum time between the starts of two group-mode
+                fsyncs; an idle log syncs its first write immediately.
+            group_commit_ops: Pending writes that trigger an early fsync.
+
+        Raises:
+            ValueError: If the durability mode or group settings are invalid.
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"Unknown durability mode: {durability}. "
+                f"Choose from: {', '.join(DURABILITY_MODES)}."
+            )
+        if group_commit_ms <= 0 or group_commit_ops < 1:
+            raise ValueError("Group commit interval and size must be positive.")
+        self.path = Path(path)
+        self.durability = durability
+        self.group_commit_ms = group_commit_ms
+        self.group_commit_ops = group_commit_ops
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._cond = threading.Condition()
+        self._appended = 0
+        self._durable = 0
+        self._syncs = 0
+        self._last_sync = 0.0
+        self._max_unsynced = 0
+        self._closed = False
+        self._syncer: threading.Thread | None = None
+        if durability == "group":
+            self._syncer = threading.Thread(
+                target=self._run_syncer, name="mutation-log-sync", daemon=True
+            )
+            self._syncer.start()
+
+    def append(self, record: dict[str, Any]) -> int:
+        """
+        Writes a record to the log.
+
+        Returns:
+            The record's sequence number, to pass to `wait`.
+
+        Raises:
+            ValueError: If the log is closed.
+        """
+        line = encode_record(record)
+        with self._cond:
+            if self._closed:
+                raise ValueError("The mutation log is closed.")
+            self._file.write(line)
+            self._appended += 1
+            if self.durability == "always":
+                self._sync_locked()
+            elif self.durability == "os":
+                self._file.flush()
+                self._max_unsynced = max(
+                    self._max_unsynced, self._appended - self._durable
+                )
+            else:
+                self._cond.notify_all()
+            return self._appended
+
+    def wait(self, sequence: int) -> None:
+        """Blocks until a record is durable; only group mode ever waits."""
+        if self.durability != "group":
+            return
+        with self._cond:
+            self._cond.wait_for(lambda: self._durable >= sequence or self._closed)
+
+    def sync(self) -> None:
+        """Forces every appended record to disk, whatever the policy."""
+        with self._cond:
+            if not self._closed and self._appended > self._durable:
+                self._sync_locked()
+
+    def _sync_locked(self) -> None:
+        """Flushes and fsyncs, releasing the lock during the fsync itself."""
+        target = self._appended
+        self._last_sync = time.monotonic()
+        self._max_unsynced = max(self._max_unsynced, target - self._durable)
+        self._file.flush()
+        fd = self._file.fileno()
+        if self.durability == "always":
+            os.fsync(fd)
+        else:
+            self._cond.release()
+            try:
+                os.fsync(fd)
+            finally:
+                self._cond.acquire()
+        self._durable = max(self._durable, target)
+        self._syncs += 1
+        self._cond.notify_all()
+
+    def _run_syncer(self) -> None:
+        """Group-commit loop: one fsync per interval or per full group."""
+        interval = self.group_commit_ms / 1000
+        with self._cond:
+            while not self._closed:
+                self._cond.wait_for(
+                    lambda: self._closed or self._appended > self._durable
+                )
+                deadline = self._last_sync + interval
+                self._cond.wait_for(
+                    lambda: self._closed
+                    or self._appended - self._durable >= self.group_commit_ops,
+                    timeout=max(0.0, deadline - time.monotonic()),
+                )
+                if self._appended > self._durable and not self._file.closed:
+                    self._sync_locked()
+
+    def stats(self) -> LogStats:
+        """Returns the write counters of the log."""
+        with self._cond:
+            return LogStats(
+                records=self._appended,
+                syncs=self._syncs,
+                max_unsynced=self._max_unsynced,
+            )
+
+    def close(self) -> None:
+        """Syncs outstanding records and closes the file."""
+        self.sync()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._syncer is not None:
+            self._syncer.join()
+        self._file.close()
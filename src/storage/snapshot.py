@@ -0,0 +1,297 @@
+import hashlib
+import marshal
+import os
+import struct
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from itertools import repeat
+from pathlib import Path
+
+from src.models.task import Task, to_ns
+
+MAGIC = b"TODOSNAP"
+VERSION = 7
+# Version 1 snapshots hold timestamps as ISO 8601 text, converted on load.
+# Versions before 3 lack the due and priority columns, versions before 4
+# the tags column, versions before 5 the blocked_by column, versions before
+# 6 the task versions and versions before 7 the revisions; they load with
+# none, and versions and revisions of 0.
+_READABLE_VERSIONS = (1, 2, 3, 4, 5, 6, VERSION)
+# magic, format version, body length, BLAKE2b-128 digest of the body
+_HEADER = struct.Struct("<8sHQ16s")
+# Private Task fields hold caches, which start empty on load.
+_CACHE_FIELDS = [f.name for f in fields(Task) if f.name.startswith("_")]
+
+
+@dataclass
+class Snapshot:
+    """
+    Column-oriented image of a task store.
+
+    Attributes:
+        next_id: The ID the store will assign to its next task.
+        revision: The store's revision counter.
+        ids: Task IDs, in ascending order.
+        titles: Titles, aligned with `ids`.
+        descriptions: Descriptions, aligned with `ids`.
+        completed: One byte per task, 1 if completed.
+        created: Creation times in nanoseconds since the epoch.
+        completed_at: Completion times in nanoseconds since the epoch, or None.
+        due: Due times in nanoseconds since the epoch, or None.
+        priorities: One byte per task, its priority.
+        tags: Tag tuples; marshal writes each distinct tag string once.
+        blocked_by: Tuples of the IDs each task waits on.
+        versions: The version of each task.
+        revisions: The revision each task last changed at.
+        view_orders: Task IDs in the order of each keyed sorted view, so
+            loading does not need to sort again.
+    """
+
+    next_id: int
+    ids: list[int] = field(default_factory=list)
+    titles: list[str] = field(default_factory=list)
+    descriptions: list[str] = field(default_factory=list)
+    completed: bytes = b""
+    created: list[int] = field(default_factory=list)
+    completed_at: list[int | None] = field(default_factory=list)
+    due: list[int | None] = field(default_factory=list)
+    priorities: bytes = b""
+    tags: list[tuple[str, ...]] = field(default_factory=list)
+    blocked_by: list[tuple[int, ...]] = field(default_factory=list)
+    versions: list[int] = field(default_factory=list)
+    revisions: list[int] = field(default_factory=list)
+    revision: int = 0
+    view_orders: dict[str, list[int]] = field(default_factory=dict)
+
+    @classmethod
+    def from_tasks(
+        cls,
+        tasks: list[Task],
+        next_id: int,
+        description: Callable[[Task], str] | None = None,
+        view_orders: dict[str, list[int]] | None = None,
+        revision: int = 0,
+    ) -> "Snapshot":
+        """
+        Builds a snapshot from tasks sorted by ID.
+
+        Args:
+            tasks: The tasks, in ascending ID order.
+            next_id: The ID the store will assign next.
+            description: Reads a task's description, for stores that keep
+                descriptions outside the task objects.
+            view_orders: Task IDs in the order of each keyed sorted view.
+            revision: The store's revision counter.
+        """
+        if description is None:
+            descriptions = [task.description for task in tasks]
+        else:
+            descriptions = [description(task) for task in tasks]
+        return cls(
+            next_id=next_id,
+            ids=[task.id for task in tasks],
+            titles=[task.title for task in tasks],
+            descriptions=descriptions,
+            completed=bytes(task.completed for task in tasks),
+            created=[task.created_ns for task in tasks],
+            completed_at=[task.completed_ns for task in tasks],
+            due=[task.due_ns for task in tasks],
+            priorities=bytes(task.priority for task in tasks),
+            tags=[task.tags for task in tasks],
+            blocked_by=[task.blocked_by for task in tasks],
+            versions=[task.version for task in tasks],
+            revisions=[task.revision for task in tasks],
+            revision=revision,
+            view_orders=view_orders or {},
+        )
+
+    def to_tasks(self, validate: bool = False) -> list[Task]:
+        """
+        Materializes the tasks of the snapshot.
+
+        Args:
+            validate: Run the Task constructor checks. Trusted snapshots skip
+                them and assign fields directly, which is much faster.
+        """
+        count = len(self.ids)
+        columns: dict[str, Iterable[object]] = {
+            "id": self.ids,
+            "title": self.titles,
+            "description": self.descriptions,
+            "completed": map(bool, self.completed),
+            "created_ns": self.created,
+            "completed_ns": self.completed_at,
+            "due_ns": self.due,
+            "priority": self.priorities,
+            "tags": self.tags,
+            "blocked_by": self.blocked_by,
+            "version": self.versions,
+            "revision": self.revisions,
+        }
+        lengths = {
+            len(self.titles),
+            len(self.descriptions),
+            len(self.completed),
+            len(self.created),
+            len(self.completed_at),
+            len(self.due),
+            len(self.priorities),
+            len(self.tags),
+            len(self.blocked_by),
+            len(self.versions),
+            len(self.revisions),
+        }
+        if lengths != {count}:
+            raise ValueError("Snapshot columns have different lengths.")
+
+        if validate:
+            return [
+                Task(**dict(zip(columns, row, strict=True)))
+                for row in zip(*columns.values(), strict=True)
+            ]
+
+        # Assign each column through its slot descriptor in a C-level loop;
+        # this skips __init__ and avoids per-task bytecode.
+        for name in _CACHE_FIELDS:
+            columns[name] = repeat(None, count)
+        tasks = list(map(Task.__new__, repeat(Task, count)))
+        for name, values in columns.items():
+            deque(map(getattr(Task, name).__set__, tasks, values), maxlen=0)
+        return tasks
+
+
+def write_snapshot(path: str | Path, snapshot: Snapshot) -> int:
+    """
+    Writes a snapshot atomically: to a temporary file, fsynced, then renamed.
+
+    Returns:
+        The number of bytes written.
+    """
+    body = marshal.dumps(
+        (
+            snapshot.next_id,
+            snapshot.ids,
+            snapshot.titles,
+            snapshot.descriptions,
+            snapshot.completed,
+            snapshot.created,
+            snapshot.completed_at,
+            snapshot.due,
+            snapshot.priorities,
+            snapshot.tags,
+            snapshot.blocked_by,
+            snapshot.versions,
+            snapshot.revisions,
+            snapshot.revision,
+            snapshot.view_orders,
+        )
+    )
+    digest = hashlib.blake2b(body, digest_size=16).digest()
+    header = _HEADER.pack(MAGIC, VERSION, len(body), digest)
+
+    path = Path(path)
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(temp_path, "wb") as file:
+        file.write(header)
+        file.write(body)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    return len(header) + len(body)
+
+
+def snapshot_digest(path: str | Path) -> bytes | None:
+    """
+    Returns the checksum stored in a snapshot's header, reading nothing else.
+
+    Returns:
+        The digest, or None if the file is missing or not a snapshot.
+    """
+    try:
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) < _HEADER.size:
+        return None
+    magic, _, _, digest = _HEADER.unpack(header)
+    return digest if magic == MAGIC else None
+
+
+def read_snapshot(path: str | Path) -> Snapshot:
+    """
+    Reads a snapshot, verifying its format and checksum.
+
+    Raises:
+        ValueError: If the file is not a snapshot or fails verification.
+    """
+    data = Path(path).read_bytes()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path} is not a task snapshot.")
+    magic, version, length, digest = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a task snapshot.")
+    if version not in _READABLE_VERSIONS:
+        raise ValueError(f"Unsupported snapshot version: {version}.")
+
+    body = memoryview(data)[_HEADER.size :]
+    if len(body) != length:
+        raise ValueError("Snapshot is truncated.")
+    if hashlib.blake2b(body, digest_size=16).digest() != digest:
+        raise ValueError("Snapshot checksum mismatch.")
+
+    columns = marshal.loads(body)
+    count = len(columns[1])
+    if version == 1:
+        created = [to_ns(datetime.fromisoformat(text)) for text in columns[5]]
+        completed_at = [
+            None if text is None else to_ns(datetime.fromisoformat(text))
+            for text in columns[6]
+        ]
+        columns = (*columns[:5], created, completed_at, columns[7])
+    if version <= 2:
+        columns = (*columns[:7], [None] * count, bytes(count), columns[7])
+    if version <= 3:
+        columns = (*columns[:9], [()] * count, columns[9])
+    if version <= 4:
+        columns = (*columns[:10], [()] * count, columns[10])
+    if version <= 5:
+        columns = (*columns[:11], [0] * count, columns[11])
+    if version <= 6:
+        columns = (*columns[:12], [0] * count, 0, columns[12])
+    (
+        next_id,
+        ids,
+        titles,
+        descriptions,
+        completed,
+        created,
+        completed_at,
+        due,
+        priorities,
+        tags,
+        blocked_by,
+        versions,
+        revisions,
+        revision,
+        view_orders,
+    ) = columns
+    return Snapshot(
+        next_id=next_id,
+        ids=ids,
+        titles=titles,
+        descriptions=descriptions,
+        completed=completed,
+        created=created,
+        completed_at=completed_at,
+        due=due,
+        priorities=priorities,
+        tags=tags,
+        blocked_by=blocked_by,
+        versions=versions,
+        revisions=revisions,
+        revision=revision,
+        view_orders=view_orders,
+    )
@@ -1,8 +1,49 @@
+import asyncio
+import re
+import signal
 import sys
+import threading
+from collections.abc import Callable, Coroutine, Iterable
+from datetime import timedelta
 
-from src.models.task import Task
+from src.models.task import PRIORITIES, Task
+from src.remote.client import RemoteTaskService
+from src.services.cache import CacheStats
+from src.services.follower import LogFollower
+from src.services.memory import format_bytes
+from src.services.sync import SyncReport
+from src.services.task_lists import TaskLists
 from src.services.task_service import TaskService
-from src.utils.validators import validate_menu_choice, validate_task_id
+from src.utils.validators import (
+    validate_due_date,
+    validate_id_expression,
+    validate_list_name,
+    validate_menu_choice,
+    validate_priority,
+    validate_tags,
+    validate_task_id,
+)
+
+_ID_RANGE_RE = re.compile(r"\d+\s*-\s*\d+")
+_ID_PART_RE = re.compile(r"\d+(\s*-\s*\d+)?")
+# Menu choices and typed commands that change the store, which a read-only
+# follower refuses or leaves out.
+_WRITE_CHOICES = frozenset({1, 3, 4, 5})
+_WRITE_COMMANDS = (
+    "archive",
+    "purge",
+    "undelete",
+    "due",
+    "priority",
+    "tag",
+    "untag",
+    "depend",
+    "undepend",
+    "sync",
+    "sync-in",
+    "restore",
+)
+_MENU_PROMPT = "Enter your choice (1-6) or a command: "
 
 
 class TodoCLI:
@@ -10,24 +51,177 @@ class TodoCLI:
     Handles user interaction via a command-line interface.
     """
 
-    def __init__(self, task_service: TaskService) -> None:
-        """Initializes the CLI with a task service instance."""
+    def __init__(
+        self,
+        task_service: TaskService | RemoteTaskService,
+        follower: LogFollower | None = None,
+        lists: TaskLists | None = None,
+        list_name: str = "default",
+    ) -> None:
+        """
+        Initializes the CLI with a task service instance.
+
+        Args:
+            task_service: The store to work on, local or served by a
+                `TaskServer`.
+            follower: Makes the CLI a read-only view of a primary's log.
+            lists: Named lists the user can switch between; `task_service`
+                is then the open list `list_name`.
+            list_name: Name of the list `task_service` belongs to.
+        """
         self.task_service = task_service
+        self.follower = follower
+        self.lists = lists
+        self.list_name = list_name
+        if lists is not None:
+            # Held for as long as the console uses it, so it is never evicted
+            # from under the service kept here.
+            self.task_service = lists.pin(list_name)
         self.max_choice = 6
+        self.max_candidates = 10
+        self.dashboard_width = 30
+        # Set by Ctrl-C while a command runs under `run_async`.
+        self.cancelled = threading.Event()
+        self._busy = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lines: asyncio.Queue[str | None] | None = None
+        self.commands: dict[str, tuple[Callable[[str], None], str]] = {
+            "search": (self.handle_search, "search <query>  Filter tasks"),
+            "explain": (self.handle_explain, "explain <query> Show the query plan"),
+            "archive": (
+                self.handle_archive,
+                "archive [days]  Move tasks completed over N days ago to disk",
+            ),
+            "archived": (self.handle_archived, "archived        Show archived tasks"),
+            "purge": (self.handle_purge, "purge           Delete all completed tasks"),
+            "undelete": (
+                self.handle_undelete,
+                "undelete <id>   Restore a recently deleted task",
+            ),
+            "due": (
+                self.handle_due,
+                "due <id> <YYYY-MM-DD [HH:MM]|none> Set or clear a due date",
+            ),
+            "priority": (
+                self.handle_priority,
+                "priority <id> <none|low|medium|high> Set a task's priority",
+            ),
+            "tag": (
+                self.handle_tag,
+                "tag <ids|?query> <tags> Add tags to tasks",
+            ),
+            "untag": (
+                self.handle_untag,
+                "untag <ids|?query> <tags> Remove tags from tasks",
+            ),
+            "tags": (
+                self.handle_tags,
+                "tags            Show tags and their task counts",
+            ),
+            "depend": (
+                self.handle_depend,
+                "depend <id> <blocker-id> Make a task wait on another",
+            ),
+            "undepend": (
+                self.handle_undepend,
+                "undepend <id> <blocker-id> Stop a task waiting on another",
+            ),
+            "ready": (
+                self.handle_ready,
+                "ready [n]       Show open tasks not waiting on others",
+            ),
+            "order": (
+                self.handle_order,
+                "order           Show dependent tasks, blockers first",
+            ),
+            "next": (self.handle_next, "next [n]        Show the open tasks due next"),
+            "overdue": (self.handle_overdue, "overdue         Show overdue tasks"),
+            "export": (
+                self.handle_export,
+                "export <file> [query] Write tasks to a .json or .csv file",
+            ),
+            "sync": (
+                self.handle_sync,
+                "sync <socket>   Two-way sync with a store served on a socket",
+            ),
+            "sync-out": (
+                self.handle_sync_out,
+                "sync-out <file> Start a sync by file: write range hashes",
+            ),
+            "sync-in": (
+                self.handle_sync_in,
+                "sync-in <file> [reply] Answer or merge a sync file",
+            ),
+            "backup": (
+                self.handle_backup,
+                "backup <file> [--since <rev>] Back up all tasks or changes since",
+            ),
+            "restore": (
+                self.handle_restore,
+                "restore <full> [incr ...] Restore backups into an empty store",
+            ),
+            "stats": (
+                self.handle_stats,
+                "stats [days]    Show counts and daily activity",
+            ),
+            "memory": (self.handle_memory, "memory          Show memory usage"),
+            "cache": (self.handle_cache, "cache           Show cache hit rates"),
+            "help": (self.handle_help, "help            List typed commands"),
+        }
+        if follower is not None:
+            for name in _WRITE_COMMANDS:
+                del self.commands[name]
+            self.commands["lag"] = (
+                self.handle_lag,
+                "lag             Show replication lag",
+            )
+            self.commands["help"] = self.commands.pop("help")
+        if lists is not None:
+            self.commands["lists"] = (
+                self.handle_lists,
+                "lists [prefix]  Show the named task lists",
+            )
+            self.commands["use"] = (
+                self.handle_use,
+                "use <name>      Switch to a list, creating it if new",
+            )
+            self.commands["help"] = self.commands.pop("help")
 
     def display_menu(self) -> None:
         """Prints the main menu to the console."""
-        print("\n=== Todo Application ===")
+        if self.follower is not None:
+            print("\n=== Todo Application (read-only follower) ===")
+        elif self.lists is not None:
+            print(f"\n=== Todo Application (list: {self.list_name}) ===")
+        else:
+            print("\n=== Todo Application ===")
         print("1. Add Task")
         print("2. View All Tasks")
         print("3. Update Task")
         print("4. Delete Task")
         print("5. Mark Task Complete/Incomplete")
         print("6. Exit")
+        print("Or type a command (help for the list).")
 
     def get_input(self, prompt: str) -> str:
-        """Gets trimmed input from the user."""
-        return input(prompt).strip()
+        """
+        Gets trimmed input from the user.
+
+        Under `run_async`, commands run in a worker thread and take their
+        input from the line queue fed by the stdin reader thread.
+
+        Raises:
+            EOFError: If standard input is closed.
+        """
+        if self._loop is None or self._lines is None:
+            return input(prompt).strip()
+        print(prompt, end="", flush=True)
+        line = asyncio.run_coroutine_threadsafe(self._lines.get(), self._loop).result()
+        if line is None:
+            # Leave the end-of-input marker for the main prompt as well.
+            self._loop.call_soon_threadsafe(self._lines.put_nowait, None)
+            raise EOFError
+        return line.strip()
 
     def display_task(self, task: Task) -> None:
         """Displays formatted details of a single task."""
@@ -37,7 +231,15 @@ class TodoCLI:
         print(f"Status: {status} ({'Completed' if task.completed else 'Incomplete'})")
         if task.description:
             print(f"Description: {task.description}")
-        print(f"Created: {task.created_at.strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"Created: {task.created_label}")
+        if task.due_ns is not None:
+            print(f"Due: {task.due_label}")
+        if task.priority:
+            print(f"Priority: {PRIORITIES[task.priority]}")
+        if task.tags:
+            print(f"Tags: {' '.join(f'#{tag}' for tag in task.tags)}")
+        if task.blocked_by:
+            print(f"Blocked by: {', '.join(map(str, task.blocked_by))}")
 
     def display_tasks(self, tasks: list[Task]) -> None:
         """Displays a list of all tasks."""
@@ -47,8 +249,125 @@ class TodoCLI:
 
         print("\n--- Task List ---")
         for task in tasks:
+            if self.cancelled.is_set():
+                print("... listing cancelled.")
+                return
             print(str(task))
 
+    def resolve_task_id(self, reference: str) -> int | None:
+        """
+        Resolves a task ID or a title prefix typed by the user to a task ID.
+
+        When a prefix matches several tasks, the candidates are listed and the
+        user picks one by ID. Errors are printed and None is returned.
+        """
+        if not reference or reference.lstrip("-").isdigit():
+            valid_id, task_id, err = validate_task_id(reference)
+            if not valid_id or task_id is None:
+                print(f"\nError: {err}")
+                return None
+            return task_id
+
+        matches = self.task_service.find_by_title_prefix(
+            reference, self.max_candidates + 1
+        )
+        if not matches:
+            print(f"\nError: No task title starts with '{reference}'.")
+            return None
+        if len(matches) == 1:
+            return matches[0].id
+
+        print(f"\nMultiple tasks match '{reference}':")
+        for task in matches[: self.max_candidates]:
+            print(str(task))
+        if len(matches) > self.max_candidates:
+            print("... (type a longer prefix to narrow the list)")
+
+        id_str = self.get_input("Enter task ID: ")
+        valid_id, task_id, err = validate_task_id(id_str)
+        if not valid_id or task_id is None:
+            print(f"\nError: {err}")
+            return None
+        return task_id
+
+    def is_bulk_reference(self, reference: str) -> bool:
+        """
+        Returns True for ID lists like `1-500,720` and `?query` targets.
+
+        Other text with commas, such as `fix, then ship`, is a title prefix.
+        """
+        if reference.startswith("?"):
+            return True
+        parts = reference.split(",")
+        if len(parts) == 1:
+            return _ID_RANGE_RE.fullmatch(reference) is not None
+        return all(_ID_PART_RE.fullmatch(part.strip()) for part in parts)
+
+    def collect_bulk_targets(self, reference: str) -> list[int] | None:
+        """
+        Resolves an ID list expression or a `?query` to existing task IDs.
+
+        Errors are printed and None is returned.
+        """
+        if reference.startswith("?"):
+            try:
+                return self.task_service.find_ids(reference[1:])
+            except ValueError as e:
+                print(f"\nError: {e}")
+                return None
+
+        valid, ranges, err = validate_id_expression(reference)
+        if not valid or ranges is None:
+            print(f"\nError: {err}")
+            return None
+        return self.task_service.ids_in_ranges(ranges)
+
+    @staticmethod
+    def summarize_ids(task_ids: list[int], max_parts: int = 5) -> str:
+        """Compacts sorted IDs into ranges, e.g. `1-500, 720, 900-950`."""
+        parts: list[str] = []
+        start = prev = task_ids[0]
+        for task_id in [*task_ids[1:], None]:
+            if task_id is not None and task_id == prev + 1:
+                prev = task_id
+                continue
+            parts.append(str(start) if start == prev else f"{start}-{prev}")
+            if task_id is not None:
+                start = prev = task_id
+        if len(parts) > max_parts:
+            return ", ".join(parts[:max_parts]) + ", ..."
+        return ", ".join(parts)
+
+    def handle_bulk(self, action: str, reference: str) -> None:
+        """
+        Applies a delete or toggle to every targeted task in one service call.
+
+        Asks for a single confirmation and prints a single summary.
+        """
+        task_ids = self.collect_bulk_targets(reference)
+        if task_ids is None:
+            return
+        if not task_ids:
+            print("\nNo matching tasks found.")
+            return
+
+        task_ids.sort()
+        verb = "Delete" if action == "delete" else "Toggle the status of"
+        confirm = self.get_input(
+            f"{verb} {len(task_ids)} task(s) "
+            f"({self.summarize_ids(task_ids)})? (y/n): "
+        )
+        if confirm.lower() != "y":
+            print("\nBulk operation cancelled.")
+            return
+
+        if action == "delete":
+            done = self.task_service.delete_tasks(task_ids)
+            print(f"\nSuccess: {len(done)} task(s) deleted.")
+        else:
+            done = self.task_service.toggle_tasks(task_ids)
+            print(f"\nSuccess: {len(done)} task(s) toggled.")
+
     def handle_add_task(self) -> None:
         """Interactive flow to add a new task."""
         print("\n--- Add New Task ---")
@@ -69,11 +388,10 @@ class TodoCLI:
     def handle_update_task(self) -> None:
         """Interactive flow to update an existing task."""
         print("\n--- Update Task ---")
-        id_str = self.get_input("Enter task ID to update: ")
-        valid_id, task_id, err = validate_task_id(id_str)
-
-        if not valid_id or task_id is None:
-            print(f"\nError: {err}")
+        task_id = self.resolve_task_id(
+            self.get_input("Enter task ID or title prefix to update: ")
+        )
+        if task_id is None:
             return
 
         task = self.task_service.get_task(task_id)
@@ -97,11 +415,15 @@ class TodoCLI:
     def handle_delete_task(self) -> None:
         """Interactive flow to delete a task."""
         print("\n--- Delete Task ---")
-        id_str = self.get_input("Enter task ID to delete: ")
-        valid_id, task_id, err = validate_task_id(id_str)
+        reference = self.get_input(
+            "Enter task ID, title prefix, ID list (1-5,9) or ?query to delete: "
+        )
+        if self.is_bulk_reference(reference):
+            self.handle_bulk("delete", reference)
+            return
 
-        if not valid_id or task_id is None:
-            print(f"\nError: {err}")
+        task_id = self.resolve_task_id(reference)
+        if task_id is None:
             return
 
         task = self.task_service.get_task(task_id)
@@ -123,11 +445,15 @@ class TodoCLI:
     def handle_toggle_status(self) -> None:
         """Interactive flow to toggle task completion status."""
         print("\n--- Toggle Task Completion ---")
-        id_str = self.get_input("Enter task ID: ")
-        valid_id, task_id, err = validate_task_id(id_str)
+        reference = self.get_input(
+            "Enter task ID, title prefix, ID list (1-5,9) or ?query: "
+        )
+        if self.is_bulk_reference(reference):
+            self.handle_bulk("toggle", reference)
+            return
 
-        if not valid_id or task_id is None:
-            print(f"\nError: {err}")
+        task_id = self.resolve_task_id(reference)
+        if task_id is None:
             return
 
         try:
@@ -137,36 +463,628 @@ class TodoCLI:
         except ValueError as e:
             print(f"\nError: {e}")
 
+    def handle_search(self, query: str) -> None:
+        """Displays the tasks matching a filter query."""
+        try:
+            tasks = self.task_service.search(query)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            return
+        self.display_tasks(tasks)
+
+    def handle_explain(self, query: str) -> None:
+        """Displays the plan chosen for a filter query."""
+        try:
+            plan = self.task_service.explain(query)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            return
+        print("\n--- Query Plan ---")
+        print(plan.describe())
+
+    def handle_archive(self, days: str) -> None:
+        """Moves old completed tasks to the cold tier."""
+        older_than: timedelta | None = None
+        if days:
+            try:
+                older_than = timedelta(days=float(days))
+            except ValueError:
+                print("\nError: Please enter the age in days as a number.")
+                return
+            if older_than < timedelta(0):
+                print("\nError: The age in days cannot be negative.")
+                return
+        try:
+            count = self.task_service.archive_completed(older_than)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            return
+        print(f"\nSuccess: {count} task(s) archived.")
+
+    def handle_archived(self, _: str) -> None:
+        """Displays the tasks in the cold tier."""
+        print("\n--- Archived Tasks ---")
+        self.display_tasks(self.task_service.get_archived_tasks())
+
+    def handle_purge(self, _: str) -> None:
+        """Deletes every completed task after one confirmation."""
+        task_ids = self.task_service.find_ids("status:done")
+        if not task_ids:
+            print("\nNo completed tasks to purge.")
+            return
+        confirm = self.get_input(f"Delete {len(task_ids)} completed task(s)? (y/n): ")
+        if confirm.lower() != "y":
+            print("\nPurge cancelled.")
+            return
+        deleted = self.task_service.purge_completed()
+        print(
+            f"\nSuccess: {len(deleted)} task(s) deleted. Use undelete to restore one."
+        )
+
+    def handle_undelete(self, argument: str) -> None:
+        """Restores a deleted task that has not been compacted away yet."""
+        valid_id, task_id, err = validate_task_id(argument)
+        if not valid_id or task_id is None:
+            print(f"\nError: {err}")
+            return
+        try:
+            task = self.task_service.undelete_task(task_id)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            return
+        print(f"\nSuccess: Task {task.id} restored.")
+
+    def _task_argument(self, argument: str) -> tuple[int, str] | None:
+        """Splits `<id> <value>` command arguments, reporting bad input."""
+        reference, _, value = argument.partition(" ")
+        valid_id, task_id, err = validate_task_id(reference)
+        if not valid_id or task_id is None:
+            print(f"\nError: {err}")
+            return None
+        if not value.strip():
+            print("\nError: Please give a value after the task ID.")
+            return None
+        return task_id, value.strip()
+
+    def handle_due(self, argument: str) -> None:
+        """Sets or clears a task's due date."""
+        parsed = self._task_argument(argument)
+        if parsed is None:
+            return
+        task_id, value = parsed
+        try:
+            if value.lower() == "none":
+                task = self.task_service.update_task(task_id, clear_due=True)
+                print(f"\nSuccess: Task {task.id} has no due date.")
+                return
+            valid_due, due_at, err = validate_due_date(value)
+            if not valid_due or due_at is None:
+                print(f"\nError: {err}")
+                return
+            task = self.task_service.update_task(task_id, due_at=due_at)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            return
+        print(f"\nSuccess: Task {task.id} is due {task.due_label}.")
+
+    def handle_priority(self, argument: str) -> None:
+        """Sets a task's priority."""
+        parsed = self._task_argument(argument)
+        if parsed is None:
+            return
+        task_id, value = parsed
+        valid_priority, priority, err = validate_priority(value)
+        if not valid_priority or priority is None:
+            print(f"\nError: {err}")
+            return
+        try:
+            task = self.task_service.update_task(task_id, priority=priority)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            return
+        print(f"\nSuccess: Task {task.id} has {PRIORITIES[priority]} priority.")
+
+    def _retag(self, argument: str, adding: bool) -> None:
+        """Adds or removes tags on the tasks named by an ID list or `?query`."""
+        reference, _, text = argument.partition(" ")
+        valid_tags, tags, err = validate_tags(text)
+        if not valid_tags or not tags:
+            print(f"\nError: {err or 'Please give at least one tag.'}")
+            return
+        task_ids = self.collect_bulk_targets(reference)
+        if task_ids is None:
+            return
+        try:
+            if adding:
+                changed = self.task_service.tag_tasks(task_ids, add=tags)
+            else:
+                changed = self.task_service.tag_tasks(task_ids, remove=tags)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            return
+        print(
+            f"\nSuccess: {len(changed)} task(s) {'tagged' if adding else 'untagged'}."
+        )
+
+    def handle_tag(self, argument: str) -> None:
+        """Adds tags to one or more tasks."""
+        self._retag(argument, adding=True)
+
+    def handle_untag(self, argument: str) -> None:
+        """Removes tags from one or more tasks."""
+        self._retag(argument, adding=False)
+
+    def handle_tags(self, _: str) -> None:
+        """Displays every tag with the number of tasks carrying it."""
+        counts = self.task_service.tag_counts()
+        if not counts:
+            print("\nNo tags yet.")
+            return
+        print("\n--- Tags ---")
+        for tag, count in counts.items():
+            print(f"#{tag}: {count}")
+
+    def _dependency_argument(self, argument: str) -> tuple[int, int] | None:
+        """Parses `<id> <blocker-id>` command arguments, reporting bad input."""
+        parsed = self._task_argument(argument)
+        if parsed is None:
+            return None
+        task_id, value = parsed
+        valid_id, blocker_id, err = validate_task_id(value)
+        if not valid_id or blocker_id is None:
+            print(f"\nError: {err}")
+            return None
+        return task_id, blocker_id
+
+    def handle_depend(self, argument: str) -> None:
+        """Makes a task wait on another."""
+        parsed = self._dependency_argument(argument)
+        if parsed is None:
+            return
+        task_id, blocker_id = parsed
+        try:
+            self.task_service.add_dependency(task_id, blocker_id)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            return
+        print(f"\nSuccess: Task {task_id} now waits on task {blocker_id}.")
+
+    def handle_undepend(self, argument: str) -> None:
+        """Stops a task waiting on another."""
+        parsed = self._dependency_argument(argument)
+        if parsed is None:
+            return
+        task_id, blocker_id = parsed
+        try:
+            self.task_service.remove_dependency(task_id, blocker_id)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            return
+        print(f"\nSuccess: Task {task_id} no longer waits on task {blocker_id}.")
+
+    def handle_ready(self, count: str) -> None:
+        """Displays the open tasks that wait on no open task."""
+        if count and not count.isdigit():
+            print("\nError: Please enter the number of tasks as a whole number.")
+            return
+        print("\n--- Ready ---")
+        self.display_tasks(self.task_service.ready_tasks(int(count) if count else None))
+
+    def handle_order(self, _: str) -> None:
+        """Displays the open tasks with dependencies, blockers first."""
+        print("\n--- Dependency Order ---")
+        self.display_tasks(self.task_service.dependency_order())
+
+    def handle_next(self, count: str) -> None:
+        """Displays the open tasks due soonest."""
+        if count and not count.isdigit():
+            print("\nError: Please enter the number of tasks as a whole number.")
+            return
+        print("\n--- Due Next ---")
+        self.display_tasks(self.task_service.next_due(int(count) if count else 10))
+
+    def handle_overdue(self, _: str) -> None:
+        """Displays the open tasks past their due time."""
+        print("\n--- Overdue ---")
+        self.display_tasks(self.task_service.overdue())
+
+    def handle_export(self, argument: str) -> None:
+        """Writes all tasks, or those matching a query, to a JSON or CSV file."""
+        path, _, query = argument.partition(" ")
+        if not path:
+            print("\nError: Please give a .json or .csv file to export to.")
+            return
+        try:
+            count = self.task_service.export_tasks(path, query.strip() or None)
+        except (ValueError, OSError) as e:
+            print(f"\nError: {e}")
+            return
+        print(f"\nSuccess: {count} task(s) exported to {path}.")
+
+    def _local_service(self) -> TaskService | None:
+        """Returns the store if it is local, reporting an error otherwise."""
+        if isinstance(self.task_service, TaskService):
+            return self.task_service
+        print("\nError: This needs a local store; run it on the server.")
+        return None
+
+    def _print_sync(self, report: SyncReport) -> None:
+        print(
+            f"\nSuccess: {report.differing} differing, {report.pulled} pulled, "
+            f"{report.pushed} pushed ({report.hashes_received} hashes received)."
+        )
+
+    def handle_sync(self, path: str) -> None:
+        """Synchronizes with a store served by a `TaskServer`."""
+        service = self._local_service()
+        if service is None:
+            return
+        if not path:
+            print("\nError: Please give the socket of the store to sync with.")
+            return
+        try:
+            peer = RemoteTaskService(path)
+        except OSError as e:
+            print(f"\nError: Cannot reach {path}: {e}")
+            return
+        try:
+            report = service.sync_with(peer)
+        except (ValueError, OSError) as e:
+            print(f"\nError: {e}")
+            return
+        finally:
+            peer.close()
+        self._print_sync(report)
+
+    def handle_sync_out(self, path: str) -> None:
+        """Writes the range hashes that start a sync by file."""
+        service = self._local_service()
+        if service is None:
+            return
+        if not path:
+            print("\nError: Please give a file to write the summary to.")
+            return
+        try:
+            size = service.write_sync_summary(path)
+        except OSError as e:
+            print(f"\nError: {e}")
+            return
+        print(f"\nSuccess: {format_bytes(size)} written to {path}.")
+
+    def handle_sync_in(self, argument: str) -> None:
+        """Answers a sync summary, or merges sync records and answers them."""
+        service = self._local_service()
+        if service is None:
+            return
+        path, _, reply = argument.partition(" ")
+        if not path:
+            print("\nError: Please give the sync file to read.")
+            return
+        try:
+            report = service.answer_sync_file(path, reply.strip() or None)
+        except (ValueError, OSError) as e:
+            print(f"\nError: {e}")
+            return
+        self._print_sync(report)
+
+    def handle_backup(self, argument: str) -> None:
+        """Writes a full backup, or an incremental one with --since."""
+        service = self._local_service()
+        if service is None:
+            return
+        parts = argument.split()
+        since = 0
+        if len(parts) == 3 and parts[1] == "--since" and parts[2].isdigit():
+            since = int(parts[2])
+        elif len(parts) != 1:
+            print("\nError: Usage: backup <file> [--since <revision>]")
+            return
+        try:
+            report = service.backup(parts[0], since)
+        except (ValueError, OSError) as e:
+            print(f"\nError: {e}")
+            return
+        kind = "Incremental backup" if report.since else "Full backup"
+        print(
+            f"\nSuccess: {kind} of {report.tasks} task(s) and {report.deleted} "
+            f"deletion(s) written ({format_bytes(report.bytes_written)})."
+        )
+        print(f"Next incremental: backup <file> --since {report.revision}")
+
+    def handle_restore(self, argument: str) -> None:
+        """Restores a full backup and the incrementals after it, in order."""
+        service = self._local_service()
+        if service is None:
+            return
+        paths = argument.split()
+        if not paths:
+            print("\nError: Please give the full backup, then any incrementals.")
+            return
+        try:
+            count = service.restore_backups(paths)
+        except (ValueError, OSError) as e:
+            print(f"\nError: {e}")
+            return
+        print(f"\nSuccess: {count} task(s) restored from {len(paths)} backup(s).")
+
+    def handle_lists(self, prefix: str) -> None:
+        """Displays the named lists, marking the current and resident ones."""
+        if self.lists is None:
+            return
+        print("\n--- Lists ---")
+        for name in self.lists.names(prefix):
+            marker = "*" if name == self.list_name else " "
+            resident = " (open)" if self.lists.is_open(name) else ""
+            print(f"{marker} {name}{resident}")
+        stats = self.lists.stats()
+        print(
+            f"\n{stats.resident}/{stats.capacity} open; "
+            f"{stats.loads} load(s), {stats.evictions} eviction(s)"
+        )
+
+    def handle_use(self, name: str) -> None:
+        """Switches to another named list, creating it if it does not exist."""
+        if self.lists is None:
+            return
+        is_valid, err = validate_list_name(name)
+        if not is_valid:
+            print(f"\nError: {err}")
+            return
+        try:
+            self.task_service = self.lists.pin(name)
+        except (ValueError, OSError) as e:
+            print(f"\nError: {e}")
+            return
+        self.lists.unpin(self.list_name)
+        self.list_name = name
+        count = self.task_service.stats(days=1).total
+        print(f"\nSwitched to list {name} ({count} task(s)).")
+
+    def handle_lag(self, _: str) -> None:
+        """Displays how far this follower is behind the primary."""
+        if self.follower is None:
+            return
+        status = self.follower.status()
+        print("\n--- Replication ---")
+        print(f"Records applied: {status.records_applied}")
+        print(f"Behind: {format_bytes(status.behind_bytes)}")
+        print(f"Lag: {status.lag_seconds:.2f} s")
+        if status.error is not None:
+            print(f"Stopped: {status.error}")
+
+    def handle_stats(self, days: str) -> None:
+        """Displays task counts and per-day activity histograms."""
+        if days and not days.isdigit():
+            print("\nError: Please enter the number of days as a whole number.")
+            return
+        try:
+            stats = self.task_service.stats(int(days) if days else 14)
+        except ValueError as e:
+            print(f"\nError: {e}")
+            return
+        print("\n--- Dashboard ---")
+        print(
+            f"Tasks: {stats.total} ({stats.open} open, {stats.completed} completed, "
+            f"{stats.completion_ratio:.0%} done)"
+        )
+        if stats.archived or stats.deleted:
+            print(f"Archived: {stats.archived}, recently deleted: {stats.deleted}")
+        saves = stats.autosave
+        if saves.saves:
+            print(
+                f"Autosave: {saves.saves} save(s), {saves.full_saves} full, "
+                f"{format_bytes(saves.bytes_written)} written; last "
+                f"{saves.last_seconds * 1000:.1f} ms, slowest "
+                f"{saves.max_seconds * 1000:.1f} ms; {saves.pending} unsaved"
+            )
+        print(f"\n{'Day':<12}{'Created':>8}{'Completed':>10}")
+        peak = max([*stats.created_per_day.values(), 1])
+        for day, created in stats.created_per_day.items():
+            completed = stats.completed_per_day[day]
+            bar = "#" * round(created * self.dashboard_width / peak)
+            print(f"{day.isoformat():<12}{created:>8}{completed:>10}  {bar}")
+
+    def handle_memory(self, _: str) -> None:
+        """Displays the estimated memory usage of the task store."""
+        report = self.task_service.memory_report()
+        print("\n--- Memory Report ---")
+        print(f"Tasks: {report.task_count}")
+        print("By field:")
+        for name, size in report.fields.items():
+            print(f"  {name:<16}{format_bytes(size):>12}")
+        print("By structure:")
+        for name, size in report.structures.items():
+            print(f"  {name:<16}{format_bytes(size):>12}")
+        print(f"Total: {format_bytes(report.total)}")
+        if report.pooled_strings is not None:
+            print(
+                f"String pool: {report.pooled_strings} distinct strings "
+                f"for {report.pooled_references} references"
+            )
+        compression = self.task_service.compression_stats()
+        if compression is not None:
+            print(
+                f"Descriptions: {format_bytes(compression.raw_bytes)} raw, "
+                f"{format_bytes(compression.stored_bytes)} stored "
+                f"({compression.ratio:.0%}); cache hit rate "
+                f"{compression.cache.hit_rate:.0%} "
+                f"({compression.cache.size}/{compression.cache.capacity} cached)"
+            )
+        if report.traced_current is not None and report.traced_peak is not None:
+            print(
+                f"tracemalloc: {format_bytes(report.traced_current)} current, "
+                f"{format_bytes(report.traced_peak)} peak"
+            )
+
+    @staticmethod
+    def _print_cache(label: str, stats: CacheStats) -> None:
+        """Prints one cache's counters on a line."""
+        budget = ""
+        if stats.max_bytes is not None:
+            budget = f", {format_bytes(stats.bytes)} of {format_bytes(stats.max_bytes)}"
+        print(
+            f"{label}: {stats.hit_rate:.0%} hit rate ({stats.hits} hits, "
+            f"{stats.misses} misses, {stats.evictions} evictions); "
+            f"{stats.size}/{stats.capacity} cached{budget}"
+        )
+
+    def handle_cache(self, _: str) -> None:
+        """Displays the hit, miss and eviction counters of the caches."""
+        print("\n--- Caches ---")
+        cold = self.task_service.cold_cache_stats()
+        compression = self.task_service.compression_stats()
+        if cold is not None:
+            self._print_cache("Archived tasks", cold)
+        if compression is not None:
+            self._print_cache("Descriptions", compression.cache)
+        if cold is None and compression is None:
+            print("No caches are enabled.")
+
+    def handle_help(self, _: str) -> None:
+        """Lists the typed commands and the query syntax."""
+        print("\n--- Commands ---")
+        for _handler, usage in self.commands.values():
+            print(usage)
+        print(
+            "\nQuery terms: status:open|done, created>=YYYY-MM-DD, "
+            "title:~word, desc:text, tag:a|b, -tag:a, word, sort:-created, limit:N"
+        )
+
+    def handle_command(self, line: str) -> bool:
+        """
+        Dispatches a typed command such as `search status:open`.
+
+        Returns:
+            True if the line named a known command, False otherwise.
+        """
+        name, _, argument = line.partition(" ")
+        entry = self.commands.get(name.lower())
+        if entry is None:
+            return False
+        handler, _usage = entry
+        handler(argument.strip())
+        return True
+
+    def dispatch(self, choice: str) -> bool:
+        """
+        Runs a menu choice or a typed command.
+
+        Returns:
+            False if the user chose to exit, True otherwise.
+        """
+        try:
+            if self.handle_command(choice):
+                return True
+
+            is_valid, choice_int, err = validate_menu_choice(choice, self.max_choice)
+            if not is_valid or choice_int is None:
+                print(f"\nError: {err}")
+                return True
+            if self.follower is not None and choice_int in _WRITE_CHOICES:
+                print("\nError: This follower is read-only.")
+                return True
+
+            if choice_int == 1:
+                self.handle_add_task()
+            elif choice_int == 2:
+                self.handle_view_tasks()
+            elif choice_int == 3:
+                self.handle_update_task()
+            elif choice_int == 4:
+                self.handle_delete_task()
+            elif choice_int == 5:
+                self.handle_toggle_status()
+            elif choice_int == 6:
+                print("\nExiting. Goodbye!")
+                return False
+        except Exception as e:
+            print(f"\nAn unhandled error occurred: {e}")
+        return True
+
     def run(self) -> None:
         """Main application loop."""
         while True:
             try:
                 self.display_menu()
-                choice = self.get_input("Enter your choice (1-6): ")
-
-                is_valid, choice_int, err = validate_menu_choice(
-                    choice, self.max_choice
-                )
-                if not is_valid or choice_int is None:
-                    print(f"\nError: {err}")
-                    continue
-
-                if choice_int == 1:
-                    self.handle_add_task()
-                elif choice_int == 2:
-                    self.handle_view_tasks()
-                elif choice_int == 3:
-                    self.handle_update_task()
-                elif choice_int == 4:
-                    self.handle_delete_task()
-                elif choice_int == 5:
-                    self.handle_toggle_status()
-                elif choice_int == 6:
-                    print("\nExiting. Goodbye!")
+                if not self.dispatch(self.get_input(_MENU_PROMPT)):
                     break
-
             except KeyboardInterrupt:
                 print("\n\nExiting. Goodbye!")
                 sys.exit(0)
             except Exception as e:
                 print(f"\nAn unhandled error occurred: {e}")
+
+    async def run_async(
+        self, background: Iterable[Coroutine[object, object, object]] = ()
+    ) -> None:
+        """
+        Main application loop driven by asyncio.
+
+        Standard input is read by a daemon thread and commands run in worker
+        threads, so the event loop stays free for background jobs while the
+        user types. Ctrl-C stops a running command's listing and returns to
+        the menu; at the menu prompt it exits.
+
+        Args:
+            background: Jobs to run on the event loop until the CLI exits.
+        """
+        self._loop = asyncio.get_running_loop()
+        lines: asyncio.Queue[str | None] = asyncio.Queue()
+        self._lines = lines
+        jobs = [asyncio.create_task(job) for job in background]
+        threading.Thread(
+            target=self._read_lines, args=(self._loop, lines), daemon=True
+        ).start()
+        try:
+            self._loop.add_signal_handler(signal.SIGINT, self._interrupt)
+        except (NotImplementedError, RuntimeError):
+            pass  # No signal handlers here; Ctrl-C raises KeyboardInterrupt.
+
+        try:
+            while True:
+                self.display_menu()
+                print(_MENU_PROMPT, end="", flush=True)
+                line = await lines.get()
+                if line is None:
+                    print("\n\nExiting. Goodbye!")
+                    break
+                self.cancelled.clear()
+                self._busy = True
+                try:
+                    if not await asyncio.to_thread(self.dispatch, line.strip()):
+                        break
+                finally:
+                    self._busy = False
+        finally:
+            try:
+                self._loop.remove_signal_handler(signal.SIGINT)
+            except (NotImplementedError, RuntimeError):
+                pass
+            for job in jobs:
+                job.cancel()
+            await asyncio.gather(*jobs, return_exceptions=True)
+            self._loop = self._lines = None
+
+    def _interrupt(self) -> None:
+        """Handles Ctrl-C: cancels the running command, or exits at the prompt."""
+        if self._busy:
+            self.cancelled.set()
+        elif self._lines is not None:
+            self._lines.put_nowait(None)
+
+    @staticmethod
+    def _read_lines(
+        loop: asyncio.AbstractEventLoop, lines: asyncio.Queue[str | None]
+    ) -> None:
+        """Feeds stdin lines to the queue; None marks the end of input."""
+        while True:
+            try:
+                line: str | None = input()
+            except (EOFError, OSError):
+                line = None
+            try:
+                loop.call_soon_threadsafe(lines.put_nowait, line)
+            except RuntimeError:
+                return  # The event loop has closed.
+            if line is None:
+                return
@@ -0,0 +1,122 @@
+import csv
+import io
+import json
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import TextIO
+
+from src.models.task import Task
+
+EXPORT_FIELDS = [
+    "id",
+    "title",
+    "description",
+    "completed",
+    "created_at",
+    "completed_at",
+    "due_at",
+    "priority",
+    "tags",
+    "blocked_by",
+    "version",
+    "revision",
+]
+
+
+def encode_json(task: Task) -> str:
+    """Encodes a task as one element of the indented JSON array export."""
+    # Dumping a one-element list keeps the array's indentation; the
+    # surrounding "[\n" and "\n]" are added once by `write_json_rows`.
+    return json.dumps([task.to_dict()], indent=2, ensure_ascii=False)[2:-2]
+
+
+def encode_csv(task: Task) -> str:
+    """Encodes a task as one CSV row, including its line terminator."""
+    buffer = io.StringIO()
+    row = task.to_dict()
+    row["tags"] = " ".join(task.tags)
+    row["blocked_by"] = " ".join(map(str, task.blocked_by))
+    csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS).writerow(row)
+    return buffer.getvalue()
+
+
+def write_json_rows(rows: Iterable[str], file: TextIO) -> int:
+    """Writes rows from `encode_json` as a JSON array."""
+    rows = list(rows)
+    file.write("[\n" + ",\n".join(rows) + "\n]\n" if rows else "[]\n")
+    return len(rows)
+
+
+def write_csv_rows(rows: Iterable[str], file: TextIO) -> int:
+    """Writes rows from `encode_csv` below a header row."""
+    csv.DictWriter(file, fieldnames=EXPORT_FIELDS).writeheader()
+    count = 0
+    for row in rows:
+        file.write(row)
+        count += 1
+    return count
+
+
+def write_json(tasks: Iterable[Task], file: TextIO) -> int:
+    """Writes tasks as a JSON array of `Task.to_dict` objects."""
+    return write_json_rows(map(encode_json, tasks), file)
+
+
+def write_csv(tasks: Iterable[Task], file: TextIO) -> int:
+    """Writes tasks as CSV with a header row."""
+    return write_csv_rows(map(encode_csv, tasks), file)
+
+
+# Per format: how one task is encoded, and how encoded rows are written.
+type ExportFormat = tuple[Callable[[Task], str], Callable[[Iterable[str], TextIO], int]]
+
+EXPORT_FORMATS: dict[str, ExportFormat] = {
+    ".json": (encode_json, write_json_rows),
+    ".csv": (encode_csv, write_csv_rows),
+}
+
+
+def export_format(path: str | Path) -> str:
+    """
+    Returns the export format of a file, i.e. its lowercased extension.
+
+    Raises:
+        ValueError: If the extension is not .json or .csv.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unknown export format: {path.suffix or path.name}. "
+            f"Use a {' or '.join(EXPORT_FORMATS)} file."
+        )
+    return suffix
+
+
+def write_export(rows: Iterable[str], path: str | Path) -> int:
+    """
+    Writes rows encoded for the file's format, e.g. cached per task.
+
+    Returns:
+        The number of rows written.
+
+    Raises:
+        ValueError: If the extension is not .json or .csv.
+    """
+    _, write_rows = EXPORT_FORMATS[export_format(path)]
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        return write_rows(rows, file)
+
+
+def export_tasks(tasks: Iterable[Task], path: str | Path) -> int:
+    """
+    Writes tasks to a file, choosing the format from its extension.
+
+    Returns:
+        The number of tasks written.
+
+    Raises:
+        ValueError: If the extension is not .json or .csv.
+    """
+    encode, _ = EXPORT_FORMATS[export_format(path)]
+    return write_export(map(encode, tasks), path)
@@ -1,3 +1,12 @@
+import re
+from collections.abc import Iterable
+from datetime import date, datetime, time
+
+from src.models.task import MAX_TAGS, PRIORITIES, TAG_PATTERN
+
+_TAG_SEPARATOR_RE = re.compile(r"[\s,]+")
+
+
 def validate_title(title: str) -> tuple[bool, str]:
     """
     Validates the task title.
@@ -25,6 +34,78 @@ def validate_description(description: str) -> tuple[bool, str]:
     return True, ""
 
 
+def validate_priority(priority: int | str) -> tuple[bool, int | None, str]:
+    """
+    Validates a task priority, given as its number or, from user input, its
+    name such as "high".
+
+    Returns:
+        A tuple of (is_valid, parsed_priority, error_message).
+    """
+    if isinstance(priority, str):
+        text = priority.strip().lower()
+        if text in PRIORITIES:
+            return True, PRIORITIES.index(text), ""
+        try:
+            priority = int(text)
+        except ValueError:
+            return False, None, f"Priority must be one of: {', '.join(PRIORITIES)}."
+    if not 0 <= priority < len(PRIORITIES):
+        return False, None, f"Priority must be between 0 and {len(PRIORITIES) - 1}."
+    return True, priority, ""
+
+
+def validate_tags(
+    tags: str | Iterable[str],
+) -> tuple[bool, tuple[str, ...] | None, str]:
+    """
+    Validates and normalizes tags, given as names or, from user input, as
+    text such as "#backend, urgent".
+
+    Names are lowercased, a leading "#" is dropped, and duplicates removed.
+
+    Returns:
+        A tuple of (is_valid, sorted_tags, error_message).
+    """
+    if isinstance(tags, str):
+        tags = _TAG_SEPARATOR_RE.split(tags)
+    normalized = {tag.strip().removeprefix("#").lower() for tag in tags}
+    normalized.discard("")
+    for tag in sorted(normalized):
+        if not TAG_PATTERN.fullmatch(tag):
+            return (
+                False,
+                None,
+                f"Invalid tag: {tag}. Use up to 32 letters, digits, '-' or '_'.",
+            )
+    if len(normalized) > MAX_TAGS:
+        return False, None, f"A task can have at most {MAX_TAGS} tags."
+    return True, tuple(sorted(normalized)), ""
+
+
+def validate_due_date(text: str) -> tuple[bool, datetime | None, str]:
+    """
+    Validates a due date such as "2025-03-01" or "2025-03-01 17:30".
+
+    A date without a time is due at the end of that day.
+
+    Returns:
+        A tuple of (is_valid, parsed_due_time, error_message).
+    """
+    text = text.strip()
+    try:
+        return True, datetime.combine(date.fromisoformat(text), time(23, 59)), ""
+    except ValueError:
+        pass
+    try:
+        due_at = datetime.fromisoformat(text)
+    except ValueError:
+        return False, None, "Please enter the due date as YYYY-MM-DD [HH:MM]."
+    if due_at.tzinfo is not None:
+        return False, None, "Please enter the due date in local time."
+    return True, due_at, ""
+
+
 def validate_task_id(task_id_str: str) -> tuple[bool, int | None, str]:
     """
     Validates the task ID string from user input.
@@ -41,6 +122,31 @@ def validate_task_id(task_id_str: str) -> tuple[bool, int | None, str]:
         return False, None, "Please enter a valid numeric task ID."
 
 
+def validate_id_expression(
+    expression: str,
+) -> tuple[bool, list[tuple[int, int]] | None, str]:
+    """
+    Validates an ID list expression such as "1-500,720,900-950".
+
+    Returns:
+        A tuple of (is_valid, inclusive_ranges, error_message).
+    """
+    ranges: list[tuple[int, int]] = []
+    for part in expression.split(","):
+        start_str, sep, end_str = part.strip().partition("-")
+        try:
+            start = int(start_str)
+            end = int(end_str) if sep else start
+        except ValueError:
+            return False, None, "Please enter IDs like 1-500,720,900-950."
+        if start <= 0:
+            return False, None, "Please enter valid positive task IDs."
+        if start > end:
+            return False, None, f"Invalid ID range: {part.strip()}."
+        ranges.append((start, end))
+    return True, ranges, ""
+
+
 def validate_menu_choice(choice: str, max_choice: int) -> tuple[bool, int | None, str]:
     """
     Validates the user's menu choice.
@@ -63,3 +169,21 @@ def validate_menu_choice(choice: str, max_choice: int) -> tuple[bool, int | None
             None,
             f"Invalid input. Please enter a number between 1 and {max_choice}.",
         )
+
+
+def validate_list_name(name: str) -> tuple[bool, str]:
+    """
+    Validates a task list name, which doubles as its file name on disk.
+
+    Returns:
+        A tuple of (is_valid, error_message).
+    """
+    if not name:
+        return False, "List name cannot be empty."
+    if len(name) > 64:
+        return False, "List name must be 64 characters or less."
+    if not all(char.isascii() and (char.isalnum() or char in "-_") for char in name):
+        return False, "List name may only contain letters, digits, '-' and '_'."
+    if name[0] in "-_":
+        return False, "List name must start with a letter or digit."
+    return True, ""
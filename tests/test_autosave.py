@@ -0,0 +1,107 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from src.services.autosave import Autosaver
+from src.services.changes import autosave_delta_path
+from src.services.task_service import TaskService
+
+
+@pytest.fixture
+def service() -> TaskService:
+    service = TaskService()
+    service.add_tasks((f"Task {i}", f"Notes {i}") for i in range(20))
+    return service
+
+
+def test_save_changes_writes_snapshot_then_deltas(
+    service: TaskService, tmp_path: Path
+) -> None:
+    path = tmp_path / "tasks.snap"
+    first = service.save_changes(path)
+    assert first.full and first.tasks == 20
+
+    service.update_task(3, title="Renamed")
+    service.toggle_status(4)
+    service.delete_task(5)
+    delta = service.save_changes(path)
+    assert not delta.full and delta.tasks == 3
+    assert delta.bytes_written < first.bytes_written
+    assert service.save_changes(path).bytes_written == 0
+
+    restored = TaskService()
+    assert restored.load_autosave(path) == 19
+    assert restored.get_all_tasks() == service.get_all_tasks()
+    assert restored.unsaved_changes() is None
+    assert restored.add_task("Next").id == 21
+
+
+def test_save_changes_goes_full_when_most_tasks_changed(
+    service: TaskService, tmp_path: Path
+) -> None:
+    path = tmp_path / "tasks.snap"
+    service.save_changes(path)
+    service.toggle_tasks(range(1, 15))
+    assert service.save_changes(path, full_ratio=0.5).full
+    lines = autosave_delta_path(path).read_text().splitlines()
+    assert len(lines) == 1 and '"op":"base"' in lines[0]
+
+
+def test_load_autosave_ignores_delta_of_older_snapshot(
+    service: TaskService, tmp_path: Path
+) -> None:
+    path = tmp_path / "tasks.snap"
+    service.save_changes(path)
+    service.delete_task(1)
+    service.save_changes(path)
+    # A full save that crashed before replacing the delta leaves it stale.
+    service.undelete_task(1)
+    service.toggle_status(2)
+    service.save_snapshot(path)
+
+    restored = TaskService()
+    assert restored.load_autosave(path) == 20
+    task = restored.get_task(2)
+    assert task is not None and task.completed
+
+
+def test_failed_save_keeps_changes_pending(
+    service: TaskService, tmp_path: Path
+) -> None:
+    with pytest.raises(OSError):
+        service.save_changes(tmp_path / "missing" / "tasks.snap")
+    assert service.unsaved_changes() is not None
+    assert service.save_changes(tmp_path / "tasks.snap").tasks == 20
+
+
+def test_autosaver_debounces_bursts(
+    service: TaskService, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    autosaver = Autosaver(service, tmp_path / "tasks.snap", debounce=2, max_delay=5)
+    service.save_changes(autosaver.path)
+
+    service.update_task(1, title="Edited")
+    clock[0] += 1.5
+    assert autosaver.save_if_due() is None
+    service.update_task(2, title="Edited again")
+    clock[0] += 1.5
+    assert not autosaver.due()
+    clock[0] += 0.5
+    report = autosaver.save_if_due()
+    assert report is not None and report.tasks == 2
+
+    for _ in range(6):
+        service.toggle_status(3)
+        clock[0] += 1
+    assert autosaver.due()
+
+    stats = service.stats().autosave
+    assert (stats.saves, stats.full_saves, stats.pending) == (2, 1, 1)
+
+
+def test_autosaver_rejects_bad_delays(service: TaskService, tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="debounce"):
+        Autosaver(service, tmp_path / "tasks.snap", debounce=5, max_delay=1)
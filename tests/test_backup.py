@@ -0,0 +1,143 @@
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from src.models.task import Task
+from src.services.backup import RevisionLog, read_backup
+from src.services.task_service import TaskService
+from src.storage.cold_store import ColdStore
+from src.storage.mutation_log import MutationLog
+
+
+def _state(service: TaskService) -> list[dict[str, object]]:
+    return [task.to_dict() for task in service.get_all_tasks()]
+
+
+@pytest.fixture
+def service() -> TaskService:
+    service = TaskService()
+    service.add_tasks((f"Task {i}", "Notes") for i in range(50))
+    return service
+
+
+def test_incrementals_hold_only_changes_and_restore_in_a_chain(
+    service: TaskService, tmp_path: Path
+) -> None:
+    full = service.backup(tmp_path / "full")
+    assert (full.since, full.revision, full.tasks) == (0, 50, 50)
+
+    service.update_task(3, title="Edited")
+    service.toggle_tasks([4, 5])
+    service.delete_tasks([6, 7])
+    service.compact()
+    first = service.backup(tmp_path / "first", since=full.revision)
+    assert (first.tasks, first.deleted) == (3, 2)
+
+    service.add_task("New")
+    service.update_task(3, title="Edited again")
+    second = service.backup(tmp_path / "second", since=first.revision)
+    assert (second.tasks, second.deleted) == (2, 0)
+    assert service.backup(tmp_path / "empty", since=second.revision).tasks == 0
+
+    restored = TaskService()
+    paths = [tmp_path / name for name in ("full", "first", "second", "empty")]
+    assert restored.restore_backups(paths) == 49
+    assert _state(restored) == _state(service)
+    assert restored.get_task(6) is None and restored.deleted_count() == 2
+    task = restored.add_task("After")
+    assert task.id == 52 and task.revision > second.revision
+
+
+def test_restore_checks_the_chain_first(service: TaskService, tmp_path: Path) -> None:
+    full = service.backup(tmp_path / "full")
+    service.update_task(1, title="One")
+    service.backup(tmp_path / "gap", since=full.revision + 1)
+
+    with pytest.raises(ValueError, match="full backup"):
+        TaskService().restore_backups([tmp_path / "gap"])
+    with pytest.raises(ValueError, match="does not follow"):
+        TaskService().restore_backups([tmp_path / "full", tmp_path / "gap"])
+    with pytest.raises(ValueError, match="empty store"):
+        service.restore_backups([tmp_path / "full"])
+
+    lines = (tmp_path / "full").read_bytes().splitlines(keepends=True)
+    (tmp_path / "torn").write_bytes(b"".join(lines[:-1]))
+    with pytest.raises(ValueError, match="not a complete backup"):
+        read_backup(tmp_path / "torn")
+    with pytest.raises(ValueError, match="outside"):
+        service.backup(tmp_path / "ahead", since=10_000)
+
+
+def test_revisions_survive_snapshots_and_log_replay(
+    service: TaskService, tmp_path: Path
+) -> None:
+    service.update_task(1, title="Changed")
+    service.save_snapshot(tmp_path / "tasks.snap")
+    loaded = TaskService()
+    loaded.load_snapshot(tmp_path / "tasks.snap")
+    assert _state(loaded) == _state(service)
+    assert loaded.update_task(2, title="Later").revision == 52
+    with pytest.raises(ValueError, match="make a full backup"):
+        loaded.backup(tmp_path / "old", since=40)
+    assert loaded.backup(tmp_path / "new", since=51).tasks == 1
+
+    log_path = tmp_path / "tasks.log"
+    logged = TaskService(log=MutationLog(log_path))
+    logged.add_tasks([("A", ""), ("B", ""), ("C", "")])
+    logged.delete_task(2)
+    logged.toggle_status(3)
+    logged.close()
+    replayed = TaskService()
+    replayed.replay_log(log_path)
+    assert _state(replayed) == _state(logged)
+    assert replayed.backup(tmp_path / "replayed", since=3).deleted == 1
+
+
+def test_archived_tasks_are_backed_up(tmp_path: Path) -> None:
+    service = TaskService(cold_store=ColdStore(tmp_path / "cold.jsonl"))
+    service.add_tasks([("Old", "Done long ago"), ("Open", "")])
+    service.toggle_status(1)
+    full = service.backup(tmp_path / "full")
+    service.archive_completed(timedelta(0))
+    assert service.backup(tmp_path / "noop", since=full.revision).tasks == 0
+    service.delete_task(1)
+    assert service.backup(tmp_path / "inc", since=full.revision).deleted == 1
+
+    restored = TaskService()
+    restored.restore_backups([tmp_path / "full"])
+    task = restored.get_task(1)
+    assert task is not None and task.completed and task.description == "Done long ago"
+
+
+def test_revision_log_sorts_replayed_changes() -> None:
+    log = RevisionLog(lambda: [])
+    for task_id, revision in ((1, 5), (2, 3), (3, 9), (1, 7)):
+        log.add(Task(task_id, "t", revision=revision))
+    assert log.changed_since(4) == [1, 3]
+    assert log.changed_since(0) == [2, 1, 3]
+    log.invalidate(floor=9)
+    with pytest.raises(ValueError, match="no longer known"):
+        log.changed_since(4)
+    assert len(log) == 0
+
+
+def test_full_backups_let_the_log_drop_compacted_tasks(
+    service: TaskService, tmp_path: Path
+) -> None:
+    full = service.backup(tmp_path / "full")
+    service.delete_tasks(range(1, 31))
+    service.compact()
+    assert len(service._revisions) == 50
+    assert service.backup(tmp_path / "inc", since=full.revision).deleted == 30
+
+    later = service.backup(tmp_path / "later")
+    assert len(service._revisions) == 20
+    with pytest.raises(ValueError, match="make a full backup"):
+        service.backup(tmp_path / "old", since=full.revision)
+    service.delete_task(31)
+    assert service.backup(tmp_path / "new", since=later.revision).deleted == 1
+
+    restored = TaskService()
+    restored.restore_backups([tmp_path / "later", tmp_path / "new"])
+    assert _state(restored) == _state(service)
@@ -0,0 +1,48 @@
+import random
+
+import pytest
+
+from src.services.bitmaps import ARRAY_MAX, CHUNK_BITS, Bitmap
+
+
+def test_bitmap_add_discard_and_membership() -> None:
+    bitmap = Bitmap([3, 1, CHUNK_BITS * 5 + 7])
+    bitmap.add(2)
+    bitmap.add(2)
+    bitmap.discard(1)
+    bitmap.discard(999)
+    assert bitmap.to_list() == [2, 3, CHUNK_BITS * 5 + 7]
+    assert len(bitmap) == 3
+    assert 3 in bitmap and 1 not in bitmap and CHUNK_BITS * 5 + 7 in bitmap
+    bitmap.discard(CHUNK_BITS * 5 + 7)
+    assert bitmap.chunk_count == 1
+
+
+def test_bitmap_switches_between_sparse_and_dense_chunks() -> None:
+    bitmap = Bitmap(range(ARRAY_MAX))
+    sparse = bitmap._chunks[0]
+    bitmap.add(ARRAY_MAX)
+    assert isinstance(sparse, bytes) and isinstance(bitmap._chunks[0], int)
+    bitmap.discard(0)
+    assert isinstance(bitmap._chunks[0], bytes)
+    assert bitmap == Bitmap(range(1, ARRAY_MAX + 1))
+
+
+@pytest.mark.parametrize("density", [0.001, 0.05, 0.5])
+def test_bitmap_set_operations_match_sets(density: float) -> None:
+    rng = random.Random(density)
+    universe = range(CHUNK_BITS * 6)
+    left = {i for i in universe if rng.random() < density}
+    right = {i for i in universe if rng.random() < density * 2}
+    a, b = Bitmap(left), Bitmap(right)
+    assert (a & b).to_list() == sorted(left & right)
+    assert (a | b).to_list() == sorted(left | right)
+    assert (a - b).to_list() == sorted(left - right)
+    assert list((a | b).values(reverse=True)) == sorted(left | right, reverse=True)
+    assert a - b == Bitmap(left - right)
+
+    removed = set(rng.sample(sorted(left), len(left) // 2))
+    a.difference_update(removed)
+    a.update(right)
+    assert a.to_list() == sorted((left - removed) | right)
+    assert len(a) == len((left - removed) | right)
@@ -0,0 +1,62 @@
+import pytest
+
+from src.services.cache import CacheStats, LRUCache
+
+
+def test_lru_cache_get_and_put() -> None:
+    cache: LRUCache[int, str] = LRUCache(2)
+    cache.put(1, "one")
+    assert cache.get(1) == "one"
+    assert cache.get(2) is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_lru_cache_evicts_least_recently_used() -> None:
+    cache: LRUCache[int, str] = LRUCache(2)
+    cache.put(1, "one")
+    cache.put(2, "two")
+    cache.get(1)
+    cache.put(3, "three")
+    assert cache.get(2) is None
+    assert cache.get(1) == "one"
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_lru_cache_zero_capacity_and_discard() -> None:
+    cache: LRUCache[int, str] = LRUCache(0)
+    cache.put(1, "one")
+    assert len(cache) == 0
+
+    cache = LRUCache(3)
+    cache.put(1, "one")
+    cache.discard(1)
+    cache.discard(99)
+    assert cache.get(1) is None
+
+
+def test_lru_cache_negative_capacity() -> None:
+    with pytest.raises(ValueError, match="Cache capacity cannot be negative."):
+        LRUCache(-1)
+
+
+def test_cache_stats_hit_rate() -> None:
+    assert CacheStats(3, 1, 0, 2, 10).hit_rate == 0.75
+    assert CacheStats(0, 0, 0, 0, 10).hit_rate == 0.0
+
+
+def test_lru_cache_byte_budget() -> None:
+    cache: LRUCache[int, str] = LRUCache(10, max_bytes=10, size_of=len)
+    cache.put(1, "aaaa")
+    cache.put(2, "bbbb")
+    cache.put(1, "aaaaaa")
+    assert cache.bytes == 10 and len(cache) == 2
+    cache.put(3, "cc")
+    assert cache.get(2) is None
+    assert cache.stats().bytes == 8 and cache.evictions == 1
+    cache.put(4, "x" * 11)
+    assert cache.get(4) is None
+
+    with pytest.raises(ValueError, match="byte budget"):
+        LRUCache(10, max_bytes=10)
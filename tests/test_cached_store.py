@@ -0,0 +1,64 @@
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.models.task import Task
+from src.services.task_service import TaskService
+from src.storage.cached_store import CachedStore, task_size
+from src.storage.cold_store import ColdStore
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> CachedStore:
+    return CachedStore(ColdStore(tmp_path / "cold.jsonl"), capacity=2)
+
+
+def test_reads_go_through_the_cache(store: CachedStore) -> None:
+    store.put(Task(id=1, title="One", completed=True))
+    with patch.object(store.backend, "get", wraps=store.backend.get) as backend_get:
+        first = store.get(1)
+        assert first is not None
+        first.title = "Changed by a caller"
+        assert store.get(1) == Task(
+            id=1, title="One", completed=True, created_ns=first.created_ns
+        )
+        backend_get.assert_not_called()
+    assert store.get(9) is None
+    assert store.stats().hits == 2 and store.stats().misses == 1
+
+
+def test_writes_reach_the_backend_and_evict(store: CachedStore) -> None:
+    for task_id in (1, 2, 3):
+        store.put(Task(id=task_id, title=f"Task {task_id}"))
+    assert store.stats().evictions == 1 and store.stats().size == 2
+    assert store.backend.get(1) is not None
+    assert store.delete(3) and 3 not in store
+    assert store.get(3) is None
+    assert [task.id for task in store.tasks()] == [1, 2]
+    assert store.stats().size == 1
+
+
+def test_byte_budget_bounds_the_cache(tmp_path: Path) -> None:
+    task = Task(id=1, title="x" * 100)
+    store = CachedStore(
+        ColdStore(tmp_path / "cold.jsonl"), capacity=100, max_bytes=task_size(task)
+    )
+    store.put(task)
+    store.put(Task(id=2, title="y" * 100))
+    assert store.stats().size == 1 and store.stats().bytes <= task_size(task)
+
+
+def test_service_reads_archived_tasks_from_cache(tmp_path: Path) -> None:
+    store = CachedStore(ColdStore(tmp_path / "cold.jsonl"), capacity=8)
+    service = TaskService(cold_store=store, archive_after=timedelta(0))
+    service.add_task("Done")
+    service.toggle_status(1)
+    assert service.archive_completed() == 1
+    for _ in range(3):
+        assert service.get_task(1) is not None
+    stats = service.cold_cache_stats()
+    assert stats is not None and stats.hits == 3
+    assert service.get_archived_tasks()[0].title == "Done"
+    assert TaskService().cold_cache_stats() is None
@@ -1,8 +1,17 @@
+import asyncio
+import threading
+from datetime import date, timedelta
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from src.models.task import Task
+from src.remote.client import RemoteTaskService
+from src.services.cache import CacheStats
+from src.services.follower import LogFollower
+from src.services.stats import TaskStats
+from src.services.task_lists import TaskLists
 from src.services.task_service import TaskService
 from src.ui.cli import TodoCLI
 
@@ -73,3 +82,442 @@ def test_handle_view_tasks(
     captured = capsys.readouterr()
     assert "View Me" in captured.out
     mock_service.get_all_tasks.assert_called_once()
+
+
+def test_handle_command_search(
+    cli: TodoCLI, mock_service: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    mock_service.search.return_value = [Task(id=3, title="Found")]
+    assert cli.handle_command("search status:open") is True
+    mock_service.search.assert_called_once_with("status:open")
+    assert "[✗] ID: 3 | Found" in capsys.readouterr().out
+
+
+def test_handle_command_search_error(
+    cli: TodoCLI, mock_service: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    mock_service.search.side_effect = ValueError("Unknown query field: owner.")
+    cli.handle_command("search owner:me")
+    assert "Error: Unknown query field: owner." in capsys.readouterr().out
+
+
+def test_handle_command_explain(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    service = TaskService()
+    for title in ("Report", "Email", "Call"):
+        service.add_task(title)
+    TodoCLI(service).handle_command("explain title:~report")
+    captured = capsys.readouterr()
+    assert "Access: text index" in captured.out
+    assert "Estimated rows: 1 of 3" in captured.out
+
+
+def test_handle_command_unknown(cli: TodoCLI) -> None:
+    assert cli.handle_command("frobnicate") is False
+
+
+def test_resolve_task_id_numeric(cli: TodoCLI, mock_service: MagicMock) -> None:
+    assert cli.resolve_task_id("12") == 12
+    mock_service.find_by_title_prefix.assert_not_called()
+
+
+def test_resolve_task_id_invalid_number(
+    cli: TodoCLI, capsys: pytest.CaptureFixture[str]
+) -> None:
+    assert cli.resolve_task_id("-3") is None
+    assert "Please enter a valid positive task ID." in capsys.readouterr().out
+
+
+def test_resolve_task_id_unique_prefix(cli: TodoCLI, mock_service: MagicMock) -> None:
+    mock_service.find_by_title_prefix.return_value = [Task(id=7, title="Groceries")]
+    assert cli.resolve_task_id("groc") == 7
+
+
+def test_resolve_task_id_no_match(
+    cli: TodoCLI, mock_service: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    mock_service.find_by_title_prefix.return_value = []
+    assert cli.resolve_task_id("zzz") is None
+    assert "No task title starts with 'zzz'." in capsys.readouterr().out
+
+
+@patch("builtins.input", side_effect=["5"])
+def test_resolve_task_id_ambiguous_prefix(
+    mock_input: MagicMock,
+    cli: TodoCLI,
+    mock_service: MagicMock,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    mock_service.find_by_title_prefix.return_value = [
+        Task(id=4, title="Pack bags"),
+        Task(id=5, title="Pay rent"),
+    ]
+    assert cli.resolve_task_id("pa") == 5
+    captured = capsys.readouterr()
+    assert "Multiple tasks match 'pa':" in captured.out
+    assert "[✗] ID: 5 | Pay rent" in captured.out
+
+
+@patch("builtins.input", side_effect=["pay"])
+def test_handle_toggle_status_by_prefix(
+    mock_input: MagicMock,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    service = TaskService()
+    service.add_task("Call mom")
+    service.add_task("Pay rent")
+    TodoCLI(service).handle_toggle_status()
+    assert "Success: Task 2 marked as Completed." in capsys.readouterr().out
+
+
+def test_summarize_ids() -> None:
+    assert TodoCLI.summarize_ids([1, 2, 3, 7, 9, 10]) == "1-3, 7, 9-10"
+    assert TodoCLI.summarize_ids([1, 3, 5, 7], max_parts=2) == "1, 3, ..."
+
+
+@patch("builtins.input", side_effect=["2-4,9", "y"])
+def test_handle_delete_task_bulk(
+    mock_input: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    service = TaskService()
+    for i in range(5):
+        service.add_task(f"Task {i}")
+    TodoCLI(service).handle_delete_task()
+    captured = capsys.readouterr()
+    assert "Delete 3 task(s) (2-4)?" in mock_input.call_args_list[1].args[0]
+    assert "Success: 3 task(s) deleted." in captured.out
+    assert [task.id for task in service.get_all_tasks()] == [1, 5]
+
+
+@patch("builtins.input", side_effect=["fix, then"])
+def test_titles_with_commas_are_prefixes(
+    mock_input: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    service = TaskService()
+    for title in ("Fix, then ship", "Fix bug", "Ship", "A", "B", "C"):
+        service.add_task(title)
+    cli = TodoCLI(service)
+    cli.handle_toggle_status()
+    assert "Success: Task 1 marked as Completed." in capsys.readouterr().out
+    assert cli.is_bulk_reference("3, 5-6")
+    assert not cli.is_bulk_reference("3, five")
+
+
+@patch("builtins.input", side_effect=["?title:~groceries", "y"])
+def test_handle_toggle_status_bulk_query(
+    mock_input: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    service = TaskService()
+    service.add_task("Buy groceries")
+    service.add_task("Call mom")
+    service.add_task("Groceries again")
+    TodoCLI(service).handle_toggle_status()
+    assert "Success: 2 task(s) toggled." in capsys.readouterr().out
+    assert service.find_ids("status:done") == [1, 3]
+
+
+@patch("builtins.input", side_effect=["1-3", "n"])
+def test_handle_bulk_cancelled(
+    mock_input: MagicMock, cli: TodoCLI, mock_service: MagicMock
+) -> None:
+    mock_service.ids_in_ranges.return_value = [1, 2]
+    cli.handle_toggle_status()
+    mock_service.toggle_tasks.assert_not_called()
+
+
+def test_handle_command_memory(capsys: pytest.CaptureFixture[str]) -> None:
+    service = TaskService(dedupe_strings=True)
+    service.add_task("Task", "Details")
+    TodoCLI(service).handle_command("memory")
+    captured = capsys.readouterr()
+    assert "--- Memory Report ---" in captured.out
+    assert "description" in captured.out
+    assert "String pool: 2 distinct strings for 2 references" in captured.out
+
+
+def test_handle_command_archive(
+    cli: TodoCLI, mock_service: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    mock_service.archive_completed.return_value = 2
+    cli.handle_command("archive 7")
+    assert "Success: 2 task(s) archived." in capsys.readouterr().out
+    mock_service.archive_completed.assert_called_once_with(timedelta(days=7))
+
+    cli.handle_command("archive soon")
+    assert "Please enter the age in days as a number." in capsys.readouterr().out
+
+
+def test_handle_command_archived(
+    cli: TodoCLI, mock_service: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    mock_service.get_archived_tasks.return_value = [
+        Task(id=9, title="Old", completed=True)
+    ]
+    cli.handle_command("archived")
+    captured = capsys.readouterr()
+    assert "--- Archived Tasks ---" in captured.out
+    assert "[✓] ID: 9 | Old" in captured.out
+
+
+def test_handle_command_export(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    service = TaskService()
+    service.add_task("Write report")
+    service.add_task("Buy milk")
+    cli = TodoCLI(service)
+    path = tmp_path / "open.csv"
+
+    cli.handle_command(f"export {path} report")
+    assert "Success: 1 task(s) exported" in capsys.readouterr().out
+    assert "Write report" in path.read_text()
+
+    cli.handle_command(f"export {tmp_path / 'tasks.xml'}")
+    assert "Unknown export format: .xml" in capsys.readouterr().out
+
+
+@patch("builtins.input", side_effect=["1", "lag", "6"])
+def test_follower_cli_is_read_only(
+    mock_input: MagicMock, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    service = TaskService()
+    follower = LogFollower(service, tmp_path / "missing.log")
+    cli = TodoCLI(service, follower)
+    assert "archive" not in cli.commands
+    cli.run()
+    captured = capsys.readouterr()
+    assert "(read-only follower)" in captured.out
+    assert "Error: This follower is read-only." in captured.out
+    assert "Records applied: 0" in captured.out
+
+
+def test_lists_cli_switches_lists(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    lists = TaskLists(tmp_path)
+    cli = TodoCLI(lists.open("default"), lists=lists)
+    cli.handle_command("use work")
+    cli.task_service.add_task("Ship it")
+    cli.handle_command("use bad/name")
+    cli.display_menu()
+    cli.handle_command("lists")
+    captured = capsys.readouterr().out
+    assert "Switched to list work (0 task(s))." in captured
+    assert "Error: List name may only contain" in captured
+    assert "(list: work)" in captured
+    assert "  default (open)\n* work (open)" in captured
+    assert lists.open("work").get_task(1) is not None
+
+
+def test_handle_command_cache(
+    cli: TodoCLI, mock_service: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    mock_service.cold_cache_stats.return_value = CacheStats(3, 1, 2, 4, 8, 512, 1024)
+    mock_service.compression_stats.return_value = None
+    cli.handle_command("cache")
+    captured = capsys.readouterr().out
+    assert "Archived tasks: 75% hit rate (3 hits, 1 misses, 2 evictions)" in captured
+    assert "4/8 cached, 512 B of 1.0 KiB" in captured
+
+
+def test_due_priority_and_next_commands(capsys: pytest.CaptureFixture[str]) -> None:
+    service = TaskService()
+    service.add_task("Taxes")
+    service.add_task("Groceries")
+    cli = TodoCLI(service)
+    cli.handle_command("due 1 2020-04-15")
+    cli.handle_command("due 2 2999-01-01 09:00")
+    cli.handle_command("priority 2 high")
+    cli.handle_command("priority 2 urgent")
+    cli.handle_command("due 3 2020-01-01")
+    cli.handle_command("next 5")
+    cli.handle_command("overdue")
+    out = capsys.readouterr().out
+    assert "Success: Task 1 is due 2020-04-15 23:59." in out
+    assert "Success: Task 2 has high priority." in out
+    assert "Priority must be one of" in out
+    assert "Task with ID 3 not found." in out
+    listing = out[out.index("--- Due Next ---") :]
+    assert listing.index("Taxes") < listing.index("Groceries | due 2999-01-01")
+    overdue = out[out.index("--- Overdue ---") :]
+    assert "Taxes" in overdue and "Groceries" not in overdue
+
+    cli.handle_command("due 1 none")
+    assert "Task 1 has no due date." in capsys.readouterr().out
+
+
+def test_tag_untag_and_tags_commands(capsys: pytest.CaptureFixture[str]) -> None:
+    service = TaskService()
+    for title in ("Deploy", "Docs", "Review"):
+        service.add_task(title)
+    cli = TodoCLI(service)
+    cli.handle_command("tag 1-3 #backend")
+    cli.handle_command("tag 2 urgent")
+    cli.handle_command("untag ?tag:urgent backend")
+    cli.handle_command("tag 1 bad!")
+    cli.handle_command("tags")
+    out = capsys.readouterr().out
+    assert "Success: 3 task(s) tagged." in out
+    assert "Success: 1 task(s) untagged." in out
+    assert "Invalid tag: bad!." in out
+    assert "#backend: 2\n#urgent: 1" in out
+    task = service.get_task(2)
+    assert task is not None
+    cli.display_task(task)
+    assert "Tags: #urgent" in capsys.readouterr().out
+
+
+def test_dependency_commands(capsys: pytest.CaptureFixture[str]) -> None:
+    service = TaskService()
+    for title in ("Design", "Build", "Ship"):
+        service.add_task(title)
+    cli = TodoCLI(service)
+    cli.handle_command("depend 3 2")
+    cli.handle_command("depend 2 1")
+    cli.handle_command("depend 1 3")
+    cli.handle_command("depend 1 x")
+    cli.handle_command("order")
+    out = capsys.readouterr().out
+    assert "Success: Task 3 now waits on task 2." in out
+    assert "would form a cycle" in out
+    assert "Error:" in out.split("would form a cycle")[1]
+    assert out.index("ID: 1 |") < out.index("ID: 2 |") < out.index("ID: 3 |")
+
+    cli.handle_command("undepend 3 2")
+    cli.handle_command("ready 5")
+    out = capsys.readouterr().out
+    assert "Task 3 no longer waits on task 2." in out
+    assert "ID: 2 |" not in out.split("--- Ready ---")[1]
+    task = service.get_task(2)
+    assert task is not None
+    cli.display_task(task)
+    assert "Blocked by: 1" in capsys.readouterr().out
+
+
+def test_sync_commands(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    left, right = TaskService(), TaskService()
+    left.add_tasks([("Write", ""), ("Review", "")])
+    cli = TodoCLI(right)
+    cli.handle_command("sync-in")
+    cli.handle_command(f"sync-in {tmp_path / 'missing'}")
+    left.write_sync_summary(tmp_path / "summary")
+    cli.handle_command(f"sync-in {tmp_path / 'summary'} {tmp_path / 'records'}")
+    left.answer_sync_file(tmp_path / "records", tmp_path / "reply")
+    cli.handle_command(f"sync-in {tmp_path / 'reply'}")
+    out = capsys.readouterr().out
+    assert out.count("Error:") == 2
+    assert "Success: 1 differing, 0 pulled, 0 pushed (1 hashes received)." in out
+    assert "Success: 1 differing, 2 pulled, 0 pushed" in out
+    assert right.get_task(2) is not None
+
+    TodoCLI(MagicMock(spec=RemoteTaskService)).handle_command("sync x.sock")
+    assert "This needs a local store" in capsys.readouterr().out
+
+
+def test_backup_and_restore_commands(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    service = TaskService()
+    service.add_tasks([("Write", ""), ("Review", "")])
+    cli = TodoCLI(service)
+    cli.handle_command(f"backup {tmp_path / 'full'}")
+    service.delete_task(1)
+    cli.handle_command(f"backup {tmp_path / 'inc'} --since 2")
+    cli.handle_command(f"backup {tmp_path / 'inc'} --since")
+    out = capsys.readouterr().out
+    assert "Full backup of 2 task(s) and 0 deletion(s)" in out
+    assert "backup <file> --since 2" in out
+    assert "Incremental backup of 0 task(s) and 1 deletion(s)" in out
+    assert "Error: Usage: backup" in out
+
+    restored = TodoCLI(TaskService())
+    restored.handle_command(f"restore {tmp_path / 'inc'}")
+    restored.handle_command(f"restore {tmp_path / 'full'} {tmp_path / 'inc'}")
+    out = capsys.readouterr().out
+    assert "Error: The first backup to restore must be a full backup." in out
+    assert "Success: 1 task(s) restored from 2 backup(s)." in out
+
+
+def test_handle_command_purge_confirms(
+    cli: TodoCLI, mock_service: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    mock_service.find_ids.return_value = [2, 5]
+    mock_service.purge_completed.return_value = [2, 5]
+    with patch.object(cli, "get_input", return_value="y"):
+        assert cli.handle_command("purge") is True
+    mock_service.purge_completed.assert_called_once_with()
+    assert "2 task(s) deleted" in capsys.readouterr().out
+
+
+def test_handle_command_undelete(
+    cli: TodoCLI, mock_service: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    mock_service.undelete_task.return_value = Task(id=7, title="Back")
+    cli.handle_command("undelete 7")
+    mock_service.undelete_task.assert_called_once_with(7)
+    assert "Task 7 restored" in capsys.readouterr().out
+
+
+def test_handle_command_stats(
+    cli: TodoCLI, mock_service: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    mock_service.stats.return_value = TaskStats(
+        total=4,
+        open=3,
+        completed=1,
+        created_per_day={date(2026, 3, 9): 1, date(2026, 3, 10): 3},
+        completed_per_day={date(2026, 3, 9): 0, date(2026, 3, 10): 1},
+    )
+    cli.handle_command("stats 2")
+    mock_service.stats.assert_called_once_with(2)
+    out = capsys.readouterr().out
+    assert "Tasks: 4 (3 open, 1 completed, 25% done)" in out
+    assert "2026-03-10         3         1  " + "#" * 30 in out
+
+
+def test_run_async_runs_background_jobs_while_waiting_for_input(
+    cli: TodoCLI, capsys: pytest.CaptureFixture[str]
+) -> None:
+    job_ran = threading.Event()
+
+    async def job() -> None:
+        await asyncio.sleep(0)
+        job_ran.set()
+
+    answers = iter(["6"])
+
+    def typed(*_: object) -> str:
+        job_ran.wait(5)
+        # The reader thread reads ahead; end the input after "6" so it stops.
+        for answer in answers:
+            return answer
+        raise EOFError
+
+    with patch("builtins.input", side_effect=typed):
+        asyncio.run(cli.run_async([job()]))
+    assert job_ran.is_set()
+    assert "Exiting. Goodbye!" in capsys.readouterr().out
+
+
+@patch("builtins.input", side_effect=["4", "9", "y", EOFError()])
+def test_run_async_feeds_prompts_of_running_commands(
+    mock_input: MagicMock, capsys: pytest.CaptureFixture[str]
+) -> None:
+    service = TaskService()
+    for i in range(10):
+        service.add_task(f"Task {i}")
+    asyncio.run(TodoCLI(service).run_async())
+    assert service.get_task(9) is None
+    assert "Success: Task deleted successfully." in capsys.readouterr().out
+
+
+def test_interrupt_cancels_listing_of_running_command(
+    cli: TodoCLI, capsys: pytest.CaptureFixture[str]
+) -> None:
+    cli._busy = True
+    cli._interrupt()
+    cli.display_tasks([Task(id=1, title="One"), Task(id=2, title="Two")])
+    out = capsys.readouterr().out
+    assert "listing cancelled" in out
+    assert "ID: 1" not in out
@@ -0,0 +1,190 @@
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.models.task import Task
+from src.services.task_service import TaskService
+from src.storage.cold_store import ColdStore
+from src.storage.mutation_log import MutationLog
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> ColdStore:
+    return ColdStore(tmp_path / "cold.jsonl")
+
+
+def test_cold_store_put_get_delete(store: ColdStore) -> None:
+    task = Task(id=3, title="Archived", description="Old", completed=True)
+    store.put(task)
+    assert 3 in store
+    assert store.get(3) == task
+    assert store.get(4) is None
+    assert store.delete(3) is True
+    assert store.delete(3) is False
+    assert len(store) == 0
+
+
+def test_cold_store_reopen(tmp_path: Path) -> None:
+    path = tmp_path / "cold.jsonl"
+    store = ColdStore(path)
+    store.put(Task(id=1, title="One"))
+    store.put(Task(id=2, title="Two"))
+    store.put(Task(id=1, title="One again"))
+    store.delete(2)
+    store.close()
+
+    reopened = ColdStore(path)
+    assert list(reopened.ids()) == [1]
+    assert reopened.max_id() == 1
+    task = reopened.get(1)
+    assert task is not None
+    assert task.title == "One again"
+
+
+def test_cold_store_compaction(tmp_path: Path) -> None:
+    path = tmp_path / "cold.jsonl"
+    store = ColdStore(path, compact_min_bytes=0)
+    for i in range(1, 11):
+        store.put(Task(id=i, title=f"Task {i}"))
+    for i in range(1, 10):
+        store.delete(i)
+    assert list(store.ids()) == [10]
+    assert len(path.read_bytes().splitlines()) == 1
+    task = store.get(10)
+    assert task is not None
+    assert task.title == "Task 10"
+
+
+def test_cold_store_corrupt_file(tmp_path: Path) -> None:
+    path = tmp_path / "cold.jsonl"
+    path.write_text("not json\n")
+    with pytest.raises(ValueError, match="Corrupt cold store record at byte 0"):
+        ColdStore(path)
+
+
+def test_cold_store_drops_torn_last_record(tmp_path: Path) -> None:
+    path = tmp_path / "cold.jsonl"
+    store = ColdStore(path)
+    store.put(Task(id=1, title="One"))
+    store.close()
+    with open(path, "ab") as file:
+        file.write(b'{"id":2,"tit')
+
+    reopened = ColdStore(path)
+    assert list(reopened.ids()) == [1]
+    reopened.put(Task(id=3, title="Three"))
+    reopened.close()
+    assert list(ColdStore(path).ids()) == [1, 3]
+
+
+@pytest.fixture
+def service(store: ColdStore) -> TaskService:
+    service = TaskService(cold_store=store, archive_after=timedelta(days=7))
+    service.add_task("Keep open")
+    service.add_task("Done long ago", "Archive me")
+    service.add_task("Done just now")
+    service.toggle_status(2)
+    service.toggle_status(3)
+    service._tasks[2].completed_at = datetime.now() - timedelta(days=30)
+    return service
+
+
+def test_archive_completed_moves_old_tasks(service: TaskService) -> None:
+    assert service.archive_completed() == 1
+    assert [task.id for task in service.get_all_tasks()] == [1, 3]
+    assert service.archived_count() == 1
+    assert service.find_ids("status:done") == [3]
+
+    archived = service.get_task(2)
+    assert archived is not None
+    assert archived.description == "Archive me"
+    assert [task.id for task in service.get_archived_tasks()] == [2]
+
+
+def test_toggle_status_restores_archived_task(service: TaskService) -> None:
+    service.archive_completed()
+    task = service.toggle_status(2)
+    assert task.completed is False
+    assert task.completed_at is None
+    assert service.archived_count() == 0
+    assert [task.id for task in service.get_all_tasks()] == [1, 2, 3]
+
+
+def test_update_and_delete_archived_task(service: TaskService) -> None:
+    service.archive_completed(timedelta(0))
+    assert service.archived_count() == 2
+
+    updated = service.update_task(3, title="Renamed")
+    assert updated.completed is True
+    assert service.archived_count() == 1
+
+    assert service.delete_task(2) is True
+    assert service.get_task(2) is None
+    assert service.delete_tasks([3, 2]) == [3]
+
+
+def test_archive_requires_configuration() -> None:
+    with pytest.raises(ValueError, match="No cold storage is configured."):
+        TaskService().archive_completed()
+
+
+def test_ids_continue_after_archived_tasks(tmp_path: Path) -> None:
+    path = tmp_path / "cold.jsonl"
+    ColdStore(path).put(Task(id=41, title="From a previous run"))
+    service = TaskService(cold_store=ColdStore(path))
+    assert service.add_task("New").id == 42
+
+
+def _archive_and_reopen(
+    tmp_path: Path, check: Callable[[TaskService], None]
+) -> TaskService:
+    """Archives tasks 1 and 3, runs a check, then replays the log."""
+    cold_path, log_path = tmp_path / "cold.jsonl", tmp_path / "tasks.log"
+    service = TaskService(cold_store=ColdStore(cold_path), log=MutationLog(log_path))
+    service.add_tasks([("Blocker", ""), ("Waiting", ""), ("Tagged", "")])
+    service.add_dependency(2, 1)
+    service.tag_tasks([3], add=[f"tag{i}" for i in range(16)])
+    service.toggle_tasks([1, 3])
+    service.archive_completed(timedelta(0))
+    check(service)
+    service.close()
+
+    recovered = TaskService(cold_store=ColdStore(cold_path))
+    recovered.replay_log(log_path)
+    return recovered
+
+
+def test_failed_dependency_changes_leave_archived_tasks(tmp_path: Path) -> None:
+    def check(service: TaskService) -> None:
+        with pytest.raises(ValueError, match="cycle"):
+            service.add_dependency(1, 2)
+        with pytest.raises(ValueError, match="does not wait"):
+            service.remove_dependency(1, 2)
+        assert service.archived_count() == 2
+
+    recovered = _archive_and_reopen(tmp_path, check)
+    assert [task.id for task in recovered.get_archived_tasks()] == [1, 3]
+
+
+def test_tags_over_the_limit_leave_archived_tasks(tmp_path: Path) -> None:
+    def check(service: TaskService) -> None:
+        with pytest.raises(ValueError, match="16"):
+            service.tag_tasks([2, 3], add=["one-more"])
+        assert service.archived_count() == 2
+        assert service.tag_counts() == {}
+
+    recovered = _archive_and_reopen(tmp_path, check)
+    assert [task.id for task in recovered.get_archived_tasks()] == [1, 3]
+
+
+def test_deleted_archived_tasks_keep_their_tombstones(tmp_path: Path) -> None:
+    def check(service: TaskService) -> None:
+        assert service.delete_tasks([3, 2]) == [2, 3]
+        assert service.deleted_count() == 2
+
+    recovered = _archive_and_reopen(tmp_path, check)
+    assert recovered.deleted_count() == 2
+    assert recovered.get_task(3) is None
+    assert len(recovered.undelete_task(3).tags) == 16
@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+from src.services.compression import (
+    CompressedTextStore,
+    DescriptionCodec,
+    train_dictionary,
+)
+from src.services.task_service import TaskService
+
+LONG_TEXT = "Collect the quarterly sales figures and update the report. " * 8
+
+
+def test_codec_round_trip() -> None:
+    codec = DescriptionCodec()
+    blob = codec.compress(LONG_TEXT)
+    assert len(blob) < len(LONG_TEXT)
+    assert codec.decompress(blob) == LONG_TEXT
+
+
+def test_trained_dictionary_improves_short_texts() -> None:
+    samples = [f"Review the deployment checklist for service {i}" for i in range(50)]
+    dictionary = train_dictionary(samples, size=1024)
+    assert 0 < len(dictionary) <= 1024
+
+    text = "Review the deployment checklist for service 99"
+    plain = DescriptionCodec().compress(text)
+    trained = DescriptionCodec(dictionary).compress(text)
+    assert len(trained) < len(plain)
+    assert DescriptionCodec(dictionary).decompress(trained) == text
+
+
+def test_train_dictionary_empty() -> None:
+    assert train_dictionary([]) == b""
+
+
+def test_store_keeps_short_texts_raw() -> None:
+    store = CompressedTextStore(min_size=64)
+    store.put(1, "short")
+    store.put(2, LONG_TEXT)
+    stats = store.stats()
+    assert stats.compressed_count == 1
+    assert stats.raw_bytes == len("short") + len(LONG_TEXT)
+    assert stats.stored_bytes < stats.raw_bytes
+    assert store.get(1) == "short"
+    assert store.get(3) == ""
+
+
+def test_store_cache_hits_and_discard() -> None:
+    store = CompressedTextStore(cache_size=1)
+    store.put(1, LONG_TEXT)
+    store.put(2, LONG_TEXT.upper())
+    assert store.get(1) == LONG_TEXT
+    assert store.get(1) == LONG_TEXT
+    assert store.get(2) == LONG_TEXT.upper()
+    stats = store.stats().cache
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 2, 1)
+
+    with patch.object(store.codec, "decompress", side_effect=AssertionError):
+        store.discard(1)
+        store.discard(2)
+    assert len(store) == 0
+    assert store.stats().raw_bytes == 0
+    assert store.stats().stored_bytes == 0
+
+
+def test_service_compressed_descriptions_are_transparent() -> None:
+    service = TaskService(compress_descriptions=True, description_cache_size=4)
+    task = service.add_task("Report", LONG_TEXT)
+    assert task.description == LONG_TEXT.strip()
+    assert service._tasks[task.id].description == ""
+
+    service.update_task(task.id, description="Quarterly budget review " * 5)
+    stored = service.get_task(task.id)
+    assert stored is not None
+    assert stored.description == ("Quarterly budget review " * 5).strip()
+
+    stats = service.compression_stats()
+    assert stats is not None
+    assert stats.compressed_count == 1
+    assert TaskService().compression_stats() is None
+
+
+def test_service_compressed_descriptions_are_searchable() -> None:
+    service = TaskService(compress_descriptions=True)
+    service.add_task("First", LONG_TEXT)
+    service.add_task("Second", "Nothing relevant here at all, just filler text " * 3)
+    assert [task.id for task in service.search("desc:~quarterly")] == [1]
+    assert [task.id for task in service.search("desc:FIGURES")] == [1]
+
+    service.delete_task(1)
+    assert service.search("desc:~quarterly") == []
+    assert "compressed descriptions" in service.memory_report().structures
@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from src.models.task import Task
+from src.services.dependencies import DependencyIndex
+
+
+def _reaches(edges: dict[int, set[int]], start: int, goal: int) -> bool:
+    """Brute-force search along blocker -> dependent edges."""
+    seen, stack = {start}, [start]
+    while stack:
+        node = stack.pop()
+        if node == goal:
+            return True
+        for nxt in edges.get(node, ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return False
+
+
+def test_order_matches_brute_force_cycle_checks() -> None:
+    rng = random.Random(7)
+    index = DependencyIndex()
+    edges: dict[int, set[int]] = {}
+    for _ in range(600):
+        blocker, task_id = rng.sample(range(1, 60), 2)
+        if _reaches(edges, task_id, blocker):
+            with pytest.raises(ValueError, match="cycle"):
+                index.make_room(blocker, task_id)
+            continue
+        index.make_room(blocker, task_id)
+        edges.setdefault(blocker, set()).add(task_id)
+        blocked_by = sorted(b for b, ds in edges.items() if task_id in ds)
+        index.add(Task(task_id, "t", completed=True, blocked_by=blocked_by))
+
+        position = {node: i for i, node in enumerate(index.order())}
+        for node, dependents in edges.items():
+            assert all(position[node] < position[d] for d in dependents)
+    assert len(index) == sum(map(len, edges.values()))
+
+
+def test_make_room_rejects_self_dependency() -> None:
+    with pytest.raises(ValueError, match="itself"):
+        DependencyIndex().make_room(1, 1)
+
+
+def test_ready_set_follows_open_blockers() -> None:
+    index = DependencyIndex()
+    first, second = Task(1, "a"), Task(2, "b")
+    third = Task(3, "c", blocked_by=[1, 2])
+    index.add_many([third, first, second])
+    assert index.ready.to_list() == [1, 2]
+    assert index.waiting_on(3) == 2
+
+    index.discard(first)
+    first.completed = True
+    index.add(first)
+    assert index.ready.to_list() == [2]
+    index.discard(second)
+    assert index.ready.to_list() == [3]
+
+    index.add(second)
+    assert index.ready.to_list() == [2]
+    index.discard(third)
+    third.blocked_by = ()
+    index.add(third)
+    assert index.ready.to_list() == [2, 3]
+    assert list(index.order()) == []
+
+
+def test_batches_count_like_single_changes() -> None:
+    rng = random.Random(3)
+    tasks = [
+        Task(i, "t", completed=rng.random() < 0.3, blocked_by=[]) for i in range(1, 301)
+    ]
+    for task in tasks[1:]:
+        if rng.random() < 0.5:
+            task.blocked_by = tuple(rng.sample(range(1, task.id), min(3, task.id - 1)))
+    single, batch = DependencyIndex(), DependencyIndex()
+    # Dependents come first, so the second batch holds blockers of both.
+    for task in tasks[150:]:
+        single.add(task)
+    batch.add_many(tasks[150:])
+    rest = tasks[:150]
+    rng.shuffle(rest)
+    for task in rest:
+        single.add(task)
+    batch.add_many(rest)
+    leaving = rng.sample(tasks, 120)
+    for task in leaving:
+        single.discard(task)
+    batch.discard_many(leaving)
+
+    assert batch.ready.to_list() == single.ready.to_list()
+    assert batch._waiting == single._waiting
+    assert list(batch.order()) == list(single.order())
+
+
+def test_forget_and_clear_drop_edges() -> None:
+    index = DependencyIndex()
+    index.add_many([Task(1, "a"), Task(2, "b", blocked_by=[1])])
+    index.forget(2)
+    assert len(index) == 0 and list(index.order()) == []
+    index.add(Task(3, "c", blocked_by=[1]))
+    index.clear()
+    assert len(index) == 0 and not index.ready
@@ -0,0 +1,68 @@
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from src.models.task import Task
+from src.services.task_service import TaskService
+from src.utils.export import export_tasks
+
+
+@pytest.fixture
+def tasks() -> list[Task]:
+    return [
+        Task(id=1, title="Write report", description="Q3, final"),
+        Task(id=2, title="Buy milk", completed=True),
+    ]
+
+
+def test_export_json(tasks: list[Task], tmp_path: Path) -> None:
+    path = tmp_path / "tasks.json"
+    assert export_tasks(tasks, path) == 2
+    rows = json.loads(path.read_text())
+    assert [Task.from_dict(row) for row in rows] == tasks
+
+
+def test_export_csv(tasks: list[Task], tmp_path: Path) -> None:
+    path = tmp_path / "tasks.CSV"
+    assert export_tasks(tasks, path) == 2
+    with open(path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert rows[0]["description"] == "Q3, final"
+    assert rows[1]["completed"] == "True"
+
+
+def test_export_rejects_unknown_format(tasks: list[Task], tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unknown export format"):
+        export_tasks(tasks, tmp_path / "tasks.txt")
+
+
+def test_service_export_refreshes_changed_tasks(tmp_path: Path) -> None:
+    service = TaskService(compress_descriptions=True)
+    service.add_task("Write report", "Q3, final")
+    service.add_task("Buy milk")
+    path = tmp_path / "tasks.csv"
+    assert service.export_tasks(path) == 2
+    first = path.read_text()
+    assert service.export_tasks(path) == 2
+    assert path.read_text() == first
+
+    service.update_task(1, title="Write summary")
+    service.toggle_tasks([2])
+    service.export_tasks(path)
+    with open(path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [row["title"] for row in rows] == ["Write summary", "Buy milk"]
+    assert rows[0]["description"] == "Q3, final"
+    assert rows[1]["completed"] == "True"
+
+
+def test_service_export_matches_plain_export(tmp_path: Path) -> None:
+    service = TaskService()
+    service.add_task("Write report", "Q3, final")
+    service.add_task("Buy milk")
+    service.export_tasks(tmp_path / "cached.json", "status:open")
+    export_tasks(service.search("status:open"), tmp_path / "plain.json")
+    cached = (tmp_path / "cached.json").read_text()
+    assert cached == (tmp_path / "plain.json").read_text()
@@ -0,0 +1,107 @@
+import json
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from src.services.follower import LogFollower
+from src.services.task_service import TaskService
+from src.storage.cold_store import ColdStore
+from src.storage.mutation_log import MutationLog
+
+
+@pytest.fixture
+def log_path(tmp_path: Path) -> Path:
+    return tmp_path / "primary.log"
+
+
+def test_follower_applies_primary_changes(log_path: Path) -> None:
+    primary = TaskService(log=MutationLog(log_path, durability="os"))
+    follower_service = TaskService()
+    follower = LogFollower(follower_service, log_path)
+
+    primary.add_task("Write report")
+    primary.add_task("Buy milk")
+    assert follower.poll() == 2
+    primary.toggle_status(1)
+    primary.delete_task(2)
+    assert follower.poll() == 2
+    assert follower.poll() == 0
+
+    assert follower_service.get_all_tasks() == primary.get_all_tasks()
+    status = follower.status()
+    assert status.records_applied == 4
+    assert status.behind_bytes == 0
+    assert status.lag_seconds == 0.0
+    primary.close()
+
+
+def test_follower_waits_for_complete_records(log_path: Path) -> None:
+    record = {"op": "delete", "ids": [5], "next_id": 6, "ts": 1.0}
+    line = json.dumps(record).encode() + b"\n"
+    log_path.write_bytes(line + line[:10])
+
+    follower = LogFollower(TaskService(), log_path)
+    assert follower.poll() == 1
+    status = follower.status()
+    assert status.behind_bytes == 10
+    assert status.lag_seconds > 0
+
+    with open(log_path, "ab") as file:
+        file.write(line[10:])
+    assert follower.poll() == 1
+    assert follower.status().behind_bytes == 0
+
+
+def test_follower_detects_truncated_log(log_path: Path) -> None:
+    log_path.write_text('{"op":"delete","ids":[1]}\n')
+    follower = LogFollower(TaskService(), log_path)
+    follower.poll()
+    log_path.write_text("")
+    with pytest.raises(ValueError, match="shrank"):
+        follower.poll()
+
+
+def test_follower_background_thread(log_path: Path) -> None:
+    primary = TaskService(log=MutationLog(log_path, durability="os"))
+    primary.add_task("Before start")
+    follower_service = TaskService()
+    follower = LogFollower(follower_service, log_path, poll_interval=0.01)
+    follower.start()
+    try:
+        assert [t.title for t in follower_service.get_all_tasks()] == ["Before start"]
+    finally:
+        follower.stop()
+    primary.close()
+
+
+def test_follower_keeps_archived_tasks(log_path: Path, tmp_path: Path) -> None:
+    primary = TaskService(
+        log=MutationLog(log_path, durability="os"),
+        cold_store=ColdStore(tmp_path / "cold.jsonl"),
+    )
+    primary.add_tasks([("Old", "Done long ago"), ("Open", ""), ("Back", "")])
+    primary.toggle_tasks([1, 3])
+    primary.archive_completed(timedelta(0))
+    primary.toggle_status(3)
+    follower_service = TaskService()
+    LogFollower(follower_service, log_path).poll()
+
+    assert follower_service.get_all_tasks() == primary.get_all_tasks()
+    assert follower_service.get_archived_tasks() == primary.get_archived_tasks()
+    assert follower_service.get_task(1) == primary.get_task(1)
+    primary.close()
+
+
+def test_follower_thread_reports_read_errors(log_path: Path) -> None:
+    follower = LogFollower(TaskService(), log_path, poll_interval=0.01)
+    follower.start()
+    try:
+        log_path.mkdir()
+        deadline = time.monotonic() + 5
+        while follower.status().error is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        follower.stop()
+    assert follower.status().error is not None
@@ -0,0 +1,209 @@
+import random
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from src.models.task import Task
+from src.services.indexes import DueIndex, SortedView, TagIndex, TextIndex
+
+
+def test_sorted_view_by_id() -> None:
+    view = SortedView()
+    for task_id in (3, 1, 2):
+        view.add(Task(id=task_id, title=f"Task {task_id}"))
+    assert list(view.ids()) == [1, 2, 3]
+    assert list(view.ids(reverse=True)) == [3, 2, 1]
+
+
+def test_sorted_view_ties_ordered_by_id() -> None:
+    view = SortedView(lambda task: task.title)
+    for task_id in (5, 2, 9):
+        view.add(Task(id=task_id, title="Same"))
+    view.add(Task(id=1, title="Zeta"))
+    assert list(view.ids()) == [2, 5, 9, 1]
+
+
+def test_sorted_view_discard() -> None:
+    view = SortedView(lambda task: task.title)
+    tasks = [Task(id=i, title=title) for i, title in enumerate("cab", start=1)]
+    for task in tasks:
+        view.add(task)
+    view.discard(tasks[0])
+    assert list(view.ids()) == [2, 3]
+    assert len(view) == 2
+
+    # Discarding a task that is not in the view is a no-op.
+    view.discard(tasks[0])
+    assert len(view) == 2
+
+
+def test_sorted_view_top_k() -> None:
+    start = datetime(2026, 1, 1)
+    view = SortedView(lambda task: task.created_at)
+    for i in range(1, 6):
+        view.add(Task(id=i, title="T", created_at=start + timedelta(days=i)))
+    assert view.top_k(2) == [1, 2]
+    assert view.top_k(2, reverse=True) == [5, 4]
+    assert view.top_k(10, reverse=True) == [5, 4, 3, 2, 1]
+    assert view.top_k(0) == []
+
+
+def test_sorted_view_prefix_ids() -> None:
+    view = SortedView(lambda task: task.title.casefold())
+    titles = ["Report draft", "report final", "Reply to Bob", "Review"]
+    for task_id, title in enumerate(titles, start=1):
+        view.add(Task(id=task_id, title=title))
+    assert view.prefix_ids("rep", 10) == [3, 1, 2]
+    assert view.prefix_ids("report", 1) == [1]
+    assert view.prefix_ids("x", 10) == []
+
+
+def test_sorted_view_batch_operations_match_single() -> None:
+    tasks = [Task(id=i, title=f"Task {i % 7}") for i in range(1, 201)]
+    single = SortedView(lambda task: task.title)
+    batch = SortedView(lambda task: task.title)
+    for task in tasks[:50]:
+        single.add(task)
+        batch.add(task)
+
+    for task in tasks[50:]:
+        single.add(task)
+    batch.add_many(tasks[50:])
+    assert list(batch.ids()) == list(single.ids())
+
+    for task in tasks[::2]:
+        single.discard(task)
+    batch.discard_many(tasks[::2])
+    assert list(batch.ids()) == list(single.ids())
+
+
+def test_sorted_view_restore_keeps_given_order() -> None:
+    tasks = {
+        1: Task(id=1, title="beta"),
+        2: Task(id=2, title="Alpha"),
+        3: Task(id=3, title="gamma"),
+    }
+    view = SortedView(lambda task: task.title.casefold())
+    view.restore([2, 1, 3], tasks)
+    assert list(view.ids()) == [2, 1, 3]
+    assert view.prefix_ids("be", 5) == [1]
+
+
+def test_sorted_view_blocks_follow_random_changes() -> None:
+    rng = random.Random(5)
+    tasks = {i: Task(id=i, title=f"T{rng.randrange(50)}") for i in range(1, 3001)}
+    view = SortedView(lambda task: task.title)
+    for task in tasks.values():
+        view.add(task)
+    for step in range(3000):
+        task = tasks[rng.randrange(1, 3001)]
+        view.discard(task)
+        if step % 3:
+            task.title = f"T{rng.randrange(50)}"
+        view.add(task)
+    view.discard_many(list(tasks.values())[::5])
+    expected = sorted((t.title, t.id) for i, t in tasks.items() if i % 5 != 1)
+    assert list(view.ids()) == [task_id for _, task_id in expected]
+    assert len(view) == len(expected)
+    assert view.count_range("T10", "T20") == len(view.range_ids("T10", "T20"))
+    assert view.range_ids("T10", "T20") == [
+        task_id for title, task_id in expected if "T10" <= title < "T20"
+    ]
+    assert view.count_range("T5", "T1") == 0 and view.range_ids("T5", "T1") == []
+    assert view.prefix_ids("T4", 10_000) == [
+        task_id for title, task_id in expected if title.startswith("T4")
+    ]
+    assert (
+        view.top_k(3, reverse=True) == [task_id for _, task_id in expected[-3:]][::-1]
+    )
+
+
+def test_sorted_view_leaves_unchanged_keys_in_place() -> None:
+    view = SortedView(lambda task: task.title)
+    task = Task(id=1, title="Same")
+    view.add(task)
+    view.add(Task(id=2, title="Other"))
+    with (
+        patch.object(view, "_insert", side_effect=AssertionError),
+        patch.object(view, "_remove", side_effect=AssertionError),
+    ):
+        view.discard(task)
+        task.completed = True
+        view.add(task)
+        assert list(view.ids()) == [2, 1]
+    view.discard(task)
+    assert list(view.ids()) == [2]
+
+
+def test_text_index_rebuilds_lazily_after_invalidate() -> None:
+    tasks = {1: Task(id=1, title="Write report"), 2: Task(id=2, title="Read mail")}
+    index = TextIndex(lambda task: task.title, tasks.values)
+    index.add_many(list(tasks.values()))
+    index.invalidate()
+    tasks[3] = Task(id=3, title="Report bug")
+    index.add(tasks[3])
+    assert index.lookup("report") == {1, 3}
+
+
+def test_due_index_orders_by_due_then_priority() -> None:
+    index = DueIndex()
+    index.add_many(
+        [
+            Task(id=1, title="Later", due_ns=300),
+            Task(id=2, title="Low", due_ns=100, priority=1),
+            Task(id=3, title="High", due_ns=100, priority=3),
+            Task(id=4, title="No due date"),
+            Task(id=5, title="Done", due_ns=50, completed=True),
+        ]
+    )
+    assert index.first(10) == [3, 2, 1]
+    assert index.first(1) == [3]
+    assert index.first(10, before=300) == [3, 2]
+
+
+def test_due_index_matches_sorting_under_churn() -> None:
+    rng = random.Random(3)
+    index = DueIndex(rebuild_min=4)
+    tasks: dict[int, Task] = {}
+    for step in range(2000):
+        task_id = rng.randrange(1, 60)
+        if task_id in tasks:
+            index.discard(tasks.pop(task_id))
+        if rng.random() < 0.7:
+            task = Task(
+                id=task_id,
+                title=f"Task {step}",
+                due_ns=rng.randrange(100) if rng.random() < 0.8 else None,
+                priority=rng.randrange(4),
+                completed=rng.random() < 0.2,
+            )
+            tasks[task_id] = task
+            index.add(task)
+        expected = sorted(
+            (t.due_ns, -t.priority, t.id)
+            for t in tasks.values()
+            if t.due_ns is not None and not t.completed
+        )
+        assert index.first(5) == [key[2] for key in expected[:5]]
+    assert len(index) == len(
+        [t for t in tasks.values() if t.due_ns is not None and not t.completed]
+    )
+
+
+def test_tag_index_selects_and_follows_changes() -> None:
+    tasks = [
+        Task(id=1, title="A", tags=("backend", "urgent")),
+        Task(id=2, title="B", tags=("backend", "blocked", "urgent")),
+        Task(id=3, title="C", tags=("frontend",)),
+        Task(id=4, title="D"),
+    ]
+    index = TagIndex()
+    index.add_many(tasks)
+    assert index.counts() == {"backend": 2, "blocked": 1, "frontend": 1, "urgent": 2}
+    assert index.select([["backend"], ["urgent"]], ["blocked"]).to_list() == [1]
+    assert index.select([["blocked", "frontend"]]).to_list() == [2, 3]
+    assert index.select([], ["backend"]).to_list() == [3, 4]
+    assert index.select([["missing"]]).to_list() == []
+
+    index.discard_many(tasks[:2])
+    assert index.counts() == {"frontend": 1}
+    assert index.all_ids.to_list() == [3, 4]
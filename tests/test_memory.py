@@ -0,0 +1,90 @@
+import tracemalloc
+
+from src.models.task import Task
+from src.services.memory import (
+    StringPool,
+    build_memory_report,
+    deep_sizeof,
+    format_bytes,
+)
+from src.services.task_service import TaskService
+
+
+def test_string_pool_shares_equal_strings() -> None:
+    pool = StringPool()
+    first = pool.intern("".join(["weekly ", "report"]))
+    second = pool.intern("".join(["weekly ", "report"]))
+    assert first is second
+    assert len(pool) == 1
+    assert pool.references == 2
+
+
+def test_string_pool_release() -> None:
+    pool = StringPool()
+    pool.intern("a")
+    pool.intern("a")
+    pool.release("a")
+    assert len(pool) == 1
+    pool.release("a")
+    assert len(pool) == 0
+    pool.release("missing")
+
+
+def test_deep_sizeof_counts_shared_objects_once() -> None:
+    shared = "x" * 100
+    seen: set[int] = set()
+    first = deep_sizeof([shared], seen)
+    second = deep_sizeof([shared], seen)
+    assert first > second
+
+
+def test_format_bytes() -> None:
+    assert format_bytes(512) == "512 B"
+    assert format_bytes(2048) == "2.0 KiB"
+    assert format_bytes(3 * 1024**3) == "3.0 GiB"
+
+
+def test_build_memory_report_fields() -> None:
+    tasks = [Task(id=i, title="Title", description="d" * 500) for i in range(1, 4)]
+    report = build_memory_report(tasks, {"list": list(tasks)})
+    assert report.task_count == 3
+    assert report.fields["description"] > report.fields["title"]
+    assert report.structures["task objects"] > 0
+    assert report.total == sum(report.fields.values()) + sum(report.structures.values())
+
+
+def test_memory_report_dedupe_reduces_text_bytes() -> None:
+    plain = TaskService()
+    pooled = TaskService(dedupe_strings=True)
+    for service in (plain, pooled):
+        for _ in range(50):
+            service.add_task("Generated", "The same long description " * 20)
+
+    plain_report = plain.memory_report()
+    pooled_report = pooled.memory_report()
+    assert pooled_report.fields["description"] < plain_report.fields["description"]
+    assert pooled_report.pooled_strings == 2
+    assert pooled_report.pooled_references == 100
+    assert plain_report.pooled_strings is None
+
+
+def test_dedupe_pool_follows_updates_and_deletes() -> None:
+    service = TaskService(dedupe_strings=True)
+    service.add_task("Same")
+    service.add_task("Same")
+    service.update_task(1, title="Other")
+    service.delete_task(2)
+    service.compact()
+    report = service.memory_report()
+    assert report.pooled_strings == 2
+    assert report.pooled_references == 2
+
+
+def test_memory_report_includes_tracemalloc() -> None:
+    tracemalloc.start()
+    try:
+        report = TaskService().memory_report()
+    finally:
+        tracemalloc.stop()
+    assert report.traced_current is not None
+    assert report.traced_peak is not None
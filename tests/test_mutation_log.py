@@ -0,0 +1,129 @@
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.services.sync import TOP_LEVEL
+from src.services.task_service import TaskService
+from src.storage.mutation_log import MutationLog, read_log
+
+
+def test_mutation_log_rejects_unknown_mode(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unknown durability mode"):
+        MutationLog(tmp_path / "tasks.log", durability="sometimes")
+
+
+@pytest.mark.parametrize("durability", ["always", "group", "os"])
+def test_mutation_log_round_trip(tmp_path: Path, durability: str) -> None:
+    path = tmp_path / "tasks.log"
+    log = MutationLog(path, durability=durability, group_commit_ms=1)
+    for n in range(3):
+        log.wait(log.append({"op": "delete", "ids": [n]}))
+    log.close()
+
+    assert [record["ids"] for record in read_log(path)] == [[0], [1], [2]]
+    if durability == "always":
+        assert log.stats().syncs == 3
+
+
+def test_read_log_ignores_torn_tail(tmp_path: Path) -> None:
+    path = tmp_path / "tasks.log"
+    path.write_bytes(b'{"op":"delete","ids":[1]}\n{"op":"del')
+    assert list(read_log(path)) == [{"op": "delete", "ids": [1]}]
+
+
+def test_group_commit_shares_fsyncs(tmp_path: Path) -> None:
+    log = MutationLog(tmp_path / "tasks.log", group_commit_ms=20, group_commit_ops=8)
+
+    def write() -> None:
+        for n in range(10):
+            log.wait(log.append({"op": "delete", "ids": [n]}))
+
+    threads = [threading.Thread(target=write) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    log.close()
+
+    stats = log.stats()
+    assert stats.records == 80
+    assert stats.syncs < stats.records
+
+
+def test_service_recovers_from_log(tmp_path: Path) -> None:
+    path = tmp_path / "tasks.log"
+    service = TaskService(log=MutationLog(path, durability="os"))
+    service.add_task("Write report", "Numbers")
+    service.add_task("Buy milk")
+    service.add_task("Call Alice")
+    service.update_task(1, description="Quarterly numbers")
+    service.toggle_status(2)
+    service.delete_task(3)
+    expected = service.get_all_tasks()
+    service.close()
+
+    recovered = TaskService()
+    assert recovered.replay_log(path) == 6
+    assert recovered.get_all_tasks() == expected
+    assert recovered.add_task("Next").id == 4
+
+
+def test_undelete_is_replayed(tmp_path: Path) -> None:
+    path = tmp_path / "tasks.log"
+    service = TaskService(log=MutationLog(path, durability="os"))
+    service.add_task("Write report")
+    service.add_task("Buy milk")
+    service.purge_completed()
+    service.delete_tasks([1, 2])
+    service.undelete_task(2)
+    service.close()
+
+    recovered = TaskService()
+    recovered.replay_log(path)
+    assert [task.title for task in recovered.get_all_tasks()] == ["Buy milk"]
+    assert recovered.deleted_count() == 1
+
+
+def test_compaction_is_replayed(tmp_path: Path) -> None:
+    path = tmp_path / "tasks.log"
+    service = TaskService(log=MutationLog(path, durability="os"))
+    service.add_tasks((f"Task {i}", "") for i in range(6))
+    service.delete_tasks([1, 2, 3])
+    assert service.compact() == 3
+    service.delete_task(4)
+    service.close()
+
+    recovered = TaskService()
+    recovered.replay_log(path)
+    assert recovered.deleted_count() == 1
+    assert recovered.sync_hashes(TOP_LEVEL) == service.sync_hashes(TOP_LEVEL)
+    with pytest.raises(ValueError, match="No deleted task"):
+        recovered.undelete_task(1)
+
+
+def test_apply_record_rejects_unknown_operation() -> None:
+    with pytest.raises(ValueError, match="Unknown mutation log operation"):
+        TaskService().apply_record({"op": "truncate"})
+    with pytest.raises(ValueError, match="Invalid mutation log record"):
+        TaskService().apply_record({"op": "put"})
+
+
+def test_replay_refuses_a_rewritten_snapshot(tmp_path: Path) -> None:
+    snapshot_path = tmp_path / "tasks.snap"
+    source = TaskService()
+    source.add_task("In the snapshot")
+    source.save_snapshot(snapshot_path)
+    log_path = tmp_path / "tasks.log"
+    service = TaskService(log=MutationLog(log_path, durability="os"))
+    service.load_snapshot(snapshot_path)
+    service.close()
+
+    recovered = TaskService()
+    recovered.replay_log(log_path)
+    assert [task.title for task in recovered.get_all_tasks()] == ["In the snapshot"]
+
+    source.add_task("Added later")
+    source.save_snapshot(snapshot_path)
+    with pytest.raises(ValueError, match="not the snapshot that was loaded"):
+        TaskService().replay_log(log_path)
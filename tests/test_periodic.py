@@ -0,0 +1,51 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.services.periodic import PeriodicWorker
+
+
+def test_worker_runs_action_until_stopped() -> None:
+    ran = threading.Event()
+    worker = PeriodicWorker(ran.set, interval=0.01, name="test-worker")
+    worker.start()
+    assert ran.wait(2)
+    worker.stop()
+    runs = worker.runs
+    assert runs >= 1
+    assert worker.runs == runs
+
+
+def test_worker_stops_on_error() -> None:
+    def fail() -> None:
+        raise OSError("disk full")
+
+    worker = PeriodicWorker(fail, interval=0.01, name="test-worker")
+    worker.start()
+    for _ in range(200):
+        if worker.error:
+            break
+        threading.Event().wait(0.01)
+    worker.stop()
+    assert worker.error == "disk full"
+    assert worker.runs == 0
+
+
+def test_worker_rejects_non_positive_interval() -> None:
+    with pytest.raises(ValueError, match="must be positive"):
+        PeriodicWorker(lambda: None, interval=0, name="test-worker")
+
+
+def test_worker_runs_as_asyncio_job() -> None:
+    ran = threading.Event()
+    worker = PeriodicWorker(ran.set, interval=0.01, name="test-worker")
+
+    async def main() -> None:
+        job = asyncio.create_task(worker.run_async())
+        await asyncio.to_thread(ran.wait, 2)
+        job.cancel()
+        await asyncio.gather(job, return_exceptions=True)
+
+    asyncio.run(main())
+    assert ran.is_set()
@@ -0,0 +1,137 @@
+from datetime import datetime
+
+import pytest
+
+from src.services.query import (
+    CreatedFilter,
+    StatusFilter,
+    SubstringFilter,
+    TagFilter,
+    WordsFilter,
+    parse_query,
+)
+from src.services.task_service import TaskService
+
+
+@pytest.fixture
+def service() -> TaskService:
+    service = TaskService()
+    service.add_task("Write weekly report", "Sales numbers")
+    service.add_task("Review report draft")
+    service.add_task("Buy groceries", "Milk and eggs")
+    service.add_task("Plan sprint", "Report blockers")
+    service.toggle_status(2)
+    return service
+
+
+def test_parse_query_terms() -> None:
+    query = parse_query("status:open created>=2026-10-01 title:~report limit:5")
+    assert query.filters == [
+        StatusFilter(completed=False),
+        CreatedFilter(start=datetime(2026, 10, 1)),
+        WordsFilter(("title",), ("report",)),
+    ]
+    assert query.limit == 5
+
+
+def test_parse_query_day_and_substring() -> None:
+    query = parse_query('created:2026-10-01 desc:"milk and" sort:-created')
+    assert query.filters == [
+        CreatedFilter(start=datetime(2026, 10, 1), end=datetime(2026, 10, 2)),
+        SubstringFilter("description", "milk and"),
+    ]
+    assert query.sort_key == "created_at"
+    assert query.reverse is True
+    assert parse_query("created<=20261001").filters == [
+        CreatedFilter(end=datetime(2026, 10, 2))
+    ]
+
+
+@pytest.mark.parametrize(
+    ("text", "message"),
+    [
+        ("status:maybe", "Invalid status: maybe."),
+        ("created>=yesterday", "Invalid date: yesterday."),
+        ("owner:me", "Unknown query field: owner."),
+        ("limit:0", "Limit must be a positive number."),
+        ("sort:size", "Invalid sort key: size."),
+        ('title:"unclosed', "Invalid query"),
+    ],
+)
+def test_parse_query_errors(text: str, message: str) -> None:
+    with pytest.raises(ValueError, match=message):
+        parse_query(text)
+
+
+def test_search_combines_filters(service: TaskService) -> None:
+    tasks = service.search("status:open title:~report")
+    assert [task.id for task in tasks] == [1]
+
+    tasks = service.search("report")
+    assert [task.id for task in tasks] == [1, 2, 4]
+
+
+def test_search_substring_and_dates(service: TaskService) -> None:
+    assert [task.id for task in service.search("title:GROC")] == [3]
+    assert service.search("created<2000-01-01") == []
+    today = datetime.now().date().isoformat()
+    assert len(service.search(f"created:{today}")) == 4
+
+
+def test_search_sort_and_limit(service: TaskService) -> None:
+    tasks = service.search("sort:-id limit:2")
+    assert [task.id for task in tasks] == [4, 3]
+
+    tasks = service.search("report sort:title")
+    assert [task.title for task in tasks] == [
+        "Plan sprint",
+        "Review report draft",
+        "Write weekly report",
+    ]
+
+
+def test_search_follows_updates(service: TaskService) -> None:
+    service.update_task(3, title="Buy report paper")
+    assert [task.id for task in service.search("title:~report")] == [1, 2, 3]
+    service.delete_task(1)
+    assert [task.id for task in service.search("title:~report")] == [2, 3]
+
+
+def test_explain_picks_most_selective_index(service: TaskService) -> None:
+    plan = service.explain("status:open title:~groceries")
+    assert plan.access.startswith("text index")
+    assert plan.estimated_rows == 1
+    assert "status = open" in plan.describe()
+
+
+def test_explain_falls_back_to_scan(service: TaskService) -> None:
+    plan = service.explain("title:sprint")
+    assert plan.access == "full scan of id view"
+    assert plan.estimated_rows == 4
+
+    plan = service.explain("sort:-created limit:2")
+    assert plan.access == "ordered scan of created_at view"
+
+
+def test_tag_terms_use_the_bitmap_index(service: TaskService) -> None:
+    service.tag_tasks([1, 2, 4], add=["work"])
+    service.tag_tasks([1, 3], add=["urgent"])
+    service.tag_tasks([2], add=["blocked"])
+    assert parse_query("tag:Work|#urgent -tag:blocked").filters == [
+        TagFilter(("work", "urgent")),
+        TagFilter(("blocked",), negated=True),
+    ]
+
+    plan = service.explain("tag:work -tag:blocked status:open")
+    assert plan.access.startswith("tag bitmap index")
+    assert plan.estimated_rows == 2
+    assert [f.describe() for f in plan.residual] == ["status = open"]
+    assert service.find_ids("tag:work -tag:blocked") == [1, 4]
+    assert service.find_ids("tag:work tag:urgent") == [1]
+    assert service.find_ids("-tag:work sort:-id") == [3]
+    assert service.find_ids("tag:work|urgent sort:-id limit:2") == [4, 3]
+
+    service.update_task(4, tags=[])
+    assert service.find_ids("tag:work") == [1, 2]
+    with pytest.raises(ValueError, match="Invalid tag"):
+        parse_query("tag:no+plus")
@@ -0,0 +1,116 @@
+from pathlib import Path
+
+import pytest
+
+from src.services.recorder import TraceRecorder, read_trace, replay_trace
+from src.services.task_service import TaskService
+from src.storage.cold_store import ColdStore
+
+
+def record_workload(path: Path) -> None:
+    recorder = TraceRecorder(path)
+    service = recorder.attach(TaskService())
+    service.add_task("Write report")
+    service.add_task("Buy milk")
+    service.toggle_status(1)
+    service.search("report")
+    service.delete_tasks(task_id for task_id in [2])
+    with pytest.raises(ValueError):
+        service.update_task(99, title="Missing")
+    recorder.close()
+
+
+def test_recorder_captures_outer_calls_only(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    record_workload(path)
+
+    events = read_trace(path)
+    assert [event.op for event in events] == [
+        "add_task",
+        "add_task",
+        "toggle_status",
+        "search",
+        "delete_tasks",
+        "update_task",
+    ]
+    assert events[1].result_id == 2
+    assert events[4].args == [[2]]
+    assert events[5].error == "Task with ID 99 not found."
+    assert all(event.duration >= 0 for event in events)
+
+
+def test_replay_scales_workload_with_own_ids(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    record_workload(path)
+    service = TaskService()
+    service.add_task("Existing")
+
+    report = replay_trace(read_trace(path), service, speed=None, scale=3)
+
+    assert report.operations == 18
+    assert report.errors == 3
+    tasks = service.get_all_tasks()
+    assert [task.title for task in tasks] == ["Existing"] + ["Write report"] * 3
+    assert [task.completed for task in tasks] == [False, True, True, True]
+    p50, p95, p99 = report.percentiles()
+    assert 0 <= p50 <= p95 <= p99
+    assert report.throughput > 0
+
+
+def test_replay_maps_ids_of_bulk_adds(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    recorder = TraceRecorder(path)
+    service = recorder.attach(TaskService())
+    service.add_tasks((title, "") for title in ("One", "Two"))
+    service.toggle_tasks([2])
+    recorder.close()
+    events = read_trace(path)
+    assert events[0].result_ids == [1, 2]
+
+    replayed = TaskService()
+    replayed.add_task("Existing")
+    replay_trace(events, replayed, speed=None, scale=2)
+    assert replayed.find_ids("status:done") == [3, 5]
+
+
+def test_replay_maps_id_ranges_and_refuses_store_wide_calls(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    recorder = TraceRecorder(path)
+    service = recorder.attach(TaskService())
+    service.add_tasks((title, "") for title in ("One", "Two", "Three"))
+    service.toggle_tasks(service.ids_in_ranges([(2, 3)]))
+    recorder.close()
+
+    replayed = TaskService()
+    replayed.add_task("Existing")
+    replay_trace(read_trace(path), replayed, speed=None, scale=2)
+    assert replayed.find_ids("status:done") == [3, 4, 6, 7]
+
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"at": 0, "op": "delete_where", "args": ["status:done"]}\n')
+    with pytest.raises(ValueError, match="delete_where at a scale above 1"):
+        replay_trace(read_trace(path), TaskService(), speed=None, scale=2)
+    assert replay_trace(read_trace(path), TaskService(), speed=None).errors == 0
+
+
+def test_replay_decodes_timedelta_arguments(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    path.write_text(
+        '{"at": 0, "op": "archive_completed", "args": [{"timedelta": 86400}]}\n'
+    )
+    service = TaskService(cold_store=ColdStore(tmp_path / "cold.jsonl"))
+    service.add_task("Old")
+    service.toggle_status(1)
+    report = replay_trace(read_trace(path), service, speed=None)
+    assert report.errors == 0
+    assert service.archived_count() == 0
+
+    with pytest.raises(ValueError, match="speed must be positive"):
+        replay_trace([], TaskService(), speed=0)
+
+
+def test_read_trace_rejects_invalid_lines(tmp_path: Path) -> None:
+    path = tmp_path / "trace.jsonl"
+    path.write_text('{"op": "add_task"}\n')
+    with pytest.raises(ValueError, match="line 1"):
+        read_trace(path)
@@ -0,0 +1,133 @@
+import threading
+from collections.abc import Iterator
+from datetime import date, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.models.task import Task
+from src.remote.client import RemoteTaskService
+from src.remote.protocol import (
+    RemotePlan,
+    decode_header,
+    decode_value,
+    encode_frame,
+    encode_value,
+)
+from src.remote.server import TaskServer
+from src.services.stats import TaskStats
+from src.services.task_service import TaskService
+from src.storage.mutation_log import MutationLog
+from src.ui.cli import TodoCLI
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[TaskServer]:
+    server = TaskServer(TaskService(), tmp_path / "todo.sock")
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def remote(server: TaskServer) -> Iterator[RemoteTaskService]:
+    remote = RemoteTaskService(server.path, timeout=5)
+    yield remote
+    remote.close()
+
+
+def test_values_survive_the_wire() -> None:
+    task = Task(id=3, title="Wire", description="Notes", completed=True, tags=["x"])
+    task.completed_ns = task.created_ns
+    stats = TaskStats(total=1, open=0, completed=1, created_per_day={date.today(): 1})
+    values = [task, (1, 2), timedelta(days=2), stats, {"a": [None, 1.5]}]
+    assert decode_value(encode_value(values)) == values
+    with pytest.raises(TypeError):
+        encode_value(object())
+
+
+def test_frame_header_carries_length_and_request_id() -> None:
+    frame = encode_frame(42, ["payload"])
+    length, request_id = decode_header(frame[:8])
+    assert (length, request_id) == (len(frame) - 8, 42)
+
+
+def test_remote_calls_reach_the_server(
+    server: TaskServer, remote: RemoteTaskService
+) -> None:
+    task = remote.add_task("Remote", "Over the socket")
+    assert task.id == 1 and server.service.get_task(1) == task
+    assert remote.toggle_status(1).completed
+    assert remote.search("status:done") == [server.service.get_task(1)]
+    assert remote.stats().completed == 1
+    plan = remote.explain("status:done")
+    assert isinstance(plan, RemotePlan) and "Access" in plan.describe()
+    with pytest.raises(ValueError, match="Task with ID 9 not found"):
+        remote.update_task(9, title="Missing")
+
+
+def test_batches_and_pipelines_share_round_trips(
+    server: TaskServer, remote: RemoteTaskService
+) -> None:
+    added = remote.batch([("add_task", (f"Task {i}",), {}) for i in range(5)])
+    assert [task.id for task in added] == [1, 2, 3, 4, 5]
+    results = remote.pipeline(
+        [[("toggle_status", (i,), {})] for i in (1, 2)]
+        + [[("find_ids", ("status:done",), {}), ("deleted_count", (), {})]]
+    )
+    assert results[-1] == [[1, 2], 0]
+    assert server.stats().frames == 4 and server.stats().calls == 9
+
+
+def test_unknown_methods_are_rejected(remote: RemoteTaskService) -> None:
+    with pytest.raises(ValueError, match="Unknown remote method: save_snapshot"):
+        remote.call("save_snapshot", "/tmp/stolen.snap")
+
+
+def test_exports_are_written_by_the_client(
+    remote: RemoteTaskService, tmp_path: Path
+) -> None:
+    remote.add_tasks([("Report", ""), ("Mail", "")])
+    with pytest.raises(ValueError, match="Unknown remote method: export_tasks"):
+        remote.call("export_tasks", str(tmp_path / "server.json"), None)
+    assert remote.export_tasks(tmp_path / "mine.json", "title:report") == 1
+    assert '"Report"' in (tmp_path / "mine.json").read_text()
+    assert not (tmp_path / "server.json").exists()
+
+
+def test_concurrent_writers_share_fsyncs(tmp_path: Path) -> None:
+    log = MutationLog(tmp_path / "tasks.log", "group", group_commit_ms=20)
+    server = TaskServer(TaskService(log=log), tmp_path / "todo.sock")
+    server.start()
+    clients = [RemoteTaskService(server.path, timeout=5) for _ in range(8)]
+
+    def write(client: RemoteTaskService) -> None:
+        for i in range(10):
+            client.add_task(f"Task {i}")
+
+    threads = [threading.Thread(target=write, args=(c,)) for c in clients]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        for client in clients:
+            client.close()
+        server.stop()
+        log.close()
+    stats = log.stats()
+    assert stats.records == 80 and stats.syncs < 40
+
+
+@patch("builtins.input", side_effect=["1", "Remote task", "", "2", "6"])
+def test_cli_runs_against_remote_service(
+    mock_input: object,
+    server: TaskServer,
+    remote: RemoteTaskService,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    TodoCLI(remote).run()
+    assert "Remote task" in capsys.readouterr().out
+    assert server.service.get_task(1) is not None
@@ -0,0 +1,170 @@
+import hashlib
+import marshal
+import struct
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.services.task_service import TaskService
+from src.storage.snapshot import (
+    MAGIC,
+    Snapshot,
+    read_snapshot,
+    write_snapshot,
+)
+
+
+@pytest.fixture
+def service() -> TaskService:
+    service = TaskService()
+    service.add_task("Write report", "Quarterly numbers")
+    service.add_task("buy milk")
+    service.add_task("Call Alice", "About the report")
+    service.toggle_status(2)
+    service.update_task(3, due_at=datetime(2030, 1, 2, 9, 30), priority=3)
+    service.tag_tasks([1, 3], add=["work"])
+    service.add_dependency(3, 1)
+    return service
+
+
+def test_snapshot_round_trip(service: TaskService, tmp_path: Path) -> None:
+    path = tmp_path / "tasks.snap"
+    assert service.save_snapshot(path) == path.stat().st_size
+
+    restored = TaskService()
+    assert restored.load_snapshot(path) == 3
+    assert restored.get_all_tasks() == service.get_all_tasks()
+    assert [t.id for t in restored.get_all_tasks("title")] == [2, 3, 1]
+    assert [t.id for t in restored.search("report")] == [1, 3]
+    assert [t.id for t in restored.search("status:done")] == [2]
+    assert restored.add_task("Next").id == 4
+    assert [t.id for t in restored.next_due()] == [3]
+    assert restored.find_ids("tag:work") == [1, 3]
+    assert [t.id for t in restored.dependency_order()] == [1, 3]
+    assert [t.id for t in restored.ready_tasks()] == [1, 4]
+
+
+def test_load_snapshot_replaces_existing_tasks(
+    service: TaskService, tmp_path: Path
+) -> None:
+    path = tmp_path / "tasks.snap"
+    service.save_snapshot(path)
+
+    other = TaskService()
+    for title in ["Stale one", "Stale two", "Stale three", "Stale four"]:
+        other.add_task(title)
+    other.load_snapshot(path)
+    assert [t.title for t in other.get_all_tasks()] == [
+        "Write report",
+        "buy milk",
+        "Call Alice",
+    ]
+    assert other.search("stale") == []
+
+
+def test_snapshot_with_compressed_and_pooled_text(
+    service: TaskService, tmp_path: Path
+) -> None:
+    path = tmp_path / "tasks.snap"
+    service.save_snapshot(path)
+
+    restored = TaskService(dedupe_strings=True, compress_descriptions=True)
+    restored.load_snapshot(path, validate=True)
+    assert restored.get_all_tasks() == service.get_all_tasks()
+    assert [t.id for t in restored.search("desc:numbers")] == [1]
+
+
+def test_snapshot_checksum_mismatch(service: TaskService, tmp_path: Path) -> None:
+    path = tmp_path / "tasks.snap"
+    service.save_snapshot(path)
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        TaskService().load_snapshot(path)
+
+
+def test_snapshot_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "tasks.json"
+    path.write_text('{"tasks": []}' * 4)
+    with pytest.raises(ValueError, match="not a task snapshot"):
+        read_snapshot(path)
+
+
+def test_validated_load_rejects_invalid_task(tmp_path: Path) -> None:
+    path = tmp_path / "tasks.snap"
+    now = time.time_ns()
+    snapshot = Snapshot(
+        next_id=2,
+        ids=[1],
+        titles=[""],
+        descriptions=[""],
+        completed=b"\x00",
+        created=[now],
+        completed_at=[None],
+    )
+    write_snapshot(path, snapshot)
+
+    with pytest.raises(ValueError):
+        TaskService().load_snapshot(path, validate=True)
+
+
+def test_version_1_snapshot_converts_iso_timestamps(
+    service: TaskService, tmp_path: Path
+) -> None:
+    path = tmp_path / "v1.snap"
+    tasks = service.get_all_tasks()
+    columns = (
+        4,
+        [task.id for task in tasks],
+        [task.title for task in tasks],
+        [task.description for task in tasks],
+        bytes(task.completed for task in tasks),
+        [task.created_at.isoformat() for task in tasks],
+        [
+            task.completed_at.isoformat() if task.completed_at else None
+            for task in tasks
+        ],
+        {},
+    )
+    body = marshal.dumps(columns)
+    digest = hashlib.blake2b(body, digest_size=16).digest()
+    path.write_bytes(struct.pack("<8sHQ16s", MAGIC, 1, len(body), digest) + body)
+
+    restored = TaskService()
+    assert restored.load_snapshot(path) == 3
+    for old, new in zip(tasks, restored.get_all_tasks(), strict=True):
+        assert new.created_ns == old.created_ns // 1000 * 1000
+        assert new.completed_at == old.completed_at
+        assert new.title == old.title
+    assert restored.add_task("Next").id == 4
+
+
+def test_version_2_snapshot_loads_without_due_dates(
+    service: TaskService, tmp_path: Path
+) -> None:
+    path = tmp_path / "old.snap"
+    snapshot = Snapshot.from_tasks(service.get_all_tasks(), next_id=4)
+    columns = (
+        snapshot.next_id,
+        snapshot.ids,
+        snapshot.titles,
+        snapshot.descriptions,
+        snapshot.completed,
+        snapshot.created,
+        snapshot.completed_at,
+        snapshot.view_orders,
+    )
+    body = marshal.dumps(columns)
+    digest = hashlib.blake2b(body, digest_size=16).digest()
+    path.write_bytes(struct.pack("<8sHQ16s", MAGIC, 2, len(body), digest) + body)
+
+    restored = TaskService()
+    assert restored.load_snapshot(path) == 3
+    task = restored.get_task(3)
+    assert task is not None and task.due_ns is None and task.priority == 0
+    assert task.tags == () and restored.tag_counts() == {}
+    assert task.blocked_by == () and restored.dependency_order() == []
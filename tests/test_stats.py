@@ -0,0 +1,106 @@
+from collections import Counter
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.models.task import Task, to_ns
+from src.services.stats import ActivityIndex
+from src.services.task_service import TaskService
+
+DAY = datetime(2026, 3, 10, 9, 0)
+
+
+class FakeClock:
+    def __init__(self, moment: datetime) -> None:
+        self.moment = moment
+
+    def __call__(self) -> int:
+        return to_ns(self.moment)
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock(DAY)
+
+
+def test_activity_index_counts_by_day() -> None:
+    index = ActivityIndex()
+    first = Task(id=1, title="A", created_at=DAY)
+    second = Task(
+        id=2,
+        title="B",
+        completed=True,
+        created_at=DAY,
+        completed_at=DAY + timedelta(days=1),
+    )
+    index.add_many([first, second])
+    created, completed = index.histograms(date(2026, 3, 11), days=2)
+    assert created == {date(2026, 3, 10): 2, date(2026, 3, 11): 0}
+    assert completed == {date(2026, 3, 10): 0, date(2026, 3, 11): 1}
+
+    index.discard_many([first, second])
+    assert not index.created and not index.completed
+
+
+def test_activity_batches_match_single_changes() -> None:
+    tasks = [
+        Task(
+            id=i,
+            title="T",
+            completed=i % 3 == 0,
+            created_at=DAY + timedelta(hours=5 * (i % 11)),
+            completed_at=DAY + timedelta(days=2, hours=i % 30),
+        )
+        for i in range(1, 200)
+    ]
+    single, batch = ActivityIndex(), ActivityIndex()
+    for task in tasks:
+        single.add(task)
+    batch.add_many(tasks)
+    assert (batch.created, batch.completed) == (single.created, single.completed)
+    for task in tasks[::2]:
+        single.discard(task)
+    batch.discard_many(tasks[::2])
+    assert (batch.created, batch.completed) == (single.created, single.completed)
+    assert all(count > 0 for count in batch.created.values())
+
+
+def test_stats_follow_every_mutation(clock: FakeClock) -> None:
+    service = TaskService(clock=clock)
+    service.add_tasks([("One", ""), ("Two", ""), ("Three", "")])
+    clock.moment += timedelta(days=1)
+    service.add_task("Four")
+    service.toggle_tasks([1, 4])
+    service.delete_task(2)
+    service.undelete_task(2)
+    service.delete_task(3)
+
+    stats = service.stats(days=3)
+    assert (stats.total, stats.open, stats.completed, stats.deleted) == (3, 1, 2, 1)
+    assert stats.completion_ratio == pytest.approx(2 / 3)
+    assert list(stats.created_per_day.values()) == [0, 2, 1]
+    assert list(stats.completed_per_day.values()) == [0, 0, 2]
+
+    tasks = service.get_all_tasks()
+    recount = Counter(task.created_at.date() for task in tasks)
+    assert {day: n for day, n in stats.created_per_day.items() if n} == recount
+
+
+def test_stats_survive_snapshot_load(clock: FakeClock, tmp_path: Path) -> None:
+    service = TaskService(clock=clock)
+    service.add_tasks([("One", ""), ("Two", "")])
+    service.toggle_status(2)
+    service.save_snapshot(tmp_path / "tasks.snap")
+
+    restored = TaskService(clock=clock)
+    restored.add_task("Replaced")
+    restored.load_snapshot(tmp_path / "tasks.snap")
+    loaded, saved = restored.stats(days=1), service.stats(days=1)
+    assert replace(loaded, autosave=saved.autosave) == saved
+
+
+def test_stats_rejects_empty_range() -> None:
+    with pytest.raises(ValueError, match="at least one day"):
+        TaskService().stats(days=0)
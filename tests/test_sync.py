@@ -0,0 +1,211 @@
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from src.remote.client import RemoteTaskService
+from src.remote.server import TaskServer
+from src.services.sync import LEAF_BITS, REPLICA_BITS, RangeHashTree, read_sync_file
+from src.services.task_service import TaskService
+from src.storage.cold_store import ColdStore
+from src.storage.mutation_log import MutationLog
+
+
+def _state(service: TaskService) -> list[dict[str, object]]:
+    """Returns every record sync covers, deleted ones included."""
+    return service.sync_records(list(range(1, 2000)))
+
+
+def _tasks(service: TaskService) -> list[dict[str, object]]:
+    """Returns the stored records sync covers, whatever their IDs."""
+    return service.sync_records(sorted(task.id for task in service.get_all_tasks()))
+
+
+@pytest.fixture
+def stores() -> tuple[TaskService, TaskService]:
+    left, right = TaskService(), TaskService()
+    left.add_tasks((f"Task {i}", "") for i in range(1000))
+    assert right.sync_with(left).pulled == 1000
+    return left, right
+
+
+def test_identical_stores_compare_only_top_hashes(
+    stores: tuple[TaskService, TaskService],
+) -> None:
+    left, right = stores
+    report = left.sync_with(right)
+    assert report.differing == 0 and report.hashes_received == 1
+
+
+def test_sync_moves_only_changed_records(
+    stores: tuple[TaskService, TaskService],
+) -> None:
+    left, right = stores
+    left.update_task(5, title="Edited on the left")
+    right.toggle_status(700)
+    right.delete_task(900)
+    right.add_task("Only on the right")
+
+    report = left.sync_with(right)
+    assert (report.differing, report.pulled, report.pushed) == (4, 3, 1)
+    assert _state(left) == _state(right)
+    assert left.get_task(900) is None and left.deleted_count() == 1
+    assert left.add_task("Next").id == 1002
+    assert left.sync_with(right).differing == 1
+
+
+def test_adds_on_both_sides_keep_every_task(tmp_path: Path) -> None:
+    left = TaskService(replica=1)
+    right = TaskService(replica=2, cold_store=ColdStore(tmp_path / "cold.jsonl"))
+    left.add_tasks([("Shared", ""), ("Also shared", "")])
+    right.sync_with(left)
+    left.add_task("Left only")
+    right.add_tasks([("Right only", ""), ("Right too", "")])
+
+    report = left.sync_with(right)
+    assert (report.pulled, report.pushed) == (2, 1)
+    titles = sorted(task.title for task in left.get_all_tasks())
+    assert titles == ["Also shared", "Left only", "Right only", "Right too", "Shared"]
+    assert _tasks(left) == _tasks(right)
+    assert left.add_task("Next").id == (1 << REPLICA_BITS) + 4
+    assert right.add_task("Next").id == (2 << REPLICA_BITS) + 3
+
+    right.toggle_tasks([(1 << REPLICA_BITS) + 1, (2 << REPLICA_BITS) + 1])
+    right.archive_completed(timedelta(0))
+    reopened = TaskService(replica=2, cold_store=ColdStore(tmp_path / "cold.jsonl"))
+    assert reopened.add_task("After").id == (2 << REPLICA_BITS) + 2
+    with pytest.raises(ValueError, match="Replica numbers"):
+        TaskService(replica=-1)
+
+
+def test_higher_version_wins_and_ties_resolve_the_same_way(
+    stores: tuple[TaskService, TaskService],
+) -> None:
+    left, right = stores
+    left.update_task(1, title="Once")
+    right.update_task(1, title="Twice")
+    right.update_task(1, title="Twice, second edit")
+    left.update_task(2, title="Left tie")
+    right.update_task(2, title="Right tie")
+
+    left.sync_with(right)
+    assert _state(left) == _state(right)
+    task = left.get_task(1)
+    assert task is not None and task.title == "Twice, second edit"
+    task = left.get_task(2)
+    assert task is not None and task.version == 1
+
+
+def test_opposite_dependencies_resolve_the_same_way(tmp_path: Path) -> None:
+    left = TaskService(replica=1)
+    right = TaskService(replica=2, cold_store=ColdStore(tmp_path / "cold.jsonl"))
+    x, y, a, b, c = (t.id for t in left.add_tasks((n, "") for n in "xyabc"))
+    left.add_dependency(c, a)
+    left.toggle_status(c)
+    right.sync_with(left)
+    right.archive_completed(timedelta(0))
+    left.add_dependency(x, y)
+    right.add_dependency(y, x)
+    left.add_dependency(a, b)
+    right.add_dependency(b, c)
+
+    left.sync_with(right)
+    assert _state(left) == _state(right)
+    tasks = {task.id: task for task in left.get_all_tasks()}
+    assert len(tasks[x].blocked_by + tasks[y].blocked_by) == 1
+    assert len(tasks[a].blocked_by + tasks[b].blocked_by + tasks[c].blocked_by) == 2
+    assert [t.id for t in left.ready_tasks()] == [t.id for t in right.ready_tasks()]
+    for chain in ({x, y}, {a, b, c}):
+        orders = [
+            [t.id for t in service.dependency_order() if t.id in chain]
+            for service in (left, right)
+        ]
+        assert orders[0] == orders[1]
+    assert left.sync_with(right).differing == 0
+
+
+def test_tree_follows_changes_without_rebuilding(
+    stores: tuple[TaskService, TaskService],
+) -> None:
+    left, _ = stores
+    left.update_task(3, title="Changed")
+    left.delete_task(4)
+    left.undelete_task(4)
+    fresh = RangeHashTree(left._description, left._sync_source)
+    fresh.invalidate()
+    for level in range(7):
+        assert fresh.hashes(level) == left.sync_hashes(level)
+    with pytest.raises(ValueError, match="leaf range"):
+        left.sync_hashes(-1)
+
+
+def test_merges_replay_from_the_log(
+    stores: tuple[TaskService, TaskService], tmp_path: Path
+) -> None:
+    _, right = stores
+    log_path = tmp_path / "tasks.log"
+    left = TaskService(log=MutationLog(log_path))
+    left.sync_with(right)
+    right.update_task(10, title="Remote edit")
+    right.delete_task(11)
+    left.sync_with(right)
+    left.close()
+
+    replayed = TaskService()
+    replayed.replay_log(log_path)
+    assert _state(replayed) == _state(right)
+
+
+def test_sync_by_files(stores: tuple[TaskService, TaskService], tmp_path: Path) -> None:
+    left, right = stores
+    left.update_task(1, title="Left edit")
+    right.update_task(1 << LEAF_BITS, title="Right edit")
+    summary, records, reply = (tmp_path / name for name in ("s", "r", "b"))
+
+    left.write_sync_summary(summary)
+    answered = right.answer_sync_file(summary, records)
+    # Leaf ranges 0 and 1 hold IDs 1-63 and 64-127.
+    assert answered.differing == 2 and answered.pushed == 127
+    with pytest.raises(ValueError, match="reply file"):
+        left.answer_sync_file(records)
+    assert left.answer_sync_file(records, reply).pulled == 1
+    assert right.answer_sync_file(reply).pulled == 1
+    assert _state(left) == _state(right)
+
+    summary.write_bytes(b"junk")
+    with pytest.raises(ValueError, match="not a sync file"):
+        read_sync_file(summary)
+
+
+def test_sync_over_a_socket(
+    stores: tuple[TaskService, TaskService], tmp_path: Path
+) -> None:
+    left, right = stores
+    server = TaskServer(right, tmp_path / "todo.sock")
+    server.start()
+    remote = RemoteTaskService(server.path, timeout=5)
+    try:
+        right.update_task(300, description="Changed over there")
+        left.toggle_status(301)
+        report = left.sync_with(remote)
+        assert (report.pulled, report.pushed) == (1, 1)
+        assert _state(left) == _state(right)
+    finally:
+        remote.close()
+        server.stop()
+
+
+def test_archived_tasks_are_covered_and_deletions_travel(tmp_path: Path) -> None:
+    left = TaskService(cold_store=ColdStore(tmp_path / "cold.jsonl"))
+    left.add_tasks((f"Task {i}", "Notes") for i in range(100))
+    left.toggle_tasks([1, 2])
+    right = TaskService(compress_descriptions=True)
+    right.sync_with(left)
+
+    left.archive_completed(timedelta(0))
+    assert left.sync_with(right).differing == 0
+    left.delete_task(2)
+    assert left.deleted_count() == 1
+    assert left.sync_with(right).pushed == 1
+    assert right.get_task(2) is None and right.get_task(1) is not None
+    assert _state(left) == _state(right)
@@ -1,8 +1,9 @@
+from copy import copy
 from datetime import datetime
 
 import pytest
 
-from src.models.task import Task
+from src.models.task import Task, from_ns, to_ns
 
 
 def test_task_creation_valid() -> None:
@@ -65,3 +66,90 @@ def test_task_defaults() -> None:
     assert task.description == ""
     assert task.completed is False
     assert isinstance(task.created_at, datetime)
+
+
+def test_task_from_dict_round_trip() -> None:
+    now = datetime.now()
+    task = Task(id=4, title="Round", completed=True, created_at=now, completed_at=now)
+    assert Task.from_dict(task.to_dict()) == task
+
+
+def test_task_from_dict_invalid() -> None:
+    with pytest.raises(ValueError, match="Invalid task data"):
+        Task.from_dict({"title": "No id"})
+
+
+def test_task_timestamps_are_integer_nanoseconds() -> None:
+    now = datetime(2024, 5, 17, 9, 30, 15, 250000)
+    task = Task(id=1, title="Stamp", created_at=now)
+    assert task.created_ns == to_ns(now)
+    assert from_ns(task.created_ns) == now
+    assert Task(id=2, title="Raw", created_ns=task.created_ns).created_at == now
+
+
+def test_task_formats_timestamps_lazily() -> None:
+    task = Task(id=1, title="Lazy", created_ns=to_ns(datetime(2024, 1, 2, 3, 4, 5)))
+    assert task.created_iso == "2024-01-02T03:04:05"
+    assert task.created_label == "2024-01-02 03:04:05"
+    assert task.completed_iso is None
+
+
+def test_task_cache_follows_changed_timestamp() -> None:
+    first = datetime(2024, 1, 1, 12, 0)
+    second = datetime(2024, 6, 1, 12, 0)
+    task = Task(id=1, title="Done", completed=True, completed_at=first)
+    assert task.completed_iso == first.isoformat()
+
+    task.completed_ns = to_ns(second)
+    assert task.completed_at == second
+    assert task.completed_iso == second.isoformat()
+
+
+def test_task_caches_encodings_until_dirty() -> None:
+    task = Task(id=1, title="Cached")
+    calls: list[int] = []
+
+    def encode(encoded_task: Task) -> str:
+        calls.append(encoded_task.id)
+        return encoded_task.title
+
+    assert task.encoded("csv", encode) == "Cached"
+    assert task.encoded("csv", encode) == "Cached"
+    assert calls == [1]
+
+    task.mark_dirty()
+    task.title = "Changed"
+    assert task.encoded("csv", encode) == "Changed"
+    assert calls == [1, 1]
+
+
+def test_task_copy_is_independent() -> None:
+    """Tests that a copied task can change without affecting the original."""
+    task = Task(id=1, title="Original", description="Notes", completed=True)
+    clone = copy(task)
+    assert clone == task and clone is not task
+    clone.title = "Changed"
+    assert task.title == "Original"
+
+
+def test_task_due_date_and_priority_round_trip() -> None:
+    """Tests that the due date and priority survive to_dict/from_dict."""
+    due = datetime(2030, 5, 6, 7, 8)
+    task = Task(id=1, title="Plan", due_at=due, priority=2)
+    assert task.due_at == due and task.due_label == "2030-05-06 07:08"
+    assert Task.from_dict(task.to_dict()) == task
+    assert str(task) == "[✗] ID: 1 | Plan | due 2030-05-06 07:08 | medium"
+    with pytest.raises(ValueError, match="Priority must be between 0 and 3."):
+        Task(id=2, title="Bad", priority=9)
+
+
+def test_task_tags_round_trip_and_validation() -> None:
+    """Tests that tags survive to_dict/from_dict and are checked."""
+    task = Task(id=1, title="Deploy", tags=["backend", "urgent"])
+    assert task.tags == ("backend", "urgent")
+    assert Task.from_dict(task.to_dict()) == task
+    assert str(task) == "[✗] ID: 1 | Deploy | #backend #urgent"
+    with pytest.raises(ValueError, match="Invalid tag: Back End."):
+        Task(id=2, title="Bad", tags=["Back End"])
+    with pytest.raises(ValueError, match="distinct and sorted"):
+        Task(id=3, title="Bad", tags=["b", "a"])
@@ -0,0 +1,102 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from src.services.task_lists import TaskLists
+from src.ui.cli import TodoCLI
+
+
+def test_open_creates_and_reuses_lists(tmp_path: Path) -> None:
+    lists = TaskLists(tmp_path)
+    work = lists.open("work")
+    work.add_task("Report")
+    assert lists.open("work") is work
+    assert lists.names() == ["work"]
+    assert lists.stats().loads == 1
+
+
+def test_least_recently_used_list_is_saved_and_evicted(tmp_path: Path) -> None:
+    lists = TaskLists(tmp_path, max_open=2)
+    lists.open("a").add_task("A task")
+    lists.open("b").add_task("B task")
+    lists.open("a")
+    lists.open("c")
+
+    assert not lists.is_open("b") and lists.is_open("a")
+    assert lists.stats().evictions == 1
+    assert lists.names() == ["a", "b", "c"]
+    reloaded = lists.open("b")
+    assert [task.title for task in reloaded.get_all_tasks()] == ["B task"]
+    assert not lists.is_open("a")
+
+
+def test_close_idle_drops_unused_lists(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    clock = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    lists = TaskLists(tmp_path)
+    lists.open("old").add_task("Stale")
+    clock[0] += 60
+    lists.open("new")
+    assert lists.close_idle(30) == 1
+    assert not lists.is_open("old") and lists.is_open("new")
+
+    lists.close_all()
+    assert lists.stats().resident == 0
+    restored = TaskLists(tmp_path)
+    assert restored.open("old").get_task(1) is not None
+
+
+def test_writes_after_an_idle_sweep_reach_a_pinned_list(tmp_path: Path) -> None:
+    lists = TaskLists(tmp_path, max_open=1)
+    service = lists.pin("default")
+    service.add_task("Before the sweep")
+    assert lists.close_idle(0) == 0 and not lists.close("default")
+    lists.open("other")
+    assert lists.is_open("default") and lists.stats().resident == 2
+    service.add_task("After the sweep")
+    lists.close_all()
+
+    restored = TaskLists(tmp_path).open("default")
+    titles = [task.title for task in restored.get_all_tasks()]
+    assert titles == ["Before the sweep", "After the sweep"]
+
+    lists.pin("default")
+    lists.unpin("default")
+    assert lists.close_idle(0) == 1
+
+
+def test_cli_keeps_writing_to_its_list_after_idle_sweeps(tmp_path: Path) -> None:
+    lists = TaskLists(tmp_path)
+    cli = TodoCLI(lists.open("default"), lists=lists)
+    cli.task_service.add_task("First")
+    lists.close_idle(0)
+    cli.task_service.add_task("Second")
+    cli.handle_use("work")
+    assert lists.close_idle(0) == 1 and lists.is_open("work")
+    lists.close_all()
+
+    restored = TaskLists(tmp_path).open("default")
+    assert [task.title for task in restored.get_all_tasks()] == ["First", "Second"]
+
+
+def test_save_due_saves_lists_after_debounce(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    clock = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    lists = TaskLists(tmp_path, debounce=1, max_delay=5)
+    lists.open("a").add_task("Task")
+    assert lists.save_due() == 0
+    clock[0] += 2
+    assert lists.save_due() == 1
+    assert lists.path("a").exists()
+
+
+def test_invalid_names_and_capacity_are_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="At least one list"):
+        TaskLists(tmp_path, max_open=0)
+    with pytest.raises(ValueError, match="may only contain"):
+        TaskLists(tmp_path).open("../escape")
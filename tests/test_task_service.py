@@ -1,3 +1,6 @@
+from datetime import datetime, timedelta
+from itertools import count
+
 import pytest
 
 from src.services.task_service import TaskService
@@ -92,3 +95,229 @@ def test_toggle_status(service: TaskService) -> None:
 def test_toggle_status_not_found(service: TaskService) -> None:
     with pytest.raises(ValueError, match="Task with ID 99 not found."):
         service.toggle_status(99)
+
+
+def test_get_all_tasks_sorted_by_title(service: TaskService) -> None:
+    service.add_task("banana")
+    service.add_task("Apple")
+    service.add_task("cherry")
+    titles = [task.title for task in service.get_all_tasks("title")]
+    assert titles == ["Apple", "banana", "cherry"]
+
+    reversed_titles = [task.title for task in service.get_all_tasks("title", True)]
+    assert reversed_titles == ["cherry", "banana", "Apple"]
+
+
+def test_get_all_tasks_unknown_sort_key(service: TaskService) -> None:
+    with pytest.raises(ValueError, match="Unknown sort key: priority."):
+        service.get_all_tasks("priority")
+
+
+def test_sorted_views_follow_updates(service: TaskService) -> None:
+    service.add_task("Alpha")
+    service.add_task("Beta")
+    service.update_task(1, title="Zulu")
+    assert [task.id for task in service.get_all_tasks("title")] == [2, 1]
+
+    service.toggle_status(2)
+    assert [task.id for task in service.get_all_tasks("completed")] == [1, 2]
+
+    service.delete_task(1)
+    assert [task.id for task in service.get_all_tasks("title")] == [2]
+
+
+def test_top_k_newest(service: TaskService) -> None:
+    for i in range(30):
+        service.add_task(f"Task {i}")
+    newest = service.top_k("created_at", 3, reverse=True)
+    assert [task.id for task in newest] == [30, 29, 28]
+    assert [task.id for task in service.top_k("id", 2)] == [1, 2]
+
+
+def test_find_by_title_prefix(service: TaskService) -> None:
+    service.add_task("Pay rent")
+    service.add_task("pack bags")
+    service.add_task("Call mom")
+    assert [task.id for task in service.find_by_title_prefix("PA")] == [2, 1]
+    assert [task.id for task in service.find_by_title_prefix("pa", limit=1)] == [2]
+    assert service.find_by_title_prefix("   ") == []
+
+    service.update_task(3, title="Pack lunch")
+    assert [task.id for task in service.find_by_title_prefix("pack")] == [2, 3]
+
+
+def test_ids_in_ranges(service: TaskService) -> None:
+    for i in range(10):
+        service.add_task(f"Task {i}")
+    service.delete_task(3)
+    assert service.ids_in_ranges([(2, 4), (9, 1000), (4, 4)]) == [2, 4, 9, 10]
+
+
+def test_delete_tasks_batch(service: TaskService) -> None:
+    for i in range(100):
+        service.add_task(f"Task {i}")
+    deleted = service.delete_tasks([*range(1, 81), 500])
+    assert deleted == list(range(1, 81))
+    assert [task.id for task in service.get_all_tasks("title")][:2] == [81, 82]
+    assert len(service.search("status:open")) == 20
+
+
+def test_toggle_tasks_batch(service: TaskService) -> None:
+    for i in range(100):
+        service.add_task(f"Task {i}")
+    toggled = service.toggle_tasks(range(1, 71))
+    assert len(toggled) == 70
+    assert service.find_ids("status:done") == list(range(1, 71))
+    assert service.get_all_tasks("completed")[0].id == 71
+
+
+def test_injected_clock_stamps_tasks() -> None:
+    readings = count(1_000)
+    service = TaskService(clock=lambda: next(readings))
+    task = service.add_task("Clocked")
+    assert task.created_ns == 1_000
+    toggled = service.toggle_status(task.id)
+    assert toggled is not None and toggled.completed_ns == 1_001
+
+
+def test_add_tasks_shares_one_clock_reading() -> None:
+    readings = count(5_000)
+    service = TaskService(clock=lambda: next(readings))
+    tasks = service.add_tasks([("First", ""), ("Second", "notes")])
+    assert [task.id for task in tasks] == [1, 2]
+    assert {task.created_ns for task in tasks} == {5_000}
+    assert next(readings) == 5_001
+    assert service.find_ids("second") == [2]
+    assert service.add_task("Third").id == 3
+
+
+def test_add_tasks_validates_before_storing(service: TaskService) -> None:
+    with pytest.raises(ValueError, match="Title cannot be empty"):
+        service.add_tasks([("Fine", ""), ("", "")])
+    assert service.get_all_tasks() == []
+
+
+def test_deleted_task_can_be_undeleted(service: TaskService) -> None:
+    service.add_task("Keep")
+    service.add_task("Restore me", "Notes")
+    assert service.delete_task(2) is True
+    assert service.get_task(2) is None
+    assert service.find_ids("title:~restore") == []
+    assert service.deleted_count() == 1
+
+    restored = service.undelete_task(2)
+    assert restored.description == "Notes"
+    assert service.find_ids("title:~restore") == [2]
+    assert service.deleted_count() == 0
+    with pytest.raises(ValueError, match="No deleted task with ID 2"):
+        service.undelete_task(2)
+
+
+def test_delete_where_and_purge_completed(service: TaskService) -> None:
+    for i in range(10):
+        service.add_task(f"Task {i}")
+    service.toggle_tasks(range(1, 5))
+    assert service.delete_where("title:~task created>=2000-01-01 status:open") == [
+        *range(5, 11)
+    ]
+    assert service.purge_completed() == [1, 2, 3, 4]
+    assert service.get_all_tasks() == []
+    assert service.deleted_count() == 10
+
+
+def test_compact_reclaims_tombstones_and_shrinks_dict() -> None:
+    service = TaskService()
+    service.add_tasks((f"Task {i}", "") for i in range(5_000))
+    grown = service.memory_report().structures["task dict"]
+    service.delete_where("title:~task")
+    service.add_task("Survivor")
+
+    assert service.compact(older_than=timedelta(days=1)) == 0
+    assert service.compact() == 5_000
+    assert service.deleted_count() == 0
+    assert service.memory_report().structures["task dict"] < grown / 10
+    assert [task.title for task in service.get_all_tasks()] == ["Survivor"]
+    with pytest.raises(ValueError, match="No deleted task"):
+        service.undelete_task(1)
+
+
+def test_next_due_and_overdue_follow_changes() -> None:
+    clock = count(start=1_000_000, step=0)
+    service = TaskService(clock=lambda: next(clock))
+    soon = datetime.fromtimestamp(0) + timedelta(microseconds=500)
+    later = soon + timedelta(days=1)
+    service.add_task("Later", due_at=later)
+    service.add_task("Soon", due_at=soon, priority=1)
+    service.add_task("Urgent", due_at=soon, priority=3)
+    service.add_task("Someday")
+
+    assert [t.id for t in service.next_due(2)] == [3, 2]
+    assert [t.id for t in service.overdue()] == [3, 2]
+    service.toggle_status(3)
+    service.update_task(1, priority=2)
+    service.update_task(2, clear_due=True)
+    assert [t.id for t in service.next_due()] == [1]
+    assert service.overdue() == []
+    service.update_task(4, due_at=soon)
+    service.delete_task(1)
+    assert [(t.id, t.due_at) for t in service.next_due()] == [(4, soon)]
+
+
+def test_priority_is_validated(service: TaskService) -> None:
+    with pytest.raises(ValueError, match="Priority must be between 0 and 3."):
+        service.add_task("Bad", priority=4)
+    task = service.add_task("Fine")
+    with pytest.raises(ValueError, match="Priority must be between 0 and 3."):
+        service.update_task(task.id, priority=-1)
+
+
+def test_tag_tasks_adds_removes_and_validates(service: TaskService) -> None:
+    task = service.add_task("Deploy", tags=["Backend", "#urgent"])
+    assert task.tags == ("backend", "urgent")
+    assert service.tag_tasks([task.id, 999], add=["ops"], remove=["urgent"]) == [
+        task.id
+    ]
+    assert service.tag_tasks([task.id], add=["ops"]) == []
+    assert service.tag_counts() == {"backend": 1, "ops": 1}
+
+    many = [f"t{i}" for i in range(15)]
+    with pytest.raises(ValueError, match="at most 16 tags"):
+        service.tag_tasks([task.id], add=many)
+    with pytest.raises(ValueError, match="Invalid tag"):
+        service.update_task(task.id, tags=["no spaces allowed!"])
+    assert service.find_ids("tag:backend tag:ops") == [task.id]
+
+    service.delete_task(task.id)
+    assert service.tag_counts() == {}
+    service.undelete_task(task.id)
+    assert service.find_ids("tag:ops") == [task.id]
+
+
+def test_dependencies_track_ready_tasks_and_reject_cycles(
+    service: TaskService,
+) -> None:
+    for title in ("Design", "Build", "Ship"):
+        service.add_task(title)
+    service.add_dependency(2, 1)
+    assert service.add_dependency(3, 2).blocked_by == (2,)
+    assert [t.id for t in service.ready_tasks()] == [1]
+    assert [t.id for t in service.dependency_order()] == [1, 2, 3]
+
+    with pytest.raises(ValueError, match="cycle"):
+        service.add_dependency(1, 3)
+    with pytest.raises(ValueError, match="itself"):
+        service.add_dependency(1, 1)
+    with pytest.raises(ValueError, match="not found"):
+        service.add_dependency(1, 99)
+
+    service.toggle_status(1)
+    assert [t.id for t in service.ready_tasks()] == [2]
+    service.delete_task(2)
+    assert [t.id for t in service.ready_tasks()] == [3]
+    service.undelete_task(2)
+    assert [t.id for t in service.ready_tasks(limit=5)] == [2]
+
+    service.remove_dependency(3, 2)
+    assert [t.id for t in service.ready_tasks()] == [2, 3]
+    with pytest.raises(ValueError, match="does not wait"):
+        service.remove_dependency(3, 2)
@@ -1,6 +1,13 @@
+from datetime import datetime
+
 from src.utils.validators import (
     validate_description,
+    validate_due_date,
+    validate_id_expression,
+    validate_list_name,
     validate_menu_choice,
+    validate_priority,
+    validate_tags,
     validate_task_id,
     validate_title,
 )
@@ -84,3 +91,77 @@ def test_validate_menu_choice_out_of_range() -> None:
     assert is_valid is False
     assert choice is None
     assert msg == "Invalid choice. Please enter a number between 1 and 6."
+
+
+def test_validate_id_expression_valid() -> None:
+    is_valid, ranges, msg = validate_id_expression("1-500, 720,900 - 950")
+    assert is_valid is True
+    assert ranges == [(1, 500), (720, 720), (900, 950)]
+    assert msg == ""
+
+
+def test_validate_id_expression_invalid() -> None:
+    is_valid, ranges, msg = validate_id_expression("1-x")
+    assert is_valid is False
+    assert ranges is None
+    assert msg == "Please enter IDs like 1-500,720,900-950."
+
+    is_valid, ranges, msg = validate_id_expression("9-3")
+    assert is_valid is False
+    assert msg == "Invalid ID range: 9-3."
+
+    is_valid, ranges, msg = validate_id_expression("0,4")
+    assert is_valid is False
+    assert msg == "Please enter valid positive task IDs."
+
+
+def test_validate_list_name() -> None:
+    assert validate_list_name("work-2024_q1") == (True, "")
+    assert validate_list_name("") == (False, "List name cannot be empty.")
+    assert validate_list_name("../etc")[0] is False
+    assert validate_list_name("-x") == (
+        False,
+        "List name must start with a letter or digit.",
+    )
+
+
+def test_validate_priority() -> None:
+    assert validate_priority("High") == (True, 3, "")
+    assert validate_priority("1") == (True, 1, "")
+    assert validate_priority("²")[0] is False
+    assert validate_priority(0) == (True, 0, "")
+    assert validate_priority(4) == (False, None, "Priority must be between 0 and 3.")
+    assert validate_priority("urgent") == (
+        False,
+        None,
+        "Priority must be one of: none, low, medium, high.",
+    )
+
+
+def test_validate_due_date() -> None:
+    assert validate_due_date("2025-03-01") == (True, datetime(2025, 3, 1, 23, 59), "")
+    assert validate_due_date("20250301") == (True, datetime(2025, 3, 1, 23, 59), "")
+    assert validate_due_date("2025-03-01 00:00")[1] == datetime(2025, 3, 1)
+    assert validate_due_date("2025-03-01 17:30") == (
+        True,
+        datetime(2025, 3, 1, 17, 30),
+        "",
+    )
+    assert validate_due_date("tomorrow")[0] is False
+    assert validate_due_date("2025-03-01T10:00+02:00")[0] is False
+
+
+def test_validate_tags() -> None:
+    assert validate_tags("#Backend, urgent backend") == (
+        True,
+        ("backend", "urgent"),
+        "",
+    )
+    assert validate_tags(["ops", ""]) == (True, ("ops",), "")
+    valid, tags, err = validate_tags("needs review!")
+    assert (valid, tags) == (False, None) and err.startswith("Invalid tag: review!.")
+    assert validate_tags([f"t{i}" for i in range(17)]) == (
+        False,
+        None,
+        "A task can have at most 16 tags.",
+    )